@@ -0,0 +1,375 @@
+"""Shared dependency cache for worktrees.
+
+A new worktree starts without node_modules or .venv, so the first test run
+in it does a full install. The cache keeps one copy of each installed
+dependency directory, keyed by a hash of its lockfile
+(package-lock.json, pnpm-lock.yaml, yarn.lock, bun.lock(b), uv.lock,
+poetry.lock), under ``.adw/depcache/<key>/``.
+
+Entries are materialized into worktrees with reflink copies (FICLONE) where
+the filesystem supports them, hardlinks otherwise, and plain copies as a
+last resort. An entry is seeded from the main checkout the first time a
+worktree needs it, provided the checkout's lockfile has the same hash.
+Least recently used entries are evicted once the cache exceeds its size
+limit.
+
+Virtualenv scripts and editable-install path files embed absolute paths.
+Those few files are copied with the paths rewritten rather than linked.
+"""
+
+from __future__ import annotations
+
+import errno
+import hashlib
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Cache directory, relative to the project root
+DEFAULT_CACHE_DIR = Path(".adw/depcache")
+
+# Evict least recently used entries beyond this total size
+DEFAULT_MAX_BYTES = 10 * 1024**3
+
+# ioctl request cloning one file's extents into another (linux/fs.h)
+FICLONE = 0x40049409
+
+# Entry metadata file
+META_FILE = "meta.json"
+
+
+@dataclass(frozen=True)
+class DependencySpec:
+    """An installed dependency directory and the lockfile it is built from.
+
+    Attributes:
+        name: Package manager name.
+        lockfiles: Lockfile names, any of which identifies the manager.
+        directory: Installed dependency directory.
+    """
+
+    name: str
+    lockfiles: tuple[str, ...]
+    directory: str
+
+
+# Checked in order; the first lockfile found claims its directory
+DEPENDENCY_SPECS = (
+    DependencySpec("pnpm", ("pnpm-lock.yaml",), "node_modules"),
+    DependencySpec("yarn", ("yarn.lock",), "node_modules"),
+    DependencySpec("bun", ("bun.lock", "bun.lockb"), "node_modules"),
+    DependencySpec("npm", ("package-lock.json",), "node_modules"),
+    DependencySpec("uv", ("uv.lock",), ".venv"),
+    DependencySpec("poetry", ("poetry.lock",), ".venv"),
+)
+
+
+def _cache_key(spec: DependencySpec, lockfile: Path) -> str:
+    digest = hashlib.sha256()
+    # Installed trees hold native builds, so they only carry over to the same platform
+    digest.update(f"{spec.name}\0{sys.platform}\0{platform.machine()}\0".encode())
+    digest.update(lockfile.read_bytes())
+    return digest.hexdigest()[:32]
+
+
+def _find_lockfile(spec: DependencySpec, root: Path) -> Path | None:
+    for name in spec.lockfiles:
+        path = root / name
+        if path.is_file():
+            return path
+    return None
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, "reflink not supported")
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        try:
+            fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+        except OSError:
+            target.close()
+            dst.unlink(missing_ok=True)
+            raise
+    shutil.copystat(src, dst)
+
+
+_CLONERS: dict[str, Callable[[Path, Path], Any]] = {
+    "reflink": _reflink,
+    "hardlink": os.link,
+    "copy": shutil.copy2,
+}
+
+
+def _needs_rewrite(relative: Path) -> bool:
+    """Check whether a virtualenv file may embed absolute paths."""
+    parts = relative.parts
+    if len(parts) >= 2 and parts[0] in ("bin", "Scripts"):
+        return True
+    return "site-packages" in parts and (relative.suffix == ".pth" or relative.name.startswith("__editable__"))
+
+
+class _TreeCloner:
+    """Clones a directory tree with the cheapest method that works."""
+
+    def __init__(self, methods: tuple[str, ...], rewrite: tuple[str, str] | None = None):
+        self.methods = list(methods)
+        self.rewrite = rewrite
+        self.bytes = 0
+
+    def _file(self, src: Path, dst: Path, relative: Path) -> None:
+        if self.rewrite and _needs_rewrite(relative):
+            data = src.read_bytes()
+            old, new = (path.encode() for path in self.rewrite)
+            if old in data:
+                dst.write_bytes(data.replace(old, new))
+                shutil.copymode(src, dst)
+                return
+        while True:
+            try:
+                _CLONERS[self.methods[0]](src, dst)
+                return
+            except OSError:
+                if len(self.methods) == 1:
+                    raise
+                logger.debug("%s unavailable, falling back to %s", self.methods[0], self.methods[1])
+                self.methods.pop(0)
+
+    def clone(self, src: Path, dst: Path) -> None:
+        """Clone src to dst (which must not exist)."""
+        dst.mkdir(parents=True)
+        for dirpath, dirnames, filenames in os.walk(src):
+            current = Path(dirpath)
+            relative_dir = current.relative_to(src)
+            target_dir = dst / relative_dir
+            for name in list(dirnames):
+                source = current / name
+                if source.is_symlink():
+                    # Not followed by os.walk; recreated as links below
+                    dirnames.remove(name)
+                    filenames.append(name)
+                else:
+                    (target_dir / name).mkdir()
+            for name in filenames:
+                source = current / name
+                target = target_dir / name
+                if source.is_symlink():
+                    os.symlink(os.readlink(source), target)
+                    continue
+                self._file(source, target, relative_dir / name)
+                self.bytes += source.lstat().st_size
+
+
+class DependencyCache:
+    """Installed dependency directories shared between worktrees.
+
+    Attributes:
+        cache_dir: Directory holding the cache entries.
+        max_bytes: Size limit; least recently used entries are evicted beyond it.
+    """
+
+    def __init__(self, cache_dir: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Cache directory. Defaults to .adw/depcache
+            max_bytes: Size limit in bytes.
+        """
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.max_bytes = max_bytes
+
+    def _read_meta(self, entry: Path) -> dict[str, Any] | None:
+        try:
+            meta: dict[str, Any] = json.loads((entry / META_FILE).read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+        return meta
+
+    def _write_meta(self, entry: Path, meta: dict[str, Any]) -> None:
+        tmp_path = entry / f"{META_FILE}.{os.getpid()}.tmp"
+        tmp_path.write_text(json.dumps(meta, indent=2))
+        os.replace(tmp_path, entry / META_FILE)
+
+    def store(self, spec: DependencySpec, source_root: Path) -> str | None:
+        """Add a checkout's installed dependency directory to the cache.
+
+        Args:
+            spec: Which dependency directory to store.
+            source_root: Checkout containing the lockfile and directory.
+
+        Returns:
+            Cache key, or None if there is nothing to store.
+        """
+        lockfile = _find_lockfile(spec, source_root)
+        source = source_root / spec.directory
+        if lockfile is None or not source.is_dir():
+            return None
+
+        key = _cache_key(spec, lockfile)
+        entry = self.cache_dir / key
+        if (entry / META_FILE).exists():
+            return key
+
+        tmp_entry = self.cache_dir / f"{key}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        # The source keeps changing under its owner, so the cache never shares its inodes
+        cloner = _TreeCloner(("reflink", "copy"))
+        try:
+            cloner.clone(source, tmp_entry / spec.directory)
+            self._write_meta(
+                tmp_entry,
+                {
+                    "manager": spec.name,
+                    "directory": spec.directory,
+                    "lockfile": lockfile.name,
+                    "origin": str(source_root.resolve()),
+                    "size": cloner.bytes,
+                    "created": time.time(),
+                    "last_used": time.time(),
+                },
+            )
+            os.rename(tmp_entry, entry)
+        except OSError as e:
+            # Another process may have stored the same entry first
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+            if not (entry / META_FILE).exists():
+                logger.debug("Could not cache %s: %s", source, e)
+                return None
+        return key
+
+    def materialize(self, spec: DependencySpec, worktree: Path, source_root: Path | None = None) -> bool:
+        """Put a cached dependency directory into a worktree.
+
+        Args:
+            spec: Which dependency directory to materialize.
+            worktree: Worktree to fill in.
+            source_root: Checkout to seed the cache from on a miss, if its
+                lockfile matches the worktree's.
+
+        Returns:
+            True if the directory was materialized.
+        """
+        lockfile = _find_lockfile(spec, worktree)
+        target = worktree / spec.directory
+        if lockfile is None or target.exists():
+            return False
+
+        key = _cache_key(spec, lockfile)
+        entry = self.cache_dir / key
+        meta = self._read_meta(entry)
+        if meta is None and source_root is not None:
+            source_lockfile = _find_lockfile(spec, source_root)
+            if source_lockfile is not None and _cache_key(spec, source_lockfile) == key:
+                if self.store(spec, source_root) == key:
+                    meta = self._read_meta(entry)
+        if meta is None:
+            return False
+
+        rewrite = None
+        if spec.directory == ".venv" and meta.get("origin"):
+            rewrite = (meta["origin"], str(worktree.resolve()))
+        cloner = _TreeCloner(("reflink", "hardlink", "copy"), rewrite)
+        try:
+            cloner.clone(entry / spec.directory, target)
+        except OSError as e:
+            logger.debug("Could not materialize %s: %s", entry, e)
+            shutil.rmtree(target, ignore_errors=True)
+            return False
+
+        meta["last_used"] = time.time()
+        try:
+            self._write_meta(entry, meta)
+        except OSError:
+            pass
+        logger.debug("Materialized %s into %s via %s", spec.directory, worktree, cloner.methods[0])
+        self.evict(keep=key)
+        return True
+
+    def entries(self) -> list[tuple[str, dict[str, Any]]]:
+        """List cache entries with their metadata, least recently used first."""
+        if not self.cache_dir.is_dir():
+            return []
+        found = []
+        for entry in self.cache_dir.iterdir():
+            if entry.name.endswith(".tmp"):
+                continue  # Being stored
+            meta = self._read_meta(entry) if entry.is_dir() else None
+            if meta is not None:
+                found.append((entry.name, meta))
+        found.sort(key=lambda item: item[1].get("last_used", 0))
+        return found
+
+    def evict(self, keep: str | None = None) -> list[str]:
+        """Evict least recently used entries until the cache fits its limit.
+
+        Args:
+            keep: Entry that must not be evicted (the one just used).
+
+        Returns:
+            Evicted keys.
+        """
+        entries = self.entries()
+        total = sum(meta.get("size", 0) for _, meta in entries)
+        evicted = []
+        for key, meta in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.cache_dir / key, ignore_errors=True)
+            total -= meta.get("size", 0)
+            evicted.append(key)
+        return evicted
+
+
+def materialize_dependencies(
+    worktree: Path,
+    source_root: Path | None = None,
+    cache: DependencyCache | None = None,
+) -> list[str]:
+    """Fill a new worktree's dependency directories from the cache.
+
+    Only initialized projects (those with an ``.adw/`` directory) get a
+    cache unless one is passed in.
+
+    Args:
+        worktree: Worktree to fill in.
+        source_root: Main checkout, used to seed the cache. Defaults to the
+            current directory.
+        cache: Dependency cache. Defaults to .adw/depcache under source_root.
+
+    Returns:
+        Directories that were materialized.
+    """
+    source_root = source_root or Path.cwd()
+    if cache is None:
+        if not (source_root / ".adw").is_dir():
+            return []
+        cache = DependencyCache(source_root / DEFAULT_CACHE_DIR)
+
+    claimed: set[str] = set()
+    done: list[str] = []
+    for spec in DEPENDENCY_SPECS:
+        if spec.directory in claimed or _find_lockfile(spec, worktree) is None:
+            continue
+        claimed.add(spec.directory)
+        try:
+            if cache.materialize(spec, worktree, source_root):
+                done.append(spec.directory)
+        except OSError as e:
+            logger.debug("Could not materialize %s: %s", spec.directory, e)
+    return done
@@ -4,10 +4,15 @@ from __future__ import annotations
 
 import json
 import os
+import signal
 import subprocess
+import threading
 import time
+from pathlib import Path
+from typing import Any
 
 from .models import AgentPromptRequest, AgentPromptResponse, RetryCode
+from .usage import StreamUsage, UsageTracker, record_usage
 from .utils import get_output_dir
 
 # Environment variables safe to pass to subprocess
@@ -34,6 +39,78 @@ def get_safe_env() -> dict[str, str]:
     return env
 
 
+def _stream_output(
+    cmd: list[str],
+    request: AgentPromptRequest,
+    output_dir: Path,
+    messages: list[dict[str, Any]],
+    tracker: UsageTracker,
+) -> str:
+    """Run Claude Code, handling its stream-json output line by line.
+
+    Raw output is written to cc_raw_output.jsonl as it arrives, and each
+    message is parsed into messages and fed to the usage tracker with its
+    arrival time.
+
+    Returns:
+        The complete raw output.
+
+    Raises:
+        subprocess.TimeoutExpired: If the run took longer than the request's
+            timeout (the process is killed).
+    """
+    process = subprocess.Popen(
+        cmd,
+        cwd=request.working_dir,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        env=get_safe_env(),
+        # Own process group, so a timeout also stops the tools it spawned
+        start_new_session=True,
+    )
+    timed_out = threading.Event()
+
+    def kill() -> None:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            process.kill()
+
+    def expire() -> None:
+        timed_out.set()
+        kill()
+
+    timer = threading.Timer(request.timeout, expire)
+    timer.daemon = True
+    timer.start()
+    lines = []
+    try:
+        with (output_dir / "cc_raw_output.jsonl").open("w", buffering=1) as raw:
+            for line in process.stdout or ():
+                received_at = time.time()
+                raw.write(line)
+                lines.append(line)
+                if not line.strip():
+                    continue
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                messages.append(message)
+                if isinstance(message, dict):
+                    tracker.feed(message, received_at)
+        process.wait()
+    finally:
+        timer.cancel()
+        if process.poll() is None:
+            kill()
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, request.timeout)
+    return "".join(lines)
+
+
 def prompt_claude_code(request: AgentPromptRequest) -> AgentPromptResponse:
     """Execute a prompt with Claude Code CLI."""
     start_time = time.time()
@@ -49,30 +126,13 @@ def prompt_claude_code(request: AgentPromptRequest) -> AgentPromptResponse:
     cmd.extend(["--verbose", "--output-format", "stream-json"])
     cmd.extend(["--print", request.prompt])
 
+    tracker = UsageTracker(start_time)
     try:
-        result = subprocess.run(
-            cmd,
-            cwd=request.working_dir,
-            capture_output=True,
-            text=True,
-            timeout=request.timeout,
-            env=get_safe_env(),
-        )
+        messages: list[dict[str, Any]] = []
+        stdout = _stream_output(cmd, request, output_dir, messages, tracker)
 
         duration = time.time() - start_time
 
-        # Save raw output
-        (output_dir / "cc_raw_output.jsonl").write_text(result.stdout)
-
-        # Parse JSONL
-        messages = []
-        for line in result.stdout.strip().split("\n"):
-            if line.strip():
-                try:
-                    messages.append(json.loads(line))
-                except json.JSONDecodeError:
-                    continue
-
         # Save parsed
         (output_dir / "cc_raw_output.json").write_text(json.dumps(messages, indent=2))
 
@@ -95,7 +155,7 @@ def prompt_claude_code(request: AgentPromptRequest) -> AgentPromptResponse:
         (output_dir / "cc_final_result.txt").write_text(result_text)
 
         # Check for empty response (Claude didn't produce output)
-        if not messages and not result.stdout.strip():
+        if not messages and not stdout.strip():
             return AgentPromptResponse(
                 output="",
                 success=False,
@@ -112,6 +172,7 @@ def prompt_claude_code(request: AgentPromptRequest) -> AgentPromptResponse:
                 retry_code=RetryCode.EXECUTION_ERROR,
                 error_message=error_msg,
                 duration_seconds=duration,
+                usage=tracker.usage,
             )
 
         return AgentPromptResponse(
@@ -119,6 +180,7 @@ def prompt_claude_code(request: AgentPromptRequest) -> AgentPromptResponse:
             success=True,
             session_id=session_id,
             duration_seconds=duration,
+            usage=tracker.usage,
         )
 
     except subprocess.TimeoutExpired:
@@ -128,6 +190,7 @@ def prompt_claude_code(request: AgentPromptRequest) -> AgentPromptResponse:
             retry_code=RetryCode.TIMEOUT_ERROR,
             error_message=f"Timeout after {request.timeout}s",
             duration_seconds=request.timeout,
+            usage=tracker.partial_usage,
         )
     except FileNotFoundError:
         return AgentPromptResponse(
@@ -157,18 +220,28 @@ def prompt_with_retry(
     max_retries: int = 3,
     retry_delays: list[int] | None = None,
 ) -> AgentPromptResponse:
-    """Execute prompt with automatic retry."""
+    """Execute prompt with automatic retry.
+
+    The run is recorded as a phase (named after the agent) of the request's
+    task in the metrics database, with usage summed over all attempts.
+    """
     if retry_delays is None:
         retry_delays = [1, 3, 5]
 
     last_response = None
+    usage: StreamUsage | None = None
+    duration = 0.0
 
     for attempt in range(max_retries + 1):
         response = prompt_claude_code(request)
         last_response = response
+        duration += response.duration_seconds
+        if response.usage is not None:
+            usage = usage or StreamUsage()
+            usage.add(response.usage)
 
         if response.success or response.retry_code == RetryCode.NONE:
-            return response
+            break
 
         if attempt < max_retries:
             delay = retry_delays[min(attempt, len(retry_delays) - 1)]
@@ -176,6 +249,17 @@ def prompt_with_retry(
                 delay *= 3
             time.sleep(delay)
 
+    if usage is not None and last_response is not None:
+        record_usage(
+            request.adw_id,
+            request.agent_name,
+            usage,
+            duration_seconds=duration,
+            success=last_response.success,
+            retries=attempt,
+            model=request.model,
+        )
+
     return last_response or AgentPromptResponse(
         output="",
         success=False,
@@ -9,8 +9,11 @@ This module provides intelligent model selection based on:
 
 from __future__ import annotations
 
+import re
 from typing import Literal
 
+from ..utils.matcher import PatternTable
+
 # Model selection based on slash command and model set
 SLASH_COMMAND_MODEL_MAP: dict[str, dict[str, str]] = {
     # Planning commands - complex reasoning benefits from Opus
@@ -52,6 +55,28 @@ PHASE_MODEL_MAP: dict[str, dict[str, str]] = {
 }
 
 
+# Keywords in a task description that suggest a complex task
+COMPLEX_KEYWORDS = [
+    "architecture",
+    "redesign",
+    "refactor",
+    "migrate",
+    "security",
+    "authentication",
+    "authorization",
+    "performance",
+    "optimization",
+    "scale",
+    "database",
+    "schema",
+    "migration",
+    "api design",
+    "system design",
+]
+
+_COMPLEX_TABLE: PatternTable[str] = PatternTable(((re.escape(kw), kw) for kw in COMPLEX_KEYWORDS), ignore_case=False)
+
+
 def get_model_for_command(
     slash_command: str,
     model_set: Literal["base", "heavy"] = "base",
@@ -147,26 +172,7 @@ def should_use_heavy_model(task_description: str, tags: list[str]) -> bool:
         return True
 
     # Keywords suggesting complexity
-    complex_keywords = [
-        "architecture",
-        "redesign",
-        "refactor",
-        "migrate",
-        "security",
-        "authentication",
-        "authorization",
-        "performance",
-        "optimization",
-        "scale",
-        "database",
-        "schema",
-        "migration",
-        "api design",
-        "system design",
-    ]
-
-    description_lower = task_description.lower()
-    if any(kw in description_lower for kw in complex_keywords):
+    if _COMPLEX_TABLE.search(task_description.lower()):
         return True
 
     return False
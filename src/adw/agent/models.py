@@ -7,6 +7,8 @@ from typing import Literal
 
 from pydantic import BaseModel, Field
 
+from .usage import StreamUsage
+
 
 class TaskStatus(str, Enum):
     PENDING = "pending"
@@ -46,6 +48,7 @@ class AgentPromptResponse(BaseModel):
     retry_code: RetryCode = RetryCode.NONE
     error_message: str | None = None
     duration_seconds: float = 0.0
+    usage: StreamUsage | None = None
 
 
 class Task(BaseModel):
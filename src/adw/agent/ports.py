@@ -1,22 +1,100 @@
-"""Deterministic port allocation for parallel ADW instances."""
+"""Lease-based port allocation for parallel ADW instances.
+
+Each ADW instance leases the ports it needs (backend, frontend, and any named
+service ports such as db or redis) from a SQLite database in ``.adw/``. A
+lease is taken inside a write transaction, so two agents can never be handed
+the same port, even between checking that it is free and starting to use it.
+
+A lease ends when its agent releases it, when it expires, or when the
+process holding it is no longer running. Expired and dead leases are
+reclaimed whenever ports are allocated, and by the daemon as agents finish.
+
+Ports are picked from per-name ranges (see ``[ports]`` in the config),
+starting at a slot derived from the ADW ID, so an instance tends to get the
+same ports every time it runs.
+"""
 
 from __future__ import annotations
 
+import logging
+import os
 import socket
+import sqlite3
+import time
+import zlib
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
 
-# Port ranges for ADW instances
+logger = logging.getLogger(__name__)
+
+# Default port ranges for ADW instances (inclusive)
 BACKEND_PORT_START = 9100
-BACKEND_PORT_END = 9114
+BACKEND_PORT_END = 9199
 FRONTEND_PORT_START = 9200
-FRONTEND_PORT_END = 9214
+FRONTEND_PORT_END = 9299
+
+# Default range for other named ports (db, redis, storybook, ...)
+SERVICE_PORT_START = 9300
+SERVICE_PORT_END = 9999
+
+# Ports every ADW instance gets
+DEFAULT_PORT_NAMES = ("backend", "frontend")
+
+# Lease lifetime, in seconds, unless renewed or released earlier
+DEFAULT_LEASE_TTL = 12 * 60 * 60
+
+# Lease database, relative to the project root
+DEFAULT_LEASE_DB = Path(".adw/ports.db")
+
+
+@dataclass
+class PortLease:
+    """A port leased to an ADW instance.
+
+    Attributes:
+        port: Port number.
+        owner: ADW ID holding the lease.
+        name: Port name (backend, frontend, db, ...).
+        pid: Process holding the lease, if any.
+        acquired_at: When the lease was taken (time.time()).
+        expires_at: When the lease expires (time.time()).
+    """
+
+    port: int
+    owner: str
+    name: str
+    pid: int | None
+    acquired_at: float
+    expires_at: float
+
+
+def _slot(adw_id: str, size: int) -> int:
+    """Get an ADW ID's preferred offset into a port range."""
+    try:
+        return int(adw_id[:8], 36) % size
+    except ValueError:
+        return zlib.crc32(adw_id.encode()) % size
 
-MAX_INSTANCES = 15
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Running, under another user
+    except OSError:
+        return False
+    return True
 
 
 def get_ports_for_adw(adw_id: str) -> tuple[int, int]:
-    """Get deterministic ports for an ADW instance.
+    """Get the preferred ports of an ADW instance.
 
-    Uses hash of ADW ID to assign consistent ports.
+    Uses a hash of the ADW ID, so an instance prefers the same ports every
+    time. Allocation moves on to other ports when these are taken.
 
     Args:
         adw_id: The 8-character ADW ID.
@@ -24,15 +102,8 @@ def get_ports_for_adw(adw_id: str) -> tuple[int, int]:
     Returns:
         Tuple of (backend_port, frontend_port).
     """
-    # Convert first 8 chars to index
-    try:
-        index = int(adw_id[:8], 36) % MAX_INSTANCES
-    except ValueError:
-        index = hash(adw_id) % MAX_INSTANCES
-
-    backend_port = BACKEND_PORT_START + index
-    frontend_port = FRONTEND_PORT_START + index
-
+    backend_port = BACKEND_PORT_START + _slot(adw_id, BACKEND_PORT_END - BACKEND_PORT_START + 1)
+    frontend_port = FRONTEND_PORT_START + _slot(adw_id, FRONTEND_PORT_END - FRONTEND_PORT_START + 1)
     return backend_port, frontend_port
 
 
@@ -53,44 +124,313 @@ def is_port_available(port: int) -> bool:
         return False
 
 
-def find_available_ports(adw_id: str) -> tuple[int, int]:
-    """Find available ports, with fallback if deterministic ports are busy.
+class PortAllocator:
+    """Hands out port leases from a SQLite database shared by all agents.
+
+    Attributes:
+        db_path: Path to the lease database.
+        ranges: Port range (inclusive) for each port name.
+        default_range: Range for names without one of their own.
+        ttl: Lease lifetime, in seconds.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | None = None,
+        ranges: dict[str, tuple[int, int]] | None = None,
+        default_range: tuple[int, int] = (SERVICE_PORT_START, SERVICE_PORT_END),
+        ttl: float = DEFAULT_LEASE_TTL,
+    ):
+        """Initialize the allocator.
+
+        Args:
+            db_path: Lease database. Defaults to .adw/ports.db
+            ranges: Port range for each port name. Defaults to the backend
+                and frontend ranges.
+            default_range: Range for other port names.
+            ttl: Lease lifetime, in seconds.
+        """
+        self.db_path = db_path or Path.cwd() / DEFAULT_LEASE_DB
+        self.ranges = (
+            ranges
+            if ranges is not None
+            else {
+                "backend": (BACKEND_PORT_START, BACKEND_PORT_END),
+                "frontend": (FRONTEND_PORT_START, FRONTEND_PORT_END),
+            }
+        )
+        self.default_range = default_range
+        self.ttl = ttl
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Open the database inside a write transaction.
+
+        The transaction takes the write lock up front, so allocations from
+        different processes are serialized.
+        """
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), timeout=30.0, isolation_level=None)
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS port_leases (
+                    port INTEGER PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    pid INTEGER,
+                    acquired_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    UNIQUE (owner, name)
+                )
+                """
+            )
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def range_for(self, name: str) -> tuple[int, int]:
+        """Get the port range a port name is allocated from."""
+        return self.ranges.get(name, self.default_range)
+
+    def _reclaim(self, conn: sqlite3.Connection, now: float) -> int:
+        """Delete expired leases and leases of processes that are gone."""
+        stale = [
+            port
+            for port, pid, expires_at in conn.execute("SELECT port, pid, expires_at FROM port_leases")
+            if expires_at <= now or (pid is not None and not _pid_alive(pid))
+        ]
+        conn.executemany("DELETE FROM port_leases WHERE port = ?", [(port,) for port in stale])
+        if stale:
+            logger.debug("Reclaimed ports %s", stale)
+        return len(stale)
+
+    def acquire(
+        self,
+        owner: str,
+        names: Iterable[str] = DEFAULT_PORT_NAMES,
+        pid: int | None = None,
+    ) -> dict[str, int]:
+        """Lease named ports for an ADW instance.
+
+        Ports the instance already holds are kept and their leases renewed.
+
+        Args:
+            owner: ADW ID of the instance.
+            names: Port names to lease.
+            pid: Process holding the leases. Defaults to the current process.
+
+        Returns:
+            Mapping of port name to port.
+
+        Raises:
+            RuntimeError: If a range has no free port left. No leases are
+                taken in that case.
+        """
+        pid = os.getpid() if pid is None else pid
+        now = time.time()
+        expires_at = now + self.ttl
+        ports: dict[str, int] = {}
+
+        with self._transaction() as conn:
+            self._reclaim(conn, now)
+            leased = {port for (port,) in conn.execute("SELECT port FROM port_leases")}
+            held = dict(conn.execute("SELECT name, port FROM port_leases WHERE owner = ?", (owner,)).fetchall())
+
+            for name in dict.fromkeys(names):
+                if name in held:
+                    ports[name] = held[name]
+                    conn.execute(
+                        "UPDATE port_leases SET pid = ?, expires_at = ? WHERE port = ?",
+                        (pid, expires_at, held[name]),
+                    )
+                    continue
+
+                start, end = self.range_for(name)
+                size = end - start + 1
+                offset = _slot(owner, size)
+                for i in range(size):
+                    port = start + (offset + i) % size
+                    # Also skip ports something outside ADW is listening on
+                    if port not in leased and is_port_available(port):
+                        break
+                else:
+                    raise RuntimeError(f"No available ports for {name!r} in ADW range {start}-{end}")
+
+                conn.execute(
+                    "INSERT INTO port_leases (port, owner, name, pid, acquired_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (port, owner, name, pid, now, expires_at),
+                )
+                leased.add(port)
+                ports[name] = port
+
+        return ports
+
+    def renew(self, owner: str) -> int:
+        """Extend the leases of an ADW instance by the lease lifetime.
+
+        Args:
+            owner: ADW ID of the instance.
+
+        Returns:
+            Number of leases renewed.
+        """
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE port_leases SET expires_at = ? WHERE owner = ?",
+                (time.time() + self.ttl, owner),
+            )
+            return cursor.rowcount
+
+    def release(self, owner: str) -> int:
+        """Release all leases of an ADW instance.
+
+        Args:
+            owner: ADW ID of the instance.
+
+        Returns:
+            Number of leases released.
+        """
+        with self._transaction() as conn:
+            return conn.execute("DELETE FROM port_leases WHERE owner = ?", (owner,)).rowcount
+
+    def reclaim(self) -> int:
+        """Release expired leases and leases held by processes that are gone.
+
+        Returns:
+            Number of leases released.
+        """
+        with self._transaction() as conn:
+            return self._reclaim(conn, time.time())
+
+    def leases(self, owner: str | None = None) -> list[PortLease]:
+        """List current leases, ordered by port.
+
+        Args:
+            owner: Only list the leases of this ADW ID.
+
+        Returns:
+            Leases, including any that are stale but not yet reclaimed.
+        """
+        query = "SELECT port, owner, name, pid, acquired_at, expires_at FROM port_leases"
+        params: tuple[str, ...] = ()
+        if owner is not None:
+            query += " WHERE owner = ?"
+            params = (owner,)
+        with self._transaction() as conn:
+            rows = conn.execute(query + " ORDER BY port", params).fetchall()
+        return [PortLease(*row) for row in rows]
+
+
+def get_port_allocator() -> PortAllocator:
+    """Get a port allocator for the current project, set up from the config."""
+    from ..config import get_config
+
+    settings = get_config().ports
+    return PortAllocator(
+        ranges={
+            "backend": (settings.backend_range[0], settings.backend_range[1]),
+            "frontend": (settings.frontend_range[0], settings.frontend_range[1]),
+        },
+        default_range=(settings.service_range[0], settings.service_range[1]),
+        ttl=settings.lease_ttl,
+    )
+
+
+def allocate_ports(adw_id: str, names: Iterable[str] = DEFAULT_PORT_NAMES) -> dict[str, int]:
+    """Lease named ports for an ADW instance, held by the current process.
 
     Args:
         adw_id: The ADW ID.
+        names: Port names to lease.
 
     Returns:
-        Tuple of (backend_port, frontend_port).
+        Mapping of port name to port.
+
+    Raises:
+        RuntimeError: If a range has no free port left.
+    """
+    return get_port_allocator().acquire(adw_id, names)
+
+
+def release_ports(adw_id: str) -> int:
+    """Release the ports of an ADW instance.
+
+    Failures are logged rather than raised, so cleanup never fails a run.
+
+    Args:
+        adw_id: The ADW ID.
+
+    Returns:
+        Number of leases released.
+    """
+    allocator = get_port_allocator()
+    if not allocator.db_path.exists():
+        return 0
+    try:
+        return allocator.release(adw_id)
+    except sqlite3.Error as e:
+        logger.warning("Could not release ports of %s: %s", adw_id, e)
+        return 0
+
+
+def reclaim_ports() -> int:
+    """Release expired leases and leases of processes that are gone.
+
+    Returns:
+        Number of leases released.
     """
-    backend, frontend = get_ports_for_adw(adw_id)
+    allocator = get_port_allocator()
+    if not allocator.db_path.exists():
+        return 0
+    try:
+        return allocator.reclaim()
+    except sqlite3.Error as e:
+        logger.warning("Could not reclaim ports: %s", e)
+        return 0
 
-    # Try deterministic ports first
-    if is_port_available(backend) and is_port_available(frontend):
-        return backend, frontend
 
-    # Fallback: find next available in range
-    for i in range(MAX_INSTANCES):
-        candidate_backend = BACKEND_PORT_START + i
-        candidate_frontend = FRONTEND_PORT_START + i
+def find_available_ports(adw_id: str) -> tuple[int, int]:
+    """Lease a backend and a frontend port for an ADW instance.
 
-        if is_port_available(candidate_backend) and is_port_available(candidate_frontend):
-            return candidate_backend, candidate_frontend
+    Args:
+        adw_id: The ADW ID.
 
-    # Last resort: let OS assign
-    raise RuntimeError("No available ports in ADW range")
+    Returns:
+        Tuple of (backend_port, frontend_port).
 
+    Raises:
+        RuntimeError: If either range has no free port left.
+    """
+    ports = allocate_ports(adw_id, DEFAULT_PORT_NAMES)
+    return ports["backend"], ports["frontend"]
 
-def write_ports_env(worktree_path: str, backend_port: int, frontend_port: int) -> None:
+
+def write_ports_env(
+    worktree_path: str,
+    backend_port: int,
+    frontend_port: int,
+    extra_ports: dict[str, int] | None = None,
+) -> None:
     """Write .ports.env file to worktree.
 
     Args:
         worktree_path: Path to worktree.
         backend_port: Backend port number.
         frontend_port: Frontend port number.
+        extra_ports: Other named ports, written as <NAME>_PORT.
     """
-    from pathlib import Path
-
     ports_file = Path(worktree_path) / ".ports.env"
-    ports_file.write_text(
+    content = (
         f"BACKEND_PORT={backend_port}\nFRONTEND_PORT={frontend_port}\nVITE_API_URL=http://localhost:{backend_port}\n"
     )
+    for name, port in (extra_ports or {}).items():
+        content += f"{name.upper().replace('-', '_')}_PORT={port}\n"
+    ports_file.write_text(content)
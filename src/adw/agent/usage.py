@@ -0,0 +1,366 @@
+"""Usage and latency extraction from Claude Code stream-json output.
+
+The ``result`` message at the end of a stream-json run reports token usage,
+API cost, turn count and durations. ``UsageTracker`` picks those up as
+messages arrive, and also measures time to first token: how long after launch
+the first assistant message came in. A run cut short before its result (such
+as by a timeout) still has the per-turn usage of its assistant messages.
+
+Each agent run is recorded as a ``PhaseMetrics`` on its task (the ADW ID) in
+the metrics database, so reports and ``adw costs`` work from real numbers.
+Runs from before this was in place can be imported from the
+``agents/<adw_id>/<agent_name>/cc_raw_output.jsonl`` files they left behind.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+from dataclasses import dataclass, replace
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..reports.metrics import MetricsDB
+
+logger = logging.getLogger(__name__)
+
+# Raw stream output saved by the executor, relative to an agent's output dir
+RAW_OUTPUT_FILE = "cc_raw_output.jsonl"
+
+# Model families, matched against full model IDs
+MODEL_FAMILIES = ("opus", "sonnet", "haiku")
+
+
+@dataclass
+class StreamUsage:
+    """Usage reported by one agent run (or several, once added up).
+
+    Attributes:
+        input_tokens: Uncached input tokens, including prompt cache writes.
+        output_tokens: Tokens generated.
+        cache_read_tokens: Input tokens read from the prompt cache.
+        cost_usd: API cost, in USD.
+        num_turns: Number of agent turns.
+        duration_seconds: Run duration reported by the agent.
+        api_duration_seconds: Time spent waiting on the API.
+        ttft_seconds: Time from launch to the first assistant message, if
+            it was measured.
+        model: Model ID the agent ran with.
+        is_error: Whether the run ended in an error.
+    """
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cost_usd: float = 0.0
+    num_turns: int = 0
+    duration_seconds: float = 0.0
+    api_duration_seconds: float = 0.0
+    ttft_seconds: float | None = None
+    model: str = ""
+    is_error: bool = False
+
+    def add(self, other: StreamUsage) -> None:
+        """Add the usage of a later run, such as a retry.
+
+        Args:
+            other: Usage of the later run.
+        """
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cache_read_tokens += other.cache_read_tokens
+        self.cost_usd += other.cost_usd
+        self.num_turns += other.num_turns
+        self.duration_seconds += other.duration_seconds
+        self.api_duration_seconds += other.api_duration_seconds
+        if other.ttft_seconds is not None:
+            self.ttft_seconds = other.ttft_seconds
+        self.model = other.model or self.model
+        self.is_error = other.is_error
+
+
+class UsageTracker:
+    """Collects usage from stream-json messages as they arrive."""
+
+    def __init__(self, start_time: float | None = None):
+        """Initialize the tracker.
+
+        Args:
+            start_time: When the agent was launched (time.time()). Time to
+                first token is only measured when this is given.
+        """
+        self.start_time = start_time
+        self._usage = StreamUsage()
+        self._has_result = False
+        self._turns: dict[str, dict[str, Any]] = {}
+
+    @property
+    def usage(self) -> StreamUsage | None:
+        """Usage of the run, or None if no result message was seen."""
+        return self._usage if self._has_result else None
+
+    @property
+    def partial_usage(self) -> StreamUsage:
+        """Usage so far: the result's, or else summed over assistant turns.
+
+        Cost is only known from the result, so it is 0 for a run without one.
+        """
+        if self._has_result:
+            return self._usage
+        turns = self._turns.values()
+        return replace(
+            self._usage,
+            input_tokens=sum(
+                int(t.get("input_tokens") or 0) + int(t.get("cache_creation_input_tokens") or 0) for t in turns
+            ),
+            output_tokens=sum(int(t.get("output_tokens") or 0) for t in turns),
+            cache_read_tokens=sum(int(t.get("cache_read_input_tokens") or 0) for t in turns),
+            num_turns=len(self._turns),
+            is_error=True,
+        )
+
+    def feed(self, message: dict[str, Any], received_at: float | None = None) -> None:
+        """Take in one stream-json message.
+
+        Args:
+            message: Parsed message.
+            received_at: When the message arrived (time.time()).
+        """
+        usage = self._usage
+        msg_type = message.get("type")
+
+        if msg_type == "system" and message.get("model"):
+            usage.model = message["model"]
+        elif msg_type == "assistant":
+            if usage.ttft_seconds is None and self.start_time is not None and received_at is not None:
+                usage.ttft_seconds = max(received_at - self.start_time, 0.0)
+            inner = message.get("message")
+            if isinstance(inner, dict) and inner.get("model") and not usage.model:
+                usage.model = inner["model"]
+            # Each content block of a turn repeats the turn's usage, so keep the latest per message
+            if isinstance(inner, dict) and isinstance(inner.get("usage"), dict):
+                self._turns[str(inner.get("id") or len(self._turns))] = inner["usage"]
+        elif msg_type == "result":
+            self._has_result = True
+            tokens = message.get("usage") or {}
+            usage.input_tokens = int(tokens.get("input_tokens") or 0) + int(
+                tokens.get("cache_creation_input_tokens") or 0
+            )
+            usage.output_tokens = int(tokens.get("output_tokens") or 0)
+            usage.cache_read_tokens = int(tokens.get("cache_read_input_tokens") or 0)
+            # Older CLI versions report cost_usd instead of total_cost_usd
+            usage.cost_usd = float(message.get("total_cost_usd") or message.get("cost_usd") or 0.0)
+            usage.num_turns = int(message.get("num_turns") or 0)
+            usage.duration_seconds = (message.get("duration_ms") or 0) / 1000
+            usage.api_duration_seconds = (message.get("duration_api_ms") or 0) / 1000
+            usage.is_error = bool(message.get("is_error"))
+
+
+def parse_stream_file(path: Path) -> StreamUsage | None:
+    """Get the usage recorded in a saved stream-json output file.
+
+    Time to first token is not available from a saved file.
+
+    Args:
+        path: Path to a cc_raw_output.jsonl file.
+
+    Returns:
+        Usage of the run, or None if the file has no result message.
+    """
+    tracker = UsageTracker()
+    try:
+        with path.open() as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(message, dict):
+                    tracker.feed(message)
+    except OSError as e:
+        logger.debug("Could not read %s: %s", path, e)
+        return None
+    return tracker.usage
+
+
+def model_name(model: str) -> str:
+    """Shorten a full model ID to its family (opus, sonnet, haiku) if known."""
+    lowered = model.lower()
+    return next((family for family in MODEL_FAMILIES if family in lowered), model)
+
+
+def record_usage(
+    adw_id: str,
+    phase: str,
+    usage: StreamUsage,
+    duration_seconds: float,
+    success: bool,
+    retries: int = 0,
+    model: str = "",
+    db: MetricsDB | None = None,
+    ended_at: datetime | None = None,
+    workflow: str = "standard",
+    description: str = "",
+    only_if_missing: bool = False,
+) -> bool:
+    """Record an agent run as a phase of its task in the metrics database.
+
+    Failures are logged rather than raised; metrics must never break a run.
+
+    Args:
+        adw_id: ADW ID of the task.
+        phase: Phase name (the agent name).
+        usage: Usage of the run.
+        duration_seconds: Wall-clock duration of the run.
+        success: Whether the run succeeded.
+        retries: Number of retries it took.
+        model: Model name. Defaults to the model the stream reported.
+        db: Metrics database. Defaults to the global one.
+        ended_at: When the run ended. Defaults to now.
+        workflow: Workflow type, if the task is new.
+        description: Task description, if the task is new.
+        only_if_missing: Skip tasks that already have this phase.
+
+    Returns:
+        True if the run was recorded.
+    """
+    from ..reports.metrics import PhaseMetrics, get_metrics_db
+
+    metrics = PhaseMetrics(
+        name=phase,
+        duration_seconds=duration_seconds,
+        retries=retries,
+        input_tokens=usage.input_tokens,
+        output_tokens=usage.output_tokens,
+        success=success,
+        cache_read_tokens=usage.cache_read_tokens,
+        cost_usd=usage.cost_usd,
+        num_turns=usage.num_turns,
+        ttft_seconds=usage.ttft_seconds,
+    )
+    try:
+        (db or get_metrics_db()).record_phase(
+            adw_id,
+            metrics,
+            model=model or model_name(usage.model),
+            workflow=workflow,
+            description=description,
+            ended_at=ended_at,
+            only_if_missing=only_if_missing,
+        )
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("Could not record metrics for %s/%s: %s", adw_id, phase, e)
+        return False
+    return True
+
+
+def record_task_end(
+    adw_id: str,
+    success: bool,
+    workflow: str,
+    description: str = "",
+    db: MetricsDB | None = None,
+) -> bool:
+    """Record the final status of a task once its workflow has ended.
+
+    Failures are logged rather than raised; metrics must never break a run.
+
+    Args:
+        adw_id: ADW ID of the task.
+        success: Whether the workflow succeeded.
+        workflow: Workflow type.
+        description: Task description.
+        db: Metrics database. Defaults to the global one.
+
+    Returns:
+        True if the status was recorded.
+    """
+    from ..reports.metrics import get_metrics_db
+
+    try:
+        (db or get_metrics_db()).finish_task(
+            adw_id,
+            "completed" if success else "failed",
+            workflow=workflow,
+            description=description,
+        )
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("Could not record the end of %s: %s", adw_id, e)
+        return False
+    return True
+
+
+# Final phases of a saved task state, by the status they stand for
+FINAL_STATE_STATUS = {"complete": "completed", "failed": "failed"}
+
+
+def _task_info(task_dir: Path) -> tuple[str, str, str | None]:
+    """Get the workflow type, description and final status of a task from its saved state."""
+    try:
+        state = json.loads((task_dir / "adw_state.json").read_text())
+    except (OSError, json.JSONDecodeError):
+        return "standard", "", None
+    return (
+        state.get("workflow_type") or "standard",
+        state.get("task_description") or "",
+        FINAL_STATE_STATUS.get(state.get("current_phase") or ""),
+    )
+
+
+def backfill_usage(agents_dir: Path | None = None, db: MetricsDB | None = None) -> int:
+    """Import usage from the saved output of past agent runs.
+
+    Scans agents/<adw_id>/<agent_name>/cc_raw_output.jsonl. Phases a task
+    already has are skipped, so running this again imports nothing twice.
+    Tasks whose saved state shows how they ended get that final status.
+
+    Args:
+        agents_dir: Agent output directory. Defaults to ./agents
+        db: Metrics database. Defaults to the global one.
+
+    Returns:
+        Number of phases imported.
+    """
+    from ..reports.metrics import get_metrics_db
+
+    agents_dir = agents_dir or Path("agents")
+    db = db or get_metrics_db()
+    imported = 0
+
+    for path in sorted(agents_dir.glob(f"*/*/{RAW_OUTPUT_FILE}")):
+        usage = parse_stream_file(path)
+        if usage is None:
+            continue
+        phase_dir = path.parent
+        task_dir = phase_dir.parent
+        task = db.get_metrics(task_dir.name)
+        if task is not None and any(p.name == phase_dir.name for p in task.phases):
+            continue
+        try:
+            ended_at = datetime.fromtimestamp(path.stat().st_mtime)
+        except OSError:
+            continue
+
+        workflow, description, status = _task_info(task_dir)
+        if record_usage(
+            task_dir.name,
+            phase_dir.name,
+            usage,
+            duration_seconds=usage.duration_seconds,
+            success=not usage.is_error,
+            db=db,
+            ended_at=ended_at,
+            workflow=workflow,
+            description=description,
+            only_if_missing=True,
+        ):
+            imported += 1
+            if status is not None:
+                db.finish_task(task_dir.name, status, ended_at=ended_at)
+
+    return imported
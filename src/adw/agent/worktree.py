@@ -8,6 +8,8 @@ from pathlib import Path
 
 from rich.console import Console
 
+from .depcache import materialize_dependencies
+
 console = Console()
 
 
@@ -129,6 +131,11 @@ def create_worktree(
                 shutil.rmtree(dest_claude)
             shutil.copytree(claude_dir, dest_claude)
 
+        # Reuse installed dependencies (node_modules, .venv) from the cache
+        materialized = materialize_dependencies(worktree_path)
+        if materialized:
+            console.print(f"[dim]Reused cached {', '.join(materialized)}[/dim]")
+
         console.print(f"[green]Created worktree: {worktree_path}[/green]")
         return worktree_path
 
@@ -3527,7 +3527,7 @@ def checkpoints_cmd(task_id: str, as_json: bool) -> None:
     """
     from .recovery.checkpoints import list_checkpoints
 
-    checkpoints = list_checkpoints(task_id)
+    checkpoints = list_checkpoints(task_id, include_state=as_json)
 
     if not checkpoints:
         console.print(f"[yellow]No checkpoints found for task {task_id}[/yellow]")
@@ -3551,6 +3551,8 @@ def checkpoints_cmd(task_id: str, as_json: bool) -> None:
         console.print(f"   Time: {cp.timestamp}")
         if cp.git_commit:
             console.print(f"   Commit: {cp.git_commit}")
+        if cp.snapshot:
+            console.print(f"   Snapshot: {cp.snapshot[:12]}")
         if cp.files_modified:
             console.print(f"   Files: {len(cp.files_modified)} modified")
         console.print()
@@ -4787,15 +4789,39 @@ def learn_clear(domain: str | None) -> None:
     store = get_default_pattern_store()
 
     if domain:
-        store._learnings = [item for item in store.learnings if item.domain != domain]
-        store.save()
+        store.clear(domain=domain)
         console.print(f"[green]✓ Cleared learnings for domain: {domain}[/green]")
     else:
-        store._learnings = []
-        store.save()
+        store.clear()
         console.print("[green]✓ Cleared all learnings[/green]")
 
 
+@learn.command("dedupe")
+@click.option("--dry-run", is_flag=True, help="Only report how many duplicates would be merged")
+def learn_dedupe(dry_run: bool) -> None:
+    """Merge near-duplicate learnings.
+
+    Finds learnings whose wording is nearly identical and folds each one
+    into the most successful match, summing their success counts.
+
+    \\b
+    Examples:
+        adw learn dedupe            # Merge duplicates
+        adw learn dedupe --dry-run  # Count duplicates only
+    """
+    from .learning import get_default_pattern_store
+
+    store = get_default_pattern_store()
+    merged = store.dedupe(dry_run=dry_run)
+
+    if not merged:
+        console.print("[green]✓ No near-duplicate learnings found[/green]")
+    elif dry_run:
+        console.print(f"[yellow]{merged} near-duplicate learnings would be merged[/yellow]")
+    else:
+        console.print(f"[green]✓ Merged {merged} near-duplicate learnings[/green]")
+
+
 @learn.command("report")
 @click.option("--output", "-o", type=click.Path(), help="Save report to file")
 def learn_report(output: str | None) -> None:
@@ -5119,8 +5145,15 @@ def report_weekly(date: str | None, save: bool, as_json: bool) -> None:
 
 @report.command("trends")
 @click.option("--days", "-d", type=int, default=30, help="Number of days to analyze (default: 30)")
+@click.option(
+    "--granularity",
+    "-g",
+    type=click.Choice(["day", "hour"]),
+    default="day",
+    help="Point spacing (default: day)",
+)
 @click.option("--json", "-j", "as_json", is_flag=True, help="Output as JSON")
-def report_trends(days: int, as_json: bool) -> None:
+def report_trends(days: int, granularity: str, as_json: bool) -> None:
     """Analyze metric trends over time.
 
     Shows success rate, duration, cost, and retry trends with sparklines.
@@ -5130,13 +5163,14 @@ def report_trends(days: int, as_json: bool) -> None:
     Examples:
         adw report trends                   # Last 30 days
         adw report trends -d 14             # Last 2 weeks
+        adw report trends -d 7 -g hour      # Hourly points for a week
         adw report trends --json            # JSON output
     """
     import json as json_lib
 
     from .reports import generate_trend_report
 
-    report = generate_trend_report(period_days=days)
+    report = generate_trend_report(period_days=days, granularity=granularity)
 
     if as_json:
         click.echo(json_lib.dumps(report.to_dict(), indent=2, default=str))
@@ -5147,7 +5181,14 @@ def report_trends(days: int, as_json: bool) -> None:
 
 @report.command("sparklines")
 @click.option("--days", "-d", type=int, default=14, help="Number of days (default: 14)")
-def report_sparklines(days: int) -> None:
+@click.option(
+    "--granularity",
+    "-g",
+    type=click.Choice(["day", "hour"]),
+    default="day",
+    help="Point spacing (default: day)",
+)
+def report_sparklines(days: int, granularity: str) -> None:
     """Show compact sparkline summary.
 
     Quick overview of key metrics with ASCII sparklines.
@@ -5159,7 +5200,7 @@ def report_sparklines(days: int) -> None:
     """
     from .reports import get_sparkline_summary
 
-    summary = get_sparkline_summary(period_days=days)
+    summary = get_sparkline_summary(period_days=days, granularity=granularity)
 
     if not summary:
         console.print("[yellow]No data available for sparklines[/yellow]")
@@ -5176,7 +5217,8 @@ def report_sparklines(days: int) -> None:
 @click.option("--summary", "-s", is_flag=True, help="Show summary statistics")
 @click.option("--recent", "-r", type=int, help="Show N most recent tasks")
 @click.option("--json", "-j", "as_json", is_flag=True, help="Output as JSON")
-def metrics_cmd(task_id: str | None, summary: bool, recent: int | None, as_json: bool) -> None:
+@click.option("--backfill", is_flag=True, help="Import usage from past agent runs in ./agents")
+def metrics_cmd(task_id: str | None, summary: bool, recent: int | None, as_json: bool, backfill: bool) -> None:
     """View task metrics.
 
     Query the metrics database for task performance data.
@@ -5187,6 +5229,7 @@ def metrics_cmd(task_id: str | None, summary: bool, recent: int | None, as_json:
         adw metrics --summary               # Overall statistics
         adw metrics --recent 10             # Last 10 tasks
         adw metrics --json                  # JSON output
+        adw metrics --backfill              # Import past agent runs
     """
     import json as json_lib
 
@@ -5194,6 +5237,18 @@ def metrics_cmd(task_id: str | None, summary: bool, recent: int | None, as_json:
 
     db = get_metrics_db()
 
+    if backfill:
+        from .agent.usage import backfill_usage
+
+        imported = backfill_usage(db=db)
+        if as_json:
+            click.echo(json_lib.dumps({"imported_phases": imported}))
+        elif imported:
+            console.print(f"[green]✓ Imported {imported} agent run(s) from agents/[/green]")
+        else:
+            console.print("[yellow]No new agent runs to import[/yellow]")
+        return
+
     if task_id:
         # Get specific task metrics
         metrics = db.get_metrics(task_id)
@@ -5219,14 +5274,24 @@ def metrics_cmd(task_id: str | None, summary: bool, recent: int | None, as_json:
         console.print(f"[bold]Commits:[/bold] {metrics.commits_generated}")
         console.print(f"[bold]Files Modified:[/bold] {metrics.files_modified}")
         console.print(f"[bold]Lines Changed:[/bold] +{metrics.lines_added} / -{metrics.lines_removed}")
-        console.print(f"[bold]Est. Cost:[/bold] ${metrics.calculate_cost():.4f}")
+        if metrics.total_cost_usd:
+            console.print(f"[bold]Cost:[/bold] ${metrics.total_cost_usd:.4f}")
+        else:
+            console.print(f"[bold]Est. Cost:[/bold] ${metrics.calculate_cost():.4f}")
 
         if metrics.phases:
             console.print()
             console.print("[bold]Phases:[/bold]")
             for phase in metrics.phases:
                 status = "✓" if phase.success else "✗"
-                console.print(f"  {status} {phase.name}: {phase.duration_seconds:.1f}s, {phase.retries} retries")
+                details = f"{phase.duration_seconds:.1f}s, {phase.retries} retries"
+                if phase.input_tokens or phase.output_tokens:
+                    details += f", {phase.input_tokens + phase.output_tokens:,} tokens"
+                if phase.cost_usd:
+                    details += f", ${phase.cost_usd:.4f}"
+                if phase.ttft_seconds is not None:
+                    details += f", first token {phase.ttft_seconds:.1f}s"
+                console.print(f"  {status} {phase.name}: {details}")
 
     elif summary:
         # Show summary statistics
@@ -5282,6 +5347,7 @@ def metrics_cmd(task_id: str | None, summary: bool, recent: int | None, as_json:
         console.print("  [cyan]adw metrics <task_id>[/cyan]    View metrics for a specific task")
         console.print("  [cyan]adw metrics --summary[/cyan]    Show overall statistics")
         console.print("  [cyan]adw metrics --recent 10[/cyan]  Show last 10 tasks")
+        console.print("  [cyan]adw metrics --backfill[/cyan]   Import usage from past agent runs")
         console.print()
         console.print("[dim]Use --json flag for JSON output[/dim]")
 
@@ -5358,6 +5424,7 @@ def costs_cmd(period: str, as_json: bool) -> None:
         "estimated_cost_opus": opus_cost,
         "estimated_cost_haiku": haiku_cost,
         "cost_per_task_sonnet": sonnet_cost / stats["total_tasks"] if stats["total_tasks"] > 0 else 0,
+        "recorded_cost": stats["total_cost_usd"],
     }
 
     if as_json:
@@ -5371,6 +5438,9 @@ def costs_cmd(period: str, as_json: bool) -> None:
     console.print(f"  Input:  {input_tokens:,}")
     console.print(f"  Output: {output_tokens:,}")
     console.print()
+    if stats["total_cost_usd"]:
+        console.print(f"[bold]Recorded Cost:[/bold] ${stats['total_cost_usd']:.2f}")
+        console.print()
     console.print("[bold]Estimated Costs (by model):[/bold]")
     console.print(f"  Sonnet 3.5: ${sonnet_cost:.2f}")
     console.print(f"  Opus:       ${opus_cost:.2f}")
@@ -5380,6 +5450,106 @@ def costs_cmd(period: str, as_json: bool) -> None:
         console.print(f"[dim]Cost per task (Sonnet): ${sonnet_cost / stats['total_tasks']:.4f}[/dim]")
 
 
+@main.command("simulate")
+@click.option("--tasks", "-t", "tasks_file", type=click.Path(path_type=Path), help="Tasks file (default: tasks.md)")
+@click.option(
+    "--concurrency",
+    "-c",
+    "concurrency",
+    multiple=True,
+    type=click.IntRange(min=1),
+    help="Agent slots to simulate (repeatable; default: 1 to twice daemon.max_concurrent)",
+)
+@click.option(
+    "--model",
+    "-m",
+    "models",
+    multiple=True,
+    type=click.Choice(["current", "haiku", "sonnet", "opus"]),
+    help="Run every phase on this model (repeatable; 'current' keeps each workflow's models)",
+)
+@click.option("--workflow", "-w", default="adaptive", help="Workflow for tasks without a workflow tag")
+@click.option("--runs", "-n", type=click.IntRange(min=1), default=20, help="Simulations per configuration")
+@click.option("--history", type=click.IntRange(min=1), default=500, help="Recent tasks to take phase history from")
+@click.option("--seed", type=int, default=0, help="Random seed")
+@click.option("--json", "-j", "as_json", is_flag=True, help="Output as JSON")
+def simulate_cmd(
+    tasks_file: Path | None,
+    concurrency: tuple[int, ...],
+    models: tuple[str, ...],
+    workflow: str,
+    runs: int,
+    history: int,
+    seed: int,
+    as_json: bool,
+) -> None:
+    """Predict how long the task queue takes and what it costs.
+
+    Simulates the daemon working through the pending tasks in tasks.md,
+    drawing phase durations, tokens and failures from past runs in the
+    metrics database. No agents are run.
+
+    \b
+    Examples:
+        adw simulate                     # Compare concurrency levels
+        adw simulate -c 2 -c 4 -c 8      # Specific levels
+        adw simulate -m current -m haiku # Compare models
+        adw simulate --json              # JSON output
+    """
+    import json as json_lib
+
+    from rich.table import Table
+
+    from .config import get_config
+    from .reports.simulate import PhaseHistory, compare_capacity, load_queue
+
+    queue = load_queue(tasks_file, default_workflow=workflow)
+    if not queue:
+        console.print("[yellow]No pending tasks to simulate[/yellow]")
+        return
+
+    levels = concurrency or tuple(range(1, 2 * get_config().daemon.max_concurrent + 1))
+    phase_history = PhaseHistory.load(limit=history)
+    results = compare_capacity(
+        queue,
+        phase_history,
+        levels,
+        models=[None if m == "current" else m for m in models or ("current",)],
+        runs=runs,
+        seed=seed,
+    )
+
+    if as_json:
+        click.echo(json_lib.dumps([r.to_dict() for r in results], indent=2))
+        return
+
+    console.print(f"[bold cyan]Capacity Simulation[/bold cyan] [dim]({len(queue)} tasks, {runs} runs each)[/dim]")
+    if not phase_history.samples:
+        console.print("[yellow]No phase history yet; phases are assumed to take their full timeout[/yellow]")
+    console.print()
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Model")
+    for column in ("Slots", "Makespan", "p90", "Util", "Avg wait", "Max wait", "Tokens", "Cost"):
+        table.add_column(column, justify="right")
+    for r in results:
+        table.add_row(
+            r.model or "current",
+            str(r.concurrency),
+            f"{r.makespan_seconds / 60:.1f}m",
+            f"{r.makespan_p90_seconds / 60:.1f}m",
+            f"{r.utilization:.0%}",
+            f"{r.mean_wait_seconds / 60:.1f}m",
+            f"{r.max_wait_seconds / 60:.1f}m",
+            f"{int(r.input_tokens + r.output_tokens):,}",
+            f"${r.cost_usd:.2f}",
+        )
+    console.print(table)
+    failed = max(r.tasks_failed + r.tasks_stranded for r in results)
+    if failed:
+        console.print()
+        console.print(f"[dim]Up to {failed:.1f} tasks per run fail or stay blocked, based on past failure rates[/dim]")
+
+
 @main.group()
 def alerts() -> None:
     """Notification channel management.
@@ -14,6 +14,7 @@ Sections:
     [ui]         - TUI and notification settings
     [workflow]   - Workflow execution settings
     [workspace]  - Workspace and multi-repo settings
+    [ports]      - Port ranges and leases for parallel instances
     [plugins]    - Plugin configuration
     [slack]      - Slack integration
     [linear]     - Linear integration
@@ -253,6 +254,42 @@ class WorkspaceSettings:
         }
 
 
+@dataclass
+class PortSettings:
+    """Port allocation settings for parallel ADW instances.
+
+    Attributes:
+        backend_range: First and last backend port.
+        frontend_range: First and last frontend port.
+        service_range: First and last port for other named ports (db, redis, ...).
+        lease_ttl: Seconds a port lease lasts unless released earlier.
+    """
+
+    backend_range: list[int] = field(default_factory=lambda: [9100, 9199])
+    frontend_range: list[int] = field(default_factory=lambda: [9200, 9299])
+    service_range: list[int] = field(default_factory=lambda: [9300, 9999])
+    lease_ttl: int = 43200
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PortSettings:
+        """Create from dictionary."""
+        return cls(
+            backend_range=[int(p) for p in data.get("backend_range", [9100, 9199])],
+            frontend_range=[int(p) for p in data.get("frontend_range", [9200, 9299])],
+            service_range=[int(p) for p in data.get("service_range", [9300, 9999])],
+            lease_ttl=int(data.get("lease_ttl", 43200)),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "backend_range": self.backend_range,
+            "frontend_range": self.frontend_range,
+            "service_range": self.service_range,
+            "lease_ttl": self.lease_ttl,
+        }
+
+
 @dataclass
 class SlackSettings:
     """Slack integration settings.
@@ -576,6 +613,7 @@ class ADWConfig:
     ui: UIConfig = field(default_factory=UIConfig)
     workflow: WorkflowConfig = field(default_factory=WorkflowConfig)
     workspace: WorkspaceSettings = field(default_factory=WorkspaceSettings)
+    ports: PortSettings = field(default_factory=PortSettings)
     slack: SlackSettings = field(default_factory=SlackSettings)
     linear: LinearSettings = field(default_factory=LinearSettings)
     notion: NotionSettings = field(default_factory=NotionSettings)
@@ -597,6 +635,7 @@ class ADWConfig:
             ui=UIConfig.from_dict(data.get("ui", {})),
             workflow=WorkflowConfig.from_dict(data.get("workflow", {})),
             workspace=WorkspaceSettings.from_dict(data.get("workspace", {})),
+            ports=PortSettings.from_dict(data.get("ports", {})),
             slack=SlackSettings.from_dict(data.get("slack", {})),
             linear=LinearSettings.from_dict(data.get("linear", {})),
             notion=NotionSettings.from_dict(data.get("notion", {})),
@@ -624,6 +663,7 @@ class ADWConfig:
             "ui": self.ui.to_dict(),
             "workflow": self.workflow.to_dict(),
             "workspace": self.workspace.to_dict(),
+            "ports": self.ports.to_dict(),
         }
 
         # Add integration configs (without secrets by default)
@@ -1022,6 +1062,14 @@ def format_config_for_display(config: ADWConfig, show_secrets: bool = False) ->
     lines.append(f"  active_workspace = {config.workspace.active_workspace}")
     lines.append("")
 
+    # Ports
+    lines.append("[ports]")
+    lines.append(f"  backend_range = {config.ports.backend_range}")
+    lines.append(f"  frontend_range = {config.ports.frontend_range}")
+    lines.append(f"  service_range = {config.ports.service_range}")
+    lines.append(f"  lease_ttl = {config.ports.lease_ttl}")
+    lines.append("")
+
     # Integrations
     lines.append("[integrations]")
 
@@ -1140,6 +1188,16 @@ def list_config_keys() -> list[str]:
         ]
     )
 
+    # Ports
+    keys.extend(
+        [
+            "ports.backend_range",
+            "ports.frontend_range",
+            "ports.service_range",
+            "ports.lease_ttl",
+        ]
+    )
+
     # Slack
     keys.extend(
         [
@@ -1,6 +1,7 @@
 """Context engineering for ADW.
 
-Provides context priming, context bundles, and session restoration.
+Provides context priming, context bundles, session restoration, and
+token-budgeted context packing.
 """
 
 from .bundles import (
@@ -14,6 +15,14 @@ from .bundles import (
     save_bundle,
     suggest_bundles,
 )
+from .packing import (
+    ContextCandidate,
+    PackedContext,
+    build_task_context,
+    estimate_tokens,
+    inject_packed_context,
+    pack_context,
+)
 from .priming import (
     PRIME_TEMPLATES,
     ProjectType,
@@ -39,4 +48,11 @@ __all__ = [
     "delete_bundle",
     "Bundle",
     "BundleFile",
+    # Packing
+    "build_task_context",
+    "inject_packed_context",
+    "pack_context",
+    "estimate_tokens",
+    "ContextCandidate",
+    "PackedContext",
 ]
@@ -0,0 +1,523 @@
+"""Persistent manifest and inverted index over context bundles.
+
+Keeps a small SQLite database under ``.adw/cache/`` with two parts:
+
+- a manifest row per bundle (metadata, tags, file list and counts), so
+  ``list_bundles`` and ``diff_bundles`` never decompress or parse bundle files;
+- one posting list per token drawn from bundle descriptions, tags and file
+  paths. ``suggest_bundles`` scores candidates with BM25 straight from the
+  posting lists, so the cost of a suggestion depends on how many bundles share
+  the query terms rather than on the total number of bundles on disk.
+
+The index is updated incrementally by ``save_bundle``, ``delete_bundle`` and
+``compress_old_bundles``. Bundles written by other means are picked up by
+``BundleIndex.sync``, which only rescans the bundles directory when its mtime
+changes.
+"""
+
+from __future__ import annotations
+
+import gzip
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Index location, relative to the project root
+DEFAULT_INDEX_PATH = Path(".adw/cache/bundle_index.db")
+
+# Per-field term weights (descriptions and tags say more than path fragments)
+FIELD_WEIGHTS = {
+    "description": 2.0,
+    "tags": 3.0,
+    "paths": 0.5,
+}
+
+# Bumped whenever the schema changes; the index is a cache and is rebuilt
+SCHEMA_VERSION = 2
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase alphanumeric tokens.
+
+    Args:
+        text: Text to tokenize.
+
+    Returns:
+        List of tokens (single characters are dropped).
+    """
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1]
+
+
+def _weighted_terms(data: dict[str, Any]) -> Counter[str]:
+    """Compute field-weighted term frequencies for a bundle dict."""
+    terms: Counter[str] = Counter()
+    for token in tokenize(data.get("description", "")):
+        terms[token] += FIELD_WEIGHTS["description"]
+    for tag in data.get("tags", []):
+        for token in tokenize(tag):
+            terms[token] += FIELD_WEIGHTS["tags"]
+    for entry in data.get("files", []):
+        for token in tokenize(entry.get("path", "")):
+            terms[token] += FIELD_WEIGHTS["paths"]
+    return terms
+
+
+def _read_bundle_file(path: Path) -> dict[str, Any] | None:
+    """Read a raw bundle dict from a ``.json`` or ``.json.gz`` file."""
+    try:
+        if path.name.endswith(".gz"):
+            with gzip.open(path, "rt") as f:
+                data: dict[str, Any] = json.load(f)
+        else:
+            data = json.loads(path.read_text())
+    except (json.JSONDecodeError, gzip.BadGzipFile, OSError) as e:
+        logger.warning(f"Skipping invalid bundle {path.name}: {e}")
+        return None
+    if not isinstance(data, dict) or "task_id" not in data:
+        return None
+    return data
+
+
+def _bundle_task_id(filename: str) -> str | None:
+    """Get the task ID encoded in a bundle filename."""
+    if filename.endswith(".json.gz"):
+        return filename[: -len(".json.gz")]
+    if filename.endswith(".json"):
+        return filename[: -len(".json")]
+    return None
+
+
+class BundleIndex:
+    """SQLite-backed inverted index for context bundles.
+
+    Attributes:
+        bundles_dir: Directory containing bundle files.
+        db_path: Path to the SQLite index file (``:memory:`` is allowed).
+    """
+
+    def __init__(self, bundles_dir: Path, db_path: Path | str | None = None):
+        """Initialize the index.
+
+        Args:
+            bundles_dir: Directory containing bundle files.
+            db_path: Index database path. Defaults to .adw/cache/bundle_index.db
+                next to the bundles directory.
+        """
+        self.bundles_dir = Path(bundles_dir)
+        if db_path is None:
+            db_path = self.bundles_dir.parent.parent / DEFAULT_INDEX_PATH
+        self.db_path = db_path
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(db_path), timeout=30.0)
+        self._conn.row_factory = sqlite3.Row
+        self._init_db()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> BundleIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @contextmanager
+    def _cursor(self) -> Iterator[sqlite3.Cursor]:
+        """Get a database cursor with automatic commit/rollback."""
+        cursor = self._conn.cursor()
+        try:
+            yield cursor
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def _init_db(self) -> None:
+        """Initialize database schema, discarding an index from an older version."""
+        with self._cursor() as cursor:
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] != SCHEMA_VERSION:
+                cursor.execute("DROP TABLE IF EXISTS meta")
+                cursor.execute("DROP TABLE IF EXISTS docs")
+                cursor.execute("DROP TABLE IF EXISTS postings")
+                cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS docs (
+                    doc_id INTEGER PRIMARY KEY,
+                    task_id TEXT NOT NULL UNIQUE,
+                    filename TEXT NOT NULL,
+                    mtime_ns INTEGER DEFAULT 0,
+                    length REAL DEFAULT 0,
+                    created_at TEXT,
+                    description TEXT DEFAULT '',
+                    total_lines INTEGER DEFAULT 0,
+                    file_count INTEGER DEFAULT 0,
+                    tags TEXT DEFAULT '[]',
+                    files TEXT DEFAULT '[]'
+                )
+                """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_docs_created
+                ON docs(created_at DESC)
+                """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT NOT NULL,
+                    doc_id INTEGER NOT NULL,
+                    tf REAL NOT NULL,
+                    length REAL NOT NULL,
+                    PRIMARY KEY (term, doc_id)
+                ) WITHOUT ROWID
+                """
+            )
+            cursor.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_postings_doc
+                ON postings(doc_id)
+                """
+            )
+
+    # -- Bookkeeping -------------------------------------------------------
+
+    def _dir_mtime_ns(self) -> int:
+        try:
+            return self.bundles_dir.stat().st_mtime_ns
+        except OSError:
+            return 0
+
+    def _get_meta(self, cursor: sqlite3.Cursor, key: str) -> str | None:
+        cursor.execute("SELECT value FROM meta WHERE key = ?", (key,))
+        row = cursor.fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, cursor: sqlite3.Cursor, key: str, value: str) -> None:
+        cursor.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def _mark_synced(self, cursor: sqlite3.Cursor) -> None:
+        self._set_meta(cursor, "dir_mtime_ns", str(self._dir_mtime_ns()))
+
+    def _write_doc(self, cursor: sqlite3.Cursor, data: dict[str, Any], filename: str, mtime_ns: int) -> None:
+        task_id = data["task_id"]
+        terms = _weighted_terms(data)
+        length = sum(terms.values())
+        self._delete_doc(cursor, task_id)
+        files = data.get("files", [])
+        cursor.execute(
+            """
+            INSERT INTO docs (
+                task_id, filename, mtime_ns, length,
+                created_at, description, total_lines, file_count, tags, files
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                task_id,
+                filename,
+                mtime_ns,
+                length,
+                data.get("created_at"),
+                data.get("description", ""),
+                data.get("total_lines", 0),
+                len(files),
+                json.dumps(data.get("tags", [])),
+                json.dumps(files, separators=(",", ":")),
+            ),
+        )
+        doc_id = cursor.lastrowid
+        # Document length is denormalized into postings so scoring never joins
+        cursor.executemany(
+            "INSERT INTO postings (term, doc_id, tf, length) VALUES (?, ?, ?, ?)",
+            [(term, doc_id, tf, length) for term, tf in terms.items()],
+        )
+
+    def _delete_doc(self, cursor: sqlite3.Cursor, task_id: str) -> None:
+        cursor.execute(
+            "DELETE FROM postings WHERE doc_id IN (SELECT doc_id FROM docs WHERE task_id = ?)",
+            (task_id,),
+        )
+        cursor.execute("DELETE FROM docs WHERE task_id = ?", (task_id,))
+
+    # -- Maintenance -------------------------------------------------------
+
+    def sync(self, force: bool = False) -> int:
+        """Bring the index in line with the bundles directory.
+
+        Does nothing unless the directory mtime changed since the last sync
+        (or ``force`` is set). Otherwise only new, changed, or removed bundle
+        files are (re)indexed.
+
+        Args:
+            force: Rescan even if the directory mtime is unchanged.
+
+        Returns:
+            Number of index entries added, updated, or removed.
+        """
+        with self._cursor() as cursor:
+            if not force and self._get_meta(cursor, "dir_mtime_ns") == str(self._dir_mtime_ns()):
+                return 0
+
+            on_disk: dict[str, tuple[str, int]] = {}
+            if self.bundles_dir.is_dir():
+                with os.scandir(self.bundles_dir) as entries:
+                    for entry in entries:
+                        task_id = _bundle_task_id(entry.name)
+                        if task_id is None:
+                            continue
+                        # Plain JSON wins over a compressed copy, as in load_bundle
+                        if task_id in on_disk and entry.name.endswith(".gz"):
+                            continue
+                        on_disk[task_id] = (entry.name, entry.stat().st_mtime_ns)
+
+            cursor.execute("SELECT task_id, filename, mtime_ns FROM docs")
+            indexed = {row["task_id"]: (row["filename"], row["mtime_ns"]) for row in cursor.fetchall()}
+
+            changes = 0
+            for task_id in indexed.keys() - on_disk.keys():
+                self._delete_doc(cursor, task_id)
+                changes += 1
+
+            for task_id, (filename, mtime_ns) in on_disk.items():
+                if indexed.get(task_id) == (filename, mtime_ns):
+                    continue
+                data = _read_bundle_file(self.bundles_dir / filename)
+                if data is None:
+                    if task_id in indexed:
+                        self._delete_doc(cursor, task_id)
+                    continue
+                data["task_id"] = task_id
+                self._write_doc(cursor, data, filename, mtime_ns)
+                changes += 1
+
+            self._mark_synced(cursor)
+
+        if changes:
+            logger.debug(f"Bundle index synced: {changes} changes")
+        return changes
+
+    def rebuild(self) -> int:
+        """Drop and rebuild the whole index from disk.
+
+        Returns:
+            Number of bundles indexed.
+        """
+        with self._cursor() as cursor:
+            cursor.execute("DELETE FROM postings")
+            cursor.execute("DELETE FROM docs")
+            cursor.execute("DELETE FROM meta")
+        return self.sync(force=True)
+
+    def add(self, data: dict[str, Any], path: Path) -> None:
+        """Index (or re-index) a bundle that was just written.
+
+        Args:
+            data: Bundle dictionary, as produced by ``Bundle.to_dict()``.
+            path: File the bundle was written to.
+        """
+        with self._cursor() as cursor:
+            self._write_doc(cursor, data, path.name, path.stat().st_mtime_ns)
+            self._mark_synced(cursor)
+
+    def remove(self, task_id: str) -> None:
+        """Remove a bundle from the index.
+
+        Args:
+            task_id: Task ID of the deleted bundle.
+        """
+        with self._cursor() as cursor:
+            self._delete_doc(cursor, task_id)
+            self._mark_synced(cursor)
+
+    def move(self, task_id: str, path: Path) -> None:
+        """Record that a bundle now lives in a different file.
+
+        Used after compression, where the content (and so the postings) is
+        unchanged.
+
+        Args:
+            task_id: Task ID of the bundle.
+            path: New bundle file.
+        """
+        with self._cursor() as cursor:
+            cursor.execute(
+                "UPDATE docs SET filename = ?, mtime_ns = ? WHERE task_id = ?",
+                (path.name, path.stat().st_mtime_ns, task_id),
+            )
+            self._mark_synced(cursor)
+
+    # -- Queries -----------------------------------------------------------
+
+    def __len__(self) -> int:
+        with self._cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM docs")
+            count: int = cursor.fetchone()[0]
+        return count
+
+    @staticmethod
+    def _row_to_entry(row: sqlite3.Row) -> dict[str, Any]:
+        return {
+            "task_id": row["task_id"],
+            "created_at": row["created_at"],
+            "files": json.loads(row["files"]),
+            "description": row["description"],
+            "total_lines": row["total_lines"],
+            "tags": json.loads(row["tags"]),
+            "file_count": row["file_count"],
+            "compressed": row["filename"].endswith(".gz"),
+        }
+
+    def list_entries(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """List manifest entries, newest first.
+
+        Args:
+            limit: Maximum number of entries to return.
+
+        Returns:
+            Bundle dictionaries in ``Bundle.to_dict()`` shape, plus
+            ``file_count`` and ``compressed`` keys.
+        """
+        query = """
+            SELECT task_id, filename, created_at, description, total_lines, file_count, tags, files
+            FROM docs
+            WHERE created_at IS NOT NULL
+            ORDER BY created_at DESC
+        """
+        params: tuple[Any, ...] = ()
+        if limit:
+            query += " LIMIT ?"
+            params = (limit,)
+
+        with self._cursor() as cursor:
+            cursor.execute(query, params)
+            return [self._row_to_entry(row) for row in cursor.fetchall()]
+
+    def get_entry(self, task_id: str) -> dict[str, Any] | None:
+        """Get the manifest entry for a single bundle.
+
+        Args:
+            task_id: Task ID of the bundle.
+
+        Returns:
+            Entry dictionary (see ``list_entries``), or None if not indexed.
+        """
+        with self._cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT task_id, filename, created_at, description, total_lines, file_count, tags, files
+                FROM docs WHERE task_id = ?
+                """,
+                (task_id,),
+            )
+            row = cursor.fetchone()
+        return self._row_to_entry(row) if row else None
+
+    def search(self, query: str, top_n: int = 3) -> list[tuple[str, float]]:
+        """Rank bundles against a free-text query using BM25.
+
+        Args:
+            query: Free-text query (task description, keywords, paths).
+            top_n: Number of results to return.
+
+        Returns:
+            List of (task_id, score) tuples, best first.
+        """
+        terms = set(tokenize(query))
+        if not terms or top_n <= 0:
+            return []
+
+        with self._cursor() as cursor:
+            cursor.execute("SELECT COUNT(*), COALESCE(AVG(length), 0) FROM docs")
+            total_docs, avg_length = cursor.fetchone()
+            if not total_docs:
+                return []
+            avg_length = avg_length or 1.0
+
+            # Document frequencies come straight off the (term, doc_id) key
+            weights: list[tuple[str, float]] = []
+            for term in terms:
+                cursor.execute("SELECT COUNT(*) FROM postings WHERE term = ?", (term,))
+                df = cursor.fetchone()[0]
+                if df:
+                    weights.append((term, math.log(1 + (total_docs - df + 0.5) / (df + 0.5))))
+            if not weights:
+                return []
+
+            # Per-document BM25 sums are accumulated inside SQLite; only the
+            # aggregated rows stream back through a bounded heap, and task IDs
+            # are resolved for the winners alone.
+            values = ", ".join("(?, ?)" for _ in weights)
+            params: list[Any] = [v for pair in weights for v in pair]
+            params += [BM25_K1 + 1, BM25_K1 * (1 - BM25_B), BM25_K1 * BM25_B / avg_length]
+            cursor.execute(
+                f"""
+                WITH q(term, idf) AS (VALUES {values}),
+                     k(k1p1, base, slope) AS (SELECT ?, ?, ?)
+                SELECT p.doc_id, SUM(q.idf * p.tf * k.k1p1 / (p.tf + k.base + k.slope * p.length))
+                FROM q JOIN postings p ON p.term = q.term, k
+                GROUP BY p.doc_id
+                """,
+                params,
+            )
+            best = heapq.nlargest(top_n, ((row[0], row[1]) for row in cursor), key=lambda item: item[1])
+
+            results = []
+            for doc_id, score in best:
+                cursor.execute("SELECT task_id FROM docs WHERE doc_id = ?", (doc_id,))
+                results.append((cursor.fetchone()[0], score))
+        return results
+
+
+def open_bundle_index(bundles_dir: Path) -> BundleIndex:
+    """Open the persistent index for a bundles directory and sync it.
+
+    Falls back to a throwaway in-memory index if the cache database cannot
+    be opened (read-only checkout, corrupt file, ...).
+
+    Args:
+        bundles_dir: Directory containing bundle files.
+
+    Returns:
+        A synced BundleIndex.
+    """
+    try:
+        index = BundleIndex(bundles_dir)
+        index.sync()
+        return index
+    except sqlite3.Error as e:
+        logger.warning(f"Bundle index unavailable, using in-memory index: {e}")
+        index = BundleIndex(bundles_dir, db_path=":memory:")
+        index.sync(force=True)
+        return index
@@ -8,11 +8,14 @@ from __future__ import annotations
 import gzip
 import json
 import logging
+import sqlite3
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from .bundle_index import BundleIndex, open_bundle_index
+
 logger = logging.getLogger(__name__)
 
 # Default bundles directory
@@ -111,6 +114,15 @@ def _get_bundles_dir(base_path: Path | None = None) -> Path:
     return bundles_dir
 
 
+def _open_index(bundles_dir: Path) -> BundleIndex | None:
+    """Open and sync the bundle index, or None if it is unavailable."""
+    try:
+        return open_bundle_index(bundles_dir)
+    except sqlite3.Error as e:
+        logger.warning(f"Bundle index unavailable: {e}")
+        return None
+
+
 def _is_binary_file(file_path: Path) -> bool:
     """Check if a file is likely binary."""
     binary_extensions = {
@@ -232,9 +244,13 @@ def save_bundle(
         tags=tags or [],
     )
 
-    # Save to file
+    # Save to file, syncing the index first so the update below is incremental
+    index = _open_index(bundles_dir)
     bundle_path = bundles_dir / f"{task_id}.json"
     bundle_path.write_text(json.dumps(bundle.to_dict(), indent=2))
+    if index is not None:
+        with index:
+            index.add(bundle.to_dict(), bundle_path)
 
     logger.info(f"Saved bundle: {bundle.summary()}")
     return bundle
@@ -282,6 +298,9 @@ def list_bundles(
 ) -> list[Bundle]:
     """List all context bundles.
 
+    Reads from the bundle manifest, so only ``limit`` rows are materialized
+    and no bundle file is parsed unless it changed since it was indexed.
+
     Args:
         base_path: Base path for bundle storage.
         limit: Maximum number of bundles to return.
@@ -290,6 +309,24 @@ def list_bundles(
         List of Bundle objects, sorted by creation date (newest first).
     """
     bundles_dir = _get_bundles_dir(base_path)
+    index = _open_index(bundles_dir)
+    if index is None:
+        return _scan_bundles(bundles_dir, limit)
+
+    with index:
+        entries = index.list_entries(limit)
+
+    bundles = []
+    for entry in entries:
+        try:
+            bundles.append(Bundle.from_dict(entry))
+        except (KeyError, ValueError) as e:
+            logger.warning(f"Skipping invalid bundle {entry['task_id']}: {e}")
+    return bundles
+
+
+def _scan_bundles(bundles_dir: Path, limit: int | None = None) -> list[Bundle]:
+    """List bundles by parsing every file (used when the manifest is unavailable)."""
     bundles = []
 
     for path in bundles_dir.glob("*.json"):
@@ -348,15 +385,26 @@ def diff_bundles(
     Returns:
         BundleDiff object, or None if either bundle not found.
     """
-    bundle1 = load_bundle(task_id1, base_path)
-    bundle2 = load_bundle(task_id2, base_path)
-
-    if not bundle1 or not bundle2:
-        logger.error("Could not load one or both bundles")
-        return None
-
-    paths1 = bundle1.file_paths
-    paths2 = bundle2.file_paths
+    bundles_dir = _get_bundles_dir(base_path)
+    index = _open_index(bundles_dir)
+    if index is not None:
+        # File lists come from the manifest; no bundle file is opened
+        with index:
+            entry1 = index.get_entry(task_id1)
+            entry2 = index.get_entry(task_id2)
+        if not entry1 or not entry2:
+            logger.error("Could not load one or both bundles")
+            return None
+        paths1 = {f["path"] for f in entry1["files"]}
+        paths2 = {f["path"] for f in entry2["files"]}
+    else:
+        bundle1 = load_bundle(task_id1, base_path)
+        bundle2 = load_bundle(task_id2, base_path)
+        if not bundle1 or not bundle2:
+            logger.error("Could not load one or both bundles")
+            return None
+        paths1 = bundle1.file_paths
+        paths2 = bundle2.file_paths
 
     return BundleDiff(
         bundle1_id=task_id1,
@@ -374,7 +422,8 @@ def suggest_bundles(
 ) -> list[tuple[Bundle, float]]:
     """Suggest bundles similar to a given description.
 
-    Uses simple keyword matching to find relevant bundles.
+    Ranks bundles with BM25 over their descriptions, tags and file paths
+    using the persistent inverted index, then loads only the winners.
 
     Args:
         description: Description to match against.
@@ -384,41 +433,23 @@ def suggest_bundles(
     Returns:
         List of (Bundle, score) tuples, sorted by relevance.
     """
-    bundles = list_bundles(base_path)
-    if not bundles:
+    bundles_dir = _get_bundles_dir(base_path)
+    index = _open_index(bundles_dir)
+    if index is None:
         return []
 
-    # Tokenize description
-    keywords = set(description.lower().split())
-
-    scored_bundles = []
-    for bundle in bundles:
-        score = 0.0
-
-        # Match against description
-        bundle_words = set(bundle.description.lower().split())
-        desc_overlap = len(keywords & bundle_words)
-        if desc_overlap:
-            score += desc_overlap * 2
-
-        # Match against tags
-        for tag in bundle.tags:
-            if any(kw in tag.lower() for kw in keywords):
-                score += 3
+    with index:
+        # Over-fetch slightly in case a bundle vanished since it was indexed
+        ranked = index.search(description, top_n=top_n + 2)
 
-        # Match against file paths
-        for bf in bundle.files:
-            path_parts = set(bf.path.lower().replace("/", " ").replace("_", " ").split())
-            path_overlap = len(keywords & path_parts)
-            if path_overlap:
-                score += path_overlap * 0.5
-
-        if score > 0:
-            scored_bundles.append((bundle, score))
-
-    # Sort by score (descending) and return top N
-    scored_bundles.sort(key=lambda x: x[1], reverse=True)
-    return scored_bundles[:top_n]
+    suggestions = []
+    for task_id, score in ranked:
+        bundle = load_bundle(task_id, base_path)
+        if bundle:
+            suggestions.append((bundle, score))
+        if len(suggestions) >= top_n:
+            break
+    return suggestions
 
 
 def compress_old_bundles(
@@ -439,6 +470,7 @@ def compress_old_bundles(
     bundles_dir = _get_bundles_dir(base_path)
     cutoff = datetime.now() - timedelta(days=days)
     compressed_count = 0
+    index = _open_index(bundles_dir)
 
     for path in bundles_dir.glob("*.json"):
         if path.suffix == ".gz":
@@ -457,10 +489,14 @@ def compress_old_bundles(
                 # Remove original
                 path.unlink()
                 compressed_count += 1
+                if index is not None:
+                    index.move(path.name[: -len(".json")], compressed_path)
                 logger.info(f"Compressed bundle: {path.name}")
         except (json.JSONDecodeError, ValueError, OSError) as e:
             logger.warning(f"Failed to compress {path.name}: {e}")
 
+    if index is not None:
+        index.close()
     return compressed_count
 
 
@@ -475,20 +511,28 @@ def delete_bundle(task_id: str, base_path: Path | None = None) -> bool:
         True if deleted, False if not found.
     """
     bundles_dir = _get_bundles_dir(base_path)
+    index = _open_index(bundles_dir)
+    deleted = False
 
     bundle_path = bundles_dir / f"{task_id}.json"
+    compressed_path = bundles_dir / f"{task_id}.json.gz"
     if bundle_path.exists():
         bundle_path.unlink()
         logger.info(f"Deleted bundle: {task_id}")
-        return True
-
-    compressed_path = bundles_dir / f"{task_id}.json.gz"
-    if compressed_path.exists():
+        deleted = True
+    elif compressed_path.exists():
         compressed_path.unlink()
         logger.info(f"Deleted compressed bundle: {task_id}")
-        return True
-
-    return False
+        deleted = True
+
+    if index is not None:
+        with index:
+            if deleted and compressed_path.exists():
+                # A compressed copy is still around and is now the live bundle
+                index.sync(force=True)
+            elif deleted:
+                index.remove(task_id)
+    return deleted
 
 
 def get_bundle_file_contents(
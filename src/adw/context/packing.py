@@ -0,0 +1,568 @@
+"""Token-budgeted context packing for ADW.
+
+Collects prompt context candidates from every source we have (context
+bundles, learned expertise, qmd search results, multi-repo workspace info),
+scores them, removes overlapping content, and picks the best set that fits a
+single global token budget. Packed results are cached per (task, commit) under
+``.adw/cache/context/`` so later phases of the same task reuse them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .bundle_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Cache location, relative to the project root
+DEFAULT_CACHE_DIR = Path(".adw/cache/context")
+
+# Default budget for all injected context combined
+DEFAULT_TOKEN_BUDGET = 6000
+
+# Rough characters-per-token ratio for English text and code
+CHARS_PER_TOKEN = 4
+
+# Candidates whose lines are at least this covered by already-picked content are dropped
+OVERLAP_THRESHOLD = 0.8
+
+# Relative weight of each source after per-source score normalization
+SOURCE_WEIGHTS = {
+    "workspace": 1.0,
+    "expertise": 0.9,
+    "bundle": 0.8,
+    "qmd": 0.7,
+}
+
+# Render order and headings for packed sections
+SOURCE_HEADINGS = {
+    "workspace": "## Workspace Context",
+    "expertise": "## Expertise",
+    "bundle": "## Relevant Files (from context bundles)",
+    "qmd": "## Relevant Context (from project docs)",
+}
+
+ALL_SOURCES = tuple(SOURCE_HEADINGS)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token cost of a piece of text.
+
+    Args:
+        text: Text to estimate.
+
+    Returns:
+        Estimated token count (at least 1 for non-empty text).
+    """
+    if not text:
+        return 0
+    return max(1, math.ceil(len(text) / CHARS_PER_TOKEN))
+
+
+@dataclass
+class ContextCandidate:
+    """A piece of context that may be injected into a prompt.
+
+    Attributes:
+        source: Source name (workspace, expertise, bundle, qmd).
+        key: Identifier within the source (file path, learning text, ...).
+        content: Text to inject.
+        score: Relevance score (higher is better).
+        tokens: Estimated token cost; computed from content if not given.
+    """
+
+    source: str
+    key: str
+    content: str
+    score: float = 1.0
+    tokens: int = 0
+
+    def __post_init__(self) -> None:
+        if not self.tokens:
+            self.tokens = estimate_tokens(self.content)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "source": self.source,
+            "key": self.key,
+            "content": self.content,
+            "score": self.score,
+            "tokens": self.tokens,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ContextCandidate:
+        """Create from dictionary."""
+        return cls(
+            source=data["source"],
+            key=data["key"],
+            content=data["content"],
+            score=data.get("score", 1.0),
+            tokens=data.get("tokens", 0),
+        )
+
+
+@dataclass
+class PackedContext:
+    """Result of packing candidates into a token budget.
+
+    Attributes:
+        items: Selected candidates, in render order.
+        token_budget: Budget the items were packed into.
+        dropped: Candidates left out for lack of budget.
+        duplicates: Candidates left out because their content overlapped.
+    """
+
+    items: list[ContextCandidate] = field(default_factory=list)
+    token_budget: int = DEFAULT_TOKEN_BUDGET
+    dropped: int = 0
+    duplicates: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        """Estimated tokens used by the selected items."""
+        return sum(item.tokens for item in self.items)
+
+    def to_prompt_section(self) -> str:
+        """Render the packed context as markdown for prompt injection."""
+        sections = []
+        for source, heading in SOURCE_HEADINGS.items():
+            items = [item for item in self.items if item.source == source]
+            if not items:
+                continue
+            # Expertise items are bullet lines; everything else is a block
+            joiner = "\n" if source == "expertise" else "\n\n"
+            sections.append(heading + "\n\n" + joiner.join(item.content for item in items))
+        return "\n\n".join(sections)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "items": [item.to_dict() for item in self.items],
+            "token_budget": self.token_budget,
+            "dropped": self.dropped,
+            "duplicates": self.duplicates,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PackedContext:
+        """Create from dictionary."""
+        return cls(
+            items=[ContextCandidate.from_dict(d) for d in data.get("items", [])],
+            token_budget=data.get("token_budget", DEFAULT_TOKEN_BUDGET),
+            dropped=data.get("dropped", 0),
+            duplicates=data.get("duplicates", 0),
+        )
+
+
+def _content_lines(text: str) -> set[str]:
+    """Normalized non-trivial lines of a text, for overlap detection."""
+    lines = set()
+    for line in text.splitlines():
+        normalized = " ".join(line.lower().split()).lstrip("-*#> ")
+        if len(normalized) >= 8:
+            lines.add(normalized)
+    return lines
+
+
+def pack_context(
+    candidates: list[ContextCandidate],
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    overlap_threshold: float = OVERLAP_THRESHOLD,
+) -> PackedContext:
+    """Select the best set of candidates that fits a token budget.
+
+    Candidates are taken greedily by score per token. A candidate is skipped as
+    a duplicate when most of its lines already appear in selected content. As
+    in the standard greedy knapsack approximation, the result is replaced by
+    the single best-scoring candidate if that alone is worth more.
+
+    Args:
+        candidates: Candidates from any mix of sources.
+        token_budget: Maximum total estimated tokens.
+        overlap_threshold: Fraction of covered lines above which a candidate
+            counts as a duplicate.
+
+    Returns:
+        PackedContext with the selected items in source order.
+    """
+    packed = PackedContext(token_budget=token_budget)
+    ranked = sorted(
+        (c for c in candidates if c.content.strip() and c.score > 0),
+        key=lambda c: (c.score / max(c.tokens, 1), c.score),
+        reverse=True,
+    )
+
+    selected: list[ContextCandidate] = []
+    seen_lines: set[str] = set()
+    used = 0
+    for candidate in ranked:
+        lines = _content_lines(candidate.content)
+        if lines and len(lines & seen_lines) / len(lines) >= overlap_threshold:
+            packed.duplicates += 1
+            continue
+        if used + candidate.tokens > token_budget:
+            packed.dropped += 1
+            continue
+        selected.append(candidate)
+        seen_lines |= lines
+        used += candidate.tokens
+
+    fitting = [c for c in ranked if c.tokens <= token_budget]
+    if fitting:
+        best_single = max(fitting, key=lambda c: c.score)
+        if best_single.score > sum(c.score for c in selected):
+            packed.dropped += len(selected) - (1 if best_single in selected else 0)
+            selected = [best_single]
+
+    order = {source: i for i, source in enumerate(SOURCE_HEADINGS)}
+    selected.sort(key=lambda c: (order.get(c.source, len(order)), -c.score))
+    packed.items = selected
+    return packed
+
+
+# -- Candidate collectors ---------------------------------------------------
+
+
+def _relevance(task_terms: set[str], text: str) -> float:
+    """Fraction of task terms that appear in a text."""
+    if not task_terms:
+        return 0.0
+    return len(task_terms & set(tokenize(text))) / len(task_terms)
+
+
+def _normalize(candidates: list[ContextCandidate], weight: float) -> list[ContextCandidate]:
+    """Scale a source's scores to [0, weight] so sources are comparable."""
+    top = max((c.score for c in candidates), default=0.0)
+    if top <= 0:
+        return candidates
+    for c in candidates:
+        c.score = weight * c.score / top
+    return candidates
+
+
+def bundle_candidates(
+    task_description: str,
+    base_path: Path | None = None,
+    top_n: int = 2,
+    max_file_tokens: int = 1500,
+    project_path: Path | None = None,
+) -> list[ContextCandidate]:
+    """Build candidates from files in the bundles most similar to the task.
+
+    Args:
+        task_description: Task description to match bundles against.
+        base_path: Checkout to read the bundle files from (such as the
+            task's worktree).
+        top_n: Number of bundles to draw files from.
+        max_file_tokens: Files longer than this are truncated.
+        project_path: Project root holding the bundles. Defaults to base_path.
+
+    Returns:
+        One candidate per bundle file.
+    """
+    from .bundles import get_bundle_file_contents, suggest_bundles
+
+    task_terms = set(tokenize(task_description))
+    max_chars = max_file_tokens * CHARS_PER_TOKEN
+    candidates: dict[str, ContextCandidate] = {}
+
+    bundles = suggest_bundles(task_description, base_path=project_path or base_path, top_n=top_n)
+    for bundle, bundle_score in bundles:
+        for path, text in get_bundle_file_contents(bundle, base_path).items():
+            if len(text) > max_chars:
+                text = text[:max_chars] + "\n... (truncated)"
+            score = bundle_score * (0.5 + _relevance(task_terms, path + "\n" + text))
+            # The same file may appear in several bundles; keep the best score
+            if path in candidates and candidates[path].score >= score:
+                continue
+            candidates[path] = ContextCandidate(
+                source="bundle",
+                key=path,
+                content=f"### {path}\n```\n{text}\n```",
+                score=score,
+            )
+
+    return list(candidates.values())
+
+
+def expertise_candidates(
+    task_description: str,
+    project: str | None = None,
+    domain: str | None = None,
+    task_id: str | None = None,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> list[ContextCandidate]:
+    """Build candidates from learned patterns, issues and practices.
+
+    Args:
+        task_description: Task description used to rank learnings.
+        project: Project name for the pattern store (git repo name if None).
+        domain: Domain filter (frontend, backend, ai).
+        task_id: ADW task ID, used to cache the ranking.
+        token_budget: Most tokens of learnings worth ranking.
+
+    Returns:
+        One candidate per learning that is relevant to the task.
+    """
+    from ..learning.patterns import LearningType
+    from ..learning.retrieval import render_learning, retrieve_ranked_learnings
+
+    type_weights = {
+        LearningType.ISSUE: 1.2,
+        LearningType.MISTAKE: 1.1,
+        LearningType.BEST_PRACTICE: 1.0,
+        LearningType.PATTERN: 0.8,
+    }
+
+    ranked = retrieve_ranked_learnings(
+        task_description,
+        project=project,
+        domain=domain,
+        token_budget=token_budget,
+        task_id=task_id,
+    )
+    return [
+        ContextCandidate(
+            source="expertise",
+            key=f"{item.learning.type.value}:{item.learning.content.lower()}",
+            content=render_learning(item.learning),
+            score=type_weights[item.learning.type] * item.score,
+        )
+        for item in ranked
+    ]
+
+
+def qmd_candidates(results: list[dict[str, Any]], min_score: float = 0.3) -> list[ContextCandidate]:
+    """Build candidates from qmd search results.
+
+    Args:
+        results: Results from ``integrations.qmd.search``.
+        min_score: Results below this relevance are ignored.
+
+    Returns:
+        One candidate per result.
+    """
+    from ..integrations.qmd import display_path
+
+    candidates = []
+    for doc in results:
+        snippet = doc.get("snippet", doc.get("text", ""))
+        score = doc.get("score", 0)
+        if not isinstance(score, (int, float)) or score < min_score or not snippet:
+            continue
+        path = display_path(doc.get("path", doc.get("file", "unknown")))
+        candidates.append(
+            ContextCandidate(
+                source="qmd",
+                key=path,
+                content=f"### {path}\n{snippet}",
+                score=float(score),
+            )
+        )
+    return candidates
+
+
+def workspace_candidates(
+    task_description: str,
+    target_repo: str | None = None,
+    config_path: Path | None = None,
+) -> list[ContextCandidate]:
+    """Build a candidate from the multi-repo workspace description.
+
+    Args:
+        task_description: Description of the current task.
+        target_repo: Primary repository for the task.
+        config_path: Path to workspace config.
+
+    Returns:
+        A single candidate, or an empty list outside a workspace.
+    """
+    from ..workspace.context import build_workspace_prompt_context
+
+    text = build_workspace_prompt_context(task_description, target_repo, config_path)
+    # Drop the horizontal rules; the packer adds its own headings
+    body = "\n".join(line for line in text.splitlines() if line.strip() != "---").strip()
+    if not body:
+        return []
+    return [ContextCandidate(source="workspace", key="workspace", content=body, score=1.0)]
+
+
+# -- Caching and entry point ------------------------------------------------
+
+
+def _get_head_commit(base_path: Path) -> str | None:
+    """Get the full HEAD commit hash, or None outside a git repository."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=base_path,
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def _project_root(path: Path) -> Path:
+    """Get the main checkout of the repository at path.
+
+    Worktrees share the main checkout's git directory, but not its untracked
+    ``.adw/`` data. Outside git, path itself is returned.
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--path-format=absolute", "--git-common-dir"],
+            capture_output=True,
+            text=True,
+            cwd=path,
+        )
+    except OSError:
+        return path
+    common_dir = Path(result.stdout.strip())
+    if result.returncode != 0 or common_dir.name != ".git":
+        return path
+    return common_dir.parent
+
+
+def _cache_path(base_path: Path, task_key: str, commit: str, token_budget: int, sources: tuple[str, ...]) -> Path:
+    digest = hashlib.sha256(f"{commit}:{token_budget}:{','.join(sources)}".encode()).hexdigest()[:16]
+    safe_key = "".join(c if c.isalnum() or c in "-_" else "_" for c in task_key)[:64]
+    return base_path / DEFAULT_CACHE_DIR / f"{safe_key}-{digest}.json"
+
+
+def build_task_context(
+    task_description: str,
+    task_id: str | None = None,
+    base_path: Path | None = None,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    project: str | None = None,
+    domain: str | None = None,
+    sources: tuple[str, ...] = ALL_SOURCES,
+    use_cache: bool = True,
+    project_path: Path | None = None,
+) -> PackedContext:
+    """Collect, score and pack prompt context for a task.
+
+    Args:
+        task_description: Description of the task.
+        task_id: ADW task ID, used as the cache key (description hash if None).
+        base_path: Project (or worktree) root. Uses cwd if not provided.
+        token_budget: Global token budget for all context combined.
+        project: Project name for learned expertise.
+        domain: Expertise domain filter.
+        sources: Which sources to draw from.
+        use_cache: Reuse a packed result for the same task and commit.
+        project_path: Project root holding the context bundles. Defaults to
+            the main checkout of base_path, so worktrees use the project's
+            bundles while files are read from the worktree.
+
+    Returns:
+        PackedContext ready for ``to_prompt_section()``.
+    """
+    path = base_path or Path.cwd()
+    task_key = task_id or hashlib.sha256(task_description.encode()).hexdigest()[:12]
+    commit = _get_head_commit(path) if use_cache else None
+    cache_file = _cache_path(path, task_key, commit, token_budget, sources) if commit else None
+
+    if cache_file and cache_file.exists():
+        try:
+            return PackedContext.from_dict(json.loads(cache_file.read_text()))
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logger.debug("Ignoring corrupt context cache %s: %s", cache_file.name, e)
+
+    candidates: list[ContextCandidate] = []
+    for source in sources:
+        try:
+            if source == "workspace":
+                found = workspace_candidates(task_description)
+            elif source == "expertise":
+                found = expertise_candidates(
+                    task_description,
+                    project=project,
+                    domain=domain,
+                    task_id=task_id,
+                    token_budget=token_budget,
+                )
+            elif source == "bundle":
+                found = bundle_candidates(
+                    task_description,
+                    base_path=path,
+                    project_path=project_path or _project_root(path),
+                )
+            elif source == "qmd":
+                from ..integrations import qmd
+
+                found = []
+                if qmd.is_available():
+                    results = qmd.search(task_description, mode="vsearch") or qmd.search(task_description)
+                    found = qmd_candidates(results)
+            else:
+                continue
+        except Exception as e:
+            logger.debug("Could not collect %s context: %s", source, e)
+            continue
+        candidates.extend(_normalize(found, SOURCE_WEIGHTS.get(source, 1.0)))
+
+    packed = pack_context(candidates, token_budget=token_budget)
+    logger.debug(
+        "Packed %d/%d context items (%d tokens, %d duplicates)",
+        len(packed.items),
+        len(candidates),
+        packed.total_tokens,
+        packed.duplicates,
+    )
+
+    if cache_file:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(packed.to_dict()))
+        except OSError as e:
+            logger.debug("Could not write context cache: %s", e)
+
+    return packed
+
+
+def inject_packed_context(
+    prompt: str,
+    task_description: str,
+    task_id: str | None = None,
+    base_path: Path | None = None,
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+    project_path: Path | None = None,
+) -> str:
+    """Append packed task context to a prompt.
+
+    Args:
+        prompt: Original prompt text.
+        task_description: Description of the task.
+        task_id: ADW task ID (cache key).
+        base_path: Project (or worktree) root.
+        token_budget: Global token budget for the injected context.
+        project_path: Project root holding the context bundles. Defaults to
+            the main checkout of base_path.
+
+    Returns:
+        Prompt with the packed context appended, or unchanged if there is none.
+    """
+    packed = build_task_context(
+        task_description,
+        task_id=task_id,
+        base_path=base_path,
+        token_budget=token_budget,
+        project_path=project_path,
+    )
+    section = packed.to_prompt_section()
+    if not section:
+        return prompt
+    return f"{prompt}\n\n---\n\n{section}"
@@ -11,6 +11,8 @@ from enum import Enum
 from pathlib import Path
 from typing import Any
 
+from ..utils.fingerprint import cached_detection
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,17 +43,45 @@ class ProjectDetection:
     config_files: list[str] | None = None
 
 
-def detect_project_type(project_path: Path | None = None) -> ProjectDetection:
+def detect_project_type(project_path: Path | None = None, use_cache: bool = True) -> ProjectDetection:
     """Detect the project type based on config files and structure.
 
+    Results are cached against the project's manifest fingerprint.
+
     Args:
         project_path: Path to the project root. Uses cwd if not provided.
+        use_cache: Whether to use the project fingerprint cache.
 
     Returns:
         ProjectDetection with detected type and framework info.
     """
     path = project_path or Path.cwd()
 
+    if not use_cache:
+        return _detect_project_type(path)
+
+    return cached_detection(
+        path,
+        "project_type",
+        lambda: _detect_project_type(path),
+        encode=lambda d: {
+            "project_type": d.project_type.value,
+            "framework": d.framework,
+            "test_framework": d.test_framework,
+            "config_files": d.config_files,
+        },
+        decode=lambda data: ProjectDetection(
+            project_type=ProjectType(data["project_type"]),
+            framework=data.get("framework"),
+            test_framework=data.get("test_framework"),
+            config_files=data.get("config_files"),
+        ),
+    )
+
+
+def _detect_project_type(path: Path) -> ProjectDetection:
+    """Detect the project type without consulting the cache."""
+
     # Check for Python
     pyproject = path / "pyproject.toml"
     requirements = path / "requirements.txt"
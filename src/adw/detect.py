@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import json
 import tomllib
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Literal
 
+from .utils.fingerprint import cached_detection
+
 ProjectCategory = Literal["frontend", "backend", "fullstack"]
 ProjectStack = Literal[
     "react",
@@ -37,11 +39,15 @@ class Detection:
     confidence: float  # 0.0 to 1.0
 
 
-def detect_project(path: Path | None = None) -> list[Detection]:
+def detect_project(path: Path | None = None, use_cache: bool = True) -> list[Detection]:
     """Detect project type from files in current directory.
 
+    Results are cached against the project's manifest fingerprint, so repeat
+    calls only re-read manifests after one of them changes.
+
     Args:
         path: Directory to analyze. Defaults to current directory.
+        use_cache: Whether to use the project fingerprint cache.
 
     Returns:
         List of detected project components.
@@ -49,6 +55,20 @@ def detect_project(path: Path | None = None) -> list[Detection]:
     if path is None:
         path = Path.cwd()
 
+    if not use_cache:
+        return _detect_project(path)
+
+    return cached_detection(
+        path,
+        "detect_project",
+        lambda: _detect_project(path),
+        encode=lambda detections: [asdict(d) for d in detections],
+        decode=lambda data: [Detection(**d) for d in data],
+    )
+
+
+def _detect_project(path: Path) -> list[Detection]:
+    """Detect project components without consulting the cache."""
     detections: list[Detection] = []
 
     # Check for package.json (Node/Frontend)
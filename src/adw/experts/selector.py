@@ -9,11 +9,12 @@ Automatically selects the appropriate expert(s) based on:
 from __future__ import annotations
 
 import logging
-import re
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from ..utils.matcher import PatternTable
+
 if TYPE_CHECKING:
     from .base import Expert
 
@@ -157,6 +158,15 @@ FILE_PATTERNS: dict[str, list[tuple[str, float]]] = {
 }
 
 
+# Compiled per-domain tables (see utils/matcher.py)
+_KEYWORD_TABLES: dict[str, PatternTable[float]] = {
+    domain: PatternTable(patterns) for domain, patterns in DOMAIN_KEYWORDS.items()
+}
+_FILE_TABLES: dict[str, PatternTable[float]] = {
+    domain: PatternTable(patterns) for domain, patterns in FILE_PATTERNS.items()
+}
+
+
 def select_experts(
     task: str,
     files: list[str | Path] | None = None,
@@ -180,32 +190,29 @@ def select_experts(
     task_lower = task.lower()
 
     # Score based on keywords
-    for domain, patterns in DOMAIN_KEYWORDS.items():
+    for domain, table in _KEYWORD_TABLES.items():
         domain_score = 0.0
         reasons: list[str] = []
 
-        for pattern, weight in patterns:
-            if re.search(pattern, task_lower, re.IGNORECASE):
-                domain_score += weight
-                match = re.search(pattern, task_lower, re.IGNORECASE)
-                if match:
-                    reasons.append(f"keyword: '{match.group()}'")
+        for match in table.scan(task_lower):
+            domain_score += match.value
+            reasons.append(f"keyword: '{match.text}'")
 
         if domain_score > 0:
             scores[domain] = (domain_score, reasons)
 
     # Score based on file patterns
     if files:
-        for domain, patterns in FILE_PATTERNS.items():
+        for domain, table in _FILE_TABLES.items():
             current_score, current_reasons = scores.get(domain, (0.0, []))
 
             for file in files:
                 file_str = str(file)
-                for pattern, weight in patterns:
-                    if re.search(pattern, file_str, re.IGNORECASE):
-                        current_score += weight
-                        current_reasons.append(f"file: '{file_str}'")
-                        break  # Only count each file once per domain
+                # Only count each file once per domain
+                match = table.first(file_str)
+                if match:
+                    current_score += match.value
+                    current_reasons.append(f"file: '{file_str}'")
 
             if current_score > 0:
                 scores[domain] = (current_score, current_reasons)
@@ -246,10 +253,9 @@ def detect_domain_from_path(path: str | Path) -> str | None:
     """
     path_str = str(path)
 
-    for domain, patterns in FILE_PATTERNS.items():
-        for pattern, _ in patterns:
-            if re.search(pattern, path_str, re.IGNORECASE):
-                return domain
+    for domain, table in _FILE_TABLES.items():
+        if table.search(path_str):
+            return domain
 
     return None
 
@@ -11,6 +11,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
+from ..utils.matcher import PatternTable
 from .review_watcher import ReviewComment
 
 logger = logging.getLogger(__name__)
@@ -122,6 +123,14 @@ QUESTION_PATTERNS = [
 # ADW marker pattern
 ADW_MARKER_PATTERN = r"<!--\s*ADW:[a-f0-9]+\s*-->"
 
+# Compiled tables (see utils/matcher.py)
+_ADW_MARKER_RE = re.compile(ADW_MARKER_PATTERN, re.IGNORECASE)
+_ACTIONABLE_TABLE: PatternTable[ActionPriority] = PatternTable(ACTIONABLE_PATTERNS)
+_NON_ACTIONABLE_TABLE: PatternTable[None] = PatternTable(
+    ((pattern, None) for pattern in NON_ACTIONABLE_PATTERNS), anchored=True
+)
+_QUESTION_TABLE: PatternTable[None] = PatternTable((pattern, None) for pattern in QUESTION_PATTERNS)
+
 
 def parse_review_comment(comment: ReviewComment) -> ActionableComment:
     """Parse a review comment to determine its type and extract action.
@@ -136,7 +145,7 @@ def parse_review_comment(comment: ReviewComment) -> ActionableComment:
     body_lower = body.lower()
 
     # Check if it's an ADW-generated comment
-    if re.search(ADW_MARKER_PATTERN, body, re.IGNORECASE):
+    if _ADW_MARKER_RE.search(body):
         return ActionableComment(
             original_comment=comment,
             comment_type=CommentType.ADW_GENERATED,
@@ -146,48 +155,38 @@ def parse_review_comment(comment: ReviewComment) -> ActionableComment:
         )
 
     # Check for non-actionable patterns first
-    for pattern in NON_ACTIONABLE_PATTERNS:
-        if re.match(pattern, body_lower, re.IGNORECASE):
-            return ActionableComment(
-                original_comment=comment,
-                comment_type=CommentType.APPROVAL,
-                action_description="",
-                file_path=comment.path,
-                line_number=comment.line,
-            )
-
-    # Check for questions
-    for pattern in QUESTION_PATTERNS:
-        if re.search(pattern, body_lower, re.IGNORECASE):
-            # Questions might still be actionable if they contain action patterns
-            has_action = False
-            for action_pattern, _ in ACTIONABLE_PATTERNS:
-                if re.search(action_pattern, body_lower, re.IGNORECASE):
-                    has_action = True
-                    break
-
-            if not has_action:
-                return ActionableComment(
-                    original_comment=comment,
-                    comment_type=CommentType.QUESTION,
-                    action_description=body,
-                    file_path=comment.path,
-                    line_number=comment.line,
-                )
+    if _NON_ACTIONABLE_TABLE.search(body_lower):
+        return ActionableComment(
+            original_comment=comment,
+            comment_type=CommentType.APPROVAL,
+            action_description="",
+            file_path=comment.path,
+            line_number=comment.line,
+        )
+
+    actions = _ACTIONABLE_TABLE.scan(body_lower)
+
+    # Check for questions; they might still be actionable if they contain action patterns
+    if not actions and _QUESTION_TABLE.search(body_lower):
+        return ActionableComment(
+            original_comment=comment,
+            comment_type=CommentType.QUESTION,
+            action_description=body,
+            file_path=comment.path,
+            line_number=comment.line,
+        )
 
     # Check for actionable patterns
     priority = ActionPriority.MEDIUM
     keywords = []
 
-    for pattern, pat_priority in ACTIONABLE_PATTERNS:
-        match = re.search(pattern, body_lower, re.IGNORECASE)
-        if match:
-            keywords.append(match.group(0))
-            # Use the highest priority found
-            if pat_priority == ActionPriority.HIGH:
-                priority = ActionPriority.HIGH
-            elif pat_priority == ActionPriority.LOW and priority != ActionPriority.HIGH:
-                priority = ActionPriority.LOW
+    for match in actions:
+        keywords.append(match.text)
+        # Use the highest priority found
+        if match.value == ActionPriority.HIGH:
+            priority = ActionPriority.HIGH
+        elif match.value == ActionPriority.LOW and priority != ActionPriority.HIGH:
+            priority = ActionPriority.LOW
 
     if keywords:
         # Extract suggested change if present
@@ -13,6 +13,7 @@ from .linear import (
     LinearClient,
     LinearConfig,
     LinearIssue,
+    LinearMutation,
     LinearWatcher,
     process_linear_issues,
     run_linear_watcher,
@@ -52,6 +53,7 @@ __all__ = [
     "LinearClient",
     "LinearConfig",
     "LinearIssue",
+    "LinearMutation",
     "LinearWatcher",
     "process_linear_issues",
     "run_linear_watcher",
@@ -15,20 +15,29 @@ Configuration:
 
 from __future__ import annotations
 
-import json
 import os
 import time
-import urllib.error
-import urllib.request
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import httpx
 from rich.console import Console
 
+from ..utils import http_client
+from .sync_state import ADW_DIR, SyncState
+
 console = Console()
 
+# Storage paths
+LINEAR_STATE_FILE = ADW_DIR / "linear_state.json"
+
+# Issues fetched per GraphQL page
+ISSUES_PAGE_SIZE = 100
+
+# Seconds before a team's cached workflow states are refetched
+STATE_CACHE_TTL = 3600
 
 # Linear workflow state mapping
 LINEAR_TO_ADW_STATUS = {
@@ -276,6 +285,43 @@ class LinearIssue:
         return priority_map.get(self.priority, "p2")
 
 
+@dataclass
+class LinearMutation:
+    """One mutation of a batched GraphQL document.
+
+    Attributes:
+        name: Mutation field (e.g., "issueUpdate").
+        input_type: GraphQL type of the input argument.
+        input: Mutation input.
+        id: Target ID, for mutations that take one.
+    """
+
+    name: str
+    input_type: str
+    input: dict[str, Any]
+    id: str | None = None
+
+    @classmethod
+    def issue_update(
+        cls,
+        issue_id: str,
+        state_id: str | None = None,
+        description: str | None = None,
+    ) -> LinearMutation:
+        """Update an issue's state and/or description."""
+        updates: dict[str, Any] = {}
+        if state_id:
+            updates["stateId"] = state_id
+        if description is not None:
+            updates["description"] = description
+        return cls("issueUpdate", "IssueUpdateInput", updates, id=issue_id)
+
+    @classmethod
+    def comment_create(cls, issue_id: str, body: str) -> LinearMutation:
+        """Add a markdown comment to an issue."""
+        return cls("commentCreate", "CommentCreateInput", {"issueId": issue_id, "body": body})
+
+
 # =============================================================================
 # Linear GraphQL Client
 # =============================================================================
@@ -284,7 +330,7 @@ class LinearIssue:
 class LinearClient:
     """Linear API client using GraphQL.
 
-    Uses urllib for HTTP requests (no external dependencies).
+    Requests go through the shared HTTP client.
     """
 
     API_URL = "https://api.linear.app/graphql"
@@ -296,75 +342,72 @@ class LinearClient:
             api_key: Linear API key.
         """
         self.api_key = api_key
-        self._rate_limit_reset: float = 0
         self._team_cache: dict[str, str] = {}  # team_id -> team_key
         self._state_cache: dict[str, dict[str, str]] = {}  # team_id -> {name: id}
+        self._state_cache_at: dict[str, float] = {}  # team_id -> monotonic fetch time
 
     def _request(
         self,
         query: str,
         variables: dict[str, Any] | None = None,
+        partial: bool = False,
     ) -> dict[str, Any] | None:
         """Make a GraphQL request.
 
         Args:
             query: GraphQL query string.
             variables: Query variables.
+            partial: Return the data of the fields that resolved even if
+                others failed; failed fields are null.
 
         Returns:
             Response data or None on error.
         """
-        # Respect rate limits
-        if time.time() < self._rate_limit_reset:
-            wait_time = self._rate_limit_reset - time.time()
-            console.print(f"[yellow]Rate limited, waiting {wait_time:.1f}s[/yellow]")
-            time.sleep(wait_time)
-
         headers = {
             "Authorization": self.api_key,
             "Content-Type": "application/json",
         }
-
-        body = json.dumps({"query": query, "variables": variables or {}}).encode("utf-8")
-
-        req = urllib.request.Request(self.API_URL, data=body, headers=headers, method="POST")
+        body = {"query": query, "variables": variables or {}}
 
         try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                # Check for rate limit headers
-                remaining = response.headers.get("X-RateLimit-Remaining")
-                if remaining and int(remaining) < 10:
-                    reset_at = response.headers.get("X-RateLimit-Reset")
-                    if reset_at:
-                        self._rate_limit_reset = float(reset_at)
-
-                result = json.loads(response.read().decode("utf-8"))
-
-                if "errors" in result:
-                    for error in result["errors"]:
-                        console.print(f"[red]Linear API error: {error.get('message')}[/red]")
-                    return None
-
-                data: dict[str, Any] | None = result.get("data")
-                return data
-
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else ""
-            if e.code == 429:
-                # Rate limited
-                retry_after = e.headers.get("Retry-After", "60")
-                self._rate_limit_reset = time.time() + float(retry_after)
-                console.print(f"[yellow]Rate limited, retry after {retry_after}s[/yellow]")
-            else:
-                console.print(f"[red]Linear API error {e.code}: {error_body}[/red]")
+            response = http_client.request("POST", self.API_URL, json=body, headers=headers)
+        except httpx.HTTPError as e:
+            console.print(f"[red]Linear connection error: {e}[/red]")
             return None
-        except urllib.error.URLError as e:
-            console.print(f"[red]Linear connection error: {e.reason}[/red]")
+
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After", "60")
+            console.print(f"[yellow]Rate limited, retry after {retry_after}s[/yellow]")
             return None
-        except Exception as e:
+        if response.is_error:
+            console.print(f"[red]Linear API error {response.status_code}: {response.text}[/red]")
+            return None
+
+        # Nearly out of requests: hold back until the window resets (epoch ms)
+        try:
+            remaining = int(response.headers.get("X-RateLimit-Requests-Remaining", "10"))
+            reset_at = float(response.headers.get("X-RateLimit-Requests-Reset", "0")) / 1000
+        except ValueError:
+            remaining, reset_at = 10, 0.0
+        limiter = http_client.get_http_client().limiter(self.API_URL)
+        if remaining < 10 and limiter is not None:
+            limiter.block(reset_at - time.time())
+
+        try:
+            result = response.json()
+        except ValueError as e:
             console.print(f"[red]Linear request failed: {e}[/red]")
             return None
 
+        if "errors" in result:
+            for error in result["errors"]:
+                console.print(f"[red]Linear API error: {error.get('message')}[/red]")
+            if not partial:
+                return None
+
+        data: dict[str, Any] | None = result.get("data")
+        return data
+
     def get_viewer(self) -> dict[str, Any] | None:
         """Get authenticated user info.
 
@@ -439,6 +482,7 @@ class LinearClient:
             states: list[dict[str, Any]] = result["team"].get("states", {}).get("nodes", [])
             # Cache state name -> id mapping
             self._state_cache[team_id] = {s["name"].lower(): s["id"] for s in states}
+            self._state_cache_at[team_id] = time.monotonic()
             return states
         return []
 
@@ -447,18 +491,21 @@ class LinearClient:
         team_id: str | None = None,
         state_names: list[str] | None = None,
         label_names: list[str] | None = None,
-        limit: int = 50,
-    ) -> list[dict[str, Any]]:
-        """Get issues matching criteria.
+        limit: int | None = 50,
+        updated_after: str | None = None,
+    ) -> list[dict[str, Any]] | None:
+        """Get issues matching criteria, following pagination.
 
         Args:
             team_id: Filter by team ID.
             state_names: Filter by state names.
             label_names: Filter by label names.
-            limit: Maximum issues to return.
+            limit: Maximum issues to return, or None for all.
+            updated_after: Only issues updated after this ISO timestamp.
 
         Returns:
-            List of issue objects.
+            List of issue objects, or None if a request failed (rather than
+            the pages fetched so far, which would look complete).
         """
         # Build filter
         filters = []
@@ -470,14 +517,16 @@ class LinearClient:
         if label_names:
             label_filter = ", ".join(f'"{lbl}"' for lbl in label_names)
             filters.append(f"labels: {{ name: {{ in: [{label_filter}] }} }}")
+        if updated_after:
+            filters.append(f'updatedAt: {{ gt: "{updated_after}" }}')
 
         filter_clause = ""
         if filters:
             filter_clause = f"filter: {{ {', '.join(filters)} }}"
 
         query = f"""
-        query {{
-            issues(first: {limit}, {filter_clause}) {{
+        query($first: Int!, $after: String) {{
+            issues(first: $first, after: $after, {filter_clause}) {{
                 nodes {{
                     id
                     identifier
@@ -505,15 +554,27 @@ class LinearClient:
                         }}
                     }}
                 }}
+                pageInfo {{
+                    hasNextPage
+                    endCursor
+                }}
             }}
         }}
         """
 
-        result = self._request(query)
-        if result and result.get("issues"):
-            issues: list[dict[str, Any]] = result["issues"].get("nodes", [])
-            return issues
-        return []
+        issues: list[dict[str, Any]] = []
+        after: str | None = None
+        while limit is None or len(issues) < limit:
+            first = ISSUES_PAGE_SIZE if limit is None else min(ISSUES_PAGE_SIZE, limit - len(issues))
+            result = self._request(query, {"first": first, "after": after})
+            if not result or not result.get("issues"):
+                return None
+            issues.extend(result["issues"].get("nodes", []))
+            page_info = result["issues"].get("pageInfo") or {}
+            if not page_info.get("hasNextPage"):
+                break
+            after = page_info.get("endCursor")
+        return issues
 
     def get_issue(self, issue_id: str) -> dict[str, Any] | None:
         """Get a single issue by ID.
@@ -628,9 +689,45 @@ class LinearClient:
             return success
         return False
 
+    def mutate(self, mutations: list[LinearMutation]) -> list[bool]:
+        """Run several mutations in one request, as aliases of one document.
+
+        Args:
+            mutations: Mutations to run, in order.
+
+        Returns:
+            Whether each mutation succeeded. A failed mutation does not
+            fail the others.
+        """
+        if not mutations:
+            return []
+
+        params = []
+        fields = []
+        variables: dict[str, Any] = {}
+        for i, mutation in enumerate(mutations):
+            args = []
+            if mutation.id is not None:
+                params.append(f"$id{i}: String!")
+                args.append(f"id: $id{i}")
+                variables[f"id{i}"] = mutation.id
+            params.append(f"$input{i}: {mutation.input_type}!")
+            args.append(f"input: $input{i}")
+            variables[f"input{i}"] = mutation.input
+            fields.append(f"m{i}: {mutation.name}({', '.join(args)}) {{ success }}")
+
+        document = f"mutation({', '.join(params)}) {{\n    " + "\n    ".join(fields) + "\n}"
+        result = self._request(document, variables, partial=True)
+        if not result:
+            return [False] * len(mutations)
+        return [bool((result.get(f"m{i}") or {}).get("success")) for i in range(len(mutations))]
+
     def find_state_id(self, team_id: str, state_name: str) -> str | None:
         """Find state ID by name for a team.
 
+        States are fetched once per team and cached for STATE_CACHE_TTL, so
+        trying several names costs at most one request.
+
         Args:
             team_id: Team ID.
             state_name: State name to find.
@@ -638,20 +735,11 @@ class LinearClient:
         Returns:
             State ID or None.
         """
-        # Check cache first
-        if team_id in self._state_cache:
-            state_id = self._state_cache[team_id].get(state_name.lower())
-            if state_id:
-                return state_id
+        fetched_at = self._state_cache_at.get(team_id)
+        if fetched_at is None or time.monotonic() - fetched_at > STATE_CACHE_TTL:
+            self.get_team_states(team_id)
 
-        # Fetch and cache states
-        self.get_team_states(team_id)
-
-        # Try again from cache
-        if team_id in self._state_cache:
-            return self._state_cache[team_id].get(state_name.lower())
-
-        return None
+        return self._state_cache.get(team_id, {}).get(state_name.lower())
 
 
 # =============================================================================
@@ -739,19 +827,24 @@ class LinearWatcher:
     """Watches Linear for issues and triggers workflows.
 
     Polls Linear at configured intervals and processes issues
-    that match the filter criteria.
+    that match the filter criteria. After the first poll only issues
+    updated since the last one are fetched: a cursor is kept per team in
+    ~/.adw/linear_state.json, and only moves past an issue once it has been
+    claimed (see sync_state).
     """
 
-    def __init__(self, config: LinearConfig) -> None:
+    def __init__(self, config: LinearConfig, state_file: Path | None = None) -> None:
         """Initialize watcher with configuration.
 
         Args:
             config: Linear configuration.
+            state_file: Where sync cursors are kept (default: LINEAR_STATE_FILE).
         """
         self.config = config
         self.client = LinearClient(config.api_key)
         self._processed_ids: set[str] = set()
         self._team_id: str | None = config.team_id
+        self._sync = SyncState(state_file or LINEAR_STATE_FILE, "teams")
 
     def _ensure_team_id(self) -> str | None:
         """Ensure we have a team ID (fetch if not configured).
@@ -771,23 +864,40 @@ class LinearWatcher:
         console.print("[red]No teams found in Linear[/red]")
         return None
 
-    def get_pending_issues(self) -> list[LinearIssue]:
+    def get_pending_issues(self, advance_cursor: bool = True) -> list[LinearIssue]:
         """Get issues ready for processing.
 
+        Fetches only issues updated since the team's cursor, with a full
+        resync every FULL_SYNC_INTERVAL. If a page request fails, no issues
+        are returned and the cursor stays where it was.
+
+        Args:
+            advance_cursor: Move the cursor past the fetched issues that
+                need no processing; mark_issue_started moves it past the
+                others. Dry runs leave it in place.
+
         Returns:
             List of issues to process.
         """
         team_id = self._ensure_team_id()
+        cursor = self._sync.begin(team_id or "")
 
         issues_data = self.client.get_issues(
             team_id=team_id,
             state_names=self.config.filter_states,
             label_names=self.config.label_filter if self.config.label_filter else None,
+            limit=None,
+            updated_after=cursor,
         )
+        if issues_data is None:
+            console.print("[yellow]Linear issue fetch incomplete, retrying next poll[/yellow]")
+            return []
 
         issues = []
+        seen: list[datetime | None] = []
         for data in issues_data:
             issue = parse_linear_issue(data)
+            seen.append(issue.updated_at)
 
             # Skip if already has ADW ID (being processed)
             if issue.adw_id:
@@ -799,6 +909,9 @@ class LinearWatcher:
 
             issues.append(issue)
 
+        if advance_cursor:
+            self._sync.fetched(team_id or "", seen, [issue.updated_at for issue in issues])
+
         return issues
 
     def mark_issue_started(self, issue: LinearIssue, adw_id: str) -> bool:
@@ -826,21 +939,20 @@ class LinearWatcher:
             new_description += "\n"
         new_description += f"\n---\nADW: {adw_id}"
 
-        success = self.client.update_issue(
-            issue.id,
-            state_id=state_id,
-            description=new_description,
-        )
-
-        if success:
-            self._processed_ids.add(issue.id)
-
-            # Add a comment if configured
-            if self.config.sync_comments:
-                self.client.add_comment(
+        # Update and comment in one request
+        mutations = [LinearMutation.issue_update(issue.id, state_id=state_id, description=new_description)]
+        if self.config.sync_comments:
+            mutations.append(
+                LinearMutation.comment_create(
                     issue.id,
                     f"🤖 **ADW Started**\n\nTask ID: `{adw_id}`\nProcessing with ADW...",
                 )
+            )
+
+        success = self.client.mutate(mutations)[0]
+        if success:
+            self._processed_ids.add(issue.id)
+            self._sync.claimed(self._team_id or "", issue.updated_at)
 
         return success
 
@@ -861,15 +973,19 @@ class LinearWatcher:
                 if state_id:
                     break
 
-        success = self.client.update_issue(issue.id, state_id=state_id)
-
-        if success and self.config.sync_comments:
-            self.client.add_comment(
-                issue.id,
-                "✅ **ADW Completed**\n\nTask completed successfully.",
+        mutations = []
+        if state_id:
+            mutations.append(LinearMutation.issue_update(issue.id, state_id=state_id))
+        if self.config.sync_comments:
+            mutations.append(
+                LinearMutation.comment_create(
+                    issue.id,
+                    "✅ **ADW Completed**\n\nTask completed successfully.",
+                )
             )
 
-        return success
+        results = self.client.mutate(mutations)
+        return results[0] if state_id else True
 
     def mark_issue_failed(self, issue: LinearIssue, error: str | None = None) -> bool:
         """Mark an issue as failed.
@@ -888,18 +1004,20 @@ class LinearWatcher:
             if state_id:
                 break
 
-        success = True
+        mutations = []
         if state_id:
-            success = self.client.update_issue(issue.id, state_id=state_id)
-
+            mutations.append(LinearMutation.issue_update(issue.id, state_id=state_id))
         if self.config.sync_comments:
             error_text = f"\n\nError: {error}" if error else ""
-            self.client.add_comment(
-                issue.id,
-                f"❌ **ADW Failed**\n\nTask failed during processing.{error_text}",
+            mutations.append(
+                LinearMutation.comment_create(
+                    issue.id,
+                    f"❌ **ADW Failed**\n\nTask failed during processing.{error_text}",
+                )
             )
 
-        return success
+        results = self.client.mutate(mutations)
+        return results[0] if state_id else True
 
 
 # =============================================================================
@@ -910,12 +1028,14 @@ class LinearWatcher:
 def process_linear_issues(
     config: LinearConfig,
     dry_run: bool = False,
+    watcher: LinearWatcher | None = None,
 ) -> int:
     """Process pending issues from Linear.
 
     Args:
         config: Linear configuration.
         dry_run: If True, don't actually process issues.
+        watcher: Watcher to reuse between polls, keeping its caches.
 
     Returns:
         Number of issues processed.
@@ -923,8 +1043,8 @@ def process_linear_issues(
     from ..agent.utils import generate_adw_id
     from ..workflows.adaptive import TaskComplexity, run_adaptive_workflow
 
-    watcher = LinearWatcher(config)
-    issues = watcher.get_pending_issues()
+    watcher = watcher or LinearWatcher(config)
+    issues = watcher.get_pending_issues(advance_cursor=not dry_run)
 
     if not issues:
         console.print("[dim]No pending issues in Linear[/dim]")
@@ -1017,9 +1137,10 @@ def run_linear_watcher(
         console.print("[yellow]DRY RUN MODE[/yellow]")
     console.print()
 
+    watcher = LinearWatcher(config)
     try:
         while True:
-            process_linear_issues(config, dry_run)
+            process_linear_issues(config, dry_run, watcher=watcher)
             time.sleep(config.poll_interval)
 
     except KeyboardInterrupt:
@@ -15,21 +15,36 @@ Configuration:
 
 from __future__ import annotations
 
-import json
 import os
 import time
-import urllib.error
-import urllib.request
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
+import httpx
 from rich.console import Console
 
+from ..utils import http_client
+from .sync_state import ADW_DIR, SyncState
+
 console = Console()
 
+# Storage paths
+NOTION_STATE_FILE = ADW_DIR / "notion_state.json"
+
+# Pages per database query request (Notion's maximum)
+QUERY_PAGE_SIZE = 100
+
+# Seconds before a database's cached property schema is refetched
+SCHEMA_CACHE_TTL = 3600
+
+
+class NotionQueryError(Exception):
+    """A database query request failed before all result pages were read."""
+
 
 class NotionStatus(Enum):
     """Standard Notion task statuses mapped to ADW."""
@@ -278,7 +293,7 @@ class NotionTask:
 
 
 class NotionClient:
-    """Simple Notion API client using urllib (no external dependencies).
+    """Notion API client, sending requests through the shared HTTP client.
 
     Uses the official Notion API v1.
     """
@@ -293,6 +308,7 @@ class NotionClient:
             api_key: Notion integration API key.
         """
         self.api_key = api_key
+        self._schema_cache: dict[str, tuple[float, dict[str, str]]] = {}  # database_id -> (fetched, types)
 
     def _request(
         self,
@@ -318,53 +334,108 @@ class NotionClient:
             "Content-Type": "application/json",
         }
 
-        body = json.dumps(data).encode("utf-8") if data else None
-
-        req = urllib.request.Request(url, data=body, headers=headers, method=method)
-
         try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                result: dict[str, Any] = json.loads(response.read().decode("utf-8"))
-                return result
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode("utf-8") if e.fp else ""
-            console.print(f"[red]Notion API error {e.code}: {error_body}[/red]")
+            response = http_client.request(method, url, json=data or None, headers=headers)
+        except httpx.HTTPError as e:
+            console.print(f"[red]Notion connection error: {e}[/red]")
             return None
-        except urllib.error.URLError as e:
-            console.print(f"[red]Notion connection error: {e.reason}[/red]")
+
+        if response.is_error:
+            console.print(f"[red]Notion API error {response.status_code}: {response.text}[/red]")
             return None
-        except Exception as e:
+
+        try:
+            result: dict[str, Any] = response.json()
+        except ValueError as e:
             console.print(f"[red]Notion request failed: {e}[/red]")
             return None
+        return result
 
-    def query_database(
+    def iter_database(
         self,
         database_id: str,
         filter_obj: dict[str, Any] | None = None,
         sorts: list[dict[str, Any]] | None = None,
-    ) -> list[dict[str, Any]]:
-        """Query a Notion database.
+        page_size: int = QUERY_PAGE_SIZE,
+    ) -> Iterator[dict[str, Any]]:
+        """Stream the pages of a database query, following start_cursor.
+
+        Each batch is requested only once the previous one is consumed.
 
         Args:
             database_id: Database ID to query.
             filter_obj: Optional Notion filter object.
             sorts: Optional sort configuration.
+            page_size: Pages per request.
 
-        Returns:
-            List of page objects.
+        Yields:
+            Page objects.
+
+        Raises:
+            NotionQueryError: If a request fails, so a cut-short query is
+                not mistaken for the last page.
         """
-        data: dict[str, Any] = {}
+        data: dict[str, Any] = {"page_size": page_size}
         if filter_obj:
             data["filter"] = filter_obj
         if sorts:
             data["sorts"] = sorts
 
-        result = self._request("POST", f"/databases/{database_id}/query", data)
-        if not result:
+        while True:
+            result = self._request("POST", f"/databases/{database_id}/query", data)
+            if not result:
+                raise NotionQueryError(f"Query of database {database_id} failed")
+
+            yield from result.get("results", [])
+
+            next_cursor = result.get("next_cursor")
+            if not result.get("has_more") or not next_cursor:
+                return
+            data = {**data, "start_cursor": next_cursor}
+
+    def query_database(
+        self,
+        database_id: str,
+        filter_obj: dict[str, Any] | None = None,
+        sorts: list[dict[str, Any]] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Query a Notion database.
+
+        Args:
+            database_id: Database ID to query.
+            filter_obj: Optional Notion filter object.
+            sorts: Optional sort configuration.
+
+        Returns:
+            List of page objects, from all result pages, or an empty list
+            if a request fails.
+        """
+        try:
+            return list(self.iter_database(database_id, filter_obj=filter_obj, sorts=sorts))
+        except NotionQueryError:
             return []
 
-        results: list[dict[str, Any]] = result.get("results", [])
-        return results
+    def get_database_properties(self, database_id: str) -> dict[str, str]:
+        """Get the property types of a database, cached for SCHEMA_CACHE_TTL.
+
+        Args:
+            database_id: Database ID.
+
+        Returns:
+            Property type (e.g., "status", "select") by property name, or an
+            empty dict if the database could not be read.
+        """
+        cached = self._schema_cache.get(database_id)
+        if cached and time.monotonic() - cached[0] < SCHEMA_CACHE_TTL:
+            return cached[1]
+
+        result = self._request("GET", f"/databases/{database_id}")
+        if not result:
+            return {}
+
+        types = {name: prop.get("type", "") for name, prop in result.get("properties", {}).items()}
+        self._schema_cache[database_id] = (time.monotonic(), types)
+        return types
 
     def get_page(self, page_id: str) -> dict[str, Any] | None:
         """Get a page by ID.
@@ -538,23 +609,25 @@ def parse_notion_page(
 # =============================================================================
 
 
-def build_status_property(status: str, config: NotionConfig) -> dict[str, Any]:
+def build_status_property(
+    status: str,
+    config: NotionConfig,
+    property_type: str = "status",
+) -> dict[str, Any]:
     """Build a Notion property update for status.
 
-    Attempts to determine property type from config.
-
     Args:
         status: ADW status (pending, in_progress, completed, failed).
         config: Notion configuration.
+        property_type: Type of the status property ("status" or "select").
 
     Returns:
         Notion property update object.
     """
     notion_status = ADW_TO_NOTION_STATUS.get(status, "To Do")
 
-    # Default to status type (most common for status properties)
     return {
-        "status": {"name": notion_status},
+        property_type: {"name": notion_status},
     }
 
 
@@ -581,73 +654,122 @@ class NotionWatcher:
     """Watches a Notion database for tasks and triggers workflows.
 
     Polls the database at configured intervals and processes tasks
-    that match the filter criteria.
+    that match the filter criteria. After the first poll only pages edited
+    since the last one are queried: a last_edited_time mark is kept per
+    database in ~/.adw/notion_state.json, so restarts resume from it.
     """
 
-    def __init__(self, config: NotionConfig) -> None:
+    def __init__(self, config: NotionConfig, state_file: Path | None = None) -> None:
         """Initialize watcher with configuration.
 
         Args:
             config: Notion configuration.
+            state_file: Where high-water marks are kept (default: NOTION_STATE_FILE).
         """
         self.config = config
         self.client = NotionClient(config.api_key)
         self._processed_ids: set[str] = set()  # Track processed in this session
+        self._sync = SyncState(state_file or NOTION_STATE_FILE, "databases", cursor_key="last_edited_time")
 
-    def build_filter(self) -> dict[str, Any] | None:
+    def _status_type(self) -> str:
+        """Get the type of the status property from the database schema."""
+        properties = self.client.get_database_properties(self.config.database_id)
+        prop_type = properties.get(self.config.status_property)
+        return prop_type if prop_type in ("status", "select") else "status"
+
+    def build_filter(
+        self,
+        edited_since: str | None = None,
+        status_type: str = "status",
+    ) -> dict[str, Any] | None:
         """Build Notion filter for task query.
 
+        Args:
+            edited_since: Only pages edited at or after this ISO timestamp.
+            status_type: Type of the status property ("status" or "select").
+
         Returns:
             Filter object or None for no filtering.
         """
-        if not self.config.filter_status:
-            return None
-
         # Build OR filter for multiple statuses
         status_filters = []
         for status_name in self.config.filter_status:
             status_filters.append(
                 {
                     "property": self.config.status_property,
-                    "status": {"equals": status_name},
+                    status_type: {"equals": status_name},
                 }
             )
 
+        status_filter: dict[str, Any] | None = None
         if len(status_filters) == 1:
-            return status_filters[0]
-
-        return {"or": status_filters}
+            status_filter = status_filters[0]
+        elif status_filters:
+            status_filter = {"or": status_filters}
+
+        if not edited_since:
+            return status_filter
+
+        # Notion rounds edit times to the minute, so pages edited in the
+        # mark's minute are returned again; already claimed ones are skipped
+        edited_filter = {
+            "timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": edited_since},
+        }
+        if status_filter is None:
+            return edited_filter
+        return {"and": [status_filter, edited_filter]}
 
-    def get_pending_tasks(self) -> list[NotionTask]:
+    def get_pending_tasks(self, advance_mark: bool = True) -> list[NotionTask]:
         """Get tasks ready for processing.
 
+        Queries only pages edited since the database's high-water mark, with
+        a full rescan every FULL_SYNC_INTERVAL. Results are streamed, so
+        only the pending tasks are kept. If a query request fails, no tasks
+        are returned and the mark stays where it was.
+
+        Args:
+            advance_mark: Move the high-water mark past the fetched pages
+                that need no processing; mark_task_started moves it past
+                the others. Dry runs leave it in place.
+
         Returns:
             List of tasks to process.
         """
-        filter_obj = self.build_filter()
+        edited_since = self._sync.begin(self.config.database_id)
+        filter_obj = self.build_filter(edited_since, status_type=self._status_type())
 
         # Sort by created time (oldest first)
         sorts = [{"timestamp": "created_time", "direction": "ascending"}]
 
-        pages = self.client.query_database(
+        pages = self.client.iter_database(
             self.config.database_id,
             filter_obj=filter_obj,
             sorts=sorts,
         )
 
         tasks = []
-        for page in pages:
-            task = parse_notion_page(page, self.config)
+        seen: list[datetime | None] = []
+        try:
+            for page in pages:
+                task = parse_notion_page(page, self.config)
+                seen.append(task.last_edited_time)
 
-            # Skip if already has an ADW ID (being processed)
-            if task.adw_id:
-                continue
+                # Skip if already has an ADW ID (being processed)
+                if task.adw_id:
+                    continue
 
-            # Skip if we already processed this in this session
-            if task.page_id in self._processed_ids:
-                continue
+                # Skip if we already processed this in this session
+                if task.page_id in self._processed_ids:
+                    continue
+
+                tasks.append(task)
+        except NotionQueryError:
+            console.print("[yellow]Notion query incomplete, retrying next poll[/yellow]")
+            return []
 
-            tasks.append(task)
+        if advance_mark:
+            self._sync.fetched(self.config.database_id, seen, [task.last_edited_time for task in tasks])
 
         return tasks
 
@@ -662,13 +784,14 @@ class NotionWatcher:
             True if successful.
         """
         properties = {
-            self.config.status_property: build_status_property("in_progress", self.config),
+            self.config.status_property: build_status_property("in_progress", self.config, self._status_type()),
             self.config.adw_id_property: build_adw_id_property(adw_id),
         }
 
         result = self.client.update_page(task.page_id, properties)
         if result:
             self._processed_ids.add(task.page_id)
+            self._sync.claimed(self.config.database_id, task.last_edited_time)
             return True
         return False
 
@@ -682,7 +805,7 @@ class NotionWatcher:
             True if successful.
         """
         properties = {
-            self.config.status_property: build_status_property("completed", self.config),
+            self.config.status_property: build_status_property("completed", self.config, self._status_type()),
         }
 
         result = self.client.update_page(task.page_id, properties)
@@ -698,7 +821,7 @@ class NotionWatcher:
             True if successful.
         """
         properties = {
-            self.config.status_property: build_status_property("failed", self.config),
+            self.config.status_property: build_status_property("failed", self.config, self._status_type()),
         }
 
         result = self.client.update_page(task.page_id, properties)
@@ -713,12 +836,14 @@ class NotionWatcher:
 def process_notion_tasks(
     config: NotionConfig,
     dry_run: bool = False,
+    watcher: NotionWatcher | None = None,
 ) -> int:
     """Process pending tasks from Notion database.
 
     Args:
         config: Notion configuration.
         dry_run: If True, don't actually process tasks.
+        watcher: Watcher to reuse between polls, keeping its caches.
 
     Returns:
         Number of tasks processed.
@@ -726,8 +851,8 @@ def process_notion_tasks(
     from ..agent.utils import generate_adw_id
     from ..workflows.adaptive import TaskComplexity, run_adaptive_workflow
 
-    watcher = NotionWatcher(config)
-    tasks = watcher.get_pending_tasks()
+    watcher = watcher or NotionWatcher(config)
+    tasks = watcher.get_pending_tasks(advance_mark=not dry_run)
 
     if not tasks:
         console.print("[dim]No pending tasks in Notion database[/dim]")
@@ -814,9 +939,10 @@ def run_notion_watcher(
         console.print("[yellow]DRY RUN MODE[/yellow]")
     console.print()
 
+    watcher = NotionWatcher(config)
     try:
         while True:
-            process_notion_tasks(config, dry_run)
+            process_notion_tasks(config, dry_run, watcher=watcher)
             time.sleep(config.poll_interval)
 
     except KeyboardInterrupt:
@@ -882,10 +1008,16 @@ def test_notion_connection(config: NotionConfig) -> bool:
     """
     client = NotionClient(config.api_key)
 
-    # Try to query the database (empty query)
-    pages = client.query_database(config.database_id)
+    # Request a single page; reading the whole database is not needed
+    try:
+        first = next(client.iter_database(config.database_id, page_size=1), None)
+    except NotionQueryError:
+        console.print("[red]✗ Could not query the Notion database[/red]")
+        return False
 
-    # If we got here without error, connection works
     console.print("[green]✓ Connected to Notion[/green]")
-    console.print(f"[dim]Found {len(pages)} pages in database[/dim]")
+    if first is None:
+        console.print("[dim]Database has no pages yet[/dim]")
+    else:
+        console.print("[dim]Database has pages[/dim]")
     return True
@@ -229,6 +229,13 @@ def get_document(path: str, full: bool = False) -> str | None:
     return result.stdout
 
 
+def display_path(path: str) -> str:
+    """Strip the qmd://<collection>/ prefix from a result path."""
+    if path.startswith("qmd://"):
+        return path.split("/", 3)[-1] if "/" in path[6:] else path[6:]
+    return path
+
+
 def format_context_for_prompt(results: list[dict], max_chars: int = 4000) -> str:
     """Format search results as context for an LLM prompt.
 
@@ -255,8 +262,7 @@ def format_context_for_prompt(results: list[dict], max_chars: int = 4000) -> str
             continue
 
         # Clean up path (remove qmd:// prefix if present)
-        if path.startswith("qmd://"):
-            path = path.split("/", 3)[-1] if "/" in path[6:] else path[6:]
+        path = display_path(path)
 
         entry = f"### {path}\n{snippet}"
 
@@ -29,16 +29,17 @@ import hmac
 import json
 import os
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import httpx
 from rich.console import Console
 
+from ..utils import http_client
+
 console = Console()
 
 # Storage paths
@@ -155,8 +156,25 @@ class SlackConfig:
 # =============================================================================
 
 
+def _interaction_response(
+    text: str | None,
+    blocks: list[dict[str, Any]] | None,
+    response_type: str,
+    replace_original: bool,
+) -> dict[str, Any]:
+    """Build the body of a response to an interaction."""
+    data: dict[str, Any] = {"response_type": response_type}
+    if text:
+        data["text"] = text
+    if blocks:
+        data["blocks"] = blocks
+    if replace_original:
+        data["replace_original"] = True
+    return data
+
+
 class SlackClient:
-    """Simple Slack API client using urllib (no external dependencies).
+    """Slack API client, sending requests through the shared HTTP client.
 
     Uses the Slack Web API.
     """
@@ -170,7 +188,6 @@ class SlackClient:
             bot_token: Slack bot token (xoxb-...).
         """
         self.bot_token = bot_token
-        self._rate_limit_reset: float = 0
 
     def _request(
         self,
@@ -186,12 +203,6 @@ class SlackClient:
         Returns:
             Response JSON or None on error.
         """
-        # Rate limit check
-        if time.time() < self._rate_limit_reset:
-            wait_time = self._rate_limit_reset - time.time()
-            console.print(f"[yellow]Rate limited, waiting {wait_time:.1f}s...[/yellow]")
-            time.sleep(wait_time)
-
         url = f"{self.BASE_URL}/{method}"
 
         headers = {
@@ -199,45 +210,33 @@ class SlackClient:
             "Content-Type": "application/json; charset=utf-8",
         }
 
-        body = json.dumps(data or {}).encode("utf-8")
-
-        req = urllib.request.Request(url, data=body, headers=headers, method="POST")
-
         try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                # Check for rate limit headers
-                retry_after = response.headers.get("Retry-After")
-                if retry_after:
-                    self._rate_limit_reset = time.time() + float(retry_after)
-
-                result: dict[str, Any] = json.loads(response.read().decode("utf-8"))
-
-                if not result.get("ok"):
-                    error = result.get("error", "unknown_error")
-                    console.print(f"[red]Slack API error: {error}[/red]")
-                    return None
-
-                return result
-
-        except urllib.error.HTTPError as e:
-            # Handle rate limiting
-            if e.code == 429:
-                retry_after = e.headers.get("Retry-After", "60")
-                self._rate_limit_reset = time.time() + float(retry_after)
-                console.print(f"[yellow]Rate limited, retry after {retry_after}s[/yellow]")
-            else:
-                error_body = e.read().decode("utf-8") if e.fp else ""
-                console.print(f"[red]Slack API error {e.code}: {error_body}[/red]")
+            response = http_client.request("POST", url, json=data or {}, headers=headers)
+        except httpx.HTTPError as e:
+            console.print(f"[red]Slack connection error: {e}[/red]")
             return None
 
-        except urllib.error.URLError as e:
-            console.print(f"[red]Slack connection error: {e.reason}[/red]")
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After", "60")
+            console.print(f"[yellow]Rate limited, retry after {retry_after}s[/yellow]")
+            return None
+        if response.is_error:
+            console.print(f"[red]Slack API error {response.status_code}: {response.text}[/red]")
             return None
 
-        except Exception as e:
+        try:
+            result: dict[str, Any] = response.json()
+        except ValueError as e:
             console.print(f"[red]Slack request failed: {e}[/red]")
             return None
 
+        if not result.get("ok"):
+            error = result.get("error", "unknown_error")
+            console.print(f"[red]Slack API error: {error}[/red]")
+            return None
+
+        return result
+
     # -------------------------------------------------------------------------
     # Chat Methods
     # -------------------------------------------------------------------------
@@ -403,31 +402,33 @@ class SlackClient:
         Returns:
             True if successful.
         """
-        data: dict[str, Any] = {"response_type": response_type}
-
-        if text:
-            data["text"] = text
-        if blocks:
-            data["blocks"] = blocks
-        if replace_original:
-            data["replace_original"] = True
-
-        body = json.dumps(data).encode("utf-8")
+        data = _interaction_response(text, blocks, response_type, replace_original)
+        try:
+            response = http_client.request("POST", response_url, json=data)
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            console.print(f"[red]Failed to respond to interaction: {e}[/red]")
+            return False
+        return response.status_code == 200
 
-        req = urllib.request.Request(
-            response_url,
-            data=body,
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
+    async def arespond_to_interaction(
+        self,
+        response_url: str,
+        text: str | None = None,
+        blocks: list[dict[str, Any]] | None = None,
+        response_type: str = "ephemeral",
+        replace_original: bool = False,
+    ) -> bool:
+        """Respond to a Slack interaction without blocking the event loop.
 
+        Same as respond_to_interaction, for use in the request handlers.
+        """
+        data = _interaction_response(text, blocks, response_type, replace_original)
         try:
-            with urllib.request.urlopen(req, timeout=30) as response:
-                status_ok: bool = response.status == 200
-                return status_ok
-        except Exception as e:
+            response = await http_client.arequest("POST", response_url, json=data)
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
             console.print(f"[red]Failed to respond to interaction: {e}[/red]")
             return False
+        return response.status_code == 200
 
     # -------------------------------------------------------------------------
     # User/Channel Info
@@ -1876,7 +1877,7 @@ def create_slack_app(config: SlackConfig) -> Any:
             if response_url:
                 client = SlackClient(config.bot_token)
                 user_id = payload_data.get("user", {}).get("id", "")
-                client.respond_to_interaction(
+                await client.arespond_to_interaction(
                     response_url=response_url,
                     text=f":x: Rejected by <@{user_id}>: {reason}",
                     response_type="in_channel",
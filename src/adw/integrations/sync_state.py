@@ -0,0 +1,152 @@
+"""Incremental sync state for the polling integrations.
+
+Watchers fetch only the items changed since a cursor kept per polled source
+(a Linear team, a Notion database), with a full resync every
+FULL_SYNC_INTERVAL to catch anything an incremental poll missed. Cursors are
+kept in a JSON file under ~/.adw so a restarted watcher resumes from them.
+
+A cursor never moves past an item that was handed out for processing but
+not claimed yet. An item whose claim failed, or that was fetched just before
+the watcher stopped, is fetched again by the next poll. Polls whose fetch was
+cut short leave the cursor and the full sync time alone.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+# Storage paths
+ADW_DIR = Path.home() / ".adw"
+
+# Seconds between full resyncs, which catch items an incremental poll missed
+FULL_SYNC_INTERVAL = 6 * 3600
+
+
+def load_sync_state(path: Path) -> dict[str, Any]:
+    """Load sync state from storage."""
+    if not path.exists():
+        return {}
+
+    try:
+        with open(path) as f:
+            data: dict[str, Any] = json.load(f)
+            return data
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def save_sync_state(path: Path, state: dict[str, Any]) -> None:
+    """Save sync state to storage."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+@dataclass
+class _Poll:
+    """Change times of the items fetched by a source's latest poll.
+
+    Attributes:
+        seen: Change times of all fetched items.
+        unclaimed: Change times of the items handed out and not claimed yet.
+    """
+
+    seen: list[datetime] = field(default_factory=list)
+    unclaimed: list[datetime] = field(default_factory=list)
+
+
+class SyncState:
+    """Cursors and full sync times of the sources polled by one watcher.
+
+    Each poll calls begin() for the cursor to fetch from, fetched() once
+    the fetch is complete, and claimed() for every item it takes on.
+    """
+
+    def __init__(self, path: Path, section: str, cursor_key: str = "cursor") -> None:
+        """Initialize the sync state.
+
+        Args:
+            path: JSON file the state is kept in.
+            section: Key of the file's per-source state (e.g. "teams").
+            cursor_key: Key of a source's cursor in its state.
+        """
+        self._path = path
+        self._section = section
+        self._cursor_key = cursor_key
+        self._sources: dict[str, dict[str, Any]] | None = None
+        self._polls: dict[str, _Poll] = {}
+        self._full_syncs: dict[str, float] = {}  # source -> start of its pending full sync
+
+    def _source(self, key: str) -> dict[str, Any]:
+        """Get a source's cursor and last full sync time, loading the file once."""
+        if self._sources is None:
+            self._sources = load_sync_state(self._path).get(self._section, {})
+        return self._sources.setdefault(key, {})
+
+    def begin(self, key: str) -> str | None:
+        """Start a poll of a source.
+
+        Args:
+            key: Source to poll.
+
+        Returns:
+            ISO timestamp to fetch changes after, or None for a full sync.
+        """
+        source = self._source(key)
+        self._polls.pop(key, None)
+        now = time.time()
+        if now - source.get("full_sync_at", 0) > FULL_SYNC_INTERVAL:
+            self._full_syncs[key] = now
+            return None
+        self._full_syncs.pop(key, None)
+        cursor: str | None = source.get(self._cursor_key)
+        return cursor
+
+    def fetched(self, key: str, seen: list[datetime | None], unclaimed: list[datetime | None]) -> None:
+        """Record a complete fetch and move the cursor as far as it may go.
+
+        Args:
+            key: Source polled.
+            seen: Change times of all fetched items.
+            unclaimed: Change times of the items handed out for processing.
+        """
+        started = self._full_syncs.pop(key, None)
+        if started is not None:
+            self._source(key)["full_sync_at"] = started
+        self._polls[key] = _Poll(
+            seen=[t for t in seen if t is not None],
+            unclaimed=[t for t in unclaimed if t is not None],
+        )
+        self._advance(key)
+
+    def claimed(self, key: str, changed_at: datetime | None) -> None:
+        """Record that an item handed out by the latest poll was taken on.
+
+        Args:
+            key: Source the item came from.
+            changed_at: The item's change time when it was fetched.
+        """
+        poll = self._polls.get(key)
+        if poll is None or changed_at not in poll.unclaimed:
+            return
+        poll.unclaimed.remove(changed_at)
+        self._advance(key)
+
+    def _advance(self, key: str) -> None:
+        """Move the cursor to the latest change before every unclaimed item, and persist it."""
+        source = self._source(key)
+        poll = self._polls[key]
+        floor = min(poll.unclaimed, default=None)
+        latest = max((t for t in poll.seen if floor is None or t < floor), default=None)
+        previous = source.get(self._cursor_key)
+        if latest is not None and (previous is None or latest > datetime.fromisoformat(previous)):
+            source[self._cursor_key] = latest.isoformat()
+        save_sync_state(self._path, {self._section: self._sources or {}})
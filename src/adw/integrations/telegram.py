@@ -24,16 +24,16 @@ from __future__ import annotations
 import json
 import os
 import time
-import urllib.error
-import urllib.parse
-import urllib.request
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import httpx
 from rich.console import Console
 
+from ..utils import http_client
+
 console = Console()
 
 # Storage paths
@@ -153,7 +153,7 @@ class TelegramConfig:
 
 
 class TelegramClient:
-    """Simple Telegram Bot API client using urllib (no external dependencies).
+    """Telegram Bot API client, sending requests through the shared HTTP client.
 
     Uses the Telegram Bot API: https://core.telegram.org/bots/api
     """
@@ -167,7 +167,6 @@ class TelegramClient:
             bot_token: Telegram bot token from @BotFather.
         """
         self.bot_token = bot_token
-        self._rate_limit_reset: float = 0
         self._last_update_id: int = 0
 
     def _request(
@@ -186,52 +185,39 @@ class TelegramClient:
         Returns:
             Response JSON or None on error.
         """
-        # Rate limit check
-        if time.time() < self._rate_limit_reset:
-            wait_time = self._rate_limit_reset - time.time()
-            console.print(f"[yellow]Rate limited, waiting {wait_time:.1f}s...[/yellow]")
-            time.sleep(wait_time)
-
         url = f"{self.BASE_URL}{self.bot_token}/{method}"
 
-        headers = {
-            "Content-Type": "application/json",
-        }
-
-        body = json.dumps(data).encode("utf-8") if data else None
-
         try:
-            req = urllib.request.Request(url, data=body, headers=headers)
-            with urllib.request.urlopen(req, timeout=timeout) as response:
-                result = json.loads(response.read().decode("utf-8"))
-
-                if not result.get("ok"):
-                    error_code = result.get("error_code", "unknown")
-                    description = result.get("description", "Unknown error")
-                    console.print(f"[red]Telegram API error {error_code}: {description}[/red]")
-                    return None
-
-                return result.get("result")
-
-        except urllib.error.HTTPError as e:
-            if e.code == 429:
-                # Rate limited
-                retry_after = int(e.headers.get("Retry-After", 30))
-                self._rate_limit_reset = time.time() + retry_after
-                console.print(f"[yellow]Rate limited, retry after {retry_after}s[/yellow]")
+            if data:
+                response = http_client.request("POST", url, json=data, timeout=timeout)
             else:
-                console.print(f"[red]HTTP error {e.code}: {e.reason}[/red]")
+                response = http_client.request("GET", url, timeout=timeout)
+        except httpx.TimeoutException:
+            # Timeout is normal for long polling
             return None
-        except urllib.error.URLError as e:
-            console.print(f"[red]URL error: {e.reason}[/red]")
+        except httpx.HTTPError as e:
+            console.print(f"[red]Connection error: {e}[/red]")
             return None
-        except json.JSONDecodeError as e:
+
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After", "30")
+            console.print(f"[yellow]Rate limited, retry after {retry_after}s[/yellow]")
+            return None
+
+        try:
+            result = response.json()
+        except ValueError as e:
             console.print(f"[red]JSON decode error: {e}[/red]")
             return None
-        except TimeoutError:
-            # Timeout is normal for long polling
+
+        if not result.get("ok"):
+            error_code = result.get("error_code", response.status_code)
+            description = result.get("description", "Unknown error")
+            console.print(f"[red]Telegram API error {error_code}: {description}[/red]")
             return None
 
+        return result.get("result")
+
     def get_me(self) -> dict[str, Any] | None:
         """Get bot information.
 
@@ -4,6 +4,7 @@ This module provides:
 - Pattern learning from successful task completions
 - Issue learning from failures and their solutions
 - Expertise section injection into agent prompts
+- Relevance-ranked retrieval of learnings for a task
 - Learning persistence and aggregation
 """
 
@@ -20,6 +21,7 @@ from .patterns import (
     get_default_pattern_store,
     record_task_outcome,
 )
+from .retrieval import rank_learnings, retrieve_learnings, retrieve_ranked_learnings
 
 __all__ = [
     # Patterns
@@ -33,4 +35,8 @@ __all__ = [
     "build_expertise_section",
     "get_combined_expertise",
     "inject_expertise_into_prompt",
+    # Retrieval
+    "rank_learnings",
+    "retrieve_learnings",
+    "retrieve_ranked_learnings",
 ]
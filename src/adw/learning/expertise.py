@@ -14,6 +14,7 @@ from .patterns import (
     LearningType,
     get_default_pattern_store,
 )
+from .retrieval import DEFAULT_EXPERTISE_BUDGET, retrieve_learnings
 
 if TYPE_CHECKING:
     from ..experts.base import Expert
@@ -92,10 +93,16 @@ def get_combined_expertise(
     project: str | None = None,
     files: list[str] | None = None,
     include_global: bool = True,
+    task_description: str | None = None,
+    task_id: str | None = None,
+    token_budget: int = DEFAULT_EXPERTISE_BUDGET,
 ) -> str:
     """Get combined expertise from expert system and learned patterns.
 
-    Merges domain expert knowledge with project-specific learnings.
+    Merges domain expert knowledge with project-specific learnings. When a
+    task description is given, learnings are chosen by relevance to the task
+    and its files (see ``retrieval.retrieve_learnings``) instead of by
+    success count alone.
 
     Args:
         domain: Domain to get expertise for (frontend, backend, ai).
@@ -103,6 +110,9 @@ def get_combined_expertise(
         project: Project name for project-specific learnings.
         files: Files being worked on (for domain detection).
         include_global: Whether to include global learnings.
+        task_description: Task to rank learnings against (optional).
+        task_id: ADW task ID, used to cache the ranking.
+        token_budget: Token budget for relevance-ranked learnings.
 
     Returns:
         Combined expertise section.
@@ -115,6 +125,27 @@ def get_combined_expertise(
         if expert_context:
             sections.append(expert_context)
 
+    if task_description:
+        relevant = retrieve_learnings(
+            task_description,
+            files=files,
+            project=project,
+            domain=domain,
+            token_budget=token_budget,
+            task_id=task_id,
+            include_global=include_global,
+        )
+        relevant_section = build_expertise_section(
+            patterns=[item for item in relevant if item.type == LearningType.PATTERN],
+            issues=[item for item in relevant if item.type == LearningType.ISSUE],
+            best_practices=[item for item in relevant if item.type == LearningType.BEST_PRACTICE],
+            mistakes=[item for item in relevant if item.type == LearningType.MISTAKE],
+            domain=f"{project or 'Project'} Learnings",
+        )
+        if relevant_section:
+            sections.append(relevant_section)
+        return "\n\n".join(sections)
+
     # Get project-specific learnings
     store = get_default_pattern_store(project=project)
 
@@ -160,6 +191,10 @@ def inject_expertise_into_prompt(
     expert: Expert | None = None,
     project: str | None = None,
     position: str = "start",
+    task_description: str | None = None,
+    files: list[str] | None = None,
+    task_id: str | None = None,
+    token_budget: int = DEFAULT_EXPERTISE_BUDGET,
 ) -> str:
     """Inject expertise section into a prompt.
 
@@ -169,6 +204,10 @@ def inject_expertise_into_prompt(
         expert: Optional Expert instance.
         project: Project name.
         position: Where to inject - "start", "end", or "after_task".
+        task_description: Task to rank learnings against (optional).
+        files: Files being worked on.
+        task_id: ADW task ID, used to cache the ranking.
+        token_budget: Token budget for relevance-ranked learnings.
 
     Returns:
         Prompt with expertise section injected.
@@ -177,6 +216,10 @@ def inject_expertise_into_prompt(
         domain=domain,
         expert=expert,
         project=project,
+        files=files,
+        task_description=task_description,
+        task_id=task_id,
+        token_budget=token_budget,
     )
 
     if not expertise:
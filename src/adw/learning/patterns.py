@@ -8,17 +8,32 @@ from __future__ import annotations
 import json
 import logging
 import re
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
+from .similarity import SIGNATURE_VERSION, LSHIndex, best_match, text_band_keys
+
 logger = logging.getLogger(__name__)
 
 # Default path for learning storage
 DEFAULT_LEARNING_DIR = Path.home() / ".adw" / "learning"
 
+# Shared database for all projects, inside the learning directory
+LEARNING_DB_NAME = "learning.db"
+
+# Outcomes are rolled up into per-day aggregates once a project has this many pending
+ROLLUP_INTERVAL = 50
+
+# Raw outcomes older than this are pruned once rolled up
+OUTCOME_RETENTION_DAYS = 90
+
 
 class LearningType(Enum):
     """Types of learnings that can be recorded."""
@@ -152,6 +167,15 @@ class PatternStore:
 
     Manages persistence and retrieval of learned patterns, issues,
     and best practices. Supports project-level and global learnings.
+
+    All projects share one SQLite database (``learning.db`` in the learning
+    directory). Changes are written through as they happen, queries run
+    against indexes on (project, domain, type, success_count), and task
+    outcomes are appended to a table that is periodically rolled up into
+    per-day aggregates. New learnings are checked against a MinHash/LSH
+    index so near-duplicates are merged instead of stored again. A legacy
+    ``patterns.json``/``outcomes.jsonl`` pair is migrated into the database
+    the first time a project is opened.
     """
 
     def __init__(self, learning_dir: Path | None = None, project: str = "global"):
@@ -163,95 +187,624 @@ class PatternStore:
         """
         self._learning_dir = learning_dir or DEFAULT_LEARNING_DIR
         self._project = project
-        self._learnings: list[Learning] = []
-        self._outcomes: list[TaskOutcome] = []
+        self._local = threading.local()
         self._loaded = False
 
+    @property
+    def db_path(self) -> Path:
+        """Path to the shared learning database."""
+        return self._learning_dir / LEARNING_DB_NAME
+
+    @property
+    def project(self) -> str:
+        """Project the store's learnings belong to."""
+        return self._project
+
     @property
     def learnings(self) -> list[Learning]:
         """Get all learnings."""
-        if not self._loaded:
-            self._load()
-        return self._learnings
+        return self._query()
 
     def _get_patterns_path(self) -> Path:
-        """Get path to patterns file."""
+        """Get path to the legacy patterns file."""
         if self._project == "global":
             return self._learning_dir / "global" / "patterns.json"
         return self._learning_dir / self._project / "patterns.json"
 
     def _get_outcomes_path(self) -> Path:
-        """Get path to outcomes file."""
+        """Get path to the legacy outcomes file."""
         if self._project == "global":
             return self._learning_dir / "global" / "outcomes.jsonl"
         return self._learning_dir / self._project / "outcomes.jsonl"
 
+    def _get_connection(self) -> sqlite3.Connection:
+        """Get or create a thread-local database connection."""
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            self._learning_dir.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30.0)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _cursor(self) -> Iterator[sqlite3.Cursor]:
+        """Get a database cursor with automatic commit/rollback."""
+        if not self._loaded:
+            self._load()
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def _init_db(self, cursor: sqlite3.Cursor) -> None:
+        """Initialize database schema."""
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS learnings (
+                id INTEGER PRIMARY KEY,
+                project TEXT NOT NULL,
+                type TEXT NOT NULL,
+                content TEXT NOT NULL,
+                content_key TEXT NOT NULL,
+                context TEXT DEFAULT '',
+                domain TEXT DEFAULT 'general',
+                success_count INTEGER DEFAULT 1,
+                created_at TEXT NOT NULL,
+                last_used TEXT,
+                source_task_id TEXT,
+                UNIQUE (project, type, content_key)
+            )
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outcomes (
+                id INTEGER PRIMARY KEY,
+                project TEXT NOT NULL,
+                task_id TEXT NOT NULL,
+                success INTEGER NOT NULL,
+                retry_count INTEGER DEFAULT 0,
+                test_passed_first_try INTEGER DEFAULT 0,
+                duration_seconds REAL DEFAULT 0,
+                timestamp TEXT NOT NULL,
+                data TEXT NOT NULL
+            )
+            """
+        )
+
+        # Per-day outcome aggregates, maintained by rollup_outcomes()
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS outcome_rollup (
+                project TEXT NOT NULL,
+                date TEXT NOT NULL,
+                outcomes INTEGER DEFAULT 0,
+                successes INTEGER DEFAULT 0,
+                first_try_passes INTEGER DEFAULT 0,
+                total_retries INTEGER DEFAULT 0,
+                total_duration_seconds REAL DEFAULT 0,
+                PRIMARY KEY (project, date)
+            )
+            """
+        )
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+            """
+        )
+
+        # Indexes for common queries
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_learnings_domain
+            ON learnings(project, domain, type, success_count DESC)
+            """
+        )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_learnings_type
+            ON learnings(project, type, success_count DESC)
+            """
+        )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_outcomes_project
+            ON outcomes(project, id)
+            """
+        )
+
+        # LSH buckets for near-duplicate lookup (see similarity.py)
+        cursor.execute(
+            """
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                project TEXT NOT NULL,
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                learning_id INTEGER NOT NULL,
+                PRIMARY KEY (project, band, bucket, learning_id)
+            ) WITHOUT ROWID
+            """
+        )
+        cursor.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_lsh_buckets_learning
+            ON lsh_buckets(learning_id)
+            """
+        )
+
     def _load(self) -> None:
-        """Load learnings from storage."""
-        patterns_path = self._get_patterns_path()
+        """Open the database and migrate legacy JSON storage for this project."""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            self._init_db(cursor)
+            key = f"migrated:{self._project}"
+            if cursor.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone() is None:
+                self._migrate_legacy(cursor)
+                cursor.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (key, datetime.now().isoformat()))
+
+            # Buckets from an older shingling no longer match new lookups
+            version = cursor.execute("SELECT value FROM meta WHERE key = 'lsh_version'").fetchone()
+            if version is None or version["value"] != str(SIGNATURE_VERSION):
+                cursor.execute("DELETE FROM lsh_buckets")
+                cursor.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('lsh_version', ?)", (str(SIGNATURE_VERSION),)
+                )
+            self._index_unbucketed(cursor)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+        self._loaded = True
 
+    def _migrate_legacy(self, cursor: sqlite3.Cursor) -> None:
+        """Import patterns.json and outcomes.jsonl written by older versions."""
+        patterns_path = self._get_patterns_path()
         if patterns_path.exists():
             try:
                 data = json.loads(patterns_path.read_text())
-                self._learnings = [Learning.from_dict(d) for d in data.get("learnings", [])]
-            except (json.JSONDecodeError, KeyError) as e:
-                logger.warning("Failed to load patterns: %s", e)
-                self._learnings = []
-        else:
-            self._learnings = []
+                for learning_data in data.get("learnings", []):
+                    self._upsert(cursor, Learning.from_dict(learning_data))
+                logger.info("Migrated %s into %s", patterns_path, self.db_path)
+            except (json.JSONDecodeError, KeyError, ValueError) as e:
+                logger.warning("Failed to migrate patterns: %s", e)
 
-        self._loaded = True
+        outcomes_path = self._get_outcomes_path()
+        if outcomes_path.exists():
+            try:
+                lines = outcomes_path.read_text().splitlines()
+            except OSError as e:
+                logger.warning("Failed to migrate outcomes: %s", e)
+                return
+            for line in lines:
+                try:
+                    self._insert_outcome(cursor, json.loads(line))
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    continue
+
+    def _row_to_learning(self, row: sqlite3.Row) -> Learning:
+        """Convert a database row to a Learning."""
+        return Learning(
+            type=LearningType(row["type"]),
+            content=row["content"],
+            context=row["context"] or "",
+            project=row["project"],
+            domain=row["domain"] or "general",
+            success_count=row["success_count"],
+            created_at=datetime.fromisoformat(row["created_at"]),
+            last_used=datetime.fromisoformat(row["last_used"]) if row["last_used"] else None,
+            source_task_id=row["source_task_id"],
+        )
+
+    def _query(
+        self,
+        learning_type: LearningType | None = None,
+        domain: str | None = None,
+        by_success: bool = False,
+        limit: int | None = None,
+    ) -> list[Learning]:
+        """Query this project's learnings.
+
+        Args:
+            learning_type: Only this type (optional).
+            domain: Only this domain plus "general" (optional).
+            by_success: Order by success count instead of insertion order.
+            limit: Maximum rows to return (optional).
+
+        Returns:
+            Matching learnings.
+        """
+        sql = "SELECT * FROM learnings WHERE project = ?"
+        params: list[Any] = [self._project]
+        if domain:
+            sql += " AND domain IN (?, 'general')"
+            params.append(domain)
+        if learning_type is not None:
+            sql += " AND type = ?"
+            params.append(learning_type.value)
+        sql += " ORDER BY success_count DESC, id" if by_success else " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._cursor() as cursor:
+            rows = cursor.execute(sql, params).fetchall()
+        return [self._row_to_learning(row) for row in rows]
+
+    def _index_unbucketed(self, cursor: sqlite3.Cursor) -> None:
+        """Add LSH buckets for any learnings stored without them."""
+        rows = cursor.execute(
+            """
+            SELECT id, content FROM learnings
+            WHERE project = ? AND id NOT IN (SELECT learning_id FROM lsh_buckets WHERE project = ?)
+            """,
+            (self._project, self._project),
+        ).fetchall()
+        for row in rows:
+            self._insert_buckets(cursor, row["id"], text_band_keys(row["content"]))
+
+    def _insert_buckets(self, cursor: sqlite3.Cursor, learning_id: int, keys: list[tuple[int, int]]) -> None:
+        """Record a learning's LSH buckets."""
+        cursor.executemany(
+            "INSERT OR IGNORE INTO lsh_buckets (project, band, bucket, learning_id) VALUES (?, ?, ?, ?)",
+            [(self._project, band, bucket, learning_id) for band, bucket in keys],
+        )
+
+    def _find_similar(
+        self,
+        cursor: sqlite3.Cursor,
+        learning: Learning,
+        keys: list[tuple[int, int]],
+    ) -> int | None:
+        """Find a stored learning of the same type that nearly matches.
+
+        Args:
+            cursor: Open cursor.
+            learning: Candidate learning.
+            keys: Its LSH bucket keys.
+
+        Returns:
+            ID of the most similar stored learning, or None.
+        """
+        values = ", ".join("(?, ?)" for _ in keys)
+        rows = cursor.execute(
+            f"""
+            WITH q(band, bucket) AS (VALUES {values})
+            SELECT DISTINCT l.id, l.content FROM q
+            JOIN lsh_buckets b ON b.project = ? AND b.band = q.band AND b.bucket = q.bucket
+            JOIN learnings l ON l.id = b.learning_id
+            WHERE l.type = ?
+            """,
+            [*(v for key in keys for v in key), self._project, learning.type.value],
+        ).fetchall()
+        return best_match(learning.content, [(row["id"], row["content"]) for row in rows])
+
+    def _find_stored(
+        self,
+        cursor: sqlite3.Cursor,
+        learning: Learning,
+        keys: list[tuple[int, int]],
+    ) -> int | None:
+        """Find the stored learning a learning is, or was merged into.
+
+        Args:
+            cursor: Open cursor.
+            learning: Learning to look up.
+            keys: Its LSH bucket keys.
+
+        Returns:
+            ID of the identical or most similar stored learning, or None.
+        """
+        row = cursor.execute(
+            "SELECT id FROM learnings WHERE project = ? AND type = ? AND content_key = ?",
+            (self._project, learning.type.value, learning.content.lower()),
+        ).fetchone()
+        return row["id"] if row else self._find_similar(cursor, learning, keys)
+
+    def _upsert(self, cursor: sqlite3.Cursor, learning: Learning) -> None:
+        """Insert a learning, or merge it into an identical or near-identical one."""
+        keys = text_band_keys(learning.content)
+        existing_id = self._find_stored(cursor, learning, keys)
+
+        if existing_id is not None:
+            cursor.execute(
+                "UPDATE learnings SET success_count = success_count + ?, last_used = ? WHERE id = ?",
+                (learning.success_count, datetime.now().isoformat(), existing_id),
+            )
+            return
+
+        cursor.execute(
+            """
+            INSERT INTO learnings (
+                project, type, content, content_key, context, domain,
+                success_count, created_at, last_used, source_task_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                self._project,
+                learning.type.value,
+                learning.content,
+                learning.content.lower(),
+                learning.context,
+                learning.domain,
+                learning.success_count,
+                learning.created_at.isoformat(),
+                learning.last_used.isoformat() if learning.last_used else None,
+                learning.source_task_id,
+            ),
+        )
+        self._insert_buckets(cursor, cursor.lastrowid or 0, keys)
+
+    def _insert_outcome(self, cursor: sqlite3.Cursor, data: dict[str, Any]) -> None:
+        """Append a serialized outcome."""
+        cursor.execute(
+            """
+            INSERT INTO outcomes (
+                project, task_id, success, retry_count,
+                test_passed_first_try, duration_seconds, timestamp, data
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                self._project,
+                data["task_id"],
+                int(bool(data.get("success"))),
+                data.get("retry_count", 0),
+                int(bool(data.get("test_passed_first_try"))),
+                data.get("duration_seconds", 0.0),
+                data.get("timestamp") or datetime.now().isoformat(),
+                json.dumps(data),
+            ),
+        )
 
     def save(self) -> None:
-        """Persist learnings to storage."""
-        patterns_path = self._get_patterns_path()
-        patterns_path.parent.mkdir(parents=True, exist_ok=True)
+        """Persist learnings to storage.
 
-        data = {
-            "learnings": [item.to_dict() for item in self._learnings],
-            "updated_at": datetime.now().isoformat(),
-            "project": self._project,
-        }
+        Changes are written through as they are made, so this only makes
+        sure the database exists. Kept for API compatibility.
+        """
+        if not self._loaded:
+            self._load()
 
-        patterns_path.write_text(json.dumps(data, indent=2))
-        logger.debug("Saved %d learnings to %s", len(self._learnings), patterns_path)
+    def close(self) -> None:
+        """Close this thread's database connection."""
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+            self._loaded = False
 
     def add_learning(self, learning: Learning) -> None:
         """Add a new learning.
 
-        Deduplicates based on content similarity.
+        A learning whose content matches or nearly matches a stored learning
+        of the same type is merged into it, summing their success counts.
         """
-        if not self._loaded:
-            self._load()
+        with self._cursor() as cursor:
+            self._upsert(cursor, learning)
+
+    def mark_used(self, learning: Learning, success: bool = True) -> None:
+        """Mark a stored learning as used.
 
-        # Check for duplicate
-        for existing in self._learnings:
-            if existing.type == learning.type and existing.content.lower() == learning.content.lower():
-                # Update existing instead of adding duplicate
-                existing.success_count += 1
-                existing.last_used = datetime.now()
+        A learning that was merged into a near-duplicate updates the
+        learning it was merged into.
+
+        Args:
+            learning: The learning that was applied.
+            success: Whether applying it led to success.
+        """
+        learning.mark_used(success)
+        with self._cursor() as cursor:
+            learning_id = self._find_stored(cursor, learning, text_band_keys(learning.content))
+            if learning_id is None:
                 return
+            cursor.execute(
+                "UPDATE learnings SET last_used = ?, success_count = success_count + ? WHERE id = ?",
+                (
+                    learning.last_used.isoformat() if learning.last_used else None,
+                    1 if success else 0,
+                    learning_id,
+                ),
+            )
+
+    def clear(self, domain: str | None = None) -> int:
+        """Delete this project's learnings.
+
+        Args:
+            domain: Only delete learnings for this domain (optional).
+
+        Returns:
+            Number of learnings deleted.
+        """
+        with self._cursor() as cursor:
+            if domain:
+                cursor.execute("DELETE FROM learnings WHERE project = ? AND domain = ?", (self._project, domain))
+            else:
+                cursor.execute("DELETE FROM learnings WHERE project = ?", (self._project,))
+            deleted: int = cursor.rowcount
+            cursor.execute(
+                "DELETE FROM lsh_buckets WHERE project = ? AND learning_id NOT IN (SELECT id FROM learnings)",
+                (self._project,),
+            )
+        return deleted
+
+    def dedupe(self, dry_run: bool = False) -> int:
+        """Merge near-duplicate learnings already in the store.
+
+        Learnings are visited from most to least successful; each one that
+        nearly matches an earlier learning of the same type is folded into it
+        and its success count added.
+
+        Args:
+            dry_run: Only count the duplicates, without changing anything.
+
+        Returns:
+            Number of learnings merged away.
+        """
+        with self._cursor() as cursor:
+            rows = cursor.execute(
+                "SELECT id, type, content, success_count FROM learnings WHERE project = ? "
+                "ORDER BY success_count DESC, id",
+                (self._project,),
+            ).fetchall()
+
+            indexes: dict[str, LSHIndex] = {}
+            added: dict[int, int] = {}
+            removed: list[int] = []
+            for row in rows:
+                index = indexes.setdefault(row["type"], LSHIndex())
+                match = index.find_or_add(row["id"], row["content"])
+                if match is None:
+                    continue
+                added[match] = added.get(match, 0) + row["success_count"]
+                removed.append(row["id"])
+
+            if removed and not dry_run:
+                cursor.executemany(
+                    "UPDATE learnings SET success_count = success_count + ? WHERE id = ?",
+                    [(count, learning_id) for learning_id, count in added.items()],
+                )
+                cursor.executemany("DELETE FROM learnings WHERE id = ?", [(i,) for i in removed])
+                cursor.executemany("DELETE FROM lsh_buckets WHERE learning_id = ?", [(i,) for i in removed])
 
-        self._learnings.append(learning)
+        if removed:
+            logger.info("Merged %d near-duplicate learnings in %s", len(removed), self._project)
+        return len(removed)
 
     def record_outcome(self, outcome: TaskOutcome) -> None:
-        """Record a task outcome for analysis."""
-        outcomes_path = self._get_outcomes_path()
-        outcomes_path.parent.mkdir(parents=True, exist_ok=True)
+        """Record a task outcome for analysis.
+
+        Outcomes are appended to the database; once ROLLUP_INTERVAL of this
+        project's outcomes are pending they are folded into the per-day rollup.
+        """
+        with self._cursor() as cursor:
+            self._insert_outcome(cursor, outcome.to_dict())
+            row = cursor.execute("SELECT value FROM meta WHERE key = ?", (f"rollup:{self._project}",)).fetchone()
+            pending = cursor.execute(
+                "SELECT COUNT(*) FROM outcomes WHERE project = ? AND id > ?",
+                (self._project, int(row["value"]) if row else 0),
+            ).fetchone()[0]
+
+        if pending >= ROLLUP_INTERVAL:
+            self.rollup_outcomes()
 
-        # Append to JSONL file
-        with outcomes_path.open("a") as f:
-            f.write(json.dumps(outcome.to_dict()) + "\n")
+    def rollup_outcomes(self, retention_days: int = OUTCOME_RETENTION_DAYS) -> int:
+        """Fold new outcomes into per-day aggregates and prune old raw rows.
 
-        self._outcomes.append(outcome)
+        Args:
+            retention_days: Raw outcomes older than this are deleted once rolled up.
+
+        Returns:
+            Number of outcomes rolled up.
+        """
+        key = f"rollup:{self._project}"
+        with self._cursor() as cursor:
+            row = cursor.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+            last_id = int(row["value"]) if row else 0
+
+            max_row = cursor.execute(
+                "SELECT MAX(id) AS max_id, COUNT(*) AS n FROM outcomes WHERE project = ? AND id > ?",
+                (self._project, last_id),
+            ).fetchone()
+            if not max_row["n"]:
+                return 0
+
+            cursor.execute(
+                """
+                INSERT INTO outcome_rollup (
+                    project, date, outcomes, successes, first_try_passes,
+                    total_retries, total_duration_seconds
+                )
+                SELECT project, substr(timestamp, 1, 10), COUNT(*), SUM(success),
+                       SUM(test_passed_first_try), SUM(retry_count), SUM(duration_seconds)
+                FROM outcomes
+                WHERE project = ? AND id > ? AND id <= ?
+                GROUP BY project, substr(timestamp, 1, 10)
+                ON CONFLICT (project, date) DO UPDATE SET
+                    outcomes = outcomes + excluded.outcomes,
+                    successes = successes + excluded.successes,
+                    first_try_passes = first_try_passes + excluded.first_try_passes,
+                    total_retries = total_retries + excluded.total_retries,
+                    total_duration_seconds = total_duration_seconds + excluded.total_duration_seconds
+                """,
+                (self._project, last_id, max_row["max_id"]),
+            )
+            cursor.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (key, str(max_row["max_id"])),
+            )
+
+            cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
+            cursor.execute(
+                "DELETE FROM outcomes WHERE project = ? AND id <= ? AND timestamp < ?",
+                (self._project, max_row["max_id"], cutoff),
+            )
+
+        rolled: int = max_row["n"]
+        logger.debug("Rolled up %d outcomes for %s", rolled, self._project)
+        return rolled
+
+    def get_outcome_statistics(self) -> dict[str, Any]:
+        """Get aggregate statistics over all recorded outcomes."""
+        self.rollup_outcomes()
+        with self._cursor() as cursor:
+            row = cursor.execute(
+                """
+                SELECT COALESCE(SUM(outcomes), 0) AS outcomes,
+                       COALESCE(SUM(successes), 0) AS successes,
+                       COALESCE(SUM(first_try_passes), 0) AS first_try_passes,
+                       COALESCE(SUM(total_retries), 0) AS total_retries,
+                       COALESCE(SUM(total_duration_seconds), 0) AS total_duration_seconds
+                FROM outcome_rollup WHERE project = ?
+                """,
+                (self._project,),
+            ).fetchone()
+
+        total = row["outcomes"]
+        return {
+            "total_outcomes": total,
+            "successes": row["successes"],
+            "success_rate": row["successes"] / total if total else 0.0,
+            "first_try_passes": row["first_try_passes"],
+            "avg_retries": row["total_retries"] / total if total else 0.0,
+            "avg_duration_seconds": row["total_duration_seconds"] / total if total else 0.0,
+        }
+
+    def revision(self) -> tuple[int, int, int]:
+        """Get a cheap fingerprint of this project's learnings.
+
+        Changes whenever a learning is added, merged, used or deleted, so
+        callers can cache results derived from the store.
+        """
+        with self._cursor() as cursor:
+            row = cursor.execute(
+                """
+                SELECT COUNT(*) AS n, COALESCE(MAX(id), 0) AS max_id,
+                       COALESCE(SUM(success_count), 0) AS successes
+                FROM learnings WHERE project = ?
+                """,
+                (self._project,),
+            ).fetchone()
+        return (row["n"], row["max_id"], row["successes"])
 
     def get_learnings_by_type(self, learning_type: LearningType) -> list[Learning]:
         """Get learnings of a specific type."""
-        return [item for item in self.learnings if item.type == learning_type]
+        return self._query(learning_type=learning_type)
 
     def get_learnings_by_domain(self, domain: str) -> list[Learning]:
         """Get learnings for a specific domain."""
-        return [item for item in self.learnings if item.domain == domain or item.domain == "general"]
+        return self._query(domain=domain)
 
     def get_top_patterns(self, limit: int = 10, domain: str | None = None) -> list[Learning]:
         """Get the most successful patterns.
@@ -263,12 +816,7 @@ class PatternStore:
         Returns:
             List of learnings sorted by success count.
         """
-        learnings = self.learnings
-        if domain:
-            learnings = self.get_learnings_by_domain(domain)
-
-        patterns = [item for item in learnings if item.type == LearningType.PATTERN]
-        return sorted(patterns, key=lambda x: x.success_count, reverse=True)[:limit]
+        return self._query(learning_type=LearningType.PATTERN, domain=domain, by_success=True, limit=limit)
 
     def get_known_issues(self, domain: str | None = None) -> list[Learning]:
         """Get known issues and their workarounds.
@@ -279,11 +827,7 @@ class PatternStore:
         Returns:
             List of issue learnings.
         """
-        learnings = self.learnings
-        if domain:
-            learnings = self.get_learnings_by_domain(domain)
-
-        return [item for item in learnings if item.type == LearningType.ISSUE]
+        return self._query(learning_type=LearningType.ISSUE, domain=domain)
 
     def get_mistakes_to_avoid(self, domain: str | None = None) -> list[Learning]:
         """Get common mistakes to avoid.
@@ -294,23 +838,33 @@ class PatternStore:
         Returns:
             List of mistake learnings.
         """
-        learnings = self.learnings
-        if domain:
-            learnings = self.get_learnings_by_domain(domain)
-
-        return [item for item in learnings if item.type == LearningType.MISTAKE]
+        return self._query(learning_type=LearningType.MISTAKE, domain=domain)
 
     def get_statistics(self) -> dict[str, Any]:
         """Get statistics about learnings."""
-        learnings = self.learnings
+        with self._cursor() as cursor:
+            by_type = {
+                row["type"]: row["n"]
+                for row in cursor.execute(
+                    "SELECT type, COUNT(*) AS n FROM learnings WHERE project = ? GROUP BY type",
+                    (self._project,),
+                )
+            }
+            domains = [
+                row["domain"]
+                for row in cursor.execute(
+                    "SELECT DISTINCT domain FROM learnings WHERE project = ?",
+                    (self._project,),
+                )
+            ]
 
         return {
-            "total_learnings": len(learnings),
-            "patterns": len(self.get_learnings_by_type(LearningType.PATTERN)),
-            "issues": len(self.get_learnings_by_type(LearningType.ISSUE)),
-            "best_practices": len(self.get_learnings_by_type(LearningType.BEST_PRACTICE)),
-            "mistakes": len(self.get_learnings_by_type(LearningType.MISTAKE)),
-            "domains": list(set(item.domain for item in learnings)),
+            "total_learnings": sum(by_type.values()),
+            "patterns": by_type.get(LearningType.PATTERN.value, 0),
+            "issues": by_type.get(LearningType.ISSUE.value, 0),
+            "best_practices": by_type.get(LearningType.BEST_PRACTICE.value, 0),
+            "mistakes": by_type.get(LearningType.MISTAKE.value, 0),
+            "domains": domains,
         }
 
     def export(self) -> dict[str, Any]:
@@ -332,12 +886,11 @@ class PatternStore:
             Number of learnings imported.
         """
         imported = 0
-        for learning_data in data.get("learnings", []):
-            learning = Learning.from_dict(learning_data)
-            self.add_learning(learning)
-            imported += 1
+        with self._cursor() as cursor:
+            for learning_data in data.get("learnings", []):
+                self._upsert(cursor, Learning.from_dict(learning_data))
+                imported += 1
 
-        self.save()
         return imported
 
 
@@ -522,7 +1075,7 @@ def get_default_pattern_store(project: str | None = None) -> PatternStore:
 
     project = project or "global"
 
-    if _default_store is None or _default_store._project != project:
+    if _default_store is None or _default_store.project != project:
         _default_store = PatternStore(project=project)
 
     return _default_store
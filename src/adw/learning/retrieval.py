@@ -0,0 +1,248 @@
+"""Relevance-ranked retrieval of learnings for a task.
+
+Instead of injecting the most-used learnings for a domain regardless of the
+task at hand, learnings are ranked with BM25 against the task description and
+the files being touched, nudged by how often they have led to success, and
+cut off at a token budget. Rankings are cached per task so every phase of the
+same task reuses them until the store changes.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+
+from ..context.bundle_index import tokenize
+from ..context.packing import estimate_tokens
+from .patterns import Learning, LearningType, get_default_pattern_store
+
+logger = logging.getLogger(__name__)
+
+# Default token budget for retrieved learnings
+DEFAULT_EXPERTISE_BUDGET = 800
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Query term weight for words taken from file paths
+FILE_TERM_WEIGHT = 0.5
+
+# How strongly success_count breaks ties between equally relevant learnings
+SUCCESS_WEIGHT = 0.1
+
+# Words too common in task descriptions to say anything about relevance
+STOPWORDS = frozenset(
+    "a an and are as at be by do for from has have in into is it of on or so that the this to up use "
+    "with add make new fix update implement should when we our you your".split()
+)
+
+# Maximum number of cached task rankings
+MAX_CACHED_TASKS = 128
+
+_cache: OrderedDict[tuple, list[RankedLearning]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+@dataclass
+class RankedLearning:
+    """A learning with its relevance score for a task.
+
+    Attributes:
+        learning: The learning.
+        score: Relevance score (higher is better).
+    """
+
+    learning: Learning
+    score: float
+
+
+def _terms(text: str) -> list[str]:
+    return [t for t in tokenize(text) if t not in STOPWORDS]
+
+
+def query_terms(task_description: str, files: list[str] | None = None) -> Counter[str]:
+    """Build weighted query terms from a task and its files.
+
+    Args:
+        task_description: What the task is about.
+        files: Files being worked on.
+
+    Returns:
+        Term weights.
+    """
+    weights: Counter[str] = Counter()
+    for term in set(_terms(task_description)):
+        weights[term] += 1.0
+    for path in files or []:
+        for term in set(_terms(path)):
+            weights[term] += FILE_TERM_WEIGHT
+    return weights
+
+
+def rank_learnings(
+    learnings: list[Learning],
+    task_description: str,
+    files: list[str] | None = None,
+) -> list[RankedLearning]:
+    """Rank learnings by BM25 relevance to a task.
+
+    Learnings sharing no terms with the task are left out. If the task has
+    no usable terms, learnings are ranked by success count alone.
+
+    Args:
+        learnings: Learnings to rank.
+        task_description: What the task is about.
+        files: Files being worked on.
+
+    Returns:
+        Ranked learnings, most relevant first.
+    """
+    query = query_terms(task_description, files)
+    if not query:
+        ordered = sorted(learnings, key=lambda item: item.success_count, reverse=True)
+        return [RankedLearning(item, math.log1p(item.success_count)) for item in ordered]
+
+    docs = [Counter(_terms(f"{item.content} {item.context}")) for item in learnings]
+    if not docs:
+        return []
+    avg_len = sum(sum(doc.values()) for doc in docs) / len(docs) or 1.0
+    df = Counter(term for doc in docs for term in doc if term in query)
+
+    ranked = []
+    for item, doc in zip(learnings, docs, strict=True):
+        length = sum(doc.values())
+        score = 0.0
+        for term, weight in query.items():
+            tf = doc.get(term)
+            if not tf:
+                continue
+            idf = math.log(1 + (len(docs) - df[term] + 0.5) / (df[term] + 0.5))
+            score += weight * idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_len))
+        if score > 0:
+            score *= 1 + SUCCESS_WEIGHT * math.log1p(item.success_count)
+            ranked.append(RankedLearning(item, score))
+
+    ranked.sort(key=lambda r: r.score, reverse=True)
+    return ranked
+
+
+def render_learning(learning: Learning) -> str:
+    """Render a learning as a prompt line, the way build_expertise_section does."""
+    if learning.type == LearningType.ISSUE:
+        workaround = f": {learning.context}" if learning.context else ""
+        return f"- **{learning.content}**{workaround}"
+    if learning.type == LearningType.MISTAKE:
+        return f"- ❌ {learning.content}"
+    return f"- {learning.content}"
+
+
+def retrieve_ranked_learnings(
+    task_description: str,
+    files: list[str] | None = None,
+    project: str | None = None,
+    domain: str | None = None,
+    token_budget: int = DEFAULT_EXPERTISE_BUDGET,
+    task_id: str | None = None,
+    include_global: bool = True,
+) -> list[RankedLearning]:
+    """Get the learnings most relevant to a task with their scores, within a token budget.
+
+    Args:
+        task_description: What the task is about.
+        files: Files being worked on.
+        project: Project name (current git repo name if None).
+        domain: Domain filter (frontend, backend, ai).
+        token_budget: Maximum estimated tokens of rendered learnings.
+        task_id: ADW task ID. Rankings are cached per task.
+        include_global: Whether global patterns compete for the budget too.
+
+    Returns:
+        Selected learnings, most relevant first.
+    """
+    store = get_default_pattern_store(project=project)
+    stores = [store]
+    if include_global and store.project != "global":
+        stores.append(get_default_pattern_store(project="global"))
+
+    key = (
+        task_id,
+        task_description,
+        tuple(files or ()),
+        store.project,
+        domain,
+        token_budget,
+        tuple(s.revision() for s in stores),
+    )
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return list(_cache[key])
+
+    learnings = store.get_learnings_by_domain(domain) if domain else store.learnings
+    for global_store in stores[1:]:
+        # Global learnings contribute their patterns, as in get_combined_expertise
+        global_learnings = global_store.get_learnings_by_domain(domain) if domain else global_store.learnings
+        learnings += [item for item in global_learnings if item.type == LearningType.PATTERN]
+
+    selected: list[RankedLearning] = []
+    seen: set[tuple[LearningType, str]] = set()
+    used = 0
+    for ranked in rank_learnings(learnings, task_description, files):
+        item = ranked.learning
+        dedupe_key = (item.type, item.content.lower())
+        if dedupe_key in seen:
+            continue
+        cost = estimate_tokens(render_learning(item))
+        if used + cost > token_budget:
+            continue
+        seen.add(dedupe_key)
+        selected.append(ranked)
+        used += cost
+
+    logger.debug("Retrieved %d learnings (%d tokens) for task", len(selected), used)
+
+    with _cache_lock:
+        _cache[key] = selected
+        while len(_cache) > MAX_CACHED_TASKS:
+            _cache.popitem(last=False)
+
+    return list(selected)
+
+
+def retrieve_learnings(
+    task_description: str,
+    files: list[str] | None = None,
+    project: str | None = None,
+    domain: str | None = None,
+    token_budget: int = DEFAULT_EXPERTISE_BUDGET,
+    task_id: str | None = None,
+    include_global: bool = True,
+) -> list[Learning]:
+    """Get the learnings most relevant to a task, within a token budget.
+
+    Same as retrieve_ranked_learnings (which documents the arguments),
+    without the scores.
+
+    Returns:
+        Selected learnings, most relevant first.
+    """
+    ranked = retrieve_ranked_learnings(
+        task_description,
+        files=files,
+        project=project,
+        domain=domain,
+        token_budget=token_budget,
+        task_id=task_id,
+        include_global=include_global,
+    )
+    return [item.learning for item in ranked]
+
+
+def clear_retrieval_cache() -> None:
+    """Drop all cached task rankings."""
+    with _cache_lock:
+        _cache.clear()
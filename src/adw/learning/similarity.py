@@ -0,0 +1,255 @@
+"""Near-duplicate detection for learnings.
+
+Learnings are compared as sets of word shingles: their words and adjacent
+word pairs. MinHash signatures approximate the Jaccard similarity of those
+sets, and locality-sensitive hashing (LSH) over signature bands finds likely
+near-duplicates without comparing against every stored learning. Candidates
+are then confirmed with an exact Jaccard check.
+
+Lexical similarity cannot tell "Always validate input" from "Never validate
+input", so texts must also share their key tokens to be duplicates: numbers
+(ports, versions, limits), file paths and identifiers (Button.tsx, get_user,
+useState), and words that flip the meaning (never, not, avoid).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import struct
+from collections import defaultdict
+from collections.abc import Iterable
+from functools import lru_cache
+
+# Words per shingle: single words and adjacent pairs
+SHINGLE_SIZE = 2
+
+# Words dropped before shingling, so "the database" matches "database"
+STOPWORDS = frozenset({"a", "an", "the"})
+
+# Words that flip a learning's meaning. Contractions normalize to a
+# separate "t" ("don't" -> "don t"), which stands for their "not".
+POLARITY_WORDS = frozenset({"always", "never", "not", "no", "avoid", "t"})
+
+# Bumped when shingling changes, so stored LSH buckets are rebuilt
+SIGNATURE_VERSION = 2
+
+# MinHash permutations, split into BANDS bands of NUM_PERM // BANDS rows.
+# Sixteen bands of three rows find pairs at the similarity threshold with
+# better than 99% probability while keeping unrelated candidates rare.
+NUM_PERM = 48
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+
+# Learnings at least this similar are treated as the same learning
+SIMILARITY_THRESHOLD = 0.8
+
+_MAX_HASH = (1 << 32) - 1
+
+# One SHAKE-128 digest per shingle supplies all NUM_PERM 32-bit hash values,
+# so the per-shingle work stays in C
+_HASH_VALUES = struct.Struct(f"<{NUM_PERM}I")
+
+
+@lru_cache(maxsize=65536)
+def _shingle_hashes(shingle: str) -> tuple[int, ...]:
+    """Hash values of one shingle (shingles repeat heavily across learnings)."""
+    return _HASH_VALUES.unpack(hashlib.shake_128(shingle.encode()).digest(_HASH_VALUES.size))
+
+
+def normalize(text: str) -> str:
+    """Lowercase text and collapse punctuation and whitespace to single spaces."""
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def shingles(text: str) -> set[str]:
+    """Get the word shingles of a text.
+
+    Args:
+        text: Learning content.
+
+    Returns:
+        Set of the normalized text's words and runs of up to SHINGLE_SIZE
+        adjacent words, ignoring STOPWORDS.
+    """
+    words = [word for word in normalize(text).split() if word not in STOPWORDS]
+    return {" ".join(words[i : i + size]) for size in range(1, SHINGLE_SIZE + 1) for i in range(len(words) - size + 1)}
+
+
+def key_tokens(text: str) -> frozenset[str]:
+    """Get the tokens a near-duplicate of a text must share.
+
+    Args:
+        text: Learning content.
+
+    Returns:
+        Numbers, file paths and identifiers (tokens with a digit, one of
+        "./_\\", or an inner capital), and POLARITY_WORDS.
+    """
+    keys = set()
+    for token in re.findall(r"[\w./\\]+", text):
+        token = token.strip("./\\")
+        if re.search(r"[\d./_\\]", token) or re.search(r".[A-Z]", token):
+            keys.add(token)
+    keys.update(word for word in normalize(text).split() if word in POLARITY_WORDS)
+    return frozenset(keys)
+
+
+def jaccard(a: set[str], b: set[str]) -> float:
+    """Exact Jaccard similarity of two shingle sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def minhash(shingle_set: set[str]) -> list[int]:
+    """Compute the MinHash signature of a shingle set.
+
+    Args:
+        shingle_set: Shingles from shingles().
+
+    Returns:
+        NUM_PERM minimum hash values.
+    """
+    if not shingle_set:
+        return [_MAX_HASH] * NUM_PERM
+    return list(map(min, zip(*map(_shingle_hashes, shingle_set))))
+
+
+def band_keys(signature: list[int]) -> list[tuple[int, int]]:
+    """Hash each signature band to an LSH bucket.
+
+    Args:
+        signature: MinHash signature from minhash().
+
+    Returns:
+        (band, bucket) pairs, one per band. Buckets are signed 64-bit ints
+        so they can be stored directly in SQLite.
+    """
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(b"".join(r.to_bytes(4, "little") for r in rows), digest_size=8).digest()
+        keys.append((band, int.from_bytes(digest, "little", signed=True)))
+    return keys
+
+
+def best_match(
+    text: str,
+    candidates: Iterable[tuple[int, str]],
+    threshold: float = SIMILARITY_THRESHOLD,
+) -> int | None:
+    """Pick the candidate most similar to a text.
+
+    Args:
+        text: Text to match.
+        candidates: (key, text) pairs, e.g. from an LSH bucket lookup.
+        threshold: Minimum Jaccard similarity for a match.
+
+    Returns:
+        Key of the best candidate at or above the threshold (lowest key on
+        ties), or None.
+    """
+    shingle_set = shingles(text)
+    text_keys = key_tokens(text)
+    best_key, best_score = None, threshold
+    for key, candidate in sorted(candidates):
+        if key_tokens(candidate) != text_keys:
+            continue
+        score = jaccard(shingle_set, shingles(candidate))
+        if score >= best_score and (best_key is None or score > best_score):
+            best_key, best_score = key, score
+    return best_key
+
+
+def text_band_keys(text: str) -> list[tuple[int, int]]:
+    """Get the LSH bucket keys for a piece of text."""
+    return band_keys(minhash(shingles(text)))
+
+
+class LSHIndex:
+    """In-memory LSH index for batch near-duplicate detection.
+
+    Attributes:
+        threshold: Minimum Jaccard similarity for a match.
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD):
+        """Initialize an empty index.
+
+        Args:
+            threshold: Minimum Jaccard similarity for a match.
+        """
+        self.threshold = threshold
+        self._buckets: dict[tuple[int, int], list[int]] = defaultdict(list)
+        self._shingles: dict[int, set[str]] = {}
+        self._keys: dict[int, frozenset[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._shingles)
+
+    def add(self, key: int, text: str) -> None:
+        """Index a text under a key."""
+        shingle_set = shingles(text)
+        self._insert(key, shingle_set, key_tokens(text), band_keys(minhash(shingle_set)))
+
+    def find(self, text: str) -> int | None:
+        """Find the most similar indexed text at or above the threshold.
+
+        Args:
+            text: Text to look up.
+
+        Returns:
+            Key of the best match, or None.
+        """
+        shingle_set = shingles(text)
+        return self._lookup(shingle_set, key_tokens(text), band_keys(minhash(shingle_set)))
+
+    def find_or_add(self, key: int, text: str) -> int | None:
+        """Find the best match for a text, indexing it if there is none.
+
+        Args:
+            key: Key to index the text under.
+            text: Text to look up.
+
+        Returns:
+            Key of the best match, or None if the text was added.
+        """
+        shingle_set = shingles(text)
+        text_keys = key_tokens(text)
+        keys = band_keys(minhash(shingle_set))
+        match = self._lookup(shingle_set, text_keys, keys)
+        if match is None:
+            self._insert(key, shingle_set, text_keys, keys)
+        return match
+
+    def _insert(
+        self,
+        key: int,
+        shingle_set: set[str],
+        text_keys: frozenset[str],
+        keys: list[tuple[int, int]],
+    ) -> None:
+        self._shingles[key] = shingle_set
+        self._keys[key] = text_keys
+        for band_key in keys:
+            self._buckets[band_key].append(key)
+
+    def _lookup(
+        self,
+        shingle_set: set[str],
+        text_keys: frozenset[str],
+        keys: list[tuple[int, int]],
+    ) -> int | None:
+        candidates: set[int] = set()
+        for band_key in keys:
+            candidates.update(self._buckets.get(band_key, ()))
+
+        best_key, best_score = None, self.threshold
+        for key in sorted(candidates):
+            if self._keys[key] != text_keys:
+                continue
+            score = jaccard(shingle_set, self._shingles[key])
+            if score >= best_score and (best_key is None or score > best_score):
+                best_key, best_score = key, score
+        return best_key
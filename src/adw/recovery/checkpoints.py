@@ -4,6 +4,11 @@ Saves and restores task state to enable:
 - Resuming failed tasks from last successful point
 - Rollback to known good states
 - Debugging failed attempts
+
+Each task's checkpoints directory has a manifest (index.jsonl) with one
+summary line per checkpoint, so listing checkpoints and finding the latest
+one do not parse every checkpoint file. Checkpoints can also snapshot the
+working tree as a git object (see snapshots.py), which rollback restores.
 """
 
 from __future__ import annotations
@@ -15,6 +20,11 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
+from .snapshots import create_snapshot, delete_snapshot, restore_snapshot
+
+# Manifest of checkpoint summaries, inside a task's checkpoints directory
+MANIFEST_FILE = "index.jsonl"
+
 
 @dataclass
 class Checkpoint:
@@ -30,6 +40,7 @@ class Checkpoint:
     files_modified: list[str] = field(default_factory=list)
     git_commit: str | None = None
     notes: str | None = None
+    snapshot: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
         """Convert checkpoint to dictionary."""
@@ -44,6 +55,7 @@ class Checkpoint:
             "files_modified": self.files_modified,
             "git_commit": self.git_commit,
             "notes": self.notes,
+            "snapshot": self.snapshot,
         }
 
     @classmethod
@@ -60,6 +72,7 @@ class Checkpoint:
             files_modified=data.get("files_modified", []),
             git_commit=data.get("git_commit"),
             notes=data.get("notes"),
+            snapshot=data.get("snapshot"),
         )
 
     def to_json(self, indent: int | None = 2) -> str:
@@ -82,6 +95,57 @@ def _get_checkpoints_dir(adw_id: str) -> Path:
     return Path("agents") / adw_id / "checkpoints"
 
 
+def _summary(checkpoint: Checkpoint) -> dict[str, Any]:
+    """Get a checkpoint's manifest entry (everything but the state snapshot)."""
+    data = checkpoint.to_dict()
+    data.pop("state_snapshot")
+    return data
+
+
+def _write_manifest(adw_id: str, entries: dict[str, dict[str, Any]]) -> None:
+    manifest_path = _get_checkpoints_dir(adw_id) / MANIFEST_FILE
+    tmp_path = manifest_path.with_suffix(".tmp")
+    tmp_path.write_text("".join(json.dumps(entry) + "\n" for entry in entries.values()))
+    tmp_path.replace(manifest_path)
+
+
+def _read_manifest(adw_id: str) -> dict[str, dict[str, Any]]:
+    """Read a task's manifest, bringing it in line with the checkpoint files.
+
+    Only checkpoint files missing from the manifest are parsed.
+
+    Returns:
+        Manifest entries by checkpoint ID.
+    """
+    checkpoints_dir = _get_checkpoints_dir(adw_id)
+    if not checkpoints_dir.exists():
+        return {}
+
+    entries: dict[str, dict[str, Any]] = {}
+    manifest_path = checkpoints_dir / MANIFEST_FILE
+    if manifest_path.exists():
+        for line in manifest_path.read_text().splitlines():
+            try:
+                entry = json.loads(line)
+                entries[entry["checkpoint_id"]] = entry
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+
+    on_disk = {path.stem for path in checkpoints_dir.glob("*.json")}
+    stale = set(entries) - on_disk
+    for checkpoint_id in stale:
+        del entries[checkpoint_id]
+    missing = on_disk - set(entries)
+    for checkpoint_id in missing:
+        checkpoint = load_checkpoint(adw_id, checkpoint_id)
+        if checkpoint is not None:
+            entries[checkpoint_id] = _summary(checkpoint)
+
+    if stale or missing:
+        _write_manifest(adw_id, entries)
+    return entries
+
+
 def _get_current_git_commit(worktree_path: Path | None = None) -> str | None:
     """Get the current git commit hash."""
     try:
@@ -107,6 +171,7 @@ def save_checkpoint(
     files_modified: list[str] | None = None,
     worktree_path: Path | None = None,
     notes: str | None = None,
+    snapshot: bool = False,
 ) -> Checkpoint:
     """Save a checkpoint for a task.
 
@@ -119,12 +184,16 @@ def save_checkpoint(
         files_modified: List of files modified in this step.
         worktree_path: Optional path to git worktree.
         notes: Optional notes about this checkpoint.
+        snapshot: Also snapshot the working tree as a git object.
 
     Returns:
         The created Checkpoint object.
     """
     checkpoint_id = _generate_checkpoint_id()
     git_commit = _get_current_git_commit(worktree_path)
+    snapshot_commit = (
+        create_snapshot(adw_id, checkpoint_id, f"[checkpoint] {phase}: {step}", worktree_path) if snapshot else None
+    )
 
     checkpoint = Checkpoint(
         checkpoint_id=checkpoint_id,
@@ -137,6 +206,7 @@ def save_checkpoint(
         files_modified=files_modified or [],
         git_commit=git_commit,
         notes=notes,
+        snapshot=snapshot_commit,
     )
 
     # Save to disk
@@ -146,6 +216,9 @@ def save_checkpoint(
     checkpoint_path = checkpoints_dir / f"{checkpoint_id}.json"
     checkpoint_path.write_text(checkpoint.to_json())
 
+    with (checkpoints_dir / MANIFEST_FILE).open("a") as manifest:
+        manifest.write(json.dumps(_summary(checkpoint)) + "\n")
+
     return checkpoint
 
 
@@ -170,30 +243,27 @@ def load_checkpoint(adw_id: str, checkpoint_id: str) -> Checkpoint | None:
         return None
 
 
-def list_checkpoints(adw_id: str) -> list[Checkpoint]:
+def list_checkpoints(adw_id: str, include_state: bool = True) -> list[Checkpoint]:
     """List all checkpoints for a task.
 
     Args:
         adw_id: The ADW task ID.
+        include_state: Load each checkpoint's state snapshot. If False,
+            checkpoints come from the manifest alone, with empty state.
 
     Returns:
         List of Checkpoint objects, sorted by timestamp (newest first).
     """
-    checkpoints_dir = _get_checkpoints_dir(adw_id)
+    entries = sorted(_read_manifest(adw_id).values(), key=lambda e: e["timestamp"], reverse=True)
 
-    if not checkpoints_dir.exists():
-        return []
+    if not include_state:
+        return [Checkpoint.from_dict(entry) for entry in entries]
 
     checkpoints = []
-    for checkpoint_path in checkpoints_dir.glob("*.json"):
-        try:
-            checkpoint = Checkpoint.from_json(checkpoint_path.read_text())
+    for entry in entries:
+        checkpoint = load_checkpoint(adw_id, entry["checkpoint_id"])
+        if checkpoint is not None:
             checkpoints.append(checkpoint)
-        except (json.JSONDecodeError, KeyError):
-            continue
-
-    # Sort by timestamp (newest first)
-    checkpoints.sort(key=lambda c: c.timestamp, reverse=True)
     return checkpoints
 
 
@@ -207,12 +277,14 @@ def get_last_checkpoint(adw_id: str, successful_only: bool = False) -> Checkpoin
     Returns:
         The most recent Checkpoint or None if no checkpoints exist.
     """
-    checkpoints = list_checkpoints(adw_id)
-
-    if successful_only:
-        checkpoints = [c for c in checkpoints if c.success]
+    for entry in list_checkpoints(adw_id, include_state=False):
+        if successful_only and not entry.success:
+            continue
+        checkpoint = load_checkpoint(adw_id, entry.checkpoint_id)
+        if checkpoint is not None:
+            return checkpoint
 
-    return checkpoints[0] if checkpoints else None
+    return None
 
 
 def get_last_successful_checkpoint(adw_id: str) -> Checkpoint | None:
@@ -227,12 +299,13 @@ def get_last_successful_checkpoint(adw_id: str) -> Checkpoint | None:
     return get_last_checkpoint(adw_id, successful_only=True)
 
 
-def delete_checkpoint(adw_id: str, checkpoint_id: str) -> bool:
-    """Delete a specific checkpoint.
+def delete_checkpoint(adw_id: str, checkpoint_id: str, worktree_path: Path | None = None) -> bool:
+    """Delete a specific checkpoint, and its working tree snapshot if any.
 
     Args:
         adw_id: The ADW task ID.
         checkpoint_id: The checkpoint ID to delete.
+        worktree_path: Optional path to git worktree.
 
     Returns:
         True if deleted, False if not found.
@@ -242,15 +315,22 @@ def delete_checkpoint(adw_id: str, checkpoint_id: str) -> bool:
     if not checkpoint_path.exists():
         return False
 
+    entries = _read_manifest(adw_id)
+    entry = entries.pop(checkpoint_id, None)
+    if entry and entry.get("snapshot"):
+        delete_snapshot(adw_id, checkpoint_id, worktree_path)
+
     checkpoint_path.unlink()
+    _write_manifest(adw_id, entries)
     return True
 
 
-def clear_checkpoints(adw_id: str) -> int:
-    """Delete all checkpoints for a task.
+def clear_checkpoints(adw_id: str, worktree_path: Path | None = None) -> int:
+    """Delete all checkpoints for a task, and their working tree snapshots.
 
     Args:
         adw_id: The ADW task ID.
+        worktree_path: Optional path to git worktree.
 
     Returns:
         Number of checkpoints deleted.
@@ -260,33 +340,39 @@ def clear_checkpoints(adw_id: str) -> int:
     if not checkpoints_dir.exists():
         return 0
 
+    for entry in _read_manifest(adw_id).values():
+        if entry.get("snapshot"):
+            delete_snapshot(adw_id, entry["checkpoint_id"], worktree_path)
+
     count = 0
     for checkpoint_path in checkpoints_dir.glob("*.json"):
         checkpoint_path.unlink()
         count += 1
 
+    (checkpoints_dir / MANIFEST_FILE).unlink(missing_ok=True)
     return count
 
 
-def clear_old_checkpoints(adw_id: str, older_than_days: int = 7) -> int:
+def clear_old_checkpoints(adw_id: str, older_than_days: int = 7, worktree_path: Path | None = None) -> int:
     """Delete checkpoints older than specified days.
 
     Args:
         adw_id: The ADW task ID.
         older_than_days: Delete checkpoints older than this many days.
+        worktree_path: Optional path to git worktree.
 
     Returns:
         Number of checkpoints deleted.
     """
     cutoff = datetime.now() - timedelta(days=older_than_days)
-    checkpoints = list_checkpoints(adw_id)
+    checkpoints = list_checkpoints(adw_id, include_state=False)
 
     count = 0
     for checkpoint in checkpoints:
         try:
             checkpoint_time = datetime.fromisoformat(checkpoint.timestamp)
             if checkpoint_time < cutoff:
-                if delete_checkpoint(adw_id, checkpoint.checkpoint_id):
+                if delete_checkpoint(adw_id, checkpoint.checkpoint_id, worktree_path):
                     count += 1
         except ValueError:
             continue
@@ -300,15 +386,17 @@ class CheckpointManager:
     Provides a higher-level interface for checkpoint operations.
     """
 
-    def __init__(self, adw_id: str, worktree_path: Path | None = None):
+    def __init__(self, adw_id: str, worktree_path: Path | None = None, snapshots: bool = False):
         """Initialize checkpoint manager.
 
         Args:
             adw_id: The ADW task ID.
             worktree_path: Optional path to git worktree.
+            snapshots: Snapshot the working tree with every checkpoint.
         """
         self.adw_id = adw_id
         self.worktree_path = worktree_path
+        self.snapshots = snapshots
         self._current_phase: str | None = None
         self._step_counter: int = 0
 
@@ -346,6 +434,7 @@ class CheckpointManager:
             files_modified=files_modified,
             worktree_path=self.worktree_path,
             notes=notes,
+            snapshot=self.snapshots,
         )
 
     def get_latest(self, successful_only: bool = False) -> Checkpoint | None:
@@ -387,7 +476,7 @@ class CheckpointManager:
         Returns:
             Number of checkpoints deleted.
         """
-        return clear_old_checkpoints(self.adw_id, older_than_days)
+        return clear_old_checkpoints(self.adw_id, older_than_days, self.worktree_path)
 
     def get_resume_context(self) -> dict[str, Any] | None:
         """Get context for resuming from last successful checkpoint.
@@ -513,7 +602,9 @@ def rollback_to_checkpoint(
 ) -> bool:
     """Rollback to a specific checkpoint or last successful one.
 
-    This performs a git reset to the checkpoint's commit.
+    This performs a git reset to the checkpoint's commit. For checkpoints
+    with a working tree snapshot, HEAD is moved back without touching files,
+    and then only the files that differ from the snapshot are restored.
 
     Args:
         adw_id: The ADW task ID.
@@ -528,11 +619,27 @@ def rollback_to_checkpoint(
     else:
         checkpoint = get_last_successful_checkpoint(adw_id)
 
-    if not checkpoint or not checkpoint.git_commit:
+    if not checkpoint:
         return False
 
     cwd = str(worktree_path) if worktree_path else None
 
+    if checkpoint.snapshot:
+        if checkpoint.git_commit and checkpoint.git_commit != _get_current_git_commit(worktree_path):
+            try:
+                subprocess.run(
+                    ["git", "reset", "--quiet", checkpoint.git_commit],
+                    cwd=cwd,
+                    check=True,
+                    capture_output=True,
+                )
+            except subprocess.CalledProcessError:
+                return False
+        return restore_snapshot(checkpoint.snapshot, worktree_path)
+
+    if not checkpoint.git_commit:
+        return False
+
     try:
         # Reset to checkpoint commit
         subprocess.run(
@@ -561,7 +668,7 @@ def rollback_all_changes(
     Returns:
         True if rollback successful, False otherwise.
     """
-    checkpoints = list_checkpoints(adw_id)
+    checkpoints = list_checkpoints(adw_id, include_state=False)
 
     if not checkpoints:
         return False
@@ -10,10 +10,11 @@ recovery strategy:
 
 from __future__ import annotations
 
-import re
 from enum import Enum
 from typing import NamedTuple
 
+from ..utils.matcher import PatternTable
+
 
 class ErrorClass(str, Enum):
     """Error classification for recovery strategies."""
@@ -314,6 +315,21 @@ FATAL_PATTERNS: list[tuple[str, str, str, float]] = [
 ]
 
 
+# All tables compiled into one, checked in order of specificity: fatal
+# patterns first (usually most specific), then retriable, then fixable
+_ERROR_TABLE: PatternTable[tuple[ErrorClass, str, str, float]] = PatternTable(
+    [
+        (pattern, (error_class, reason, action, confidence))
+        for error_class, table in (
+            (ErrorClass.FATAL, FATAL_PATTERNS),
+            (ErrorClass.RETRIABLE, RETRIABLE_PATTERNS),
+            (ErrorClass.FIXABLE, FIXABLE_PATTERNS),
+        )
+        for pattern, reason, action, confidence in table
+    ]
+)
+
+
 def classify_error(error_message: str) -> ClassificationResult:
     """Classify an error message to determine recovery strategy.
 
@@ -334,45 +350,20 @@ def classify_error(error_message: str) -> ClassificationResult:
     # Normalize the error message for matching
     normalized = error_message.lower().strip()
 
-    # Check each pattern category in order of specificity
+    # Highest confidence wins; ties go to the earlier (more specific) table
     best_match: ClassificationResult | None = None
     best_confidence = 0.0
 
-    # Check fatal patterns first (usually most specific)
-    for pattern, reason, action, confidence in FATAL_PATTERNS:
-        if re.search(pattern, normalized, re.IGNORECASE):
-            if confidence > best_confidence:
-                best_match = ClassificationResult(
-                    error_class=ErrorClass.FATAL,
-                    confidence=confidence,
-                    reason=reason,
-                    suggested_action=action,
-                )
-                best_confidence = confidence
-
-    # Check retriable patterns
-    for pattern, reason, action, confidence in RETRIABLE_PATTERNS:
-        if re.search(pattern, normalized, re.IGNORECASE):
-            if confidence > best_confidence:
-                best_match = ClassificationResult(
-                    error_class=ErrorClass.RETRIABLE,
-                    confidence=confidence,
-                    reason=reason,
-                    suggested_action=action,
-                )
-                best_confidence = confidence
-
-    # Check fixable patterns
-    for pattern, reason, action, confidence in FIXABLE_PATTERNS:
-        if re.search(pattern, normalized, re.IGNORECASE):
-            if confidence > best_confidence:
-                best_match = ClassificationResult(
-                    error_class=ErrorClass.FIXABLE,
-                    confidence=confidence,
-                    reason=reason,
-                    suggested_action=action,
-                )
-                best_confidence = confidence
+    for match in _ERROR_TABLE.scan(normalized):
+        error_class, reason, action, confidence = match.value
+        if confidence > best_confidence:
+            best_match = ClassificationResult(
+                error_class=error_class,
+                confidence=confidence,
+                reason=reason,
+                suggested_action=action,
+            )
+            best_confidence = confidence
 
     # Return best match or unknown
     if best_match:
@@ -0,0 +1,243 @@
+"""Working tree snapshots stored as git objects.
+
+A snapshot records the whole working tree (tracked and untracked files,
+minus ignored ones) as a commit without moving HEAD, touching the index or
+adding to the branch history. It is built with a private index file:
+``git add -A`` against that index, ``git write-tree`` and ``git
+commit-tree``. The private index is kept between snapshots, so its stat cache
+stays warm and only files that changed since the last snapshot are hashed
+again.
+
+Snapshots are kept alive by refs under ``refs/adw/checkpoints/<adw_id>/``.
+Restoring one compares it with the current working tree and only rewrites
+the paths that differ.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Ref namespace holding snapshot commits
+SNAPSHOT_REF_PREFIX = "refs/adw/checkpoints"
+
+# Private index file, inside the (per-worktree) git directory
+SNAPSHOT_INDEX = "adw-snapshot-index"
+
+
+def _git(
+    args: list[str],
+    cwd: Path | None,
+    index: Path | None = None,
+    stdin: str | None = None,
+) -> str:
+    """Run a git command and return its output.
+
+    Raises:
+        subprocess.CalledProcessError: If the command fails.
+        OSError: If git could not be run.
+    """
+    env = None
+    if index is not None:
+        env = os.environ.copy()
+        env["GIT_INDEX_FILE"] = str(index)
+    result = subprocess.run(
+        ["git", *args],
+        cwd=str(cwd) if cwd else None,
+        env=env,
+        input=stdin,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+def _toplevel(cwd: Path | None) -> Path:
+    return Path(_git(["rev-parse", "--show-toplevel"], cwd).strip())
+
+
+def _git_path(name: str, root: Path) -> Path:
+    path = Path(_git(["rev-parse", "--git-path", name], root).strip())
+    return path if path.is_absolute() else root / path
+
+
+def _snapshot_index(root: Path) -> Path:
+    """Get the private index, seeding it from the real index the first time."""
+    index = _git_path(SNAPSHOT_INDEX, root)
+    if not index.exists():
+        real_index = _git_path("index", root)
+        if real_index.exists():
+            # Starts with the real index's stat cache, so tracked files need no rehashing
+            shutil.copyfile(real_index, index)
+    return index
+
+
+def snapshot_ref(adw_id: str, checkpoint_id: str) -> str:
+    """Get the ref a checkpoint's snapshot is stored under."""
+    return f"{SNAPSHOT_REF_PREFIX}/{adw_id}/{checkpoint_id}"
+
+
+def write_worktree_tree(worktree_path: Path | None = None) -> str | None:
+    """Write the working tree as a git tree object.
+
+    Args:
+        worktree_path: Repository or worktree directory (default: current).
+
+    Returns:
+        Tree hash, or None if git failed.
+    """
+    try:
+        root = _toplevel(worktree_path)
+        index = _snapshot_index(root)
+        _git(["add", "-A"], root, index)
+        return _git(["write-tree"], root, index).strip()
+    except (subprocess.CalledProcessError, OSError) as e:
+        logger.debug("Could not write working tree: %s", e)
+        return None
+
+
+def create_snapshot(
+    adw_id: str,
+    checkpoint_id: str,
+    message: str,
+    worktree_path: Path | None = None,
+) -> str | None:
+    """Snapshot the working tree under a checkpoint's ref.
+
+    HEAD, the index and the working tree are left as they are.
+
+    Args:
+        adw_id: The ADW task ID.
+        checkpoint_id: Checkpoint the snapshot belongs to.
+        message: Commit message of the snapshot.
+        worktree_path: Repository or worktree directory (default: current).
+
+    Returns:
+        Snapshot commit hash, or None if git failed.
+    """
+    tree = write_worktree_tree(worktree_path)
+    if tree is None:
+        return None
+
+    try:
+        args = ["commit-tree", tree, "-m", f"{message}\n\nADW ID: {adw_id}"]
+        try:
+            args += ["-p", _git(["rev-parse", "--verify", "--quiet", "HEAD"], worktree_path).strip()]
+        except subprocess.CalledProcessError:
+            pass  # No commits yet
+        commit = _git(args, worktree_path).strip()
+        _git(["update-ref", snapshot_ref(adw_id, checkpoint_id), commit], worktree_path)
+        return commit
+    except (subprocess.CalledProcessError, OSError) as e:
+        logger.debug("Could not create snapshot: %s", e)
+        return None
+
+
+def _changed_paths(current: str, target: str, root: Path) -> tuple[list[str], list[str]]:
+    """Get the paths to delete and to write to turn one tree into another."""
+    output = _git(["diff-tree", "-r", "-z", "--no-renames", "--name-status", current, target], root)
+    fields = output.split("\0")
+    deleted, written = [], []
+    for status, path in zip(fields[0::2], fields[1::2], strict=False):
+        if not path:
+            continue
+        (deleted if status == "D" else written).append(path)
+    return deleted, written
+
+
+def _remove(root: Path, path: str) -> None:
+    """Remove a file, and any directories it leaves empty."""
+    target = root / path
+    target.unlink(missing_ok=True)
+    parent = target.parent
+    while parent != root:
+        try:
+            parent.rmdir()
+        except OSError:
+            break
+        parent = parent.parent
+
+
+def restore_snapshot(snapshot: str, worktree_path: Path | None = None) -> bool:
+    """Restore the working tree to a snapshot.
+
+    Only paths that differ between the working tree and the snapshot are
+    deleted or rewritten. HEAD and the index are left as they are, and
+    ignored files are not touched.
+
+    Args:
+        snapshot: Snapshot commit (or ref).
+        worktree_path: Repository or worktree directory (default: current).
+
+    Returns:
+        True if the working tree now matches the snapshot.
+    """
+    current = write_worktree_tree(worktree_path)
+    if current is None:
+        return False
+
+    try:
+        root = _toplevel(worktree_path)
+        target = _git(["rev-parse", f"{snapshot}^{{tree}}"], root).strip()
+        if current == target:
+            return True
+
+        deleted, written = _changed_paths(current, target, root)
+        for path in deleted:
+            _remove(root, path)
+
+        # A two-way merge keeps the stat info of unchanged entries
+        index = _snapshot_index(root)
+        _git(["read-tree", "-m", current, target], root, index)
+        if written:
+            _git(["checkout-index", "-f", "-u", "-z", "--stdin"], root, index, stdin="\0".join(written))
+        return True
+    except (subprocess.CalledProcessError, OSError) as e:
+        logger.debug("Could not restore snapshot %s: %s", snapshot, e)
+        return False
+
+
+def list_snapshots(adw_id: str, worktree_path: Path | None = None) -> dict[str, str]:
+    """List the snapshots of a task.
+
+    Args:
+        adw_id: The ADW task ID.
+        worktree_path: Repository or worktree directory (default: current).
+
+    Returns:
+        Mapping of checkpoint ID to snapshot commit.
+    """
+    prefix = f"{SNAPSHOT_REF_PREFIX}/{adw_id}/"
+    try:
+        output = _git(["for-each-ref", "--format=%(refname) %(objectname)", prefix], worktree_path)
+    except (subprocess.CalledProcessError, OSError):
+        return {}
+    snapshots = {}
+    for line in output.splitlines():
+        ref, _, commit = line.partition(" ")
+        snapshots[ref[len(prefix) :]] = commit
+    return snapshots
+
+
+def delete_snapshot(adw_id: str, checkpoint_id: str, worktree_path: Path | None = None) -> bool:
+    """Delete a checkpoint's snapshot ref.
+
+    Args:
+        adw_id: The ADW task ID.
+        checkpoint_id: Checkpoint the snapshot belongs to.
+        worktree_path: Repository or worktree directory (default: current).
+
+    Returns:
+        True if the ref was deleted.
+    """
+    try:
+        _git(["update-ref", "-d", snapshot_ref(adw_id, checkpoint_id)], worktree_path)
+        return True
+    except (subprocess.CalledProcessError, OSError):
+        return False
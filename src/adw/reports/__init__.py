@@ -13,6 +13,7 @@ from .metrics import (
     PhaseMetrics,
     TaskMetrics,
     get_metrics_db,
+    record_phase_metrics,
     record_task_completion,
     record_task_metrics,
 )
@@ -33,6 +34,7 @@ from .notifications import (
     send_notification,
     test_channel,
 )
+from .series import SeriesStats, series_stats
 from .trends import (
     TrendAnalysis,
     TrendPoint,
@@ -59,6 +61,7 @@ __all__ = [
     "PhaseMetrics",
     "TaskMetrics",
     "get_metrics_db",
+    "record_phase_metrics",
     "record_task_metrics",
     "record_task_completion",
     # Trends
@@ -68,6 +71,8 @@ __all__ = [
     "analyze_metric",
     "generate_trend_report",
     "get_sparkline_summary",
+    "SeriesStats",
+    "series_stats",
     # Notifications
     "NotificationChannel",
     "NotificationConfig",
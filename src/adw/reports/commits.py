@@ -0,0 +1,204 @@
+"""Cached per-day git commit counts for reports.
+
+Daily summaries fall back to counting git commits when no commits were
+recorded in the metrics database. Rather than running one ``git log`` per day,
+commit counts are bucketed by day from a single ``git log --format=%ct`` over
+a whole range. They are cached against HEAD, so later runs only scan days
+outside the cached range, plus any commits added since the cached HEAD.
+
+For initialized projects (those with an ``.adw/`` directory) the cache is
+persisted to ``.adw/cache/commit_counts.json``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import subprocess
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Cache file, relative to the repository root
+DEFAULT_CACHE_PATH = Path(".adw/cache/commit_counts.json")
+
+# Bumped whenever the cache format changes
+CACHE_VERSION = 1
+
+# Timeout for each git command, in seconds
+GIT_TIMEOUT = 30
+
+
+def _day(value: date | datetime) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _run_git(args: list[str], cwd: Path) -> subprocess.CompletedProcess[str] | None:
+    """Run a git command, returning None if git could not be run."""
+    try:
+        return subprocess.run(
+            ["git", *args],
+            capture_output=True,
+            text=True,
+            timeout=GIT_TIMEOUT,
+            cwd=cwd,
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug("git %s failed: %s", args[0], e)
+        return None
+
+
+class CommitCountCache:
+    """Per-day commit counts of one repository, keyed by HEAD.
+
+    Attributes:
+        repo_path: Repository root (or any directory inside it).
+        cache_path: JSON file the cache is persisted to.
+    """
+
+    def __init__(self, repo_path: Path | None = None, cache_path: Path | None = None):
+        """Initialize the cache.
+
+        Args:
+            repo_path: Repository directory. Defaults to the current directory.
+            cache_path: Cache file. Defaults to .adw/cache/commit_counts.json
+        """
+        self.repo_path = (repo_path or Path.cwd()).resolve()
+        self.cache_path = cache_path or self.repo_path / DEFAULT_CACHE_PATH
+
+    def _persistent(self) -> bool:
+        """Only initialized projects get an on-disk cache."""
+        return (self.repo_path / ".adw").is_dir()
+
+    def _read(self) -> dict[str, Any]:
+        try:
+            data: dict[str, Any] = json.loads(self.cache_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return data if data.get("version") == CACHE_VERSION else {}
+
+    def _write(self, data: dict[str, Any]) -> None:
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True))
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.debug("Could not write commit count cache: %s", e)
+
+    def _head(self) -> str | None:
+        result = _run_git(["rev-parse", "--verify", "--quiet", "HEAD"], self.repo_path)
+        if result is None or result.returncode != 0:
+            return None
+        return result.stdout.strip() or None
+
+    def _is_ancestor(self, old: str, new: str) -> bool:
+        result = _run_git(["merge-base", "--is-ancestor", old, new], self.repo_path)
+        return result is not None and result.returncode == 0
+
+    def _log_days(self, args: list[str]) -> list[date] | None:
+        """Get the committer day of every commit a git log selects."""
+        result = _run_git(["log", "--format=%ct", *args], self.repo_path)
+        if result is None or result.returncode != 0:
+            return None
+        return [datetime.fromtimestamp(int(line)).date() for line in result.stdout.split()]
+
+    def _scan(self, days: dict[str, int], start: date, end: date) -> bool:
+        """Add the commits of a day range to the counts."""
+        found = self._log_days([f"--since={start.isoformat()} 00:00:00", f"--until={end.isoformat()} 23:59:59"])
+        if found is None:
+            return False
+        for day in found:
+            # --since/--until are inclusive to the second; keep to the range
+            if start <= day <= end:
+                key = day.isoformat()
+                days[key] = days.get(key, 0) + 1
+        return True
+
+    def counts(self, start: date | datetime, end: date | datetime) -> dict[str, int]:
+        """Get commit counts per day for a date range.
+
+        Args:
+            start: First day (inclusive).
+            end: Last day (inclusive).
+
+        Returns:
+            Mapping of 'YYYY-MM-DD' to commit count, for days in the range
+            with at least one commit. Empty if this is not a git repository.
+        """
+        start, end = _day(start), _day(end)
+        head = self._head()
+        if head is None:
+            return {}
+
+        persistent = self._persistent()
+        data = self._read() if persistent else {}
+        days: dict[str, int] = data.get("days", {})
+        first = date.fromisoformat(data["first"]) if data.get("first") else None
+        last = date.fromisoformat(data["last"]) if data.get("last") else None
+        changed = False
+
+        if data.get("head") != head:
+            old_head = data.get("head")
+            new_days = None
+            if old_head and first and last and self._is_ancestor(old_head, head):
+                # Fast-forward: only the new commits need counting
+                new_days = self._log_days([f"{old_head}..{head}"])
+            if new_days is None:
+                days, first, last = {}, None, None
+            else:
+                for day in new_days:
+                    if first and last and first <= day <= last:
+                        key = day.isoformat()
+                        days[key] = days.get(key, 0) + 1
+            changed = True
+
+        if first is None or last is None:
+            if not self._scan(days, start, end):
+                return {}
+            first, last = start, end
+            changed = True
+        else:
+            if start < first:
+                if not self._scan(days, start, first - timedelta(days=1)):
+                    return {}
+                first, changed = start, True
+            if end > last:
+                if not self._scan(days, last + timedelta(days=1), end):
+                    return {}
+                last, changed = end, True
+
+        if persistent and changed:
+            self._write(
+                {
+                    "version": CACHE_VERSION,
+                    "head": head,
+                    "first": first.isoformat(),
+                    "last": last.isoformat(),
+                    "days": days,
+                }
+            )
+
+        low, high = start.isoformat(), end.isoformat()
+        return {day: count for day, count in days.items() if low <= day <= high}
+
+
+def get_commit_counts(
+    start: date | datetime,
+    end: date | datetime,
+    repo_path: Path | None = None,
+) -> dict[str, int]:
+    """Get per-day commit counts for a date range through the cache.
+
+    Args:
+        start: First day (inclusive).
+        end: Last day (inclusive).
+        repo_path: Repository directory. Defaults to the current directory.
+
+    Returns:
+        Mapping of 'YYYY-MM-DD' to commit count, for days with commits.
+    """
+    return CommitCountCache(repo_path).counts(start, end)
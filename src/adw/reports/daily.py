@@ -6,13 +6,13 @@ that aggregate task metrics, commits, and other activity.
 
 from __future__ import annotations
 
-import subprocess
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from .metrics import MetricsDB, get_metrics_db
+from .commits import get_commit_counts
+from .metrics import AGGREGATE_COLUMNS, MetricsDB, get_metrics_db
 
 # Anthropic pricing (USD per million tokens)
 # Sonnet 3.5 pricing as default
@@ -22,6 +22,15 @@ PRICING = {
     "haiku": {"input": 0.25, "output": 1.25},
 }
 
+# Aggregate columns carried into per-model and per-workflow breakdowns
+_BREAKDOWN_COLUMNS = (
+    "tasks_completed",
+    "tasks_failed",
+    "total_duration_seconds",
+    "total_input_tokens",
+    "total_output_tokens",
+)
+
 
 @dataclass
 class DailySummary:
@@ -47,6 +56,8 @@ class DailySummary:
         lines_added: Total lines added.
         lines_removed: Total lines removed.
         task_details: List of individual task summaries.
+        model_breakdown: Per-model tasks, tokens and cost.
+        workflow_breakdown: Per-workflow tasks, tokens and cost.
     """
 
     date: datetime
@@ -68,6 +79,8 @@ class DailySummary:
     lines_added: int = 0
     lines_removed: int = 0
     task_details: list[dict[str, Any]] = field(default_factory=list)
+    model_breakdown: dict[str, dict[str, Any]] = field(default_factory=dict)
+    workflow_breakdown: dict[str, dict[str, Any]] = field(default_factory=dict)
 
     @property
     def total_tasks(self) -> int:
@@ -124,6 +137,8 @@ class DailySummary:
             "lines_added": self.lines_added,
             "lines_removed": self.lines_removed,
             "task_details": self.task_details,
+            "model_breakdown": self.model_breakdown,
+            "workflow_breakdown": self.workflow_breakdown,
         }
 
     def to_markdown(self) -> str:
@@ -162,6 +177,8 @@ class DailySummary:
             "",
         ]
 
+        lines.extend(render_breakdowns(self.model_breakdown, self.workflow_breakdown))
+
         if self.task_details:
             lines.extend(
                 [
@@ -204,6 +221,35 @@ def _format_duration(seconds: float) -> str:
     return f"{secs}s"
 
 
+def render_breakdowns(
+    model_breakdown: dict[str, dict[str, Any]],
+    workflow_breakdown: dict[str, dict[str, Any]],
+) -> list[str]:
+    """Render per-model and per-workflow breakdown tables.
+
+    Breakdowns with a single entry repeat the overview and are left out.
+    """
+    lines: list[str] = []
+    for title, breakdown in (("By Model", model_breakdown), ("By Workflow", workflow_breakdown)):
+        if len(breakdown) < 2:
+            continue
+        lines.extend(
+            [
+                f"## {title}",
+                "",
+                "| Name | Tasks | Success Rate | Tokens | Cost |",
+                "|------|-------|--------------|--------|------|",
+            ]
+        )
+        for name, entry in sorted(breakdown.items(), key=lambda item: -item[1]["estimated_cost"]):
+            finished = entry["tasks_completed"] + entry["tasks_failed"]
+            rate = entry["tasks_completed"] / finished * 100 if finished else 0.0
+            tokens = entry["total_input_tokens"] + entry["total_output_tokens"]
+            lines.append(f"| {name} | {entry['tasks']} | {rate:.0f}% | {tokens:,} | ${entry['estimated_cost']:.2f} |")
+        lines.append("")
+    return lines
+
+
 def _get_git_commits_for_date(date: datetime) -> int:
     """Count git commits for a specific date.
 
@@ -213,25 +259,7 @@ def _get_git_commits_for_date(date: datetime) -> int:
     Returns:
         Number of commits on that date.
     """
-    date_str = date.strftime("%Y-%m-%d")
-    try:
-        result = subprocess.run(
-            [
-                "git",
-                "log",
-                "--oneline",
-                f"--after={date_str} 00:00:00",
-                f"--before={date_str} 23:59:59",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        if result.returncode == 0:
-            return len(result.stdout.strip().split("\n")) if result.stdout.strip() else 0
-    except Exception:
-        pass
-    return 0
+    return get_commit_counts(date, date).get(date.strftime("%Y-%m-%d"), 0)
 
 
 def _estimate_time_saved(
@@ -263,7 +291,7 @@ def _estimate_time_saved(
     return base_hours + lines_hours
 
 
-def _calculate_cost(
+def calculate_cost(
     input_tokens: int,
     output_tokens: int,
     model: str = "sonnet",
@@ -273,77 +301,85 @@ def _calculate_cost(
     Args:
         input_tokens: Input tokens used.
         output_tokens: Output tokens generated.
-        model: Model name (sonnet, opus, haiku).
+        model: Model name (sonnet, opus, haiku) or full model ID.
 
     Returns:
         Estimated cost in USD.
     """
-    pricing = PRICING.get(model, PRICING["sonnet"])
+    # Full model IDs (claude-opus-4-...) are priced by their family
+    family = next((name for name in PRICING if name in model.lower()), "sonnet")
+    pricing = PRICING[family]
     input_cost = (input_tokens / 1_000_000) * pricing["input"]
     output_cost = (output_tokens / 1_000_000) * pricing["output"]
     return input_cost + output_cost
 
 
-def generate_daily_summary(
-    date: datetime | None = None,
-    db: MetricsDB | None = None,
-) -> DailySummary:
-    """Generate daily summary report.
+def _row_cost(row: dict[str, Any]) -> float:
+    """Estimate the cost of an aggregate row, priced by its model (Sonnet if unknown)."""
+    return calculate_cost(row["total_input_tokens"], row["total_output_tokens"], row.get("model") or "sonnet")
+
+
+def aggregate_breakdowns(
+    rows: list[dict[str, Any]],
+) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, Any]]]:
+    """Break aggregate rows down by model and by workflow.
 
     Args:
-        date: Date to generate report for (default: today).
-        db: MetricsDB instance (default: global instance).
+        rows: Rows from MetricsDB.query_aggregates, grouped by workflow
+            and/or model.
 
     Returns:
-        DailySummary for the specified date.
+        Tuple of (model_breakdown, workflow_breakdown), each mapping a name
+        to its tasks, tokens, duration and estimated cost.
     """
-    if date is None:
-        date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-
-    if db is None:
-        db = get_metrics_db()
+    breakdowns: dict[str, dict[str, dict[str, Any]]] = {"model": {}, "workflow": {}}
+    for row in rows:
+        cost = _row_cost(row)
+        for dimension, breakdown in breakdowns.items():
+            if dimension not in row:
+                continue
+            entry = breakdown.setdefault(
+                row[dimension] or "unknown",
+                {"tasks": 0, **dict.fromkeys(_BREAKDOWN_COLUMNS, 0), "estimated_cost": 0.0},
+            )
+            entry["tasks"] += row["tasks_completed"] + row["tasks_failed"] + row["tasks_in_progress"]
+            for key in _BREAKDOWN_COLUMNS:
+                entry[key] += row[key]
+            entry["estimated_cost"] += cost
+    return breakdowns["model"], breakdowns["workflow"]
+
+
+def summarize_aggregates(
+    date: datetime,
+    rows: list[dict[str, Any]],
+    task_details: list[dict[str, Any]] | None = None,
+    git_commits: int | None = None,
+) -> DailySummary:
+    """Build a daily summary from aggregate rows.
 
-    # Get task metrics for the date
-    metrics_list = db.get_metrics_for_date(date)
-
-    # Initialize counters
-    tasks_completed = 0
-    tasks_failed = 0
-    total_duration = 0.0
-    total_retries = 0
-    total_input_tokens = 0
-    total_output_tokens = 0
-    total_commits = 0
-    files_modified = 0
-    lines_added = 0
-    lines_removed = 0
-    task_details = []
+    Args:
+        date: Date the rows cover.
+        rows: Rows from MetricsDB.query_aggregates, grouped by workflow
+            and/or model.
+        task_details: Individual task summaries to include.
+        git_commits: Git commits on the date, used when no commits were
+            recorded. Looked up if None.
 
-    for metrics in metrics_list:
-        if metrics.status == "completed":
-            tasks_completed += 1
-        elif metrics.status == "failed":
-            tasks_failed += 1
-
-        total_duration += metrics.total_duration_seconds
-        total_retries += metrics.total_retries
-        total_input_tokens += metrics.total_input_tokens
-        total_output_tokens += metrics.total_output_tokens
-        total_commits += metrics.commits_generated
-        files_modified += metrics.files_modified
-        lines_added += metrics.lines_added
-        lines_removed += metrics.lines_removed
-
-        task_details.append(
-            {
-                "task_id": metrics.task_id,
-                "description": metrics.description,
-                "status": metrics.status,
-                "duration": metrics.total_duration_seconds,
-                "retries": metrics.total_retries,
-                "tokens": metrics.total_tokens,
-            }
-        )
+    Returns:
+        DailySummary totalling the rows.
+    """
+    totals: dict[str, float] = dict.fromkeys(AGGREGATE_COLUMNS, 0)
+    for row in rows:
+        for key in AGGREGATE_COLUMNS:
+            totals[key] += row[key]
+    model_breakdown, workflow_breakdown = aggregate_breakdowns(rows)
+
+    tasks_completed = int(totals["tasks_completed"])
+    tasks_failed = int(totals["tasks_failed"])
+    total_duration = float(totals["total_duration_seconds"])
+    total_retries = int(totals["total_retries"])
+    lines_added = int(totals["lines_added"])
+    lines_removed = int(totals["lines_removed"])
 
     # Calculate averages
     total_tasks = tasks_completed + tasks_failed
@@ -351,33 +387,76 @@ def generate_daily_summary(
     avg_retries = total_retries / total_tasks if total_tasks > 0 else 0.0
 
     # Get git commits if no commits recorded in metrics
+    total_commits = int(totals["total_commits"])
     if total_commits == 0:
-        total_commits = _get_git_commits_for_date(date)
-
-    # Calculate estimated cost and time saved
-    estimated_cost = _calculate_cost(total_input_tokens, total_output_tokens)
-    estimated_time_saved = _estimate_time_saved(tasks_completed, lines_added, lines_removed)
+        total_commits = _get_git_commits_for_date(date) if git_commits is None else git_commits
 
     return DailySummary(
         date=date,
         tasks_completed=tasks_completed,
         tasks_failed=tasks_failed,
+        tasks_in_progress=int(totals["tasks_in_progress"]),
         total_commits=total_commits,
         total_duration_seconds=total_duration,
         avg_task_duration_seconds=avg_duration,
         total_retries=total_retries,
         avg_retries_per_task=avg_retries,
-        total_input_tokens=total_input_tokens,
-        total_output_tokens=total_output_tokens,
-        estimated_cost=estimated_cost,
-        estimated_time_saved_hours=estimated_time_saved,
-        files_modified=files_modified,
+        total_input_tokens=int(totals["total_input_tokens"]),
+        total_output_tokens=int(totals["total_output_tokens"]),
+        estimated_cost=sum(_row_cost(row) for row in rows),
+        estimated_time_saved_hours=_estimate_time_saved(tasks_completed, lines_added, lines_removed),
+        files_modified=int(totals["files_modified"]),
         lines_added=lines_added,
         lines_removed=lines_removed,
-        task_details=task_details,
+        task_details=task_details or [],
+        model_breakdown=model_breakdown,
+        workflow_breakdown=workflow_breakdown,
     )
 
 
+def generate_daily_summary(
+    date: datetime | None = None,
+    db: MetricsDB | None = None,
+    include_tasks: bool = True,
+) -> DailySummary:
+    """Generate daily summary report.
+
+    Totals come from the hourly aggregates, so only the task list (if
+    requested) reads individual task rows.
+
+    Args:
+        date: Date to generate report for (default: today).
+        db: MetricsDB instance (default: global instance).
+        include_tasks: Whether to list the day's individual tasks.
+
+    Returns:
+        DailySummary for the specified date.
+    """
+    if date is None:
+        date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if db is None:
+        db = get_metrics_db()
+
+    rows = db.query_aggregates(date, date, granularity=None, group_by=("workflow", "model"))
+
+    task_details = []
+    if include_tasks:
+        for metrics in db.get_metrics_for_date(date):
+            task_details.append(
+                {
+                    "task_id": metrics.task_id,
+                    "description": metrics.description,
+                    "status": metrics.status,
+                    "duration": metrics.total_duration_seconds,
+                    "retries": metrics.total_retries,
+                    "tokens": metrics.total_tokens,
+                }
+            )
+
+    return summarize_aggregates(date, rows, task_details)
+
+
 def get_daily_summary(
     date: datetime | None = None,
     db: MetricsDB | None = None,
@@ -2,6 +2,10 @@
 
 This module provides the database and models for tracking per-task metrics
 including duration, retry counts, token usage, and commits.
+
+Every recorded task is also rolled up into hourly aggregates, bucketed by
+workflow and model, so reports can sum a handful of aggregate rows instead of
+loading every task.
 """
 
 from __future__ import annotations
@@ -25,6 +29,86 @@ _local = threading.local()
 # Global database instance
 _db_instance: MetricsDB | None = None
 
+# Columns summed by the hourly and daily aggregate tables
+AGGREGATE_COLUMNS = (
+    "tasks_completed",
+    "tasks_failed",
+    "tasks_in_progress",
+    "total_commits",
+    "total_duration_seconds",
+    "total_input_tokens",
+    "total_output_tokens",
+    "total_retries",
+    "files_modified",
+    "lines_added",
+    "lines_removed",
+)
+
+# Dimensions aggregates can be broken down by
+AGGREGATE_DIMENSIONS = ("workflow", "model")
+
+
+def _upsert_sql(table: str, keys: tuple[str, ...]) -> str:
+    """Build an UPSERT that adds a task's contribution to an aggregate row."""
+    columns = keys + AGGREGATE_COLUMNS
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT({', '.join(keys)}) DO UPDATE SET "
+        + ", ".join(f"{c} = {c} + excluded.{c}" for c in AGGREGATE_COLUMNS)
+    )
+
+
+_HOURLY_UPSERT = _upsert_sql("hourly_aggregates", ("hour", "workflow", "model"))
+_DAILY_UPSERT = _upsert_sql("daily_aggregates", ("date",))
+
+# SQL expressions for a task_metrics row's aggregate contribution
+_ROLLUP_SELECT = """
+    SUM(COALESCE(status, '') = 'completed'),
+    SUM(COALESCE(status, '') = 'failed'),
+    SUM(COALESCE(status, '') NOT IN ('completed', 'failed')),
+    SUM(commits_generated),
+    SUM(total_duration_seconds),
+    SUM(total_input_tokens),
+    SUM(total_output_tokens),
+    SUM(total_retries),
+    SUM(files_modified),
+    SUM(lines_added),
+    SUM(lines_removed)
+"""
+
+
+def _hour_key(start_time: str) -> str:
+    """Get the hourly bucket ('YYYY-MM-DD HH') of an ISO start time."""
+    return start_time.replace("T", " ")[:13]
+
+
+def _day_bounds(start_date: datetime, end_date: datetime) -> tuple[str, str]:
+    """Get ISO start_time bounds [start, end) covering whole days.
+
+    Comparing start_time directly, rather than date(start_time), lets SQLite
+    use the start_time index.
+    """
+    return start_date.strftime("%Y-%m-%d"), (end_date + timedelta(days=1)).strftime("%Y-%m-%d")
+
+
+def _contribution(row: dict[str, Any], sign: int) -> list[float]:
+    """Get a task row's contribution to the aggregate columns."""
+    status = row.get("status") or ""
+    values = [
+        status == "completed",
+        status == "failed",
+        status not in ("completed", "failed"),
+        row.get("commits_generated") or 0,
+        row.get("total_duration_seconds") or 0,
+        row.get("total_input_tokens") or 0,
+        row.get("total_output_tokens") or 0,
+        row.get("total_retries") or 0,
+        row.get("files_modified") or 0,
+        row.get("lines_added") or 0,
+        row.get("lines_removed") or 0,
+    ]
+    return [sign * v for v in values]
+
 
 @dataclass
 class PhaseMetrics:
@@ -37,6 +121,12 @@ class PhaseMetrics:
         input_tokens: Tokens used for input/prompts.
         output_tokens: Tokens generated as output.
         success: Whether the phase completed successfully.
+        cache_read_tokens: Prompt tokens served from the prompt cache
+            (not included in input_tokens).
+        cost_usd: API cost reported by the agent, in USD.
+        num_turns: Number of agent turns.
+        ttft_seconds: Time from launching the agent to its first response,
+            if it was measured.
     """
 
     name: str
@@ -45,6 +135,10 @@ class PhaseMetrics:
     input_tokens: int = 0
     output_tokens: int = 0
     success: bool = True
+    cache_read_tokens: int = 0
+    cost_usd: float = 0.0
+    num_turns: int = 0
+    ttft_seconds: float | None = None
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for storage."""
@@ -55,6 +149,10 @@ class PhaseMetrics:
             "input_tokens": self.input_tokens,
             "output_tokens": self.output_tokens,
             "success": self.success,
+            "cache_read_tokens": self.cache_read_tokens,
+            "cost_usd": self.cost_usd,
+            "num_turns": self.num_turns,
+            "ttft_seconds": self.ttft_seconds,
         }
 
     @classmethod
@@ -67,8 +165,32 @@ class PhaseMetrics:
             input_tokens=data.get("input_tokens", 0),
             output_tokens=data.get("output_tokens", 0),
             success=data.get("success", True),
+            cache_read_tokens=data.get("cache_read_tokens", 0),
+            cost_usd=data.get("cost_usd", 0.0),
+            num_turns=data.get("num_turns", 0),
+            ttft_seconds=data.get("ttft_seconds"),
         )
 
+    def add(self, other: PhaseMetrics) -> None:
+        """Fold a later run of the same phase into this one.
+
+        Counts and durations are summed; success and time to first token
+        are taken from the later run.
+
+        Args:
+            other: Metrics of the later run.
+        """
+        self.duration_seconds += other.duration_seconds
+        self.retries += other.retries
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+        self.cache_read_tokens += other.cache_read_tokens
+        self.cost_usd += other.cost_usd
+        self.num_turns += other.num_turns
+        self.success = other.success
+        if other.ttft_seconds is not None:
+            self.ttft_seconds = other.ttft_seconds
+
 
 @dataclass
 class TaskMetrics:
@@ -78,6 +200,7 @@ class TaskMetrics:
         task_id: The ADW task ID.
         description: Task description.
         workflow: Workflow type (simple, standard, sdlc).
+        model: Model that ran the task (sonnet, opus, haiku), if known.
         status: Final task status (completed, failed).
         start_time: When task execution started.
         end_time: When task execution ended.
@@ -86,6 +209,7 @@ class TaskMetrics:
         total_retries: Sum of all retry attempts.
         total_input_tokens: Sum of all input tokens.
         total_output_tokens: Sum of all output tokens.
+        total_cost_usd: Sum of the API costs reported by the agent.
         commits_generated: Number of commits made.
         files_modified: Number of files changed.
         lines_added: Lines of code added.
@@ -95,6 +219,7 @@ class TaskMetrics:
     task_id: str
     description: str = ""
     workflow: str = "standard"
+    model: str = ""
     status: str = "completed"
     start_time: datetime = field(default_factory=datetime.now)
     end_time: datetime | None = None
@@ -103,6 +228,7 @@ class TaskMetrics:
     total_retries: int = 0
     total_input_tokens: int = 0
     total_output_tokens: int = 0
+    total_cost_usd: float = 0.0
     commits_generated: int = 0
     files_modified: int = 0
     lines_added: int = 0
@@ -155,6 +281,7 @@ class TaskMetrics:
             "task_id": self.task_id,
             "description": self.description,
             "workflow": self.workflow,
+            "model": self.model,
             "status": self.status,
             "start_time": self.start_time.isoformat(),
             "end_time": self.end_time.isoformat() if self.end_time else None,
@@ -163,6 +290,7 @@ class TaskMetrics:
             "total_retries": self.total_retries,
             "total_input_tokens": self.total_input_tokens,
             "total_output_tokens": self.total_output_tokens,
+            "total_cost_usd": self.total_cost_usd,
             "commits_generated": self.commits_generated,
             "files_modified": self.files_modified,
             "lines_added": self.lines_added,
@@ -180,6 +308,7 @@ class TaskMetrics:
             task_id=data["task_id"],
             description=data.get("description", ""),
             workflow=data.get("workflow", "standard"),
+            model=data.get("model") or "",
             status=data.get("status", "completed"),
             start_time=datetime.fromisoformat(data["start_time"])
             if isinstance(data["start_time"], str)
@@ -190,6 +319,7 @@ class TaskMetrics:
             total_retries=data.get("total_retries", 0),
             total_input_tokens=data.get("total_input_tokens", 0),
             total_output_tokens=data.get("total_output_tokens", 0),
+            total_cost_usd=data.get("total_cost_usd") or 0.0,
             commits_generated=data.get("commits_generated", 0),
             files_modified=data.get("files_modified", 0),
             lines_added=data.get("lines_added", 0),
@@ -246,6 +376,25 @@ class MetricsDB:
         finally:
             cursor.close()
 
+    @contextmanager
+    def _write_cursor(self) -> Iterator[sqlite3.Cursor]:
+        """Get a cursor inside a write transaction.
+
+        The transaction takes the write lock up front, so read-modify-write
+        updates from different processes are serialized.
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
     def _init_db(self) -> None:
         """Initialize database schema."""
         with self._cursor() as cursor:
@@ -313,118 +462,251 @@ class MetricsDB:
                 """
             )
 
+            # Databases created before tasks recorded their model
+            columns = {row["name"] for row in cursor.execute("PRAGMA table_info(task_metrics)")}
+            if "model" not in columns:
+                cursor.execute("ALTER TABLE task_metrics ADD COLUMN model TEXT DEFAULT ''")
+            if "total_cost_usd" not in columns:
+                cursor.execute("ALTER TABLE task_metrics ADD COLUMN total_cost_usd REAL DEFAULT 0")
+
+            # Hourly rollups by workflow and model, maintained by record_metrics
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'hourly_aggregates'")
+            hourly_exists = cursor.fetchone() is not None
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS hourly_aggregates (
+                    hour TEXT NOT NULL,
+                    workflow TEXT NOT NULL DEFAULT '',
+                    model TEXT NOT NULL DEFAULT '',
+                    tasks_completed INTEGER DEFAULT 0,
+                    tasks_failed INTEGER DEFAULT 0,
+                    tasks_in_progress INTEGER DEFAULT 0,
+                    total_commits INTEGER DEFAULT 0,
+                    total_duration_seconds REAL DEFAULT 0,
+                    total_input_tokens INTEGER DEFAULT 0,
+                    total_output_tokens INTEGER DEFAULT 0,
+                    total_retries INTEGER DEFAULT 0,
+                    files_modified INTEGER DEFAULT 0,
+                    lines_added INTEGER DEFAULT 0,
+                    lines_removed INTEGER DEFAULT 0,
+                    PRIMARY KEY (hour, workflow, model)
+                ) WITHOUT ROWID
+                """
+            )
+            if not hourly_exists:
+                self._rebuild_aggregates(cursor)
+
+    @staticmethod
+    def _rebuild_aggregates(cursor: sqlite3.Cursor) -> None:
+        """Recompute hourly and daily aggregates from task_metrics."""
+        cursor.execute("DELETE FROM hourly_aggregates")
+        cursor.execute(
+            f"""
+            INSERT INTO hourly_aggregates (hour, workflow, model, {", ".join(AGGREGATE_COLUMNS)})
+            SELECT substr(replace(start_time, 'T', ' '), 1, 13), COALESCE(workflow, ''), COALESCE(model, ''),
+                {_ROLLUP_SELECT}
+            FROM task_metrics
+            GROUP BY 1, 2, 3
+            """
+        )
+        cursor.execute("DELETE FROM daily_aggregates")
+        cursor.execute(
+            f"""
+            INSERT INTO daily_aggregates (date, {", ".join(AGGREGATE_COLUMNS)})
+            SELECT substr(hour, 1, 10), {", ".join(f"SUM({c})" for c in AGGREGATE_COLUMNS)}
+            FROM hourly_aggregates
+            GROUP BY 1
+            """
+        )
+
+    def rebuild_aggregates(self) -> None:
+        """Rebuild the hourly and daily aggregates from recorded tasks."""
+        with self._cursor() as cursor:
+            self._rebuild_aggregates(cursor)
+
     def record_metrics(self, metrics: TaskMetrics) -> None:
         """Record task metrics.
 
+        Re-recording a task replaces its previous metrics, in the aggregates
+        as well as the task row.
+
         Args:
             metrics: TaskMetrics to record.
         """
+        with self._write_cursor() as cursor:
+            self._record_metrics(cursor, metrics)
+
+    def _record_metrics(self, cursor: sqlite3.Cursor, metrics: TaskMetrics) -> None:
+        """Record task metrics within the caller's write transaction."""
         data = metrics.to_dict()
 
-        with self._cursor() as cursor:
-            cursor.execute(
-                """
-                INSERT OR REPLACE INTO task_metrics (
-                    task_id, description, workflow, status,
-                    start_time, end_time, total_duration_seconds,
-                    phases, total_retries,
-                    total_input_tokens, total_output_tokens,
-                    commits_generated, files_modified,
-                    lines_added, lines_removed
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    data["task_id"],
-                    data["description"],
-                    data["workflow"],
-                    data["status"],
-                    data["start_time"],
-                    data["end_time"],
-                    data["total_duration_seconds"],
-                    data["phases"],
-                    data["total_retries"],
-                    data["total_input_tokens"],
-                    data["total_output_tokens"],
-                    data["commits_generated"],
-                    data["files_modified"],
-                    data["lines_added"],
-                    data["lines_removed"],
-                ),
-            )
+        cursor.execute("SELECT * FROM task_metrics WHERE task_id = ?", (data["task_id"],))
+        previous = cursor.fetchone()
+        if previous:
+            self._apply_aggregates(cursor, dict(previous), -1)
+
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO task_metrics (
+                task_id, description, workflow, model, status,
+                start_time, end_time, total_duration_seconds,
+                phases, total_retries,
+                total_input_tokens, total_output_tokens, total_cost_usd,
+                commits_generated, files_modified,
+                lines_added, lines_removed
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                data["task_id"],
+                data["description"],
+                data["workflow"],
+                data["model"],
+                data["status"],
+                data["start_time"],
+                data["end_time"],
+                data["total_duration_seconds"],
+                data["phases"],
+                data["total_retries"],
+                data["total_input_tokens"],
+                data["total_output_tokens"],
+                data["total_cost_usd"],
+                data["commits_generated"],
+                data["files_modified"],
+                data["lines_added"],
+                data["lines_removed"],
+            ),
+        )
 
-        # Update daily aggregates
-        self._update_daily_aggregate(metrics)
+        # Update hourly and daily aggregates
+        self._apply_aggregates(cursor, data, 1)
 
-    def _update_daily_aggregate(self, metrics: TaskMetrics) -> None:
-        """Update daily aggregate for the task's date."""
-        date_str = metrics.start_time.strftime("%Y-%m-%d")
+    def _apply_aggregates(self, cursor: sqlite3.Cursor, row: dict[str, Any], sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) a task row from the aggregates."""
+        hour = _hour_key(row["start_time"])
+        workflow = row.get("workflow") or ""
+        model = row.get("model") or ""
+        values = _contribution(row, sign)
 
-        with self._cursor() as cursor:
-            # Get existing aggregate
+        cursor.execute(_HOURLY_UPSERT, (hour, workflow, model, *values))
+        cursor.execute(_DAILY_UPSERT, (hour[:10], *values))
+
+        if sign < 0:
+            # Drop buckets the task was the only contributor to
+            empty = "tasks_completed + tasks_failed + tasks_in_progress <= 0"
             cursor.execute(
-                "SELECT * FROM daily_aggregates WHERE date = ?",
-                (date_str,),
+                f"DELETE FROM hourly_aggregates WHERE hour = ? AND workflow = ? AND model = ? AND {empty}",
+                (hour, workflow, model),
             )
-            row = cursor.fetchone()
+            cursor.execute(f"DELETE FROM daily_aggregates WHERE date = ? AND {empty}", (hour[:10],))
+
+    def record_phase(
+        self,
+        task_id: str,
+        phase: PhaseMetrics,
+        model: str = "",
+        workflow: str = "standard",
+        description: str = "",
+        ended_at: datetime | None = None,
+        only_if_missing: bool = False,
+    ) -> TaskMetrics:
+        """Add a phase to a task, creating the task if it is not recorded yet.
+
+        A new task is in progress until finish_task records how its workflow
+        ended. A later run of a phase the task already has is folded into it.
+        Task totals grow by the phase's values, and a failed phase marks the
+        task failed.
+
+        Args:
+            task_id: Task ID.
+            phase: Metrics of the phase run.
+            model: Model that ran the phase (kept if the task has none).
+            workflow: Workflow type, for a new task.
+            description: Task description, for a new task.
+            ended_at: When the phase ended. Defaults to now.
+            only_if_missing: Leave the task unchanged if it already has a
+                phase of this name (makes re-imports idempotent).
 
-            if row:
-                # Update existing
-                completed_delta = 1 if metrics.status == "completed" else 0
-                failed_delta = 1 if metrics.status == "failed" else 0
-
-                cursor.execute(
-                    """
-                    UPDATE daily_aggregates SET
-                        tasks_completed = tasks_completed + ?,
-                        tasks_failed = tasks_failed + ?,
-                        total_commits = total_commits + ?,
-                        total_duration_seconds = total_duration_seconds + ?,
-                        total_input_tokens = total_input_tokens + ?,
-                        total_output_tokens = total_output_tokens + ?,
-                        total_retries = total_retries + ?,
-                        files_modified = files_modified + ?,
-                        lines_added = lines_added + ?,
-                        lines_removed = lines_removed + ?
-                    WHERE date = ?
-                    """,
-                    (
-                        completed_delta,
-                        failed_delta,
-                        metrics.commits_generated,
-                        metrics.total_duration_seconds,
-                        metrics.total_input_tokens,
-                        metrics.total_output_tokens,
-                        metrics.total_retries,
-                        metrics.files_modified,
-                        metrics.lines_added,
-                        metrics.lines_removed,
-                        date_str,
-                    ),
+        Returns:
+            The task's updated metrics.
+        """
+        ended_at = ended_at or datetime.now()
+
+        with self._write_cursor() as cursor:
+            metrics = self._get_metrics(cursor, task_id)
+            if metrics is None:
+                metrics = TaskMetrics(
+                    task_id=task_id,
+                    description=description,
+                    workflow=workflow,
+                    status="in_progress",
+                    start_time=ended_at - timedelta(seconds=phase.duration_seconds),
+                    end_time=ended_at,
                 )
+
+            existing = next((p for p in metrics.phases if p.name == phase.name), None)
+            if existing is not None:
+                if only_if_missing:
+                    return metrics
+                existing.add(phase)
             else:
-                # Insert new
-                cursor.execute(
-                    """
-                    INSERT INTO daily_aggregates (
-                        date, tasks_completed, tasks_failed, total_commits,
-                        total_duration_seconds, total_input_tokens, total_output_tokens,
-                        total_retries, files_modified, lines_added, lines_removed
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        date_str,
-                        1 if metrics.status == "completed" else 0,
-                        1 if metrics.status == "failed" else 0,
-                        metrics.commits_generated,
-                        metrics.total_duration_seconds,
-                        metrics.total_input_tokens,
-                        metrics.total_output_tokens,
-                        metrics.total_retries,
-                        metrics.files_modified,
-                        metrics.lines_added,
-                        metrics.lines_removed,
-                    ),
-                )
+                metrics.phases.append(phase)
+
+            metrics.total_duration_seconds += phase.duration_seconds
+            metrics.total_retries += phase.retries
+            metrics.total_input_tokens += phase.input_tokens
+            metrics.total_output_tokens += phase.output_tokens
+            metrics.total_cost_usd += phase.cost_usd
+            metrics.model = metrics.model or model
+            if not phase.success:
+                metrics.status = "failed"
+            if metrics.end_time is None or ended_at > metrics.end_time:
+                metrics.end_time = ended_at
+
+            self._record_metrics(cursor, metrics)
+
+        return metrics
+
+    def finish_task(
+        self,
+        task_id: str,
+        status: str,
+        workflow: str = "",
+        description: str = "",
+        ended_at: datetime | None = None,
+    ) -> TaskMetrics:
+        """Record how a task's workflow ended.
+
+        Phases are recorded by agent runs, which do not know the workflow or
+        the task description; both are filled in here. A task with no
+        recorded phases is created.
+
+        Args:
+            task_id: Task ID.
+            status: Final status (completed/failed).
+            workflow: Workflow type. Kept as recorded if empty.
+            description: Task description. Kept as recorded if empty.
+            ended_at: When the workflow ended. Defaults to now.
+
+        Returns:
+            The task's updated metrics.
+        """
+        ended_at = ended_at or datetime.now()
+
+        with self._write_cursor() as cursor:
+            metrics = self._get_metrics(cursor, task_id) or TaskMetrics(
+                task_id=task_id,
+                start_time=ended_at,
+                end_time=ended_at,
+            )
+            metrics.status = status
+            metrics.workflow = workflow or metrics.workflow
+            metrics.description = description or metrics.description
+            if metrics.end_time is None or ended_at > metrics.end_time:
+                metrics.end_time = ended_at
+
+            self._record_metrics(cursor, metrics)
+
+        return metrics
 
     def get_metrics(self, task_id: str) -> TaskMetrics | None:
         """Get metrics for a specific task.
@@ -436,11 +718,16 @@ class MetricsDB:
             TaskMetrics or None if not found.
         """
         with self._cursor() as cursor:
-            cursor.execute(
-                "SELECT * FROM task_metrics WHERE task_id = ?",
-                (task_id,),
-            )
-            row = cursor.fetchone()
+            return self._get_metrics(cursor, task_id)
+
+    @staticmethod
+    def _get_metrics(cursor: sqlite3.Cursor, task_id: str) -> TaskMetrics | None:
+        """Get a task's metrics within the caller's transaction."""
+        cursor.execute(
+            "SELECT * FROM task_metrics WHERE task_id = ?",
+            (task_id,),
+        )
+        row = cursor.fetchone()
 
         if not row:
             return None
@@ -456,16 +743,14 @@ class MetricsDB:
         Returns:
             List of TaskMetrics for that date.
         """
-        date_str = date.strftime("%Y-%m-%d")
-
         with self._cursor() as cursor:
             cursor.execute(
                 """
                 SELECT * FROM task_metrics
-                WHERE date(start_time) = ?
+                WHERE start_time >= ? AND start_time < ?
                 ORDER BY start_time DESC
                 """,
-                (date_str,),
+                _day_bounds(date, date),
             )
             rows = cursor.fetchall()
 
@@ -485,17 +770,14 @@ class MetricsDB:
         Returns:
             List of TaskMetrics in the range.
         """
-        start_str = start_date.strftime("%Y-%m-%d")
-        end_str = end_date.strftime("%Y-%m-%d")
-
         with self._cursor() as cursor:
             cursor.execute(
                 """
                 SELECT * FROM task_metrics
-                WHERE date(start_time) >= ? AND date(start_time) <= ?
+                WHERE start_time >= ? AND start_time < ?
                 ORDER BY start_time DESC
                 """,
-                (start_str, end_str),
+                _day_bounds(start_date, end_date),
             )
             rows = cursor.fetchall()
 
@@ -551,6 +833,116 @@ class MetricsDB:
 
         return [dict(row) for row in rows]
 
+    def query_aggregates(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        granularity: str | None = "day",
+        group_by: tuple[str, ...] = (),
+    ) -> list[dict[str, Any]]:
+        """Sum the hourly aggregates over a range.
+
+        Args:
+            start_date: Start of range (inclusive). Whole days unless
+                granularity is "hour".
+            end_date: End of range (inclusive). Whole days unless
+                granularity is "hour".
+            granularity: Bucket size: "hour", "day", or None for a single
+                bucket over the whole range.
+            group_by: Dimensions to break buckets down by ("workflow",
+                "model").
+
+        Returns:
+            One dictionary per bucket, oldest first, with a "period" key
+            ('YYYY-MM-DD HH' or 'YYYY-MM-DD', absent when granularity is
+            None), the group_by dimensions, and the summed aggregate columns.
+
+        Raises:
+            ValueError: If granularity or group_by is not supported.
+        """
+        if granularity not in ("hour", "day", None):
+            raise ValueError(f"Unsupported granularity: {granularity}")
+        unknown = set(group_by) - set(AGGREGATE_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unsupported aggregate dimensions: {', '.join(sorted(unknown))}")
+
+        if granularity == "hour":
+            low, high = start_date.strftime("%Y-%m-%d %H"), end_date.strftime("%Y-%m-%d %H")
+        else:
+            low, high = start_date.strftime("%Y-%m-%d 00"), end_date.strftime("%Y-%m-%d 23")
+
+        keys = list(group_by)
+        if granularity == "hour":
+            keys.insert(0, "hour AS period")
+        elif granularity == "day":
+            keys.insert(0, "substr(hour, 1, 10) AS period")
+        sums = ", ".join(f"SUM({c}) AS {c}" for c in AGGREGATE_COLUMNS)
+        positions = ", ".join(str(i) for i in range(1, len(keys) + 1))
+        group_clause = f"GROUP BY {positions} ORDER BY {positions}" if keys else ""
+
+        with self._cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT {", ".join([*keys, sums])}
+                FROM hourly_aggregates
+                WHERE hour >= ? AND hour <= ?
+                {group_clause}
+                """,
+                (low, high),
+            )
+            rows = cursor.fetchall()
+
+        # An ungrouped SUM over no rows still yields one all-NULL row
+        return [
+            {k: (v or 0) if k in AGGREGATE_COLUMNS else v for k, v in dict(row).items()}
+            for row in rows
+            if row["tasks_completed"] is not None
+        ]
+
+    def get_task_extremes(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
+        """Find the fastest completed task and the most retried task in a range.
+
+        Args:
+            start_date: Start of range (inclusive day).
+            end_date: End of range (inclusive day).
+
+        Returns:
+            Tuple of (best_task, worst_task) dictionaries with task_id,
+            description, status, duration and retries. Ties go to the most
+            recent task.
+        """
+        columns = "task_id, description, status, total_duration_seconds AS duration, total_retries AS retries"
+        where = "start_time >= ? AND start_time < ?"
+        bounds = _day_bounds(start_date, end_date)
+
+        with self._cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT {columns} FROM task_metrics
+                WHERE {where} AND status = 'completed'
+                ORDER BY total_duration_seconds ASC, start_time DESC
+                LIMIT 1
+                """,
+                bounds,
+            )
+            best = cursor.fetchone()
+            cursor.execute(
+                f"""
+                SELECT {columns} FROM task_metrics
+                WHERE {where}
+                ORDER BY total_retries DESC, start_time DESC
+                LIMIT 1
+                """,
+                bounds,
+            )
+            worst = cursor.fetchone()
+
+        return (dict(best) if best else None), (dict(worst) if worst else None)
+
     def get_recent_metrics(self, limit: int = 50) -> list[TaskMetrics]:
         """Get most recent task metrics.
 
@@ -605,6 +997,7 @@ class MetricsDB:
                     AVG(total_retries) as avg_retries,
                     SUM(total_input_tokens) as total_input_tokens,
                     SUM(total_output_tokens) as total_output_tokens,
+                    SUM(total_cost_usd) as total_cost_usd,
                     SUM(commits_generated) as total_commits,
                     SUM(files_modified) as total_files_modified,
                     SUM(lines_added) as total_lines_added,
@@ -628,6 +1021,7 @@ class MetricsDB:
                 "avg_retries": 0,
                 "total_input_tokens": 0,
                 "total_output_tokens": 0,
+                "total_cost_usd": 0.0,
                 "total_commits": 0,
                 "total_files_modified": 0,
                 "total_lines_added": 0,
@@ -648,6 +1042,7 @@ class MetricsDB:
             "avg_retries": row["avg_retries"] or 0,
             "total_input_tokens": row["total_input_tokens"] or 0,
             "total_output_tokens": row["total_output_tokens"] or 0,
+            "total_cost_usd": row["total_cost_usd"] or 0.0,
             "total_commits": row["total_commits"] or 0,
             "total_files_modified": row["total_files_modified"] or 0,
             "total_lines_added": row["total_lines_added"] or 0,
@@ -690,6 +1085,20 @@ def record_task_metrics(metrics: TaskMetrics) -> None:
     get_metrics_db().record_metrics(metrics)
 
 
+def record_phase_metrics(task_id: str, phase: PhaseMetrics, model: str = "") -> TaskMetrics:
+    """Add a phase to a task using the global database.
+
+    Args:
+        task_id: Task ID.
+        phase: Metrics of the phase run.
+        model: Model that ran the phase.
+
+    Returns:
+        The task's updated metrics.
+    """
+    return get_metrics_db().record_phase(task_id, phase, model=model)
+
+
 def record_task_completion(
     task_id: str,
     description: str = "",
@@ -703,6 +1112,7 @@ def record_task_completion(
     files_modified: int = 0,
     lines_added: int = 0,
     lines_removed: int = 0,
+    model: str = "",
 ) -> TaskMetrics:
     """Record a task completion with basic metrics.
 
@@ -722,6 +1132,7 @@ def record_task_completion(
         files_modified: Files modified.
         lines_added: Lines added.
         lines_removed: Lines removed.
+        model: Model that ran the task.
 
     Returns:
         The created TaskMetrics.
@@ -730,6 +1141,7 @@ def record_task_completion(
         task_id=task_id,
         description=description,
         workflow=workflow,
+        model=model,
         status=status,
         start_time=datetime.now() - timedelta(seconds=duration_seconds),
         end_time=datetime.now(),
@@ -13,8 +13,10 @@ from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any
-from urllib.error import URLError
-from urllib.request import Request, urlopen
+
+import httpx
+
+from ..utils import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -216,21 +218,11 @@ def _send_webhook(url: str, payload: dict[str, Any]) -> bool:
         True if successful, False otherwise.
     """
     try:
-        data = json.dumps(payload).encode("utf-8")
-        request = Request(
-            url,
-            data=data,
-            headers={"Content-Type": "application/json"},
-            method="POST",
-        )
-        with urlopen(request, timeout=10) as response:
-            return bool(response.status == 200 or response.status == 204)
-    except URLError as e:
+        response = http_client.request("POST", url, json=payload, timeout=10)
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
         logger.error(f"Failed to send webhook: {e}")
         return False
-    except Exception as e:
-        logger.error(f"Unexpected error sending webhook: {e}")
-        return False
+    return response.status_code in (200, 204)
 
 
 def send_notification(
@@ -0,0 +1,284 @@
+"""Array-backed statistics for metric time series.
+
+Trend reports compute the same statistics for every metric: summary
+statistics, a rolling mean, an exponentially weighted moving average (EWMA),
+a least-squares slope and anomaly scores. This module computes them for a
+whole series at once, with NumPy when it is installed and ``array``-based
+loops otherwise. Both backends give the same results.
+
+Anomaly scores are modified z-scores (median/MAD) of each value after its
+seasonal level is removed. The seasonal level is the median of all values in
+the same slot (hour of day for hourly series, weekday for daily ones), so a
+busy Monday or a quiet 3am is not flagged just because it differs from the
+rest of the week.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from collections import defaultdict
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from statistics import median
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None  # type: ignore[assignment]
+
+# Whether the NumPy backend is available
+HAS_NUMPY = np is not None
+
+# Rolling mean window, in periods
+DEFAULT_WINDOW = 7
+
+# EWMA smoothing factor (weight of the newest value)
+DEFAULT_EWMA_ALPHA = 0.3
+
+# Modified z-score above which a value is anomalous (Iglewicz and Hoaglin)
+ANOMALY_THRESHOLD = 3.5
+
+# Scale factors making MAD, or mean absolute deviation when MAD is zero,
+# comparable to a standard deviation for normally distributed data
+MAD_SCALE = 1.4826
+MEAN_AD_SCALE = 1.2533
+
+# Seasonal levels are only removed once every slot has this many values
+MIN_SEASONS = 3
+
+# EWMA is vectorized in chunks short enough that the decay powers stay finite
+_EWMA_CHUNK = 64
+
+
+@dataclass
+class SeriesStats:
+    """Statistics of one metric series.
+
+    Attributes:
+        count: Number of values.
+        mean: Mean value.
+        std: Population standard deviation.
+        minimum: Smallest value.
+        maximum: Largest value.
+        slope: Least-squares slope, in value units per period.
+        rolling_mean: Trailing rolling mean at each period.
+        ewma: Exponentially weighted moving average at each period.
+        scores: Robust anomaly score of each value (signed).
+    """
+
+    count: int = 0
+    mean: float = 0.0
+    std: float = 0.0
+    minimum: float = 0.0
+    maximum: float = 0.0
+    slope: float = 0.0
+    rolling_mean: list[float] = field(default_factory=list)
+    ewma: list[float] = field(default_factory=list)
+    scores: list[float] = field(default_factory=list)
+
+    def anomalies(self, threshold: float = ANOMALY_THRESHOLD) -> list[int]:
+        """Get the indexes of anomalous values.
+
+        Args:
+            threshold: Minimum absolute anomaly score.
+
+        Returns:
+            Indexes whose score exceeds the threshold.
+        """
+        return [i for i, score in enumerate(self.scores) if abs(score) > threshold]
+
+
+def _seasonal(slots: Sequence[int] | None, count: int) -> bool:
+    """Check whether there is enough history to remove seasonal levels."""
+    if slots is None or len(slots) != count:
+        return False
+    counts: dict[int, int] = defaultdict(int)
+    for slot in slots:
+        counts[slot] += 1
+    return len(counts) > 1 and min(counts.values()) >= MIN_SEASONS
+
+
+def _stats_python(
+    values: Sequence[float],
+    slots: Sequence[int] | None,
+    window: int,
+    alpha: float,
+) -> SeriesStats:
+    data = array("d", values)
+    n = len(data)
+
+    mean = math.fsum(data) / n
+    std = math.sqrt(math.fsum((x - mean) ** 2 for x in data) / n) if n > 1 else 0.0
+
+    rolling = array("d", bytes(8 * n))
+    running = 0.0
+    for i, x in enumerate(data):
+        running += x
+        if i >= window:
+            running -= data[i - window]
+        rolling[i] = running / min(i + 1, window)
+
+    ewma = array("d", bytes(8 * n))
+    level = data[0]
+    for i, x in enumerate(data):
+        level = alpha * x + (1 - alpha) * level
+        ewma[i] = level
+
+    x_mean = (n - 1) / 2
+    denominator = math.fsum((i - x_mean) ** 2 for i in range(n))
+    slope = math.fsum((i - x_mean) * (x - mean) for i, x in enumerate(data)) / denominator if denominator else 0.0
+
+    residuals = data
+    if slots is not None and _seasonal(slots, n):
+        by_slot: dict[int, list[float]] = defaultdict(list)
+        for slot, x in zip(slots, data, strict=True):
+            by_slot[slot].append(x)
+        levels = {slot: median(xs) for slot, xs in by_slot.items()}
+        residuals = array("d", (x - levels[slot] for slot, x in zip(slots, data, strict=True)))
+
+    center = median(residuals)
+    deviations = [abs(r - center) for r in residuals]
+    spread = MAD_SCALE * median(deviations)
+    if spread == 0:
+        spread = MEAN_AD_SCALE * math.fsum(deviations) / n
+    scores = [(r - center) / spread for r in residuals] if spread else [0.0] * n
+
+    return SeriesStats(
+        count=n,
+        mean=mean,
+        std=std,
+        minimum=min(data),
+        maximum=max(data),
+        slope=slope,
+        rolling_mean=rolling.tolist(),
+        ewma=ewma.tolist(),
+        scores=scores,
+    )
+
+
+def _ewma_numpy(data: Any, alpha: float) -> Any:
+    """EWMA as cumulative sums of decay-scaled values, one chunk at a time."""
+    out = np.empty_like(data)
+    beta = 1 - alpha
+    level = data[0]
+    for start in range(0, len(data), _EWMA_CHUNK):
+        chunk = data[start : start + _EWMA_CHUNK]
+        if beta == 0:
+            out[start : start + len(chunk)] = chunk
+            level = chunk[-1]
+            continue
+        decay = beta ** np.arange(1, len(chunk) + 1)
+        # level_j = beta^(j+1) * (level + alpha * sum_{k<=j} x_k / beta^(k+1))
+        out[start : start + len(chunk)] = decay * (level + alpha * np.cumsum(chunk / decay))
+        level = out[start + len(chunk) - 1]
+    return out
+
+
+def _stats_numpy(
+    values: Sequence[float],
+    slots: Sequence[int] | None,
+    window: int,
+    alpha: float,
+) -> SeriesStats:
+    data = np.asarray(values, dtype=np.float64)
+    n = len(data)
+
+    mean = float(data.mean())
+    std = float(data.std()) if n > 1 else 0.0
+
+    sums = np.concatenate(([0.0], np.cumsum(data)))
+    index = np.arange(n)
+    lower = np.maximum(index + 1 - window, 0)
+    rolling = (sums[index + 1] - sums[lower]) / (index + 1 - lower)
+
+    ewma = _ewma_numpy(data, alpha)
+
+    centered = index - (n - 1) / 2
+    denominator = float(np.dot(centered, centered))
+    slope = float(np.dot(centered, data - mean)) / denominator if denominator else 0.0
+
+    residuals = data
+    if slots is not None and _seasonal(slots, n):
+        slot_array = np.asarray(slots)
+        levels = np.empty(n)
+        for slot in np.unique(slot_array):
+            mask = slot_array == slot
+            levels[mask] = np.median(data[mask])
+        residuals = data - levels
+
+    center = np.median(residuals)
+    deviations = np.abs(residuals - center)
+    spread = MAD_SCALE * float(np.median(deviations))
+    if spread == 0:
+        spread = MEAN_AD_SCALE * float(deviations.mean())
+    scores = (residuals - center) / spread if spread else np.zeros(n)
+
+    return SeriesStats(
+        count=n,
+        mean=mean,
+        std=std,
+        minimum=float(data.min()),
+        maximum=float(data.max()),
+        slope=slope,
+        rolling_mean=rolling.tolist(),
+        ewma=ewma.tolist(),
+        scores=scores.tolist(),
+    )
+
+
+def series_stats(
+    values: Sequence[float],
+    slots: Sequence[int] | None = None,
+    window: int = DEFAULT_WINDOW,
+    alpha: float = DEFAULT_EWMA_ALPHA,
+    use_numpy: bool | None = None,
+) -> SeriesStats:
+    """Compute the statistics of a metric series.
+
+    Args:
+        values: Values in time order.
+        slots: Seasonal slot of each value (e.g. weekday or hour of day).
+            Seasonal levels are removed before scoring anomalies once every
+            slot has at least MIN_SEASONS values.
+        window: Rolling mean window, in periods.
+        alpha: EWMA smoothing factor, in (0, 1].
+        use_numpy: Force a backend. Defaults to NumPy when installed.
+
+    Returns:
+        SeriesStats for the series (all zero for an empty series).
+    """
+    if not values:
+        return SeriesStats()
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+    if use_numpy and HAS_NUMPY:
+        return _stats_numpy(values, slots, window, alpha)
+    return _stats_python(values, slots, window, alpha)
+
+
+def resample(values: Sequence[float], width: int) -> list[float]:
+    """Shrink a series to a width by averaging equal-sized buckets.
+
+    Args:
+        values: Values in time order.
+        width: Number of buckets.
+
+    Returns:
+        Bucket means, or the values unchanged if there are no more than
+        width of them.
+    """
+    n = len(values)
+    if n <= width:
+        return list(values)
+    if HAS_NUMPY:
+        data = np.asarray(values, dtype=np.float64)
+        edges = (np.arange(width + 1) * n) // width
+        sums = np.add.reduceat(data, edges[:-1])
+        return (sums / np.diff(edges)).tolist()
+    out = []
+    for i in range(width):
+        start, end = i * n // width, (i + 1) * n // width
+        out.append(math.fsum(values[start:end]) / (end - start))
+    return out
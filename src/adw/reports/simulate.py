@@ -0,0 +1,464 @@
+"""Capacity simulation for the task queue.
+
+Predicts how the daemon would work through the current tasks.md queue,
+without running any agents. Each task is expanded into the phases of the
+workflow it would get (adaptive complexity configs or DSL phases). Phase
+durations, token usage and outcomes are drawn from the history of the same
+phase on the same model in the metrics database.
+
+A discrete-event simulation then schedules the tasks onto a number of agent
+slots the way the daemon does. Tasks start in queue order, and blocked tasks
+wait for everything above them in their worktree. It reports:
+
+- makespan, the time until the queue is drained,
+- slot utilization,
+- time tasks wait in the queue once eligible, and
+- token usage and cost.
+
+Each configuration is simulated several times with different draws, so
+results carry a spread as well as a mean.
+"""
+
+from __future__ import annotations
+
+import heapq
+import random
+import statistics
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..agent.models import Task, TaskStatus
+from ..agent.task_parser import load_tasks
+from .daily import calculate_cost
+from .metrics import MetricsDB, TaskMetrics, get_metrics_db
+
+# Number of recent tasks whose phases make up the history
+DEFAULT_HISTORY = 500
+
+# Simulations per configuration
+DEFAULT_RUNS = 20
+
+# Workflow names the daemon runs as adaptive, with the complexity they force
+ADAPTIVE_WORKFLOWS = {"adaptive": None, "simple": "minimal", "standard": "standard", "sdlc": "full"}
+
+
+@dataclass
+class PhaseSample:
+    """One recorded run of a phase.
+
+    Attributes:
+        duration_seconds: Wall-clock duration.
+        input_tokens: Input tokens used.
+        output_tokens: Output tokens generated.
+        cost_usd: Recorded cost, or 0 if the agent did not report one.
+        success: Whether the phase succeeded.
+    """
+
+    duration_seconds: float
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    success: bool = True
+
+
+@dataclass
+class SimPhase:
+    """A phase of a simulated task.
+
+    Attributes:
+        name: Phase name, as recorded in metrics.
+        model: Model the phase runs on.
+        timeout_seconds: Phase timeout, the estimate when there is no history.
+        required: Whether the task fails if this phase fails.
+        depends_on: Phases that must finish before this one starts.
+    """
+
+    name: str
+    model: str
+    timeout_seconds: float
+    required: bool = True
+    depends_on: list[str] = field(default_factory=list)
+
+
+@dataclass
+class SimTask:
+    """A queued task to simulate.
+
+    Attributes:
+        description: Task description.
+        worktree: Worktree section the task is in.
+        blocked: Whether the task waits for all tasks above it in its worktree.
+        workflow: Workflow the task runs.
+        phases: Phases of the workflow, in declaration order.
+    """
+
+    description: str
+    worktree: str
+    blocked: bool
+    workflow: str
+    phases: list[SimPhase]
+
+
+@dataclass
+class SimulationResult:
+    """Predicted outcome of draining the queue with one configuration.
+
+    Times, tokens and costs are means over all runs.
+
+    Attributes:
+        concurrency: Number of agent slots.
+        model: Model override, or None for each workflow's own models.
+        runs: Number of simulation runs.
+        makespan_seconds: Time until the last task finishes.
+        makespan_p90_seconds: 90th percentile of the makespan.
+        utilization: Fraction of slot time spent running tasks.
+        mean_wait_seconds: Mean time from a task becoming eligible to it starting.
+        max_wait_seconds: Longest such wait.
+        input_tokens: Input tokens used.
+        output_tokens: Output tokens generated.
+        cost_usd: Cost, recorded where known and estimated from tokens otherwise.
+        tasks_completed: Tasks that succeed.
+        tasks_failed: Tasks whose required phase fails.
+        tasks_stranded: Blocked tasks that never start because a task above
+            them fails.
+    """
+
+    concurrency: int
+    model: str | None
+    runs: int
+    makespan_seconds: float = 0.0
+    makespan_p90_seconds: float = 0.0
+    utilization: float = 0.0
+    mean_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    input_tokens: float = 0.0
+    output_tokens: float = 0.0
+    cost_usd: float = 0.0
+    tasks_completed: float = 0.0
+    tasks_failed: float = 0.0
+    tasks_stranded: float = 0.0
+
+    def to_dict(self) -> dict[str, float | int | str | None]:
+        """Convert to dictionary for JSON output."""
+        return dict(self.__dict__)
+
+
+class PhaseHistory:
+    """Recorded phase runs, by phase name and model."""
+
+    def __init__(self) -> None:
+        """Initialize an empty history."""
+        self.samples: dict[tuple[str, str], list[PhaseSample]] = {}
+        self.by_phase: dict[str, list[PhaseSample]] = {}
+
+    def add(self, phase: str, model: str, sample: PhaseSample) -> None:
+        """Record a phase run."""
+        self.samples.setdefault((phase, model), []).append(sample)
+        self.by_phase.setdefault(phase, []).append(sample)
+
+    @classmethod
+    def from_metrics(cls, tasks: Iterable[TaskMetrics]) -> PhaseHistory:
+        """Build a history from task metrics.
+
+        Agents are recorded as "<phase>-<adw_id>", so the suffix is dropped
+        to group runs of the same phase across tasks.
+        """
+        history = cls()
+        for task in tasks:
+            for phase in task.phases:
+                if phase.duration_seconds <= 0:
+                    continue
+                name = phase.name.removesuffix(f"-{task.task_id}").lower()
+                sample = PhaseSample(
+                    duration_seconds=phase.duration_seconds,
+                    input_tokens=phase.input_tokens,
+                    output_tokens=phase.output_tokens,
+                    cost_usd=phase.cost_usd,
+                    success=phase.success,
+                )
+                history.add(name, task.model or "sonnet", sample)
+        return history
+
+    @classmethod
+    def load(cls, db: MetricsDB | None = None, limit: int = DEFAULT_HISTORY) -> PhaseHistory:
+        """Build a history from the most recent tasks in the metrics database."""
+        return cls.from_metrics((db or get_metrics_db()).get_recent_metrics(limit))
+
+    def draw(self, phase: SimPhase, rng: random.Random) -> PhaseSample:
+        """Draw a plausible run of a phase.
+
+        Runs of the same phase on the same model are preferred. Otherwise
+        runs on any model are used, with the recorded cost dropped so it is
+        estimated for the right model. A phase that never ran takes its
+        timeout and uses no tokens.
+        """
+        runs = self.samples.get((phase.name, phase.model))
+        if runs:
+            return rng.choice(runs)
+        runs = self.by_phase.get(phase.name)
+        if runs:
+            sample = rng.choice(runs)
+            return PhaseSample(sample.duration_seconds, sample.input_tokens, sample.output_tokens, 0.0, sample.success)
+        return PhaseSample(duration_seconds=phase.timeout_seconds)
+
+
+def plan_task(task: Task, default_workflow: str = "adaptive") -> SimTask:
+    """Expand a queued task into the phases the daemon would run.
+
+    Workflow selection matches the daemon: the task's workflow tag, else
+    the default. Adaptive workflows get their phases from the detected (or
+    forced) complexity and run every phase on the task's model. Unknown
+    workflows fall back to adaptive.
+
+    Args:
+        task: Task from tasks.md.
+        default_workflow: Workflow for tasks without a workflow tag.
+
+    Returns:
+        The task with its phases.
+    """
+    from ..workflows.adaptive import AdaptiveConfig, TaskComplexity, detect_complexity
+    from ..workflows.dsl import get_workflow
+
+    workflow_name = task.workflow or default_workflow
+    dsl_workflow = None if workflow_name in ADAPTIVE_WORKFLOWS else get_workflow(workflow_name)
+
+    if dsl_workflow is not None:
+        graph = dsl_workflow.dependency_graph()
+        phases = [
+            SimPhase(p.name.lower(), p.model, p.timeout_seconds, p.required, [d.lower() for d in graph[p.name]])
+            for p in dsl_workflow.phases
+        ]
+    else:
+        forced = ADAPTIVE_WORKFLOWS.get(workflow_name)
+        workflow_name = workflow_name if workflow_name in ADAPTIVE_WORKFLOWS else "adaptive"
+        complexity = (
+            TaskComplexity(forced)
+            if forced
+            else detect_complexity(task.description, priority=task.priority, tags=task.tags)
+        )
+        phases = []
+        for config in AdaptiveConfig.for_complexity(complexity).phases:
+            previous = [phases[-1].name] if phases else []
+            phases.append(SimPhase(config.name.value, task.model, config.timeout_seconds, config.required, previous))
+
+    return SimTask(
+        description=task.description,
+        worktree=task.worktree_name or "Main",
+        blocked=task.status == TaskStatus.BLOCKED,
+        workflow=workflow_name,
+        phases=phases,
+    )
+
+
+def load_queue(tasks_file: Path | None = None, default_workflow: str = "adaptive") -> list[SimTask]:
+    """Load the pending and blocked tasks of tasks.md, in queue order."""
+    return [
+        plan_task(task, default_workflow)
+        for worktree in load_tasks(tasks_file)
+        for task in worktree.tasks
+        if task.is_eligible
+    ]
+
+
+@dataclass
+class _TaskRun:
+    """Outcome of one simulated task."""
+
+    duration: float
+    success: bool
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+
+
+def _dependency_order(phases: list[SimPhase]) -> list[SimPhase]:
+    """Order phases so each comes after its dependencies.
+
+    depends_on may name a phase declared later; otherwise declaration order
+    is kept.
+    """
+    by_name = {phase.name: phase for phase in phases}
+    ordered: list[SimPhase] = []
+    visited: set[str] = set()
+
+    def visit(phase: SimPhase) -> None:
+        if phase.name in visited:
+            return
+        visited.add(phase.name)
+        for dep in phase.depends_on:
+            if dep in by_name:
+                visit(by_name[dep])
+        ordered.append(phase)
+
+    for phase in phases:
+        visit(phase)
+    return ordered
+
+
+def _run_task(task: SimTask, history: PhaseHistory, model: str | None, rng: random.Random) -> _TaskRun:
+    """Simulate one task's phases.
+
+    Phases start as soon as their dependencies finish. A failed required
+    phase ends the task once the phases already running finish; phases
+    that were not started are not run.
+    """
+    finish: dict[str, float] = {}
+    run = _TaskRun(duration=0.0, success=True)
+    failed_at: float | None = None
+
+    for phase in _dependency_order(task.phases):
+        if any(dep not in finish for dep in phase.depends_on):
+            continue  # Waits for a phase that never ran
+        start = max((finish[dep] for dep in phase.depends_on), default=0.0)
+        if failed_at is not None and start >= failed_at:
+            continue
+        if model is not None:
+            phase = SimPhase(phase.name, model, phase.timeout_seconds, phase.required, phase.depends_on)
+        sample = history.draw(phase, rng)
+        finish[phase.name] = start + sample.duration_seconds
+        run.input_tokens += sample.input_tokens
+        run.output_tokens += sample.output_tokens
+        run.cost_usd += sample.cost_usd or calculate_cost(sample.input_tokens, sample.output_tokens, phase.model)
+        if not sample.success and phase.required:
+            run.success = False
+            failed_at = finish[phase.name] if failed_at is None else min(failed_at, finish[phase.name])
+
+    run.duration = max(finish.values(), default=0.0)
+    return run
+
+
+def simulate_once(
+    tasks: list[SimTask],
+    history: PhaseHistory,
+    concurrency: int,
+    model: str | None = None,
+    rng: random.Random | None = None,
+) -> SimulationResult:
+    """Simulate draining the queue once.
+
+    Args:
+        tasks: Queued tasks, in queue order.
+        history: Phase history to draw runs from.
+        concurrency: Number of agent slots.
+        model: Run every phase on this model instead of the workflow's.
+        rng: Random source. Defaults to an unseeded one.
+
+    Returns:
+        Result of this run.
+    """
+    rng = rng or random.Random()
+    result = SimulationResult(concurrency=concurrency, model=model, runs=1)
+    runs = [_run_task(task, history, model, rng) for task in tasks]
+
+    # A blocked task waits for every task above it in its worktree
+    above: dict[int, list[int]] = {}
+    seen: dict[str, list[int]] = {}
+    for i, task in enumerate(tasks):
+        above[i] = list(seen.get(task.worktree, [])) if task.blocked else []
+        seen.setdefault(task.worktree, []).append(i)
+
+    # Eligible tasks not yet started, with the time they became eligible
+    eligible_at: dict[int, float] = {i: 0.0 for i in above if not above[i]}
+    started: set[int] = set()
+    done: dict[int, bool] = {}
+    running: list[tuple[float, int]] = []
+    now = 0.0
+    waits: list[float] = []
+    busy = 0.0
+
+    while True:
+        # Free slots go to eligible tasks in queue order
+        for i in sorted(eligible_at)[: concurrency - len(running)]:
+            waits.append(now - eligible_at.pop(i))
+            started.add(i)
+            busy += runs[i].duration
+            heapq.heappush(running, (now + runs[i].duration, i))
+        if not running:
+            break
+
+        now, i = heapq.heappop(running)
+        done[i] = runs[i].success
+        for j, deps in above.items():
+            if deps and j not in started and j not in eligible_at and all(done.get(d) for d in deps):
+                eligible_at[j] = now
+
+    finished = [runs[i] for i in done]
+    result.makespan_seconds = now
+    result.utilization = busy / (concurrency * now) if now else 0.0
+    result.mean_wait_seconds = statistics.mean(waits) if waits else 0.0
+    result.max_wait_seconds = max(waits, default=0.0)
+    result.input_tokens = sum(r.input_tokens for r in finished)
+    result.output_tokens = sum(r.output_tokens for r in finished)
+    result.cost_usd = sum(r.cost_usd for r in finished)
+    result.tasks_completed = sum(done.values())
+    result.tasks_failed = len(done) - result.tasks_completed
+    result.tasks_stranded = len(tasks) - len(done)
+    return result
+
+
+def simulate(
+    tasks: list[SimTask],
+    history: PhaseHistory,
+    concurrency: int,
+    model: str | None = None,
+    runs: int = DEFAULT_RUNS,
+    seed: int | None = 0,
+) -> SimulationResult:
+    """Simulate draining the queue several times and average the results.
+
+    Args:
+        tasks: Queued tasks, in queue order.
+        history: Phase history to draw runs from.
+        concurrency: Number of agent slots.
+        model: Run every phase on this model instead of the workflow's.
+        runs: Number of simulations.
+        seed: Random seed, for repeatable results. None for a random one.
+
+    Returns:
+        Mean results, with the 90th percentile makespan.
+    """
+    rng = random.Random(seed)
+    results = [simulate_once(tasks, history, concurrency, model, rng) for _ in range(max(1, runs))]
+
+    summary = SimulationResult(concurrency=concurrency, model=model, runs=len(results))
+    for name in (
+        "makespan_seconds",
+        "utilization",
+        "mean_wait_seconds",
+        "max_wait_seconds",
+        "input_tokens",
+        "output_tokens",
+        "cost_usd",
+        "tasks_completed",
+        "tasks_failed",
+        "tasks_stranded",
+    ):
+        setattr(summary, name, statistics.mean(getattr(r, name) for r in results))
+    makespans = sorted(r.makespan_seconds for r in results)
+    summary.makespan_p90_seconds = makespans[min(len(makespans) - 1, int(0.9 * len(makespans)))]
+    return summary
+
+
+def compare_capacity(
+    tasks: list[SimTask],
+    history: PhaseHistory,
+    concurrency_levels: Iterable[int],
+    models: Iterable[str | None] = (None,),
+    runs: int = DEFAULT_RUNS,
+    seed: int | None = 0,
+) -> list[SimulationResult]:
+    """Simulate the queue for every combination of concurrency and model.
+
+    Every configuration uses the same seed, so differences between them
+    come from the configuration rather than from the draws.
+
+    Returns:
+        One result per configuration, by model then concurrency.
+    """
+    return [
+        simulate(tasks, history, concurrency, model, runs, seed)
+        for model in models
+        for concurrency in concurrency_levels
+    ]
@@ -2,6 +2,8 @@
 
 This module provides functionality for analyzing trends in ADW metrics
 over time, including anomaly detection and sparkline visualization.
+Series are built from the hourly aggregates at daily or hourly granularity
+and analyzed with the array-backed engine in ``series``.
 """
 
 from __future__ import annotations
@@ -10,11 +12,32 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any
 
+from .daily import calculate_cost
 from .metrics import MetricsDB, get_metrics_db
+from .series import ANOMALY_THRESHOLD, resample, series_stats
 
 # Sparkline characters for terminal visualization
 SPARKLINE_CHARS = "▁▂▃▄▅▆▇█"
 
+# Supported granularities, with their period length and seasonal cycle
+GRANULARITIES = {
+    "day": (timedelta(days=1), 7),
+    "hour": (timedelta(hours=1), 24),
+}
+
+# Anomaly alerts listed per metric (most recent first)
+MAX_ANOMALY_ALERTS = 5
+
+
+def _format_period(date: datetime, granularity: str = "day") -> str:
+    """Format a trend point's date, with the hour at hourly granularity."""
+    return date.strftime("%Y-%m-%d %H:00" if granularity == "hour" else "%Y-%m-%d")
+
+
+def _season_slot(date: datetime, granularity: str) -> int:
+    """Get the seasonal slot of a period: weekday for days, hour for hours."""
+    return date.hour if granularity == "hour" else date.weekday()
+
 
 @dataclass
 class TrendPoint:
@@ -25,20 +48,33 @@ class TrendPoint:
         value: Metric value.
         change: Percentage change from previous point.
         is_anomaly: Whether this point is anomalous.
+        rolling_avg: Trailing rolling average up to this point.
+        ewma: Exponentially weighted moving average up to this point.
+        anomaly_score: Robust (median/MAD) anomaly score of this point.
     """
 
     date: datetime
     value: float
     change: float = 0.0
     is_anomaly: bool = False
+    rolling_avg: float = 0.0
+    ewma: float = 0.0
+    anomaly_score: float = 0.0
 
-    def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary."""
+    def to_dict(self, granularity: str = "day") -> dict[str, Any]:
+        """Convert to dictionary.
+
+        Args:
+            granularity: Spacing of the series the point belongs to.
+        """
         return {
-            "date": self.date.strftime("%Y-%m-%d"),
+            "date": _format_period(self.date, granularity),
             "value": self.value,
             "change": self.change,
             "is_anomaly": self.is_anomaly,
+            "rolling_avg": self.rolling_avg,
+            "ewma": self.ewma,
+            "anomaly_score": self.anomaly_score,
         }
 
 
@@ -60,6 +96,8 @@ class TrendAnalysis:
         trend_direction: 'up', 'down', or 'stable'.
         anomalies: List of anomalous points.
         sparkline: ASCII sparkline visualization.
+        granularity: Point spacing ('day' or 'hour').
+        ewma: Latest exponentially weighted moving average.
     """
 
     metric_name: str
@@ -75,13 +113,15 @@ class TrendAnalysis:
     trend_direction: str = "stable"
     anomalies: list[TrendPoint] = field(default_factory=list)
     sparkline: str = ""
+    granularity: str = "day"
+    ewma: float = 0.0
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
         return {
             "metric_name": self.metric_name,
             "period_days": self.period_days,
-            "points": [p.to_dict() for p in self.points],
+            "points": [p.to_dict(self.granularity) for p in self.points],
             "current_value": self.current_value,
             "previous_value": self.previous_value,
             "change_pct": self.change_pct,
@@ -90,8 +130,10 @@ class TrendAnalysis:
             "max_value": self.max_value,
             "std_dev": self.std_dev,
             "trend_direction": self.trend_direction,
-            "anomalies": [a.to_dict() for a in self.anomalies],
+            "anomalies": [a.to_dict(self.granularity) for a in self.anomalies],
             "sparkline": self.sparkline,
+            "granularity": self.granularity,
+            "ewma": self.ewma,
         }
 
     def to_summary(self) -> str:
@@ -115,8 +157,9 @@ class TrendReport:
         avg_duration: Average task duration trend.
         cost_per_task: Cost per task trend.
         retries_per_task: Retries per task trend.
-        tasks_per_day: Tasks per day trend.
+        tasks_per_day: Tasks per period trend (per hour at hourly granularity).
         alerts: List of anomaly alerts.
+        granularity: Point spacing ('day' or 'hour').
     """
 
     period_days: int
@@ -127,6 +170,7 @@ class TrendReport:
     retries_per_task: TrendAnalysis | None = None
     tasks_per_day: TrendAnalysis | None = None
     alerts: list[str] = field(default_factory=list)
+    granularity: str = "day"
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -139,13 +183,14 @@ class TrendReport:
             "retries_per_task": self.retries_per_task.to_dict() if self.retries_per_task else None,
             "tasks_per_day": self.tasks_per_day.to_dict() if self.tasks_per_day else None,
             "alerts": self.alerts,
+            "granularity": self.granularity,
         }
 
     def to_markdown(self) -> str:
         """Generate markdown report."""
         lines = [
             "# Trend Analysis Report",
-            f"**Period:** Last {self.period_days} days",
+            f"**Period:** Last {self.period_days} days" + (" (hourly)" if self.granularity == "hour" else ""),
             f"**Generated:** {self.generated_at.strftime('%Y-%m-%d %H:%M:%S')}",
             "",
         ]
@@ -175,7 +220,7 @@ class TrendReport:
             ("Avg Duration", self.avg_duration, "s"),
             ("Cost/Task", self.cost_per_task, "$"),
             ("Retries/Task", self.retries_per_task, ""),
-            ("Tasks/Day", self.tasks_per_day, ""),
+            ("Tasks/Hour" if self.granularity == "hour" else "Tasks/Day", self.tasks_per_day, ""),
         ]
 
         for name, trend, unit in metrics:
@@ -215,11 +260,9 @@ def _generate_sparkline(values: list[float], width: int = 10) -> str:
     if not values:
         return ""
 
-    # Resample to target width if needed
     if len(values) > width:
-        step = len(values) / width
-        resampled = [values[int(i * step)] for i in range(width)]
-        values = resampled
+        # Average equal-sized buckets, so long series don't alias
+        values = resample(values, width)
     elif len(values) < width:
         # Pad with zeros or repeat last value
         values = values + [values[-1]] * (width - len(values))
@@ -250,23 +293,24 @@ def _calculate_std_dev(values: list[float]) -> float:
     Returns:
         Standard deviation.
     """
-    if len(values) < 2:
-        return 0.0
-
-    mean = sum(values) / len(values)
-    variance = sum((x - mean) ** 2 for x in values) / len(values)
-    return float(variance**0.5)
+    return series_stats(values).std
 
 
 def _detect_anomalies(
     points: list[TrendPoint],
     std_threshold: float = 2.0,
+    granularity: str = "day",
 ) -> list[TrendPoint]:
-    """Detect anomalous points using z-score method.
+    """Detect anomalous points using robust (median/MAD) scores.
+
+    Each point is compared with the typical value of its seasonal slot
+    (weekday, or hour of day for hourly points) once there is enough history.
 
     Args:
         points: List of trend points.
-        std_threshold: Number of standard deviations for anomaly threshold.
+        std_threshold: Minimum absolute anomaly score (in standard
+            deviation equivalents) for a point to be anomalous.
+        granularity: Point spacing ('day' or 'hour').
 
     Returns:
         List of anomalous points.
@@ -274,23 +318,33 @@ def _detect_anomalies(
     if len(points) < 3:
         return []
 
-    values = [p.value for p in points]
-    mean = sum(values) / len(values)
-    std_dev = _calculate_std_dev(values)
-
-    if std_dev == 0:
-        return []
+    stats = series_stats(
+        [p.value for p in points],
+        slots=[_season_slot(p.date, granularity) for p in points],
+    )
 
     anomalies = []
-    for point in points:
-        z_score = abs(point.value - mean) / std_dev
-        if z_score > std_threshold:
-            point.is_anomaly = True
-            anomalies.append(point)
+    for i in stats.anomalies(std_threshold):
+        points[i].is_anomaly = True
+        points[i].anomaly_score = stats.scores[i]
+        anomalies.append(points[i])
 
     return anomalies
 
 
+def _direction_from_slope(slope: float, mean: float) -> str:
+    """Classify a slope, normalized by the mean, as 'up', 'down' or 'stable'."""
+    # Normalize slope by mean to get percentage change
+    normalized_slope = slope / abs(mean) * 100 if mean != 0 else slope
+
+    # Threshold for determining direction
+    if normalized_slope > 5:  # 5% increase per period
+        return "up"
+    elif normalized_slope < -5:  # 5% decrease per period
+        return "down"
+    return "stable"
+
+
 def _determine_trend_direction(points: list[TrendPoint]) -> str:
     """Determine overall trend direction.
 
@@ -306,39 +360,15 @@ def _determine_trend_direction(points: list[TrendPoint]) -> str:
     if len(points) < 2:
         return "stable"
 
-    values = [p.value for p in points]
-
-    # Simple linear regression slope
-    n = len(values)
-    x_mean = (n - 1) / 2
-    y_mean = sum(values) / n
-
-    numerator = sum((i - x_mean) * (v - y_mean) for i, v in enumerate(values))
-    denominator = sum((i - x_mean) ** 2 for i in range(n))
-
-    if denominator == 0:
-        return "stable"
-
-    slope = numerator / denominator
-
-    # Normalize slope by mean to get percentage change
-    if y_mean != 0:
-        normalized_slope = slope / abs(y_mean) * 100
-    else:
-        normalized_slope = slope
-
-    # Threshold for determining direction
-    if normalized_slope > 5:  # 5% increase per period
-        return "up"
-    elif normalized_slope < -5:  # 5% decrease per period
-        return "down"
-    return "stable"
+    stats = series_stats([p.value for p in points])
+    return _direction_from_slope(stats.slope, stats.mean)
 
 
 def analyze_metric(
     metric_name: str,
     values: list[tuple[datetime, float]],
     period_days: int,
+    granularity: str = "day",
 ) -> TrendAnalysis:
     """Analyze a single metric's trend.
 
@@ -346,6 +376,7 @@ def analyze_metric(
         metric_name: Name of the metric.
         values: List of (date, value) tuples.
         period_days: Number of days in the period.
+        granularity: Point spacing ('day' or 'hour').
 
     Returns:
         TrendAnalysis for the metric.
@@ -354,29 +385,39 @@ def analyze_metric(
         return TrendAnalysis(
             metric_name=metric_name,
             period_days=period_days,
+            granularity=granularity,
         )
 
     # Sort by date
     values = sorted(values, key=lambda x: x[0])
+    raw_values = [value for _, value in values]
+
+    stats = series_stats(
+        raw_values,
+        slots=[_season_slot(date, granularity) for date, _ in values],
+    )
 
     # Create trend points
     points = []
     prev_value = None
-    for date, value in values:
+    for i, (date, value) in enumerate(values):
         change = 0.0
         if prev_value is not None and prev_value != 0:
             change = ((value - prev_value) / prev_value) * 100
-        points.append(TrendPoint(date=date, value=value, change=change))
+        points.append(
+            TrendPoint(
+                date=date,
+                value=value,
+                change=change,
+                rolling_avg=stats.rolling_mean[i],
+                ewma=stats.ewma[i],
+                anomaly_score=stats.scores[i],
+            )
+        )
         prev_value = value
 
-    # Calculate statistics
-    raw_values = [p.value for p in points]
-    current_value = raw_values[-1] if raw_values else 0.0
+    current_value = raw_values[-1]
     previous_value = raw_values[-2] if len(raw_values) >= 2 else 0.0
-    avg_value = sum(raw_values) / len(raw_values) if raw_values else 0.0
-    min_value = min(raw_values) if raw_values else 0.0
-    max_value = max(raw_values) if raw_values else 0.0
-    std_dev = _calculate_std_dev(raw_values)
 
     # Calculate overall change
     change_pct = 0.0
@@ -384,13 +425,16 @@ def analyze_metric(
         change_pct = ((current_value - previous_value) / previous_value) * 100
 
     # Detect anomalies
-    anomalies = _detect_anomalies(points)
-
-    # Determine trend direction
-    trend_direction = _determine_trend_direction(points)
+    anomalies = []
+    if len(points) >= 3:
+        for i in stats.anomalies(ANOMALY_THRESHOLD):
+            points[i].is_anomaly = True
+            anomalies.append(points[i])
 
-    # Generate sparkline
-    sparkline = _generate_sparkline(raw_values)
+    # Determine trend direction, with hourly slopes expressed per day
+    period_length, _ = GRANULARITIES[granularity]
+    periods_per_day = timedelta(days=1) / period_length
+    trend_direction = "stable" if len(points) < 2 else _direction_from_slope(stats.slope * periods_per_day, stats.mean)
 
     return TrendAnalysis(
         metric_name=metric_name,
@@ -399,78 +443,98 @@ def analyze_metric(
         current_value=current_value,
         previous_value=previous_value,
         change_pct=change_pct,
-        avg_value=avg_value,
-        min_value=min_value,
-        max_value=max_value,
-        std_dev=std_dev,
+        avg_value=stats.mean,
+        min_value=stats.minimum,
+        max_value=stats.maximum,
+        std_dev=stats.std,
         trend_direction=trend_direction,
         anomalies=anomalies,
-        sparkline=sparkline,
+        sparkline=_generate_sparkline(raw_values),
+        granularity=granularity,
+        ewma=stats.ewma[-1],
     )
 
 
 def generate_trend_report(
     period_days: int = 30,
     db: MetricsDB | None = None,
+    granularity: str = "day",
 ) -> TrendReport:
     """Generate a complete trend report.
 
     Args:
         period_days: Number of days to analyze.
         db: MetricsDB instance (default: global instance).
+        granularity: Point spacing ('day' or 'hour').
 
     Returns:
         TrendReport with all metric trends.
+
+    Raises:
+        ValueError: If the granularity is not supported.
     """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unsupported granularity: {granularity}")
+
     if db is None:
         db = get_metrics_db()
 
+    period_length, _ = GRANULARITIES[granularity]
     end_date = datetime.now()
     start_date = end_date - timedelta(days=period_days)
 
-    # Get daily aggregates for the period
-    aggregates = db.get_daily_aggregates_range(start_date, end_date)
+    # Every period in the range, including ones without tasks
+    first = start_date.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        first = first.replace(hour=0)
+    periods: list[datetime] = []
+    current = first
+    while current <= end_date:
+        periods.append(current)
+        current += period_length
+
+    # One pass over the aggregates fills a column per measure; costs use each model's pricing
+    columns = {name: [0.0] * len(periods) for name in ("completed", "failed", "duration", "retries", "cost")}
+    for row in db.query_aggregates(start_date, end_date, granularity=granularity, group_by=("model",)):
+        # Periods are 'YYYY-MM-DD' or 'YYYY-MM-DD HH', both ISO dates
+        i = (datetime.fromisoformat(row["period"]) - first) // period_length
+        if not 0 <= i < len(periods):
+            continue
+        columns["completed"][i] += row["tasks_completed"]
+        columns["failed"][i] += row["tasks_failed"]
+        columns["duration"][i] += row["total_duration_seconds"]
+        columns["retries"][i] += row["total_retries"]
+        columns["cost"][i] += calculate_cost(
+            row["total_input_tokens"], row["total_output_tokens"], row["model"] or "sonnet"
+        )
 
     # Prepare data series for each metric
     success_rates: list[tuple[datetime, float]] = []
     avg_durations: list[tuple[datetime, float]] = []
     costs_per_task: list[tuple[datetime, float]] = []
     retries_per_task: list[tuple[datetime, float]] = []
-    tasks_per_day: list[tuple[datetime, float]] = []
+    tasks_per_period: list[tuple[datetime, float]] = []
 
-    for agg in aggregates:
-        date = datetime.strptime(agg["date"], "%Y-%m-%d")
-        total_tasks = agg.get("tasks_completed", 0) + agg.get("tasks_failed", 0)
+    for i, date in enumerate(periods):
+        total_tasks = columns["completed"][i] + columns["failed"][i]
 
-        # Success rate
+        # Per-task metrics only exist for periods with finished tasks
         if total_tasks > 0:
-            success_rate = (agg.get("tasks_completed", 0) / total_tasks) * 100
-            success_rates.append((date, success_rate))
-
-            # Average duration
-            avg_duration = agg.get("total_duration_seconds", 0) / total_tasks
-            avg_durations.append((date, avg_duration))
+            success_rates.append((date, columns["completed"][i] / total_tasks * 100))
+            avg_durations.append((date, columns["duration"][i] / total_tasks))
+            costs_per_task.append((date, columns["cost"][i] / total_tasks))
+            retries_per_task.append((date, columns["retries"][i] / total_tasks))
 
-            # Cost per task (using Sonnet pricing)
-            input_tokens = agg.get("total_input_tokens", 0)
-            output_tokens = agg.get("total_output_tokens", 0)
-            cost = (input_tokens / 1_000_000 * 3.0) + (output_tokens / 1_000_000 * 15.0)
-            cost_per_task = cost / total_tasks
-            costs_per_task.append((date, cost_per_task))
-
-            # Retries per task
-            retries = agg.get("total_retries", 0) / total_tasks
-            retries_per_task.append((date, retries))
-
-        # Tasks per day (always track even if 0)
-        tasks_per_day.append((date, float(total_tasks)))
+        # Tasks per period (always tracked, so quiet periods count too)
+        tasks_per_period.append((date, total_tasks))
 
     # Analyze each metric
-    success_rate_trend = analyze_metric("Success Rate", success_rates, period_days)
-    avg_duration_trend = analyze_metric("Avg Duration", avg_durations, period_days)
-    cost_trend = analyze_metric("Cost/Task", costs_per_task, period_days)
-    retries_trend = analyze_metric("Retries/Task", retries_per_task, period_days)
-    tasks_trend = analyze_metric("Tasks/Day", tasks_per_day, period_days)
+    success_rate_trend = analyze_metric("Success Rate", success_rates, period_days, granularity)
+    avg_duration_trend = analyze_metric("Avg Duration", avg_durations, period_days, granularity)
+    cost_trend = analyze_metric("Cost/Task", costs_per_task, period_days, granularity)
+    retries_trend = analyze_metric("Retries/Task", retries_per_task, period_days, granularity)
+    tasks_name = "Tasks/Hour" if granularity == "hour" else "Tasks/Day"
+    tasks_trend = analyze_metric(tasks_name, tasks_per_period, period_days, granularity)
 
     # Generate alerts
     alerts = []
@@ -487,14 +551,11 @@ def generate_trend_report(
     if retries_trend.trend_direction == "up" and retries_trend.change_pct > 30:
         alerts.append(f"🔄 Retries per task increasing: +{retries_trend.change_pct:.1f}%")
 
-    # Alert on anomalies
+    # Alert on the most recent anomalies
     for trend in [success_rate_trend, cost_trend, retries_trend]:
-        if trend.anomalies:
-            for anomaly in trend.anomalies:
-                alerts.append(
-                    f"🔍 Anomaly detected in {trend.metric_name} on "
-                    f"{anomaly.date.strftime('%Y-%m-%d')}: {anomaly.value:.1f}"
-                )
+        for anomaly in trend.anomalies[-MAX_ANOMALY_ALERTS:][::-1]:
+            period = _format_period(anomaly.date, trend.granularity)
+            alerts.append(f"🔍 Anomaly detected in {trend.metric_name} on {period}: {anomaly.value:.1f}")
 
     return TrendReport(
         period_days=period_days,
@@ -504,23 +565,26 @@ def generate_trend_report(
         retries_per_task=retries_trend,
         tasks_per_day=tasks_trend,
         alerts=alerts,
+        granularity=granularity,
     )
 
 
 def get_sparkline_summary(
     db: MetricsDB | None = None,
     period_days: int = 14,
+    granularity: str = "day",
 ) -> str:
     """Get a compact sparkline summary of key metrics.
 
     Args:
         db: MetricsDB instance (default: global instance).
         period_days: Number of days to include.
+        granularity: Point spacing ('day' or 'hour').
 
     Returns:
         Multi-line sparkline summary string.
     """
-    report = generate_trend_report(period_days, db)
+    report = generate_trend_report(period_days, db, granularity)
 
     lines = []
     if report.success_rate:
@@ -11,8 +11,9 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 
-from .daily import DailySummary, generate_daily_summary
-from .metrics import MetricsDB, TaskMetrics, get_metrics_db
+from .commits import get_commit_counts
+from .daily import DailySummary, aggregate_breakdowns, render_breakdowns, summarize_aggregates
+from .metrics import MetricsDB, get_metrics_db
 
 
 @dataclass
@@ -44,6 +45,8 @@ class WeeklyDigest:
         best_task: Task with best performance (fastest completion).
         worst_task: Task with worst performance (most retries or failed).
         prev_week_comparison: Comparison with previous week.
+        model_breakdown: Per-model tasks, tokens and cost.
+        workflow_breakdown: Per-workflow tasks, tokens and cost.
     """
 
     week_start: datetime
@@ -67,6 +70,8 @@ class WeeklyDigest:
     best_task: dict[str, Any] | None = None
     worst_task: dict[str, Any] | None = None
     prev_week_comparison: dict[str, Any] = field(default_factory=dict)
+    model_breakdown: dict[str, dict[str, Any]] = field(default_factory=dict)
+    workflow_breakdown: dict[str, dict[str, Any]] = field(default_factory=dict)
 
     @property
     def total_tasks(self) -> int:
@@ -130,6 +135,8 @@ class WeeklyDigest:
             "best_task": self.best_task,
             "worst_task": self.worst_task,
             "prev_week_comparison": self.prev_week_comparison,
+            "model_breakdown": self.model_breakdown,
+            "workflow_breakdown": self.workflow_breakdown,
             "daily_summaries": [d.to_dict() for d in self.daily_summaries],
         }
 
@@ -186,6 +193,8 @@ class WeeklyDigest:
                     lines.append(f"- **{formatted_key}:** {direction} {abs(value)}")
             lines.append("")
 
+        lines.extend(render_breakdowns(self.model_breakdown, self.workflow_breakdown))
+
         # Best and worst tasks
         if self.best_task:
             lines.extend(
@@ -304,54 +313,6 @@ def _calculate_comparison(current: WeeklyDigest, previous: WeeklyDigest) -> dict
     }
 
 
-def _find_best_worst_tasks(
-    metrics_list: list[TaskMetrics],
-) -> tuple[dict[str, Any] | None, dict[str, Any] | None]:
-    """Find best and worst performing tasks.
-
-    Best = completed with fastest duration
-    Worst = failed or most retries
-
-    Args:
-        metrics_list: List of task metrics.
-
-    Returns:
-        Tuple of (best_task, worst_task) dictionaries.
-    """
-    if not metrics_list:
-        return None, None
-
-    best_task = None
-    worst_task = None
-    best_duration = float("inf")
-    worst_retries = -1
-
-    for metrics in metrics_list:
-        task_dict = {
-            "task_id": metrics.task_id,
-            "description": metrics.description,
-            "status": metrics.status,
-            "duration": metrics.total_duration_seconds,
-            "retries": metrics.total_retries,
-        }
-
-        # Best: completed with fastest duration
-        if metrics.status == "completed" and metrics.total_duration_seconds < best_duration:
-            best_duration = metrics.total_duration_seconds
-            best_task = task_dict
-
-        # Worst: failed or most retries
-        if metrics.status == "failed":
-            if worst_task is None or metrics.total_retries > worst_retries:
-                worst_retries = metrics.total_retries
-                worst_task = task_dict
-        elif metrics.total_retries > worst_retries:
-            worst_retries = metrics.total_retries
-            worst_task = task_dict
-
-    return best_task, worst_task
-
-
 def generate_weekly_digest(
     date: datetime | None = None,
     db: MetricsDB | None = None,
@@ -375,16 +336,25 @@ def generate_weekly_digest(
 
     week_start, week_end = _get_week_bounds(date)
 
-    # Generate daily summaries for each day of the week
+    # One aggregate query covers every day of the week
+    rows_by_day: dict[str, list[dict[str, Any]]] = {}
+    for row in db.query_aggregates(week_start, week_end, granularity="day", group_by=("workflow", "model")):
+        rows_by_day.setdefault(row["period"], []).append(row)
+
+    # One git log covers the week's commit counts
+    git_commits = get_commit_counts(week_start, week_end)
+
+    # Build daily summaries for each day of the week
     daily_summaries = []
     current_day = week_start
     while current_day <= week_end:
-        summary = generate_daily_summary(current_day, db)
-        daily_summaries.append(summary)
+        day = current_day.strftime("%Y-%m-%d")
+        daily_summaries.append(
+            summarize_aggregates(current_day, rows_by_day.get(day, []), git_commits=git_commits.get(day, 0))
+        )
         current_day += timedelta(days=1)
 
-    # Get all task metrics for the week
-    metrics_list = db.get_metrics_for_range(week_start, week_end)
+    model_breakdown, workflow_breakdown = aggregate_breakdowns([row for rows in rows_by_day.values() for row in rows])
 
     # Aggregate from daily summaries
     tasks_completed = sum(s.tasks_completed for s in daily_summaries)
@@ -407,7 +377,7 @@ def generate_weekly_digest(
     avg_duration = total_duration / total_tasks if total_tasks > 0 else 0.0
 
     # Find best and worst tasks
-    best_task, worst_task = _find_best_worst_tasks(metrics_list)
+    best_task, worst_task = db.get_task_extremes(week_start, week_end)
 
     # Create the digest
     digest = WeeklyDigest(
@@ -431,6 +401,8 @@ def generate_weekly_digest(
         lines_removed=lines_removed,
         best_task=best_task,
         worst_task=worst_task,
+        model_breakdown=model_breakdown,
+        workflow_breakdown=workflow_breakdown,
     )
 
     # Get previous week comparison if requested
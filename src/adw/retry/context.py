@@ -272,6 +272,10 @@ def format_test_failure_context(
         if len(test_result.failed_tests) > 5:
             error_lines.append(f"  ... and {len(test_result.failed_tests) - 5} more")
 
+    if test_result.error_message:
+        error_lines.append("")
+        error_lines.append(test_result.error_message)
+
     error = "\n".join(error_lines)
 
     # Use stderr as stack trace if available
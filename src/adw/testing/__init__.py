@@ -5,11 +5,19 @@ This module provides:
 - Test execution with result parsing
 - Retry-ready test results
 - Test validation with retry support for workflows
+- Test impact analysis (run only the tests a change affects)
+- Sharded parallel test execution
+- Streaming execution with fail-fast
+- Caching of passing results by working tree
 """
 
+from .cache import TestResultCache, run_cached
 from .detector import TestFrameworkInfo, detect_test_framework, get_test_command
+from .impact import TestSelection, select_tests
 from .models import FailedTest, TestFramework, TestResult
 from .runner import run_tests
+from .shards import run_sharded_tests
+from .stream import stream_tests
 from .validation import (
     ValidationConfig,
     ValidationResult,
@@ -29,6 +37,14 @@ __all__ = [
     "TestFrameworkInfo",
     # Execution
     "run_tests",
+    "run_sharded_tests",
+    "stream_tests",
+    # Result cache
+    "run_cached",
+    "TestResultCache",
+    # Impact analysis
+    "select_tests",
+    "TestSelection",
     # Validation
     "validate_tests",
     "validate_with_retry",
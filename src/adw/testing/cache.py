@@ -0,0 +1,234 @@
+"""Test result cache keyed by working tree content.
+
+Workflows often run the same suite on a tree that has not changed since the
+last run, for example after a review phase that edited nothing, or when a
+task is resumed. Results are cached against:
+
+- the git tree hash of the working tree, untracked files included (see
+  ``recovery.snapshots.write_worktree_tree``),
+- the directory the tests run in, relative to the repository root,
+- the test command, and
+- a fingerprint of the environment the suite sees.
+
+Only passing runs are cached, since a failure may be flaky and is worth
+running again. Results are memoized in-process and, for initialized
+projects (those with an ``.adw/`` directory), persisted under
+``.adw/cache/tests``. The least recently used entries are evicted beyond
+``max_entries``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from ..recovery.snapshots import write_worktree_tree
+from .models import TestResult
+
+logger = logging.getLogger(__name__)
+
+# Cache directory, relative to the project root
+DEFAULT_CACHE_DIR = Path(".adw/cache/tests")
+
+# Evict least recently used entries beyond this count
+DEFAULT_MAX_ENTRIES = 256
+
+# Environment variables that can change what a suite does
+FINGERPRINT_ENV_VARS = (
+    "PATH",
+    "VIRTUAL_ENV",
+    "PYTHONPATH",
+    "NODE_ENV",
+    "NODE_OPTIONS",
+    "GOFLAGS",
+    "CGO_ENABLED",
+    "RUSTFLAGS",
+    "CARGO_TARGET_DIR",
+    "CI",
+)
+
+_memo: dict[str, dict[str, Any]] = {}
+_memo_lock = threading.Lock()
+
+
+def env_fingerprint(env: dict[str, str] | None = None) -> str:
+    """Fingerprint the environment a test command runs in.
+
+    Args:
+        env: Extra environment variables the command gets.
+
+    Returns:
+        Hex digest of the platform, interpreter and relevant variables.
+    """
+    parts = [sys.platform, platform.machine(), platform.python_version()]
+    parts += [f"{name}={os.environ.get(name, '')}" for name in FINGERPRINT_ENV_VARS]
+    parts += [f"{name}={value}" for name, value in sorted((env or {}).items())]
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+class TestResultCache:
+    """Test results of previously run working trees.
+
+    Attributes:
+        root: Project root.
+        cache_dir: Directory holding one JSON file per entry.
+        max_entries: Entry limit; least recently used entries are evicted beyond it.
+    """
+
+    def __init__(
+        self,
+        root: Path | None = None,
+        cache_dir: Path | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        """Initialize the cache.
+
+        Args:
+            root: Project root. Defaults to current directory.
+            cache_dir: Cache directory. Defaults to .adw/cache/tests
+            max_entries: Entry limit.
+        """
+        self.root = root or Path.cwd()
+        self.cache_dir = cache_dir or self.root / DEFAULT_CACHE_DIR
+        self.max_entries = max_entries
+
+    def _persistent(self) -> bool:
+        """Only initialized projects get an on-disk cache."""
+        return (self.root / ".adw").is_dir()
+
+    def key(self, path: Path, command: str, env: dict[str, str] | None = None) -> str | None:
+        """Compute the cache key of running a command in a working tree.
+
+        Args:
+            path: Directory the command runs in.
+            command: Test command.
+            env: Extra environment variables the command gets.
+
+        Returns:
+            Cache key, or None if the tree cannot be hashed (e.g. not a git
+            repository).
+        """
+        tree = write_worktree_tree(path)
+        if tree is None:
+            return None
+        try:
+            prefix = subprocess.run(
+                ["git", "rev-parse", "--show-prefix"],
+                cwd=path,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (subprocess.CalledProcessError, OSError):
+            return None
+        material = "\0".join([tree, prefix, command, env_fingerprint(env)])
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def get(self, key: str) -> TestResult | None:
+        """Look up a cached result, marking it as recently used."""
+        with _memo_lock:
+            data = _memo.get(key)
+        entry = self.cache_dir / f"{key}.json"
+        if data is None and self._persistent():
+            try:
+                data = json.loads(entry.read_text())
+            except (OSError, json.JSONDecodeError):
+                return None
+            with _memo_lock:
+                _memo[key] = data
+        if data is None:
+            return None
+
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        result = TestResult.from_dict(data)
+        result.cached = True
+        return result
+
+    def put(self, key: str, result: TestResult) -> None:
+        """Store a passing result, evicting old entries if the cache is full."""
+        if not result.success or result.timed_out or result.error_message:
+            return
+        data = result.to_dict()
+        with _memo_lock:
+            _memo[key] = data
+        if not self._persistent():
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_dir / f"{key}.{os.getpid()}.tmp"
+            tmp_path.write_text(json.dumps(data))
+            os.replace(tmp_path, self.cache_dir / f"{key}.json")
+        except OSError as e:
+            logger.debug("Could not cache test result: %s", e)
+            return
+        self.evict()
+
+    def evict(self) -> list[str]:
+        """Evict least recently used entries until the cache fits its limit.
+
+        Returns:
+            Evicted keys.
+        """
+        try:
+            entries = sorted(self.cache_dir.glob("*.json"), key=lambda entry: entry.stat().st_mtime)
+        except OSError:
+            return []
+        evicted = []
+        for entry in entries[: max(0, len(entries) - self.max_entries)]:
+            entry.unlink(missing_ok=True)
+            evicted.append(entry.stem)
+        with _memo_lock:
+            for key in evicted:
+                _memo.pop(key, None)
+        return evicted
+
+
+def run_cached(
+    run: Callable[[], TestResult],
+    path: Path,
+    command: str,
+    env: dict[str, str] | None = None,
+    cache: TestResultCache | None = None,
+) -> TestResult:
+    """Run tests unless the same tree already has a result for the command.
+
+    Args:
+        run: Runs the tests.
+        path: Directory the tests run in.
+        command: Test command, as part of the cache key.
+        env: Extra environment variables the tests get.
+        cache: Cache to use. Defaults to the project's cache.
+
+    Returns:
+        The cached result (with cached set), or the result of run.
+    """
+    cache = cache or TestResultCache()
+    key = cache.key(path, command, env)
+    if key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            logger.info("Reusing test result of unchanged tree for %s", command)
+            return cached
+
+    result = run()
+    if key is not None:
+        cache.put(key, result)
+    return result
+
+
+def clear_test_result_cache() -> None:
+    """Forget results memoized in this process."""
+    with _memo_lock:
+        _memo.clear()
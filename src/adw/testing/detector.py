@@ -11,6 +11,7 @@ import tomllib
 from dataclasses import dataclass
 from pathlib import Path
 
+from ..utils.fingerprint import cached_detection
 from .models import TestFramework
 
 
@@ -24,7 +25,7 @@ class TestFrameworkInfo:
     config_file: str | None = None
 
 
-def detect_test_framework(path: Path | None = None) -> TestFrameworkInfo | None:
+def detect_test_framework(path: Path | None = None, use_cache: bool = True) -> TestFrameworkInfo | None:
     """Detect test framework from project files.
 
     Detection order (first match wins within confidence tiers):
@@ -33,8 +34,12 @@ def detect_test_framework(path: Path | None = None) -> TestFrameworkInfo | None:
     3. Presence of test directories with framework-specific patterns
     4. package.json scripts.test as fallback
 
+    Positive results are cached against the project's manifest fingerprint;
+    a miss is always re-checked, since test files may appear at any depth.
+
     Args:
         path: Project directory to analyze. Defaults to current directory.
+        use_cache: Whether to use the project fingerprint cache.
 
     Returns:
         TestFrameworkInfo if detected, None otherwise.
@@ -42,6 +47,31 @@ def detect_test_framework(path: Path | None = None) -> TestFrameworkInfo | None:
     if path is None:
         path = Path.cwd()
 
+    if not use_cache:
+        return _detect_test_framework(path)
+
+    return cached_detection(
+        path,
+        "test_framework",
+        lambda: _detect_test_framework(path),
+        encode=lambda info: {
+            "framework": info.framework.value,
+            "command": info.command,
+            "confidence": info.confidence,
+            "config_file": info.config_file,
+        },
+        decode=lambda data: TestFrameworkInfo(
+            framework=TestFramework(data["framework"]),
+            command=data["command"],
+            confidence=data["confidence"],
+            config_file=data.get("config_file"),
+        ),
+        cache_none=False,
+    )
+
+
+def _detect_test_framework(path: Path) -> TestFrameworkInfo | None:
+    """Detect the test framework without consulting the cache."""
     # Try each detector in priority order
     detectors = [
         _detect_pytest,
@@ -0,0 +1,510 @@
+"""Test impact analysis: select the tests a change can affect.
+
+Files changed since a base commit (``git diff`` plus untracked files) are
+followed backwards through the project's import graph to the test files that
+import them, directly or indirectly. Python imports, relative JS/TS imports
+(``import``, ``export ... from``, ``require()``, ``import()``) and Go
+package imports within the module are understood; other imports are treated
+as external.
+
+Each file's imports are cached by size and mtime, so rebuilding the graph
+after a small change only re-reads the files that changed. The cache is
+memoized in-process and, for initialized projects (those with an ``.adw/``
+directory), persisted to ``.adw/cache/import_graph.json``.
+
+Selection is conservative: changes to build or test configuration, deleted
+source files, or anything that is neither source nor documentation mean the
+whole suite has to run.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import logging
+import os
+import re
+import shlex
+import subprocess
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from .models import TestFramework
+
+logger = logging.getLogger(__name__)
+
+# Cache file, relative to the project root
+DEFAULT_CACHE_PATH = Path(".adw/cache/import_graph.json")
+
+# Bumped whenever the cache format changes
+CACHE_VERSION = 1
+
+# Timeout for each git command, in seconds
+GIT_TIMEOUT = 30
+
+PYTHON_SUFFIXES = frozenset({".py"})
+JS_SUFFIXES = (".ts", ".tsx", ".js", ".jsx", ".mts", ".cts", ".mjs", ".cjs")
+GO_SUFFIXES = frozenset({".go"})
+
+# Directories Python imports are resolved from, besides the importing file's own
+PYTHON_ROOTS = ("", "src", "lib")
+
+# Changes to these files can affect any test, so they force a full run
+FULL_RUN_FILES = frozenset(
+    {
+        "conftest.py",
+        "pyproject.toml",
+        "setup.py",
+        "setup.cfg",
+        "pytest.ini",
+        "tox.ini",
+        "requirements.txt",
+        "uv.lock",
+        "poetry.lock",
+        "package.json",
+        "package-lock.json",
+        "pnpm-lock.yaml",
+        "yarn.lock",
+        "bun.lock",
+        "bun.lockb",
+        "tsconfig.json",
+        "go.mod",
+        "go.sum",
+        "Cargo.toml",
+        "Cargo.lock",
+    }
+)
+FULL_RUN_PREFIXES = ("jest.config.", "vitest.config.", "vite.config.", "babel.config.", ".babelrc")
+
+# Changes to these files never affect tests (docs, and files ADW itself
+# writes into worktrees)
+IGNORED_SUFFIXES = frozenset({".md", ".rst", ".txt", ".adoc"})
+IGNORED_NAMES = frozenset({".ports.env", ".adw.env"})
+IGNORED_PREFIXES = (".adw/", ".claude/", "agents/", "specs/")
+
+_JS_TEST_PATTERN = re.compile(r"\.(test|spec)\.[cm]?[jt]sx?$")
+_JS_IMPORT_PATTERNS = (
+    re.compile(r"""(?:^|[;\s])(?:import|export)\s[^'";]*?\bfrom\s*['"]([^'"]+)['"]""", re.MULTILINE),
+    re.compile(r"""(?:^|[;\s])import\s*['"]([^'"]+)['"]""", re.MULTILINE),
+    re.compile(r"""\b(?:require|import)\s*\(\s*['"]([^'"]+)['"]\s*\)"""),
+)
+_GO_IMPORT_BLOCK = re.compile(r"^import\s*\((.*?)\)", re.MULTILINE | re.DOTALL)
+_GO_IMPORT_LINE = re.compile(r"""^import\s+(?:[\w.]+\s+)?"([^"]+)\"""", re.MULTILINE)
+_GO_QUOTED = re.compile(r'"([^"]+)"')
+
+_memo: dict[str, dict[str, Any]] = {}
+_memo_lock = threading.Lock()
+
+
+def _git(args: list[str], cwd: Path) -> str | None:
+    """Run a git command, returning None if it failed."""
+    try:
+        result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, timeout=GIT_TIMEOUT)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.debug("git %s failed: %s", args[0], e)
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def changed_files(path: Path, base: str) -> list[str] | None:
+    """List files changed since a base commit, including untracked files.
+
+    Args:
+        path: Repository (or worktree) root.
+        base: Commit to compare the working tree against.
+
+    Returns:
+        Changed paths, relative to path, or None if git failed.
+    """
+    diff = _git(["diff", "--name-only", "--relative", "--no-renames", "-z", base], path)
+    untracked = _git(["ls-files", "--others", "--exclude-standard", "-z"], path)
+    if diff is None or untracked is None:
+        return None
+    return sorted({name for name in (diff + untracked).split("\0") if name})
+
+
+def project_files(path: Path) -> list[str] | None:
+    """List a project's files: tracked, plus untracked ones that are not ignored.
+
+    Args:
+        path: Project root.
+
+    Returns:
+        Paths relative to path, or None if git failed.
+    """
+    output = _git(["ls-files", "--cached", "--others", "--exclude-standard", "-z"], path)
+    if output is None:
+        return None
+    return [name for name in output.split("\0") if name]
+
+
+def is_test_file(name: str) -> bool:
+    """Check whether a path is a test file (Python, JS/TS or Go)."""
+    path = PurePosixPath(name)
+    if path.suffix in PYTHON_SUFFIXES:
+        return path.name.startswith("test_") or path.name.endswith("_test.py")
+    if path.suffix in JS_SUFFIXES:
+        return bool(_JS_TEST_PATTERN.search(path.name)) or "__tests__" in path.parts
+    return path.name.endswith("_test.go")
+
+
+def _needs_full_run(name: str, root: Path) -> bool:
+    path = PurePosixPath(name)
+    if path.name in FULL_RUN_FILES or path.name.startswith(FULL_RUN_PREFIXES):
+        return True
+    if path.suffix in IGNORED_SUFFIXES or path.name in IGNORED_NAMES or name.startswith(IGNORED_PREFIXES):
+        return False
+    if path.suffix in PYTHON_SUFFIXES or path.suffix in JS_SUFFIXES or path.suffix in GO_SUFFIXES:
+        # Importers of a deleted file can no longer be found
+        return not (root / name).exists()
+    return True
+
+
+def _python_imports(source: str, name: str) -> list[str]:
+    """Get the modules a Python file imports, as (possibly relative) dotted names."""
+    try:
+        tree = ast.parse(source, filename=name)
+    except (SyntaxError, ValueError):
+        return []
+    specs: list[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            specs.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            module = "." * node.level + (node.module or "")
+            for alias in node.names:
+                # The name may be a submodule; resolution falls back to the module
+                if alias.name == "*":
+                    specs.append(module)
+                elif module.endswith("."):
+                    specs.append(module + alias.name)
+                else:
+                    specs.append(f"{module}.{alias.name}")
+    return specs
+
+
+def _js_imports(source: str) -> list[str]:
+    specs = {match for pattern in _JS_IMPORT_PATTERNS for match in pattern.findall(source)}
+    return sorted(spec for spec in specs if spec.startswith("."))
+
+
+def _go_imports(source: str) -> list[str]:
+    specs = set(_GO_IMPORT_LINE.findall(source))
+    for block in _GO_IMPORT_BLOCK.findall(source):
+        specs.update(_GO_QUOTED.findall(block))
+    return sorted(specs)
+
+
+def _parse_imports(root: Path, name: str) -> list[str]:
+    suffix = PurePosixPath(name).suffix
+    try:
+        source = (root / name).read_text(errors="replace")
+    except OSError:
+        return []
+    if suffix in PYTHON_SUFFIXES:
+        return _python_imports(source, name)
+    if suffix in JS_SUFFIXES:
+        return _js_imports(source)
+    return _go_imports(source)
+
+
+class ImportGraph:
+    """Import dependencies between a project's source files.
+
+    Attributes:
+        root: Project root.
+        files: Source files, relative to the root.
+        imports: Each file's resolved in-project imports.
+    """
+
+    def __init__(self, root: Path, files: set[str], imports: dict[str, set[str]]):
+        self.root = root
+        self.files = files
+        self.imports = imports
+        self._importers: dict[str, set[str]] | None = None
+
+    @property
+    def importers(self) -> dict[str, set[str]]:
+        """Reverse edges: the files importing each file."""
+        if self._importers is None:
+            importers: dict[str, set[str]] = defaultdict(set)
+            for name, deps in self.imports.items():
+                for dep in deps:
+                    importers[dep].add(name)
+            self._importers = importers
+        return self._importers
+
+    def affected(self, changed: list[str]) -> set[str]:
+        """Get the files a change reaches, including the changed files themselves."""
+        seen = set(changed)
+        queue = deque(changed)
+        while queue:
+            for importer in self.importers.get(queue.popleft(), ()):
+                if importer not in seen:
+                    seen.add(importer)
+                    queue.append(importer)
+        return seen
+
+
+class _Resolver:
+    """Resolves raw import specifiers to project files."""
+
+    def __init__(self, root: Path, files: set[str]):
+        self.files = files
+        self.dir_files: dict[str, list[str]] = defaultdict(list)
+        for name in files:
+            self.dir_files[str(PurePosixPath(name).parent)].append(name)
+        self.go_module = self._go_module(root)
+
+    @staticmethod
+    def _go_module(root: Path) -> str | None:
+        try:
+            match = re.search(r"^module\s+(\S+)", (root / "go.mod").read_text(), re.MULTILINE)
+        except OSError:
+            return None
+        return match.group(1) if match else None
+
+    def _python_module(self, base: PurePosixPath, dotted: str) -> list[str]:
+        """Resolve a dotted module under a base directory, with its package inits."""
+        parts = [part for part in dotted.split(".") if part]
+        while parts:
+            stem = base.joinpath(*parts)
+            for candidate in (f"{stem}.py", f"{stem}/__init__.py"):
+                candidate = candidate.removeprefix("./")
+                if candidate in self.files:
+                    inits = [
+                        init
+                        for i in range(1, len(parts))
+                        if (init := str(base.joinpath(*parts[:i], "__init__.py")).removeprefix("./")) in self.files
+                    ]
+                    return [candidate, *inits]
+            parts.pop()  # Imported a name from the module, not a submodule
+        return []
+
+    def python(self, name: str, spec: str) -> list[str]:
+        directory = PurePosixPath(name).parent
+        if spec.startswith("."):
+            level = len(spec) - len(spec.lstrip("."))
+            base = directory
+            for _ in range(level - 1):
+                base = base.parent
+            return self._python_module(base, spec[level:])
+        for root in (str(directory), *PYTHON_ROOTS):
+            resolved = self._python_module(PurePosixPath(root or "."), spec)
+            if resolved:
+                return resolved
+        return []
+
+    def js(self, name: str, spec: str) -> list[str]:
+        target = os.path.normpath(str(PurePosixPath(name).parent / spec)).replace(os.sep, "/")
+        stem, ext = os.path.splitext(target)
+        candidates = [target]
+        candidates += [target + suffix for suffix in JS_SUFFIXES]
+        candidates += [f"{target}/index{suffix}" for suffix in JS_SUFFIXES]
+        if ext in JS_SUFFIXES:
+            # TypeScript sources imported by their compiled .js name
+            candidates += [stem + suffix for suffix in JS_SUFFIXES]
+        return next(([c] for c in candidates if c in self.files), [])
+
+    def go(self, spec: str) -> list[str]:
+        if not self.go_module or not (spec == self.go_module or spec.startswith(self.go_module + "/")):
+            return []
+        directory = spec[len(self.go_module) :].strip("/") or "."
+        return [f for f in self.dir_files.get(directory, []) if not f.endswith("_test.go")]
+
+    def resolve(self, name: str, specs: list[str]) -> set[str]:
+        suffix = PurePosixPath(name).suffix
+        deps: set[str] = set()
+        if suffix in PYTHON_SUFFIXES:
+            for spec in specs:
+                deps.update(self.python(name, spec))
+        elif suffix in JS_SUFFIXES:
+            for spec in specs:
+                deps.update(self.js(name, spec))
+        else:
+            for spec in specs:
+                deps.update(self.go(spec))
+            # Files of one package see each other without importing
+            directory = str(PurePosixPath(name).parent)
+            deps.update(f for f in self.dir_files[directory] if not f.endswith("_test.go"))
+        deps.discard(name)
+        return deps
+
+
+class ImportGraphCache:
+    """Per-file imports of one project, keyed by each file's size and mtime.
+
+    Attributes:
+        root: Project root.
+        cache_path: JSON file the cache is persisted to.
+    """
+
+    def __init__(self, root: Path, cache_path: Path | None = None):
+        """Initialize the cache.
+
+        Args:
+            root: Project root.
+            cache_path: Cache file. Defaults to .adw/cache/import_graph.json
+        """
+        self.root = root.resolve()
+        self.cache_path = cache_path or self.root / DEFAULT_CACHE_PATH
+
+    def _persistent(self) -> bool:
+        """Only initialized projects get an on-disk cache."""
+        return (self.root / ".adw").is_dir()
+
+    def _read(self) -> dict[str, Any]:
+        with _memo_lock:
+            if str(self.root) in _memo:
+                return _memo[str(self.root)]
+        if not self._persistent():
+            return {}
+        try:
+            data: dict[str, Any] = json.loads(self.cache_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return data.get("files", {}) if data.get("version") == CACHE_VERSION else {}
+
+    def _write(self, entries: dict[str, Any]) -> None:
+        with _memo_lock:
+            _memo[str(self.root)] = entries
+        if not self._persistent():
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps({"version": CACHE_VERSION, "files": entries}))
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.debug("Could not write import graph cache: %s", e)
+
+    def build(self) -> ImportGraph | None:
+        """Build the import graph, re-reading only files that changed.
+
+        Returns:
+            ImportGraph, or None if the project's files could not be listed.
+        """
+        listed = project_files(self.root)
+        if listed is None:
+            return None
+        suffixes = PYTHON_SUFFIXES | GO_SUFFIXES | frozenset(JS_SUFFIXES)
+        files = {name for name in listed if PurePosixPath(name).suffix in suffixes}
+
+        cached = self._read()
+        entries: dict[str, Any] = {}
+        changed = False
+        for name in files:
+            try:
+                st = (self.root / name).stat()
+            except OSError:
+                continue  # Deleted but not yet staged
+            entry = cached.get(name)
+            if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+                entries[name] = entry
+                continue
+            entries[name] = [st.st_mtime_ns, st.st_size, _parse_imports(self.root, name)]
+            changed = True
+
+        files = set(entries)
+        if changed or len(entries) != len(cached):
+            self._write(entries)
+
+        resolver = _Resolver(self.root, files)
+        imports = {name: resolver.resolve(name, entry[2]) for name, entry in entries.items()}
+        return ImportGraph(self.root, files, imports)
+
+
+@dataclass
+class TestSelection:
+    """Tests affected by a change.
+
+    Attributes:
+        changed: Files changed since the base commit.
+        tests: Affected test files, relative to the project root.
+        full_run: Whether the change can affect any test, so the whole
+            suite has to run.
+        reason: Why the whole suite has to run.
+    """
+
+    changed: list[str] = field(default_factory=list)
+    tests: list[str] = field(default_factory=list)
+    full_run: bool = False
+    reason: str = ""
+
+
+def select_tests(path: Path, base: str) -> TestSelection:
+    """Select the test files a change since a base commit can affect.
+
+    Args:
+        path: Project root.
+        base: Commit the change started from.
+
+    Returns:
+        TestSelection; check full_run before using its tests.
+    """
+    changed = changed_files(path, base)
+    if changed is None:
+        return TestSelection(full_run=True, reason=f"could not diff against {base}")
+
+    for name in changed:
+        if _needs_full_run(name, path):
+            return TestSelection(changed=changed, full_run=True, reason=f"{name} changed")
+
+    graph = ImportGraphCache(path).build()
+    if graph is None:
+        return TestSelection(changed=changed, full_run=True, reason="could not list project files")
+
+    affected = graph.affected([name for name in changed if name in graph.files])
+    tests = sorted(name for name in affected if is_test_file(name))
+    return TestSelection(changed=changed, tests=tests)
+
+
+def narrow_command(command: str, framework: TestFramework, tests: list[str]) -> str | None:
+    """Restrict a test command to some test files.
+
+    Args:
+        command: Full-suite test command.
+        framework: Framework the command runs.
+        tests: Test files to run, relative to the project root.
+
+    Returns:
+        The narrowed command, or None if the framework cannot select files
+        (the whole suite has to run).
+    """
+    if framework == TestFramework.GO_TEST:
+        directories = sorted({str(PurePosixPath(test).parent) for test in tests})
+        packages = ["." if directory == "." else f"./{directory}" for directory in directories]
+        if "./..." in command.split():
+            return command.replace("./...", " ".join(packages), 1)
+        return f"{command} {' '.join(packages)}"
+
+    quoted = " ".join(shlex.quote(test) for test in tests)
+    if framework == TestFramework.PYTEST:
+        return f"{command} {quoted}"
+    if framework in (TestFramework.JEST, TestFramework.VITEST, TestFramework.BUN_TEST):
+        # Arguments to a package script go after "--"
+        if re.search(r"\b(npm|pnpm|yarn)\s+(run\s+)?test\b", command) and " -- " not in command:
+            return f"{command} -- {quoted}"
+        return f"{command} {quoted}"
+    return None
+
+
+def clear_import_graph_cache(path: Path | None = None) -> None:
+    """Drop cached imports.
+
+    Args:
+        path: Project whose imports to drop (in memory and on disk). Clears
+            the in-process memo for all projects if None.
+    """
+    with _memo_lock:
+        if path is None:
+            _memo.clear()
+            return
+        _memo.pop(str(path.resolve()), None)
+
+    cache_path = path.resolve() / DEFAULT_CACHE_PATH
+    if cache_path.exists():
+        cache_path.unlink()
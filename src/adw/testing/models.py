@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
+from typing import Any
 
 
 class TestFramework(str, Enum):
@@ -38,6 +39,25 @@ class FailedTest:
             location += ")"
         return f"{self.name}{location}: {self.error_message[:100]}"
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert failed test to dictionary."""
+        return {
+            "name": self.name,
+            "error_message": self.error_message,
+            "file_path": self.file_path,
+            "line_number": self.line_number,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> FailedTest:
+        """Create failed test from dictionary."""
+        return cls(
+            name=data["name"],
+            error_message=data["error_message"],
+            file_path=data.get("file_path"),
+            line_number=data.get("line_number"),
+        )
+
 
 @dataclass
 class TestResult:
@@ -58,12 +78,54 @@ class TestResult:
     command: str = ""
     timed_out: bool = False
     error_message: str | None = None
+    cached: bool = False  # Reused from an earlier run on the same tree
 
     @property
     def success(self) -> bool:
         """Check if all tests passed."""
         return self.exit_code == 0 and self.failed == 0 and self.errors == 0
 
+    def to_dict(self) -> dict[str, Any]:
+        """Convert test result to dictionary."""
+        return {
+            "passed": self.passed,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "total": self.total,
+            "duration_seconds": self.duration_seconds,
+            "coverage_percent": self.coverage_percent,
+            "failed_tests": [test.to_dict() for test in self.failed_tests],
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+            "exit_code": self.exit_code,
+            "framework": self.framework.value,
+            "command": self.command,
+            "timed_out": self.timed_out,
+            "error_message": self.error_message,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TestResult:
+        """Create test result from dictionary."""
+        return cls(
+            passed=data.get("passed", 0),
+            failed=data.get("failed", 0),
+            skipped=data.get("skipped", 0),
+            errors=data.get("errors", 0),
+            total=data.get("total", 0),
+            duration_seconds=data.get("duration_seconds", 0.0),
+            coverage_percent=data.get("coverage_percent"),
+            failed_tests=[FailedTest.from_dict(test) for test in data.get("failed_tests", [])],
+            stdout=data.get("stdout", ""),
+            stderr=data.get("stderr", ""),
+            exit_code=data.get("exit_code", 0),
+            framework=TestFramework(data.get("framework", TestFramework.UNKNOWN.value)),
+            command=data.get("command", ""),
+            timed_out=data.get("timed_out", False),
+            error_message=data.get("error_message"),
+        )
+
     @property
     def has_failures(self) -> bool:
         """Check if there are any test failures."""
@@ -82,7 +144,9 @@ class TestResult:
             parts.append(f"{self.errors} errors")
 
         result = f"Tests: {', '.join(parts) or 'no tests run'}"
-        if self.duration_seconds > 0:
+        if self.cached:
+            result += " (cached)"
+        elif self.duration_seconds > 0:
             result += f" ({self.duration_seconds:.1f}s)"
         if self.coverage_percent is not None:
             result += f" | Coverage: {self.coverage_percent:.1f}%"
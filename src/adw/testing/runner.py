@@ -17,6 +17,9 @@ from .models import FailedTest, TestFramework, TestResult
 # Default timeout for test execution (5 minutes)
 DEFAULT_TIMEOUT = 300
 
+# Terminal color and style codes
+ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
 
 def run_tests(
     command: str | None = None,
@@ -160,8 +163,9 @@ def _parse_output(
         TestFramework.BUN_TEST: _parse_bun_test_output,
     }
 
+    # Colors are forced on for readable logs; the parsers match plain text
     parser = parsers.get(framework, _parse_generic_output)
-    result = parser(stdout, stderr, exit_code)
+    result = parser(ANSI_ESCAPE.sub("", stdout), ANSI_ESCAPE.sub("", stderr), exit_code)
     result.stdout = stdout
     result.stderr = stderr
     result.exit_code = exit_code
@@ -181,8 +185,9 @@ def _parse_pytest_output(stdout: str, stderr: str, exit_code: int) -> TestResult
     combined = stdout + "\n" + stderr
 
     # Parse summary line (e.g., "5 passed, 2 failed, 1 skipped in 0.05s")
-    summary_pattern = r"=+\s*([\d\w\s,]+)\s+in\s+([\d.]+)s\s*=+"
-    summary_match = re.search(summary_pattern, combined)
+    # (without the "=" rule under -q)
+    summary_pattern = r"^=*\s*(\d+\s+\w+(?:,\s*\d+\s+\w+)*)\s+in\s+([\d.]+)s\b"
+    summary_match = re.search(summary_pattern, combined, re.MULTILINE)
 
     if summary_match:
         summary_text = summary_match.group(1)
@@ -376,15 +381,13 @@ def _parse_cargo_test_output(stdout: str, stderr: str, exit_code: int) -> TestRe
     result = TestResult()
     combined = stdout + "\n" + stderr
 
-    # Parse summary line
+    # Parse summary lines (one per test target)
     summary_pattern = r"test result: \w+\.\s*(\d+)\s+passed;\s*(\d+)\s+failed;\s*(\d+)\s+ignored"
-    summary_match = re.search(summary_pattern, combined)
-
-    if summary_match:
-        result.passed = int(summary_match.group(1))
-        result.failed = int(summary_match.group(2))
-        result.skipped = int(summary_match.group(3))
-        result.total = result.passed + result.failed + result.skipped
+    for summary_match in re.finditer(summary_pattern, combined):
+        result.passed += int(summary_match.group(1))
+        result.failed += int(summary_match.group(2))
+        result.skipped += int(summary_match.group(3))
+    result.total = result.passed + result.failed + result.skipped
 
     # Extract failed test names
     failed_pattern = r"test\s+([\w:]+)\s+\.\.\.\s+FAILED"
@@ -0,0 +1,450 @@
+"""Sharded parallel test execution.
+
+The suite is split into shards by test unit (a test file, a Go package or a
+Cargo test target), and each shard runs as its own test process. Shards are
+balanced by recorded unit durations: longest first, each onto the shard with
+the least work so far. Every shard gets its own temporary directory and its
+own leased backend/frontend ports, so shards do not trip over each other.
+
+Shard results are parsed with the usual framework parsers and merged into a
+single ``TestResult``. Unit durations are then updated from the shard
+timings, in proportion to each unit's share of its shard. They are
+memoized in-process and, for initialized projects (those with an ``.adw/``
+directory), persisted to ``.adw/cache/test_durations.json``.
+"""
+
+from __future__ import annotations
+
+import configparser
+import heapq
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from ..agent.ports import allocate_ports, release_ports
+from .detector import detect_test_framework
+from .impact import JS_SUFFIXES, is_test_file, narrow_command, project_files
+from .models import TestFramework, TestResult
+from .runner import DEFAULT_TIMEOUT, _infer_framework_from_command, run_tests
+
+logger = logging.getLogger(__name__)
+
+# Duration cache file, relative to the project root
+DEFAULT_DURATIONS_PATH = Path(".adw/cache/test_durations.json")
+
+# Weight of the newest timing when updating a unit's recorded duration
+DURATION_SMOOTHING = 0.5
+
+# Assumed duration of a unit with no history, in seconds
+DEFAULT_UNIT_SECONDS = 1.0
+
+# Frameworks whose suites can be split
+SHARDABLE_FRAMEWORKS = frozenset(
+    {
+        TestFramework.PYTEST,
+        TestFramework.JEST,
+        TestFramework.VITEST,
+        TestFramework.GO_TEST,
+        TestFramework.CARGO_TEST,
+    }
+)
+
+# Units that must run in a shard of their own: cargo rejects --doc together
+# with any other target option
+EXCLUSIVE_UNITS = frozenset({"--doc"})
+
+# Directories pytest does not recurse into unless norecursedirs is configured
+PYTEST_DEFAULT_NORECURSEDIRS = ("*.egg", ".*", "_darcs", "build", "CVS", "dist", "node_modules", "venv", "{arch}")
+
+_memo: dict[str, dict[str, Any]] = {}
+_memo_lock = threading.Lock()
+
+
+def discover_units(path: Path, framework: TestFramework) -> list[str]:
+    """List the units a suite can be split into.
+
+    Args:
+        path: Project root.
+        framework: Test framework.
+
+    Returns:
+        Test files (pytest, jest, vitest), package directories (go test) or
+        target arguments (cargo test), sorted. Empty if the suite cannot be
+        split.
+    """
+    if framework == TestFramework.CARGO_TEST:
+        units = []
+        if (path / "src" / "lib.rs").exists():
+            units += ["--lib", "--doc"]
+        if (path / "src" / "main.rs").exists() or (path / "src" / "bin").is_dir():
+            units.append("--bins")
+        units += [f"--test {test.stem}" for test in sorted((path / "tests").glob("*.rs"))]
+        return units
+
+    files = project_files(path)
+    if files is None:
+        return []
+    tests = [name for name in files if is_test_file(name)]
+    if framework == TestFramework.PYTEST:
+        options = _pytest_options(path)
+        testpaths = _option_list(options.get("testpaths")) or ["."]
+        norecursedirs = _option_list(options.get("norecursedirs", PYTEST_DEFAULT_NORECURSEDIRS))
+        return sorted(
+            name for name in tests if name.endswith(".py") and _pytest_collects(name, testpaths, norecursedirs)
+        )
+    if framework == TestFramework.GO_TEST:
+        return sorted({str(PurePosixPath(name).parent) for name in tests if name.endswith("_test.go")})
+    if framework in (TestFramework.JEST, TestFramework.VITEST):
+        return sorted(name for name in tests if name.endswith(JS_SUFFIXES))
+    return []
+
+
+def _pytest_options(path: Path) -> dict[str, Any]:
+    """Read pytest's ini options from the config file pytest would use.
+
+    Config files are tried in pytest's order: pytest.ini, pyproject.toml,
+    tox.ini, setup.cfg. Unreadable files count as having no options.
+    """
+    if (path / "pytest.ini").is_file():
+        return _ini_section(path / "pytest.ini", "pytest") or {}
+    if (path / "pyproject.toml").is_file():
+        try:
+            data = tomllib.loads((path / "pyproject.toml").read_text())
+        except (OSError, UnicodeDecodeError, tomllib.TOMLDecodeError):
+            data = {}
+        options = data.get("tool", {}).get("pytest", {}).get("ini_options")
+        if isinstance(options, dict):
+            return options
+    for name, section in (("tox.ini", "pytest"), ("setup.cfg", "tool:pytest")):
+        options = _ini_section(path / name, section)
+        if options is not None:
+            return options
+    return {}
+
+
+def _ini_section(file: Path, section: str) -> dict[str, Any] | None:
+    """Read one section of an ini file, or None if the file or section is missing."""
+    parser = configparser.ConfigParser(interpolation=None)
+    try:
+        parser.read(file)
+    except (configparser.Error, UnicodeDecodeError):
+        return None
+    if not parser.has_section(section):
+        return None
+    return dict(parser.items(section))
+
+
+def _option_list(value: Any) -> list[str]:
+    """Normalize a pytest list option (whitespace-separated in ini files)."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return value.split()
+    return [str(item) for item in value]
+
+
+def _pytest_collects(name: str, testpaths: list[str], norecursedirs: list[str]) -> bool:
+    """Check whether a plain ``pytest`` run would collect a test file.
+
+    The file must lie under one of testpaths, and no directory between that
+    test path and the file may match norecursedirs.
+    """
+    parts = PurePosixPath(name).parts
+    for testpath in testpaths:
+        # Test paths may be globs, matched against the file's leading directories
+        pattern = testpath.removeprefix("./").rstrip("/") or "."
+        depths = [0] if pattern == "." else range(1, len(parts) + 1)
+        for depth in depths:
+            if depth and not fnmatch("/".join(parts[:depth]), pattern):
+                continue
+            below = parts[depth:-1]
+            if not any(fnmatch(part, skip) for part in below for skip in norecursedirs):
+                return True
+    return False
+
+
+def units_for_files(files: list[str], framework: TestFramework) -> list[str]:
+    """Map test files (e.g. from select_tests) to the units they belong to."""
+    if framework == TestFramework.GO_TEST:
+        return sorted({str(PurePosixPath(name).parent) for name in files})
+    return sorted(files)
+
+
+def shard_command(command: str, framework: TestFramework, units: list[str]) -> str | None:
+    """Restrict a test command to a shard's units.
+
+    Args:
+        command: Full-suite test command.
+        framework: Framework the command runs.
+        units: Units of the shard, as returned by discover_units.
+
+    Returns:
+        The shard's command, or None if the framework cannot be sharded.
+    """
+    if framework == TestFramework.CARGO_TEST:
+        return f"{command} {' '.join(units)}"
+    if framework == TestFramework.GO_TEST:
+        # narrow_command takes test files and runs their packages
+        return narrow_command(command, framework, [f"{unit}/x_test.go" for unit in units])
+    return narrow_command(command, framework, units)
+
+
+class DurationHistory:
+    """Recorded test unit durations of one project.
+
+    Attributes:
+        root: Project root.
+        cache_path: JSON file the durations are persisted to.
+    """
+
+    def __init__(self, root: Path, cache_path: Path | None = None):
+        """Initialize the history.
+
+        Args:
+            root: Project root.
+            cache_path: Cache file. Defaults to .adw/cache/test_durations.json
+        """
+        self.root = root.resolve()
+        self.cache_path = cache_path or self.root / DEFAULT_DURATIONS_PATH
+
+    def _persistent(self) -> bool:
+        """Only initialized projects get an on-disk cache."""
+        return (self.root / ".adw").is_dir()
+
+    def _read(self) -> dict[str, Any]:
+        with _memo_lock:
+            if str(self.root) in _memo:
+                return _memo[str(self.root)]
+        if not self._persistent():
+            return {}
+        try:
+            data: dict[str, Any] = json.loads(self.cache_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return data
+
+    def _write(self, data: dict[str, Any]) -> None:
+        with _memo_lock:
+            _memo[str(self.root)] = data
+        if not self._persistent():
+            return
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True))
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.debug("Could not write test durations: %s", e)
+
+    def get(self, framework: TestFramework) -> dict[str, float]:
+        """Get the recorded durations of a framework's units, in seconds."""
+        durations: dict[str, float] = self._read().get(framework.value, {})
+        return durations
+
+    def record(self, framework: TestFramework, shards: list[list[str]], seconds: list[float]) -> None:
+        """Update unit durations from shard timings.
+
+        Each shard's time is split between its units in proportion to their
+        previous estimates.
+
+        Args:
+            framework: Framework the shards ran.
+            shards: Units of each shard.
+            seconds: Wall-clock time of each shard.
+        """
+        data = dict(self._read())
+        durations = dict(data.get(framework.value, {}))
+        for units, elapsed in zip(shards, seconds, strict=True):
+            estimates = [durations.get(unit, DEFAULT_UNIT_SECONDS) for unit in units]
+            total = sum(estimates) or 1.0
+            for unit, estimate in zip(units, estimates, strict=True):
+                measured = elapsed * estimate / total
+                previous = durations.get(unit)
+                durations[unit] = (
+                    measured
+                    if previous is None
+                    else DURATION_SMOOTHING * measured + (1 - DURATION_SMOOTHING) * previous
+                )
+        data[framework.value] = durations
+        self._write(data)
+
+
+def balance_shards(units: list[str], count: int, durations: dict[str, float]) -> list[list[str]]:
+    """Split units into shards of about equal expected duration.
+
+    Longest units are placed first, each on the shard with the least work so
+    far. Units with no recorded duration are assumed to take the median of
+    the recorded ones.
+
+    Args:
+        units: Units to split.
+        count: Number of shards.
+        durations: Recorded unit durations, in seconds.
+
+    Returns:
+        Non-empty shards (fewer than count if there are fewer units).
+    """
+    known = [durations[unit] for unit in units if unit in durations]
+    default = statistics.median(known) if known else DEFAULT_UNIT_SECONDS
+    weighted = sorted(units, key=lambda unit: (-durations.get(unit, default), unit))
+
+    heap = [(0.0, i) for i in range(min(count, len(units)))]
+    shards: list[list[str]] = [[] for _ in heap]
+    for unit in weighted:
+        load, i = heapq.heappop(heap)
+        shards[i].append(unit)
+        heapq.heappush(heap, (load + durations.get(unit, default), i))
+    return [sorted(shard) for shard in shards]
+
+
+def merge_results(results: list[TestResult], command: str, duration_seconds: float) -> TestResult:
+    """Merge shard results into one result for the whole suite.
+
+    Args:
+        results: Result of each shard.
+        command: Full-suite command, reported as the merged command.
+        duration_seconds: Wall-clock time of the whole run.
+
+    Returns:
+        Combined TestResult. It fails if any shard failed.
+    """
+    merged = TestResult(
+        command=command,
+        duration_seconds=duration_seconds,
+        framework=results[0].framework if results else TestFramework.UNKNOWN,
+    )
+    stdout, stderr, errors = [], [], []
+    for i, result in enumerate(results, 1):
+        merged.passed += result.passed
+        merged.failed += result.failed
+        merged.skipped += result.skipped
+        merged.errors += result.errors
+        merged.total += result.total
+        merged.failed_tests.extend(result.failed_tests)
+        merged.timed_out = merged.timed_out or result.timed_out
+        if result.exit_code != 0 and merged.exit_code == 0:
+            merged.exit_code = result.exit_code
+        header = f"--- shard {i}/{len(results)}: {result.command} ---"
+        stdout.append(f"{header}\n{result.stdout}")
+        if result.stderr:
+            stderr.append(f"{header}\n{result.stderr}")
+        if result.error_message:
+            errors.append(f"shard {i}: {result.error_message}")
+
+    merged.stdout = "\n".join(stdout)
+    merged.stderr = "\n".join(stderr)
+    merged.error_message = "; ".join(errors) or None
+    return merged
+
+
+def _lease_ports(owner: str) -> dict[str, str]:
+    """Lease a shard's ports, as environment variables.
+
+    A shard that gets no ports still runs, on whatever ports its tests pick.
+    """
+    try:
+        ports = allocate_ports(owner)
+    except (RuntimeError, sqlite3.Error) as e:
+        logger.warning("Could not lease ports for %s: %s", owner, e)
+        return {}
+    return {f"{name.upper()}_PORT": str(port) for name, port in ports.items()}
+
+
+def run_sharded_tests(
+    command: str | None = None,
+    path: Path | None = None,
+    shards: int | None = None,
+    timeout: int = DEFAULT_TIMEOUT,
+    env: dict[str, str] | None = None,
+    units: list[str] | None = None,
+    owner: str = "tests",
+) -> TestResult:
+    """Run a test suite split across parallel shards.
+
+    Falls back to a single run when the framework cannot be sharded or
+    there is only one unit.
+
+    Args:
+        command: Full-suite test command. Auto-detected if not provided.
+        path: Working directory. Defaults to current directory.
+        shards: Number of shards. Defaults to the CPU count.
+        timeout: Maximum time in seconds for each shard.
+        env: Additional environment variables to set.
+        units: Units to run (e.g. only affected test files). Defaults to the
+            whole suite.
+        owner: Prefix of the shards' port leases, such as the ADW ID.
+
+    Returns:
+        Merged TestResult of all shards.
+    """
+    path = path or Path.cwd()
+    if command is None:
+        framework_info = detect_test_framework(path)
+        if framework_info is None:
+            return run_tests(path=path, timeout=timeout, env=env)
+        command, framework = framework_info.command, framework_info.framework
+    else:
+        framework = _infer_framework_from_command(command)
+
+    if framework not in SHARDABLE_FRAMEWORKS:
+        return run_tests(command=command, path=path, timeout=timeout, env=env)
+
+    selected = units is not None
+    if units is None:
+        units = discover_units(path, framework)
+    isolated = [[unit] for unit in units if unit in EXCLUSIVE_UNITS]
+    shared = [unit for unit in units if unit not in EXCLUSIVE_UNITS]
+    count = max(1, shards or os.cpu_count() or 1)
+    if len(units) <= 1 or (count == 1 and not (isolated and shared and selected)):
+        narrowed = shard_command(command, framework, units) if selected and units else None
+        return run_tests(command=narrowed or command, path=path, timeout=timeout, env=env)
+
+    history = DurationHistory(path)
+    plan = balance_shards(shared, max(1, count - len(isolated)), history.get(framework)) + isolated
+    commands = [shard_command(command, framework, shard) for shard in plan]
+    if any(shard is None for shard in commands):
+        return run_tests(command=command, path=path, timeout=timeout, env=env)
+
+    temp_root = Path(tempfile.mkdtemp(prefix="adw-shards-"))
+    elapsed = [0.0] * len(plan)
+
+    def run_shard(i: int) -> TestResult:
+        shard_owner = f"{owner}-shard{i + 1}"
+        shard_tmp = temp_root / f"shard{i + 1}"
+        shard_tmp.mkdir()
+        shard_env = {
+            **(env or {}),
+            "TMPDIR": str(shard_tmp),
+            "ADW_SHARD_INDEX": str(i + 1),
+            "ADW_SHARD_COUNT": str(len(plan)),
+            **_lease_ports(shard_owner),
+        }
+        start = time.time()
+        try:
+            return run_tests(command=commands[i], path=path, timeout=timeout, env=shard_env)
+        finally:
+            elapsed[i] = time.time() - start
+            release_ports(shard_owner)
+
+    start = time.time()
+    try:
+        with ThreadPoolExecutor(max_workers=len(plan)) as pool:
+            results = list(pool.map(run_shard, range(len(plan))))
+    finally:
+        shutil.rmtree(temp_root, ignore_errors=True)
+
+    if not any(result.timed_out for result in results):
+        history.record(framework, plan, elapsed)
+    logger.debug("Ran %d test units in %d shards", len(units), len(plan))
+    return merge_results(results, command, time.time() - start)
@@ -0,0 +1,326 @@
+"""Streaming test execution with fail-fast.
+
+``run_tests`` only parses output once the suite has finished. ``stream_tests``
+reads the output line by line while the suite runs instead. Each line goes
+through the framework's parser, so failures are reported as soon as they are
+printed. The run can be stopped after a number of failures, or shortly after
+a collection or compile error shows up. The output that follows such an error
+(an ImportError traceback, the compiler's explanation) is still read for
+FATAL_ERROR_GRACE_SECONDS and kept in the result; pytest stops by itself
+after collection errors, so it is left to finish.
+
+A failure limit is left to pytest itself (``--maxfail``) so its failure
+summary is still printed. Runners that print each failure's details as it
+happens are stopped at the next failure past the limit. Other runners, which
+only print details at the end, run to completion.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import re
+import shlex
+import signal
+import subprocess
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO
+
+from .detector import detect_test_framework
+from .models import FailedTest, TestFramework, TestResult
+from .runner import ANSI_ESCAPE, DEFAULT_TIMEOUT, _infer_framework_from_command, _parse_output
+
+logger = logging.getLogger(__name__)
+
+# Seconds a stopped suite gets to exit before it is killed
+TERMINATE_GRACE_SECONDS = 5
+
+# Seconds output is still read after a fatal error before the suite is stopped
+FATAL_ERROR_GRACE_SECONDS = 5
+
+# Lines of output from a fatal error on that are kept to explain it
+FATAL_OUTPUT_LINES = 40
+
+# Pytest output when --maxfail cut the run short
+PYTEST_MAXFAIL_PATTERN = re.compile(r"stopping after \d+ failures")
+
+# Runners that exit by themselves after a fatal error
+SELF_STOPPING_FRAMEWORKS = frozenset({TestFramework.PYTEST})
+
+# Runners that print each failure's details before the next failure starts
+INLINE_FAILURE_FRAMEWORKS = frozenset({TestFramework.JEST, TestFramework.BUN_TEST, TestFramework.GO_TEST})
+
+# Per-test result lines the summary parsers do not pick up
+PROGRESS_FAILURE_PATTERNS: dict[TestFramework, re.Pattern[str]] = {
+    # "tests/test_a.py::test_x FAILED  [ 50%]" (verbose pytest)
+    TestFramework.PYTEST: re.compile(r"^([\w/.\-\[\]]+::[\w\[\]\-.:]+)\s+(?:FAILED|ERROR)\b"),
+}
+
+# Lines that mean the suite cannot run at all
+FATAL_ERROR_PATTERNS: dict[TestFramework, re.Pattern[str]] = {
+    TestFramework.PYTEST: re.compile(r"ERROR collecting \S+|ImportError while importing test module"),
+    TestFramework.JEST: re.compile(r"Test suite failed to run"),
+    TestFramework.VITEST: re.compile(r"Failed to load url|Transform failed|Failed to parse source"),
+    TestFramework.BUN_TEST: re.compile(r"^error: .*(?:Cannot find module|Unexpected)"),
+    TestFramework.GO_TEST: re.compile(r"\[(?:build|setup) failed\]"),
+    TestFramework.CARGO_TEST: re.compile(r"^error\[E\d+\]: |could not compile"),
+}
+
+
+class OutputWatcher:
+    """Incremental parser of test output.
+
+    Attributes:
+        framework: Framework producing the output.
+        failures: Failed tests seen so far, in order.
+        fatal_error: First line showing the suite cannot run, if any.
+        fatal_output: Lines from fatal_error on, up to FATAL_OUTPUT_LINES.
+    """
+
+    def __init__(
+        self,
+        framework: TestFramework,
+        on_failure: Callable[[FailedTest], None] | None = None,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            framework: Framework producing the output.
+            on_failure: Called with each new failure as it is seen.
+        """
+        self.framework = framework
+        self.failures: list[FailedTest] = []
+        self.fatal_error: str | None = None
+        self.fatal_output: list[str] = []
+        self._on_failure = on_failure
+        self._seen: set[str] = set()
+
+    def feed(self, line: str) -> None:
+        """Parse one line of output."""
+        line = ANSI_ESCAPE.sub("", line).rstrip()
+        if not line:
+            return
+
+        fatal = FATAL_ERROR_PATTERNS.get(self.framework)
+        if self.fatal_error is None and fatal is not None and fatal.search(line):
+            self.fatal_error = line.strip()
+        if self.fatal_error is not None and len(self.fatal_output) < FATAL_OUTPUT_LINES:
+            self.fatal_output.append(line)
+
+        found = _parse_output(line, "", 1, self.framework).failed_tests
+        progress = PROGRESS_FAILURE_PATTERNS.get(self.framework)
+        match = progress.search(line) if progress is not None else None
+        if match and not found:
+            name = match.group(1)
+            found = [FailedTest(name=name, error_message="Test failed", file_path=name.split("::")[0])]
+
+        for failure in found:
+            # The short summary repeats failures already seen, without parameters
+            key = failure.name.split(" - ")[0]
+            if key in self._seen or any(seen.startswith(f"{key}[") for seen in self._seen):
+                continue
+            self._seen.add(key)
+            self.failures.append(failure)
+            if self._on_failure:
+                self._on_failure(failure)
+
+
+def _stream_env(
+    command: str,
+    framework: TestFramework,
+    env: dict[str, str] | None,
+    max_failures: int = 0,
+) -> dict[str, str]:
+    """Build the environment of a streamed run.
+
+    Matches run_tests, except that pytest reports every test on its own
+    line, so failures are visible before the final summary, and stops by
+    itself after max_failures.
+    """
+    proc_env = os.environ.copy()
+    proc_env["PYTHONUNBUFFERED"] = "1"
+    proc_env["FORCE_COLOR"] = "1"
+    proc_env["PYTEST_ADDOPTS"] = "--color=yes"
+    if framework == TestFramework.PYTEST:
+        try:
+            quiet = shlex.split(command).count("-q")
+        except ValueError:
+            quiet = 0
+        proc_env["PYTEST_ADDOPTS"] += " -v" * (quiet + 1)
+        if max_failures:
+            proc_env["PYTEST_ADDOPTS"] += f" --maxfail={max_failures}"
+    if env:
+        proc_env.update(env)
+    return proc_env
+
+
+def _read_lines(stream: IO[str], name: str, lines: queue.Queue[tuple[str, str | None]]) -> None:
+    """Forward a pipe's lines to a queue, then None once it closes."""
+    for line in stream:
+        lines.put((name, line))
+    lines.put((name, None))
+
+
+def _terminate(process: subprocess.Popen[str]) -> None:
+    """Stop a suite and everything it started."""
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=TERMINATE_GRACE_SECONDS)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+    except ProcessLookupError:
+        pass
+
+
+def stream_tests(
+    command: str | None = None,
+    path: Path | None = None,
+    timeout: int = DEFAULT_TIMEOUT,
+    env: dict[str, str] | None = None,
+    on_failure: Callable[[FailedTest], None] | None = None,
+    max_failures: int = 0,
+    stop_on_error: bool = True,
+) -> TestResult:
+    """Run tests, parsing their output while they run.
+
+    Args:
+        command: Explicit test command to run. If not provided, will auto-detect.
+        path: Working directory for test execution. Defaults to current directory.
+        timeout: Maximum time in seconds for test execution.
+        env: Additional environment variables to set.
+        on_failure: Called with each failed test as soon as it is reported.
+        max_failures: Stop the run after this many failures (0 = never).
+            Only applies to pytest and to runners that print failures
+            inline.
+        stop_on_error: Stop the run shortly after a collection or compile
+            error, keeping the output that explains it.
+
+    Returns:
+        TestResult with parsed output. If the run was stopped early, it
+        holds the failures seen so far and error_message says why.
+    """
+    if path is None:
+        path = Path.cwd()
+
+    if command is None:
+        framework_info = detect_test_framework(path)
+        if framework_info is None:
+            return TestResult(
+                error_message="No test framework detected",
+                framework=TestFramework.UNKNOWN,
+            )
+        command = framework_info.command
+        framework = framework_info.framework
+    else:
+        framework = _infer_framework_from_command(command)
+
+    # Failures after which the process is stopped; pytest stops by itself
+    kill_after = max_failures if framework in INLINE_FAILURE_FRAMEWORKS else 0
+    stop_early = stop_on_error and framework not in SELF_STOPPING_FRAMEWORKS
+    start_time = time.time()
+    deadline = start_time + timeout
+    watcher = OutputWatcher(framework, on_failure)
+    output: dict[str, list[str]] = {"stdout": [], "stderr": []}
+    lines: queue.Queue[tuple[str, str | None]] = queue.Queue()
+    stopped: str | None = None
+    stop_at: float | None = None  # End of the grace period after a fatal error
+    timed_out = False
+
+    try:
+        process = subprocess.Popen(
+            command,
+            shell=True,
+            cwd=path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            errors="replace",
+            env=_stream_env(command, framework, env, max_failures),
+            start_new_session=True,
+        )
+    except OSError as e:
+        return TestResult(
+            error_message=f"Test execution failed: {e}",
+            exit_code=-1,
+            duration_seconds=time.time() - start_time,
+            command=command,
+            framework=framework,
+        )
+
+    readers = [
+        threading.Thread(target=_read_lines, args=(stream, name, lines), daemon=True)
+        for name, stream in (("stdout", process.stdout), ("stderr", process.stderr))
+    ]
+    for reader in readers:
+        reader.start()
+
+    open_streams = len(readers)
+    while open_streams:
+        wait_until = deadline if stop_at is None else min(deadline, stop_at)
+        try:
+            name, line = lines.get(timeout=max(0.0, wait_until - time.time()))
+        except queue.Empty:
+            if wait_until < deadline:
+                stopped = f"Stopped on error: {watcher.fatal_error}"
+            else:
+                timed_out = True
+            break
+        if line is None:
+            open_streams -= 1
+            continue
+        output[name].append(line)
+        watcher.feed(line)
+        if stop_early and watcher.fatal_error and stop_at is None:
+            stop_at = time.time() + FATAL_ERROR_GRACE_SECONDS
+        # One failure past the limit, so the last reported one's details are complete
+        if kill_after and len(watcher.failures) > kill_after:
+            stopped = f"Stopped after {len(watcher.failures)} failures"
+            break
+
+    if stopped or timed_out:
+        _terminate(process)
+    exit_code = process.wait()
+    for reader in readers:
+        reader.join(timeout=1)
+
+    stdout, stderr = "".join(output["stdout"]), "".join(output["stderr"])
+    duration = time.time() - start_time
+    if timed_out:
+        return TestResult(
+            timed_out=True,
+            error_message=f"Test execution timed out after {timeout}s",
+            failed=len(watcher.failures),
+            failed_tests=watcher.failures,
+            stdout=stdout,
+            stderr=stderr,
+            exit_code=-1,
+            duration_seconds=duration,
+            command=command,
+            framework=framework,
+        )
+
+    test_result = _parse_output(stdout=stdout, stderr=stderr, exit_code=exit_code, framework=framework)
+    test_result.duration_seconds = duration
+    test_result.command = command
+    test_result.framework = framework
+    if framework == TestFramework.PYTEST and max_failures and PYTEST_MAXFAIL_PATTERN.search(stdout):
+        test_result.error_message = test_result.error_message or f"Stopped after {max_failures} failures"
+    if stopped:
+        # The suite never printed its summary; report what was seen
+        logger.info("%s: %s", command, stopped)
+        test_result.failed = max(test_result.failed, len(watcher.failures))
+        test_result.failed_tests = test_result.failed_tests or watcher.failures
+        if watcher.fatal_error and not test_result.errors:
+            test_result.errors = 1
+        test_result.total = test_result.passed + test_result.failed + test_result.skipped + test_result.errors
+        test_result.exit_code = exit_code or 1
+        test_result.error_message = stopped
+    if stop_on_error and watcher.fatal_error and exit_code and (stopped is None or stop_at is not None):
+        # Keep the output explaining the error; stdout is not part of the retry context
+        test_result.error_message = "\n".join([f"Stopped on error: {watcher.fatal_error}", *watcher.fatal_output[1:]])
+    return test_result
@@ -9,6 +9,7 @@ from __future__ import annotations
 import logging
 from collections.abc import Callable
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 
 from ..retry.context import (
@@ -20,9 +21,13 @@ from ..retry.escalation import (
     EscalationReport,
     generate_escalation_report,
 )
+from .cache import TestResultCache, run_cached
 from .detector import detect_test_framework
-from .models import TestResult
-from .runner import run_tests
+from .impact import narrow_command, select_tests
+from .models import FailedTest, TestResult
+from .runner import _infer_framework_from_command, run_tests
+from .shards import run_sharded_tests, units_for_files
+from .stream import stream_tests
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +42,14 @@ class ValidationConfig:
     test_command: str | None = None  # Auto-detect if None
     retry_delay_seconds: int = 2
     exponential_backoff: bool = True
+    impact_base: str | None = None  # Run only tests affected since this commit
+    full_suite_on_pass: bool = True  # Confirm a passing affected-test run with the full suite
+    shards: int = 1  # Parallel test shards (0 = one per CPU)
+    owner: str = "tests"  # Prefix of the shards' port leases, such as the ADW ID
+    stream_output: bool = False  # Parse output while tests run (single-process runs only)
+    max_failures: int = 0  # Stop a streamed run after this many failures (0 = never)
+    stop_on_error: bool = True  # Stop a streamed run on a collection/compile error
+    use_cache: bool = False  # Reuse the passing result of an unchanged tree
 
 
 @dataclass
@@ -73,6 +86,7 @@ def validate_tests(
     on_progress: Callable[[str], None] | None = None,
     task_id: str | None = None,
     task_description: str | None = None,
+    on_failure: Callable[[FailedTest], None] | None = None,
 ) -> ValidationResult:
     """Run tests and return validation result.
 
@@ -86,6 +100,8 @@ def validate_tests(
         on_progress: Optional progress callback.
         task_id: Optional task ID for logging.
         task_description: Optional task description for escalation.
+        on_failure: Called with each failed test as it is reported, when
+            config.stream_output is set.
 
     Returns:
         ValidationResult with test outcome.
@@ -112,15 +128,34 @@ def validate_tests(
         if on_progress:
             on_progress(f"Detected {framework_info.framework.value}, using: {test_command}")
 
-    # Run tests
-    if on_progress:
-        on_progress(f"Running tests: {test_command}")
+    cache = TestResultCache() if config.use_cache else None
+    cache_key = cache.key(path, test_command) if cache else None
+    test_result = cache.get(cache_key) if cache and cache_key else None
+    if test_result is not None and on_progress:
+        on_progress("Tree unchanged since the suite last passed, reusing its result")
 
-    test_result = run_tests(
-        command=test_command,
-        path=path,
-        timeout=config.timeout_seconds,
-    )
+    if test_result is None and config.impact_base:
+        test_result = _run_affected_tests(path, test_command, config.impact_base, config, on_progress, on_failure)
+        if test_result is not None and test_result.success and config.full_suite_on_pass:
+            if on_progress:
+                on_progress(f"✅ Affected tests: {test_result.summary()}, running full suite")
+            test_result = None
+
+    if test_result is None:
+        if on_progress:
+            on_progress(f"Running tests: {test_command}")
+        if config.shards != 1:
+            test_result = run_sharded_tests(
+                command=test_command,
+                path=path,
+                shards=config.shards or None,
+                timeout=config.timeout_seconds,
+                owner=config.owner,
+            )
+        else:
+            test_result = _run_single(test_command, path, config, on_progress, on_failure)
+        if cache and cache_key:
+            cache.put(cache_key, test_result)
 
     if test_result.success:
         if on_progress:
@@ -152,6 +187,75 @@ def validate_tests(
         )
 
 
+def _run_affected_tests(
+    path: Path,
+    test_command: str,
+    base: str,
+    config: ValidationConfig,
+    on_progress: Callable[[str], None] | None = None,
+    on_failure: Callable[[FailedTest], None] | None = None,
+) -> TestResult | None:
+    """Run only the tests affected since a base commit.
+
+    Returns:
+        TestResult of the affected tests (empty if none are affected), or
+        None if they cannot be selected and the full suite has to run.
+    """
+    selection = select_tests(path, base)
+    if selection.full_run:
+        if on_progress:
+            on_progress(f"Running full suite ({selection.reason})")
+        return None
+    if not selection.tests:
+        if on_progress:
+            on_progress(f"No tests affected by {len(selection.changed)} changed files")
+        return TestResult(command=test_command, framework=_infer_framework_from_command(test_command))
+
+    framework = _infer_framework_from_command(test_command)
+    command = narrow_command(test_command, framework, selection.tests)
+    if command is None:
+        return None
+    if on_progress:
+        on_progress(f"Running {len(selection.tests)} affected test files: {command}")
+    if config.shards != 1:
+        return run_sharded_tests(
+            command=test_command,
+            path=path,
+            shards=config.shards or None,
+            timeout=config.timeout_seconds,
+            units=units_for_files(selection.tests, framework),
+            owner=config.owner,
+        )
+    return _run_single(command, path, config, on_progress, on_failure)
+
+
+def _run_single(
+    command: str,
+    path: Path,
+    config: ValidationConfig,
+    on_progress: Callable[[str], None] | None = None,
+    on_failure: Callable[[FailedTest], None] | None = None,
+) -> TestResult:
+    """Run a test command in one process, streaming its output if configured."""
+    if not config.stream_output:
+        return run_tests(command=command, path=path, timeout=config.timeout_seconds)
+
+    def report(failure: FailedTest) -> None:
+        if on_progress:
+            on_progress(f"❌ {failure}")
+        if on_failure:
+            on_failure(failure)
+
+    return stream_tests(
+        command=command,
+        path=path,
+        timeout=config.timeout_seconds,
+        on_failure=report,
+        max_failures=config.max_failures,
+        stop_on_error=config.stop_on_error,
+    )
+
+
 def validate_with_retry(
     path: Path | None = None,
     config: ValidationConfig | None = None,
@@ -209,11 +313,11 @@ def validate_with_retry(
         if on_progress:
             on_progress(f"Test attempt {attempt}/{max_attempts}: {test_command}")
 
-        test_result = run_tests(
-            command=test_command,
-            path=path,
-            timeout=config.timeout_seconds,
-        )
+        if config.use_cache:
+            run = partial(_run_single, test_command, path, config, on_progress)
+            test_result = run_cached(run, path, test_command)
+        else:
+            test_result = _run_single(test_command, path, config, on_progress)
         test_results.append(test_result)
 
         if test_result.success:
@@ -13,6 +13,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 
 from ..agent.manager import AgentManager
+from ..agent.ports import reclaim_ports, release_ports
 from ..agent.task_parser import get_eligible_tasks
 from ..agent.task_updater import mark_done, mark_failed, mark_in_progress
 from ..agent.utils import generate_adw_id
@@ -162,6 +163,9 @@ class CronDaemon:
         completed = self.manager.poll()
 
         for adw_id, return_code, stderr in completed:
+            # Free the agent's ports, even if it died without releasing them
+            release_ports(adw_id)
+
             # Find task by adw_id
             task_desc = None
             for desc, aid in list(self._task_agents.items()):
@@ -285,6 +289,9 @@ class CronDaemon:
         self._state_manager = DaemonStateManager()
         self._state_manager.start()
 
+        # Leases left behind by agents that died while the daemon was down
+        reclaim_ports()
+
         self.notify("started")
 
         await self._poll_loop()
@@ -22,6 +22,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+import httpx
+
+from ..utils import http_client
+
 logger = logging.getLogger(__name__)
 
 # Storage paths
@@ -527,9 +531,6 @@ def send_callback(
     Returns:
         True if callback sent successfully.
     """
-    import urllib.request
-    from urllib.error import URLError
-
     callback_url = get_callback_url(task_id)
     if not callback_url:
         return False
@@ -542,26 +543,21 @@ def send_callback(
     }
 
     try:
-        req = urllib.request.Request(
+        response = http_client.request(
+            "POST",
             callback_url,
-            data=json.dumps(payload).encode("utf-8"),
-            headers={
-                "Content-Type": "application/json",
-                "User-Agent": "ADW-Webhook/1.0",
-                "X-ADW-Task-ID": task_id,
-            },
-            method="POST",
+            json=payload,
+            headers={"User-Agent": "ADW-Webhook/1.0", "X-ADW-Task-ID": task_id},
+            timeout=30,
         )
-
-        with urllib.request.urlopen(req, timeout=30) as resp:
-            success: bool = resp.status < 400
+        success = response.status_code < 400
 
         # Remove callback if successful
         if success:
             _remove_callback(task_id)
 
         return success
-    except (URLError, TimeoutError) as e:
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
         logger.warning(f"Failed to send callback for {task_id}: {e}")
         return False
 
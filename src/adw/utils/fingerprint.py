@@ -0,0 +1,253 @@
+"""Project fingerprint cache for ADW.
+
+Project detection (``detect.detect_project``), prime generation
+(``context.priming.detect_project_type``) and test-framework detection
+(``testing.detector.detect_test_framework``) all derive their answers from the
+same handful of manifest files. This module fingerprints those files by size
+and mtime and caches each detector's result against the fingerprint, so a
+detector only re-runs when a manifest actually changed.
+
+Results are memoized in-process and, for initialized projects (those with an
+``.adw/`` directory), persisted to ``.adw/cache/project_fingerprint.json``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Cache file, relative to the project root
+DEFAULT_CACHE_PATH = Path(".adw/cache/project_fingerprint.json")
+
+# Files whose content decides what kind of project this is
+MANIFEST_FILES = (
+    "pyproject.toml",
+    "requirements.txt",
+    "setup.py",
+    "setup.cfg",
+    "manage.py",
+    "pytest.ini",
+    "conftest.py",
+    "uv.lock",
+    "poetry.lock",
+    "package.json",
+    "package-lock.json",
+    "pnpm-lock.yaml",
+    "yarn.lock",
+    "bun.lockb",
+    "tsconfig.json",
+    "vitest.config.ts",
+    "vitest.config.js",
+    "vitest.config.mts",
+    "vitest.config.mjs",
+    "jest.config.ts",
+    "jest.config.js",
+    "jest.config.mts",
+    "jest.config.mjs",
+    "jest.config.json",
+    "go.mod",
+    "go.sum",
+    "Cargo.toml",
+    "Cargo.lock",
+    "pnpm-workspace.yaml",
+    "lerna.json",
+    "nx.json",
+    "rush.json",
+    "turbo.json",
+)
+
+# Directories whose listing feeds detection (test discovery, monorepo layout)
+MANIFEST_DIRS = ("tests", "test", "__tests__", "packages", "apps")
+
+# Files modified this recently are also content-hashed, since coarse mtime
+# resolution could otherwise hide a rewrite within the same tick
+RACY_WINDOW_SECONDS = 2.0
+
+_memo: dict[tuple[str, str, str], Any] = {}
+_memo_lock = threading.Lock()
+
+
+def compute_fingerprint(path: Path) -> str:
+    """Compute a fingerprint of a project's manifest files.
+
+    Args:
+        path: Project root.
+
+    Returns:
+        Hex digest that changes whenever a manifest file or directory changes.
+    """
+    now = time.time()
+    parts: list[str] = []
+
+    for name in MANIFEST_FILES:
+        file_path = path / name
+        try:
+            st = file_path.stat()
+        except OSError:
+            continue
+        entry = f"{name}:{st.st_size}:{st.st_mtime_ns}"
+        if now - st.st_mtime < RACY_WINDOW_SECONDS:
+            try:
+                entry += ":" + hashlib.sha1(file_path.read_bytes()).hexdigest()
+            except OSError:
+                pass
+        parts.append(entry)
+
+    for name in MANIFEST_DIRS:
+        try:
+            st = (path / name).stat()
+        except OSError:
+            continue
+        parts.append(f"{name}/:{st.st_mtime_ns}")
+
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+
+class FingerprintCache:
+    """Detector results for one project, keyed by its manifest fingerprint.
+
+    Attributes:
+        project_path: Project root.
+        cache_path: JSON file the cache is persisted to.
+    """
+
+    def __init__(self, project_path: Path, cache_path: Path | None = None):
+        """Initialize the cache.
+
+        Args:
+            project_path: Project root.
+            cache_path: Cache file. Defaults to .adw/cache/project_fingerprint.json
+        """
+        self.project_path = project_path.resolve()
+        self.cache_path = cache_path or self.project_path / DEFAULT_CACHE_PATH
+
+    def _persistent(self) -> bool:
+        """Only initialized projects get an on-disk cache."""
+        return (self.project_path / ".adw").is_dir()
+
+    def _read(self) -> dict[str, Any]:
+        try:
+            data: dict[str, Any] = json.loads(self.cache_path.read_text())
+            return data
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    def _write(self, data: dict[str, Any]) -> None:
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(data, indent=2))
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.debug("Could not write fingerprint cache: %s", e)
+
+    def get(
+        self,
+        detector: str,
+        compute: Callable[[], T],
+        encode: Callable[[T], Any],
+        decode: Callable[[Any], T],
+        cache_none: bool = True,
+    ) -> T:
+        """Get a detector result, recomputing only if manifests changed.
+
+        Args:
+            detector: Detector name (cache key).
+            compute: Runs the real detection.
+            encode: Converts a result to JSON-serializable data.
+            decode: Converts cached data back to a result.
+            cache_none: Whether a None result may be cached.
+
+        Returns:
+            The cached or freshly computed result.
+        """
+        fingerprint = compute_fingerprint(self.project_path)
+        memo_key = (str(self.project_path), detector, fingerprint)
+
+        with _memo_lock:
+            if memo_key in _memo:
+                return decode(_memo[memo_key])
+
+        persistent = self._persistent()
+        data = self._read() if persistent else {}
+        if data.get("fingerprint") == fingerprint and detector in data.get("results", {}):
+            encoded = data["results"][detector]
+            try:
+                result = decode(encoded)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.debug("Discarding cached %s result: %s", detector, e)
+            else:
+                with _memo_lock:
+                    _memo[memo_key] = encoded
+                return result
+
+        result = compute()
+        if result is None and not cache_none:
+            return result
+
+        encoded = encode(result)
+        with _memo_lock:
+            _memo[memo_key] = encoded
+
+        if persistent:
+            if data.get("fingerprint") != fingerprint:
+                data = {"fingerprint": fingerprint, "results": {}}
+            data.setdefault("results", {})[detector] = encoded
+            self._write(data)
+
+        return result
+
+
+def cached_detection(
+    path: Path,
+    detector: str,
+    compute: Callable[[], T],
+    encode: Callable[[T], Any],
+    decode: Callable[[Any], T],
+    cache_none: bool = True,
+) -> T:
+    """Run a detector through the project fingerprint cache.
+
+    Args:
+        path: Project root.
+        detector: Detector name (cache key).
+        compute: Runs the real detection.
+        encode: Converts a result to JSON-serializable data.
+        decode: Converts cached data back to a result.
+        cache_none: Whether a None result may be cached.
+
+    Returns:
+        The cached or freshly computed result.
+    """
+    return FingerprintCache(path).get(detector, compute, encode, decode, cache_none=cache_none)
+
+
+def clear_fingerprint_cache(path: Path | None = None) -> None:
+    """Drop cached detector results.
+
+    Args:
+        path: Project whose results to drop (in memory and on disk). Clears
+            the in-process memo for all projects if None.
+    """
+    with _memo_lock:
+        if path is None:
+            _memo.clear()
+            return
+        root = str(path.resolve())
+        for key in [k for k in _memo if k[0] == root]:
+            del _memo[key]
+
+    cache_path = path.resolve() / DEFAULT_CACHE_PATH
+    if cache_path.exists():
+        cache_path.unlink()
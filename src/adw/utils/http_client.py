@@ -0,0 +1,404 @@
+"""Shared HTTP client for integrations and webhooks.
+
+The Slack, Telegram, Linear and Notion clients and the webhook senders all
+send requests through one pooled httpx client. Connections, and their TLS
+sessions, are kept alive between calls instead of being opened per request.
+On top of httpx this adds:
+
+- per-host rate limiting, shared by every caller in the process, so a busy
+  integration queues its own requests rather than tripping the API's limit,
+- retries of rate-limited and unavailable responses, honoring Retry-After,
+  and of requests that failed to connect (requests that may have been acted
+  on, such as a POST answered by a 502 or 504, are not resent), and
+- HTTP/2 when the optional ``h2`` package is installed.
+
+``request`` is the synchronous facade and ``arequest`` the asynchronous one.
+Both share the rate limiters.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import importlib.util
+import logging
+import random
+import threading
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+from .. import __version__
+
+logger = logging.getLogger(__name__)
+
+# Default request timeout, in seconds
+DEFAULT_TIMEOUT = 30.0
+
+# Retries after the first attempt
+DEFAULT_MAX_RETRIES = 3
+
+# Longest Retry-After waited out; longer ones are returned to the caller
+MAX_RETRY_AFTER = 60.0
+
+# Backoff before a retry without Retry-After: RETRY_BACKOFF * 2**attempt, jittered
+RETRY_BACKOFF = 0.5
+
+# Responses worth retrying: rate limited or temporarily unavailable
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+# Responses meaning the request was not acted on, so any method can be resent.
+# A 502 or 504 may come after the upstream already handled it.
+REJECTED_STATUSES = frozenset({429, 503})
+
+# Methods safe to resend after a failure mid-request, since the server may
+# have acted on the first attempt
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Sustained requests per second and burst size per host (subdomains included),
+# from each API's published limits
+HOST_RATE_LIMITS: dict[str, tuple[float, int]] = {
+    "slack.com": (1.0, 5),
+    "api.telegram.org": (30.0, 30),
+    "api.linear.app": (1500 / 3600, 20),
+    "api.notion.com": (3.0, 10),
+    "discord.com": (2.5, 5),
+}
+
+# Connection pool shared by all requests
+POOL_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+
+USER_AGENT = f"ADW-CLI/{__version__}"
+
+
+class RateLimiter:
+    """Token bucket rate limiter for one host.
+
+    Attributes:
+        rate: Sustained requests per second.
+        burst: Requests allowed at once after a quiet period.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        """Initialize a full bucket.
+
+        Args:
+            rate: Sustained requests per second.
+            burst: Bucket size.
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a slot for one request.
+
+        Returns:
+            Seconds to wait before sending it.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._blocked_until - now)
+
+    def block(self, seconds: float) -> None:
+        """Hold back all requests for a while, e.g. after a Retry-After."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header, given in seconds or as an HTTP date.
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _retryable_error(method: str, error: httpx.TransportError) -> bool:
+    """Check whether a request that failed in transport can be sent again.
+
+    Requests that never reached the server are always retried; others only
+    if resending them is harmless.
+    """
+    if isinstance(error, httpx.ConnectError | httpx.ConnectTimeout | httpx.PoolTimeout):
+        return True
+    return method.upper() in IDEMPOTENT_METHODS
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff with jitter."""
+    return float(RETRY_BACKOFF * 2**attempt * random.uniform(0.5, 1.5))
+
+
+class HttpClient:
+    """Pooled HTTP client with per-host rate limiting and retries.
+
+    Attributes:
+        timeout: Default request timeout in seconds.
+        max_retries: Default retries after the first attempt.
+        http2: Whether HTTP/2 is negotiated.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        http2: bool | None = None,
+        rate_limits: dict[str, tuple[float, int]] | None = None,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        """Initialize the client. Connections are opened on first use.
+
+        Args:
+            timeout: Default request timeout in seconds.
+            max_retries: Default retries after the first attempt.
+            http2: Use HTTP/2. Defaults to whether h2 is installed.
+            rate_limits: Requests per second and burst per host. Defaults
+                to HOST_RATE_LIMITS.
+            transport: Transport for synchronous requests (for tests).
+            async_transport: Transport for asynchronous requests (for tests).
+        """
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.http2 = importlib.util.find_spec("h2") is not None if http2 is None else http2
+        self._rate_limits = HOST_RATE_LIMITS if rate_limits is None else rate_limits
+        self._transport = transport
+        self._async_transport = async_transport
+        self._limiters: dict[str, RateLimiter | None] = {}
+        self._client: httpx.Client | None = None
+        # An async client is bound to the event loop it was created in
+        self._async_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _options(self) -> dict[str, Any]:
+        """Options shared by the sync and async httpx clients."""
+        return {
+            "http2": self.http2,
+            "limits": POOL_LIMITS,
+            "timeout": self.timeout,
+            "headers": {"User-Agent": USER_AGENT},
+        }
+
+    @property
+    def client(self) -> httpx.Client:
+        """The pooled synchronous client."""
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(transport=self._transport, **self._options())
+            return self._client
+
+    def _async_client(self) -> httpx.AsyncClient:
+        """The pooled asynchronous client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(transport=self._async_transport, **self._options())
+                self._async_clients[loop] = client
+            return client
+
+    def limiter(self, url: str) -> RateLimiter | None:
+        """Get the rate limiter of a URL's host, if it has a limit."""
+        host = (urlsplit(url).hostname or "").lower()
+        with self._lock:
+            if host not in self._limiters:
+                limit = next(
+                    (v for k, v in self._rate_limits.items() if host == k or host.endswith(f".{k}")),
+                    None,
+                )
+                self._limiters[host] = RateLimiter(*limit) if limit else None
+            return self._limiters[host]
+
+    def _retry_delay(self, response: httpx.Response, attempt: int, retries: int) -> float | None:
+        """Decide whether to retry a response.
+
+        Returns:
+            Seconds to wait before retrying, or None to return the response.
+        """
+        if response.status_code not in RETRY_STATUSES:
+            return None
+        if response.status_code not in REJECTED_STATUSES and response.request.method.upper() not in IDEMPOTENT_METHODS:
+            return None
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            limiter = self.limiter(str(response.request.url))
+            if limiter is not None:
+                limiter.block(retry_after)
+        if attempt >= retries or (retry_after is not None and retry_after > MAX_RETRY_AFTER):
+            return None
+        return retry_after if retry_after is not None else _backoff(attempt)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        retries: int | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request, waiting for the host's rate limit and retrying.
+
+        Args:
+            method: HTTP method.
+            url: Request URL.
+            retries: Retries after the first attempt. Defaults to max_retries.
+            **kwargs: Passed to httpx (json, content, headers, timeout, ...).
+
+        Returns:
+            The response. Error statuses are returned, not raised.
+
+        Raises:
+            httpx.TransportError: If the request failed on every attempt.
+        """
+        retries = self.max_retries if retries is None else retries
+        limiter = self.limiter(url)
+        attempt = 0
+        while True:
+            if limiter is not None:
+                wait = limiter.reserve()
+                if wait > 0:
+                    logger.debug("Rate limited, waiting %.1fs for %s", wait, url)
+                    time.sleep(wait)
+            try:
+                response = self.client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt >= retries or not _retryable_error(method, e):
+                    raise
+                delay = _backoff(attempt)
+                logger.debug("%s %s failed (%s), retrying in %.1fs", method, url, e, delay)
+            else:
+                retry_delay = self._retry_delay(response, attempt, retries)
+                if retry_delay is None:
+                    return response
+                delay = retry_delay
+                logger.info("%s %s returned %d, retrying in %.1fs", method, url, response.status_code, delay)
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    async def arequest(
+        self,
+        method: str,
+        url: str,
+        *,
+        retries: int | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """Send a request without blocking the event loop.
+
+        Same as request, with waits done by asyncio.sleep.
+        """
+        retries = self.max_retries if retries is None else retries
+        limiter = self.limiter(url)
+        client = self._async_client()
+        attempt = 0
+        while True:
+            if limiter is not None:
+                wait = limiter.reserve()
+                if wait > 0:
+                    logger.debug("Rate limited, waiting %.1fs for %s", wait, url)
+                    await asyncio.sleep(wait)
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                if attempt >= retries or not _retryable_error(method, e):
+                    raise
+                delay = _backoff(attempt)
+                logger.debug("%s %s failed (%s), retrying in %.1fs", method, url, e, delay)
+            else:
+                retry_delay = self._retry_delay(response, attempt, retries)
+                if retry_delay is None:
+                    return response
+                delay = retry_delay
+                logger.info("%s %s returned %d, retrying in %.1fs", method, url, response.status_code, delay)
+                await response.aclose()
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        """Close pooled connections.
+
+        Async clients of event loops that are still running are left to
+        aclose; the others are dropped with their loops.
+        """
+        with self._lock:
+            client, self._client = self._client, None
+            self._async_clients.clear()
+        if client is not None:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Close the pooled connections of the running event loop."""
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+_client: HttpClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Get the process-wide HTTP client."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def set_http_client(client: HttpClient | None) -> None:
+    """Replace the process-wide HTTP client, closing the old one.
+
+    Args:
+        client: New client, or None to create a default one on next use.
+    """
+    global _client
+    with _client_lock:
+        old, _client = _client, client
+    if old is not None and old is not client:
+        old.close()
+
+
+def close_http_client() -> None:
+    """Close the process-wide HTTP client's connections."""
+    set_http_client(None)
+
+
+def request(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """Send a request through the process-wide client (see HttpClient.request)."""
+    return get_http_client().request(method, url, **kwargs)
+
+
+async def arequest(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """Send a request through the process-wide client (see HttpClient.arequest)."""
+    return await get_http_client().arequest(method, url, **kwargs)
+
+
+atexit.register(close_http_client)
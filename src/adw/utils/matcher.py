@@ -0,0 +1,154 @@
+"""Compiled multi-pattern matching for classifier tables.
+
+Several modules classify text against a table of ``(regex, value)`` entries
+(error classes, expert domains, complexity hints, review comment kinds).
+``PatternTable`` compiles such a table once and reports every matching entry,
+with its value, in one call. Results are memoized, since the same error
+strings and file paths tend to be classified repeatedly.
+
+Case-insensitive tables fold the input to lowercase once and match against
+lowercased patterns without ``re.IGNORECASE``. That lets the regex engine use
+its literal-prefix fast paths, which makes scanning long logs several times
+faster than ``re.search(pattern, text, re.IGNORECASE)`` per entry.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+# Default number of memoized inputs per table
+DEFAULT_MEMO_SIZE = 1024
+
+# Longer inputs (whole logs) are scanned but not memoized
+MEMO_MAX_CHARS = 65536
+
+
+@dataclass(frozen=True)
+class PatternMatch(Generic[T]):
+    """One table entry that matched.
+
+    Attributes:
+        index: Position of the entry in its table.
+        pattern: The entry's regex source.
+        value: The entry's payload (weight, priority, classification, ...).
+        text: Leftmost text the entry matched (lowercased for
+            case-insensitive tables).
+    """
+
+    index: int
+    pattern: str
+    value: T
+    text: str
+
+
+def fold_pattern(pattern: str) -> str:
+    """Lowercase the literal characters of a regex, leaving escapes intact.
+
+    Args:
+        pattern: Regex source.
+
+    Returns:
+        Regex that matches the lowercased text the original would have
+        matched case-insensitively.
+    """
+    out = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\" and i + 1 < len(pattern):
+            # Keep escapes such as \S, \W, \D and \B as written
+            out.append(pattern[i : i + 2])
+            i += 2
+            continue
+        out.append(char.lower())
+        i += 1
+    return "".join(out)
+
+
+class PatternTable(Generic[T]):
+    """A table of regex entries compiled for repeated matching.
+
+    Attributes:
+        entries: The (pattern, value) entries, in table order.
+        ignore_case: Whether matching is case-insensitive.
+        anchored: Whether entries only match at the start of the text,
+            like ``re.match``.
+    """
+
+    def __init__(
+        self,
+        entries: Iterable[tuple[str, T]],
+        ignore_case: bool = True,
+        anchored: bool = False,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+    ):
+        """Compile a table.
+
+        Args:
+            entries: (pattern, value) pairs.
+            ignore_case: Match case-insensitively.
+            anchored: Only match entries at the start of the text.
+            memo_size: Number of inputs to memoize.
+        """
+        self.entries: list[tuple[str, T]] = list(entries)
+        self.ignore_case = ignore_case
+        self.anchored = anchored
+        compiled = [re.compile(fold_pattern(p) if ignore_case else p) for p, _ in self.entries]
+        self._matchers = [c.match if anchored else c.search for c in compiled]
+        self._memo_scan = lru_cache(maxsize=memo_size)(self._scan)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _scan(self, text: str) -> tuple[PatternMatch[T], ...]:
+        if self.ignore_case:
+            text = text.lower()
+        found = []
+        for i, matcher in enumerate(self._matchers):
+            match = matcher(text)
+            if match is not None:
+                pattern, value = self.entries[i]
+                found.append(PatternMatch(i, pattern, value, match.group(0)))
+        return tuple(found)
+
+    def scan(self, text: str) -> tuple[PatternMatch[T], ...]:
+        """Find every entry that matches a text.
+
+        Args:
+            text: Text to scan.
+
+        Returns:
+            Matching entries, in table order.
+        """
+        if len(text) > MEMO_MAX_CHARS:
+            return self._scan(text)
+        return self._memo_scan(text)
+
+    def first(self, text: str) -> PatternMatch[T] | None:
+        """Get the first entry, in table order, that matches a text."""
+        if len(text) <= MEMO_MAX_CHARS:
+            found = self._memo_scan(text)
+            return found[0] if found else None
+        # Long inputs stop at the first hit instead of scanning every entry
+        if self.ignore_case:
+            text = text.lower()
+        for i, matcher in enumerate(self._matchers):
+            match = matcher(text)
+            if match is not None:
+                pattern, value = self.entries[i]
+                return PatternMatch(i, pattern, value, match.group(0))
+        return None
+
+    def search(self, text: str) -> bool:
+        """Check whether any entry matches a text."""
+        return self.first(text) is not None
+
+    def clear_memo(self) -> None:
+        """Drop memoized results."""
+        self._memo_scan.cache_clear()
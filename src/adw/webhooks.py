@@ -6,13 +6,14 @@ Supports Slack, Discord, and generic webhooks.
 
 from __future__ import annotations
 
-import json
 import os
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from urllib.error import URLError
-from urllib.request import Request, urlopen
+
+import httpx
+
+from .utils import http_client
 
 
 class WebhookType(str, Enum):
@@ -169,17 +170,10 @@ def send_webhook(
         payload = format_generic_payload(event, data)
 
     try:
-        req = Request(
-            config.url,
-            data=json.dumps(payload).encode("utf-8"),
-            headers={"Content-Type": "application/json", "User-Agent": "ADW-CLI/0.3.1"},
-            method="POST",
-        )
-
-        with urlopen(req, timeout=config.timeout) as resp:
-            return resp.status < 400
-    except (URLError, TimeoutError, Exception):
+        response = http_client.request("POST", config.url, json=payload, timeout=config.timeout)
+    except (httpx.HTTPError, httpx.InvalidURL):
         return False
+    return response.status_code < 400
 
 
 class WebhookHandler:
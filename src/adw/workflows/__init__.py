@@ -45,6 +45,7 @@ try:
         PhaseDefinition,
         PromptTemplate,
         WorkflowDefinition,
+        clear_template_cache,
         create_workflow,
         delete_workflow,
         ensure_builtin_workflows,
@@ -85,6 +86,7 @@ __all__ = [
     "LoopCondition",
     "WorkflowDefinition",
     "PromptTemplate",
+    "clear_template_cache",
     # DSL parsing/serialization
     "parse_workflow_yaml",
     "load_workflow",
@@ -16,7 +16,6 @@ explicit overrides to determine the appropriate execution phases.
 from __future__ import annotations
 
 import logging
-import re
 import subprocess
 import sys
 import time
@@ -31,15 +30,17 @@ import click
 from ..agent.environment import write_env_file
 from ..agent.executor import prompt_with_retry
 from ..agent.models import AgentPromptRequest
-from ..agent.ports import find_available_ports, write_ports_env
+from ..agent.ports import find_available_ports, release_ports, write_ports_env
 from ..agent.state import ADWState
 from ..agent.task_updater import mark_done, mark_failed, mark_in_progress
+from ..agent.usage import record_task_end
 from ..agent.utils import generate_adw_id
 from ..agent.worktree import create_worktree
 from ..retry.context import format_test_failure_context, select_retry_strategy
 from ..retry.escalation import AttemptRecord, generate_escalation_report
 from ..testing.detector import detect_test_framework
 from ..testing.validation import ValidationConfig, ValidationResult, validate_tests
+from ..utils.matcher import PatternTable
 
 logger = logging.getLogger(__name__)
 
@@ -90,6 +91,10 @@ class AdaptiveConfig:
     max_test_retries: int = 3
     test_timeout_seconds: int = 300
     skip_if_no_tests: bool = True
+    test_impact_analysis: bool = True  # Run affected tests first, full suite once they pass
+    test_shards: int = 1  # Parallel test shards (0 = one per CPU)
+    test_max_failures: int = 5  # Stop a test run after this many failures (0 = never)
+    test_result_cache: bool = True  # Skip the suite on a tree that already passed
     inject_expertise: bool = True
 
     @classmethod
@@ -218,6 +223,9 @@ FULL_PATTERNS = [
     r"\b(database|schema|migration)\b",
 ]
 
+_MINIMAL_TABLE: PatternTable[None] = PatternTable((pattern, None) for pattern in MINIMAL_PATTERNS)
+_FULL_TABLE: PatternTable[None] = PatternTable((pattern, None) for pattern in FULL_PATTERNS)
+
 
 def detect_complexity(
     description: str,
@@ -264,13 +272,11 @@ def detect_complexity(
         return TaskComplexity.MINIMAL
 
     # Pattern-based detection
-    for pattern in FULL_PATTERNS:
-        if re.search(pattern, desc_lower, re.IGNORECASE):
-            return TaskComplexity.FULL
+    if _FULL_TABLE.search(desc_lower):
+        return TaskComplexity.FULL
 
-    for pattern in MINIMAL_PATTERNS:
-        if re.search(pattern, desc_lower, re.IGNORECASE):
-            return TaskComplexity.MINIMAL
+    if _MINIMAL_TABLE.search(desc_lower):
+        return TaskComplexity.MINIMAL
 
     # Default to standard
     return TaskComplexity.STANDARD
@@ -293,6 +299,7 @@ def run_test_validation(
     task_description: str,
     config: AdaptiveConfig,
     on_progress: Callable[[str], None] | None = None,
+    base_commit: str | None = None,
 ) -> ValidationResult:
     """Run test validation.
 
@@ -302,6 +309,9 @@ def run_test_validation(
         task_description: Task description.
         config: Workflow configuration.
         on_progress: Progress callback.
+        base_commit: Commit the task started from. With impact analysis
+            enabled, tests unaffected since then are skipped until the
+            affected ones pass.
 
     Returns:
         ValidationResult with test outcomes.
@@ -332,6 +342,12 @@ def run_test_validation(
         max_retries=0,  # We handle retries at the workflow level
         timeout_seconds=config.test_timeout_seconds,
         test_command=framework_info.command,
+        impact_base=base_commit if config.test_impact_analysis else None,
+        shards=config.test_shards,
+        owner=adw_id,
+        stream_output=True,
+        max_failures=config.test_max_failures,
+        use_cache=config.test_result_cache,
     )
 
     result = validate_tests(
@@ -376,14 +392,14 @@ def execute_phase(
     # Build prompt
     prompt = phase_config.prompt_template.format(task=task_description)
 
-    # Inject expertise for PLAN and IMPLEMENT phases
+    # Inject packed context (expertise, bundles, docs) for PLAN and IMPLEMENT phases
     if inject_expertise and phase_name in ("plan", "implement"):
         try:
-            from ..learning.expertise import inject_expertise_into_prompt
+            from ..context.packing import inject_packed_context
 
-            prompt = inject_expertise_into_prompt(prompt=prompt, position="end")
+            prompt = inject_packed_context(prompt, task_description, task_id=adw_id, base_path=worktree_path)
         except Exception as e:
-            logger.debug("Could not inject expertise: %s", e)
+            logger.debug("Could not inject context: %s", e)
 
     # Add retry context if provided
     if retry_context:
@@ -503,6 +519,7 @@ def run_adaptive_workflow(
     worktree_path = create_worktree(worktree_name)
     if not worktree_path:
         return False, []
+    base_commit = get_current_commit(worktree_path)
 
     # Allocate ports and setup environment
     backend_port, frontend_port = find_available_ports(adw_id)
@@ -583,6 +600,7 @@ def run_adaptive_workflow(
                 task_description=task_description,
                 config=config,
                 on_progress=on_progress,
+                base_commit=base_commit,
             )
             duration = time.time() - start_time
 
@@ -665,6 +683,7 @@ def run_adaptive_workflow(
                 task_description=task_description,
                 config=config,
                 on_progress=on_progress,
+                base_commit=base_commit,
             )
 
             if not validation_result.success:
@@ -695,6 +714,7 @@ def run_adaptive_workflow(
     # Get final commit
     commit_hash = get_current_commit(worktree_path)
     state.commit_hash = commit_hash
+    release_ports(adw_id)
 
     # Update task status
     if overall_success:
@@ -710,6 +730,7 @@ def run_adaptive_workflow(
         error_msg = failed_phase.error if failed_phase and failed_phase.error else "Unknown error"
         mark_failed(tasks_file, task_description, adw_id, error_msg)
         state.save("failed")
+    record_task_end(adw_id, overall_success, state.workflow_type, task_description)
 
     return overall_success, results
 
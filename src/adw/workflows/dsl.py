@@ -29,8 +29,11 @@ phases:
 
 from __future__ import annotations
 
+import copy
 import logging
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -89,6 +92,10 @@ class PhaseDefinition:
     # Parallel execution (experimental)
     parallel_with: list[str] = field(default_factory=list)
 
+    # Dependency scheduling: phases this one waits for. None keeps list order
+    # (wait for the previous phase or parallel group); [] starts right away.
+    depends_on: list[str] | None = None
+
     def __post_init__(self) -> None:
         """Validate phase definition."""
         if not self.name:
@@ -123,6 +130,7 @@ class WorkflowDefinition:
     # Workflow-level settings
     fail_fast: bool = True  # Stop on first required phase failure
     skip_optional_on_failure: bool = True  # Skip optional phases if any required failed
+    max_parallel: int = 4  # Phases running at once
 
     # Metadata
     created_at: str = field(default_factory=lambda: datetime.now().isoformat())
@@ -146,6 +154,38 @@ class WorkflowDefinition:
                 if ref not in names:
                     raise ValueError(f"Phase '{phase.name}' references unknown parallel phase '{ref}'")
 
+        # Validate depends_on references exist and form no cycle
+        for phase in self.phases:
+            for ref in phase.depends_on or []:
+                if ref not in names:
+                    raise ValueError(f"Phase '{phase.name}' depends on unknown phase '{ref}'")
+                if ref == phase.name:
+                    raise ValueError(f"Phase '{phase.name}' depends on itself")
+        if self.uses_dependencies:
+            _check_acyclic(self.name, self.dependency_graph())
+
+        if self.max_parallel <= 0:
+            raise ValueError(f"Invalid max_parallel for workflow '{self.name}'")
+
+    @property
+    def uses_dependencies(self) -> bool:
+        """Check if any phase declares depends_on."""
+        return any(p.depends_on is not None for p in self.phases)
+
+    def dependency_graph(self) -> dict[str, list[str]]:
+        """Map each phase to the phases it waits for.
+
+        Phases without depends_on wait for the previous parallel group, as
+        they would without dependency scheduling.
+        """
+        graph: dict[str, list[str]] = {}
+        previous: list[str] = []
+        for group in build_parallel_groups(self.phases):
+            for phase in group:
+                graph[phase.name] = list(phase.depends_on if phase.depends_on is not None else previous)
+            previous = [p.name for p in group]
+        return graph
+
     def get_phase(self, name: str) -> PhaseDefinition | None:
         """Get phase by name."""
         return next((p for p in self.phases if p.name == name), None)
@@ -159,6 +199,69 @@ class WorkflowDefinition:
         return [p for p in self.phases if not p.required]
 
 
+def build_parallel_groups(
+    phases: list[PhaseDefinition],
+) -> list[list[PhaseDefinition]]:
+    """Build groups of phases that can be executed together.
+
+    Phases with `parallel_with` references are grouped together.
+    Phases without parallel references are in their own single-phase group.
+
+    Args:
+        phases: List of phase definitions.
+
+    Returns:
+        List of phase groups (each group executes in parallel).
+    """
+    groups: list[list[PhaseDefinition]] = []
+    processed_names: set[str] = set()
+
+    for phase in phases:
+        if phase.name in processed_names:
+            continue
+
+        if phase.parallel_with:
+            # Build a group with this phase and all its parallel partners
+            group = [phase]
+            processed_names.add(phase.name)
+
+            for ref_name in phase.parallel_with:
+                # Find the referenced phase
+                ref_phase = next((p for p in phases if p.name == ref_name), None)
+                if ref_phase and ref_name not in processed_names:
+                    group.append(ref_phase)
+                    processed_names.add(ref_name)
+
+            groups.append(group)
+        else:
+            # Single phase group
+            groups.append([phase])
+            processed_names.add(phase.name)
+
+    return groups
+
+
+def _check_acyclic(workflow_name: str, graph: dict[str, list[str]]) -> None:
+    """Raise ValueError if phase dependencies form a cycle."""
+    visiting: list[str] = []
+    done: set[str] = set()
+
+    def visit(name: str) -> None:
+        if name in done:
+            return
+        if name in visiting:
+            cycle = " -> ".join([*visiting[visiting.index(name) :], name])
+            raise ValueError(f"Workflow '{workflow_name}' has a dependency cycle: {cycle}")
+        visiting.append(name)
+        for dep in graph[name]:
+            visit(dep)
+        visiting.pop()
+        done.add(name)
+
+    for name in graph:
+        visit(name)
+
+
 def parse_phase_yaml(data: dict[str, Any], defaults: dict[str, Any]) -> PhaseDefinition:
     """Parse a phase definition from YAML data.
 
@@ -204,6 +307,7 @@ def parse_phase_yaml(data: dict[str, Any], defaults: dict[str, Any]) -> PhaseDef
         tests=data.get("tests"),
         test_timeout=data.get("test_timeout", 300),
         parallel_with=data.get("parallel_with", []),
+        depends_on=data.get("depends_on"),
     )
 
 
@@ -262,6 +366,7 @@ def parse_workflow_yaml(yaml_content: str) -> WorkflowDefinition:
         default_max_retries=defaults["default_max_retries"],
         fail_fast=data.get("fail_fast", True),
         skip_optional_on_failure=data.get("skip_optional_on_failure", True),
+        max_parallel=data.get("max_parallel", 4),
         tags=data.get("tags", []),
     )
 
@@ -269,6 +374,8 @@ def parse_workflow_yaml(yaml_content: str) -> WorkflowDefinition:
 def load_workflow(path: Path | str) -> WorkflowDefinition:
     """Load a workflow definition from a YAML file.
 
+    Parsed definitions are cached until the file's mtime or size changes.
+
     Args:
         path: Path to the YAML file.
 
@@ -280,11 +387,20 @@ def load_workflow(path: Path | str) -> WorkflowDefinition:
         ValueError: If file content is invalid.
     """
     path = Path(path)
-    if not path.exists():
+    signature = _file_signature(path)
+    if signature is None:
         raise FileNotFoundError(f"Workflow file not found: {path}")
 
-    content = path.read_text(encoding="utf-8")
-    return parse_workflow_yaml(content)
+    key = path.resolve()
+    with _cache_lock:
+        cached = _workflow_cache.get(key)
+    if cached is None or cached[0] != signature:
+        workflow = parse_workflow_yaml(path.read_text(encoding="utf-8"))
+        cached = (signature, workflow)
+        with _cache_lock:
+            _workflow_cache[key] = cached
+    # Callers may modify what they get; the cached definition stays as parsed
+    return copy.deepcopy(cached[1])
 
 
 def serialize_workflow(workflow: WorkflowDefinition) -> str:
@@ -324,6 +440,8 @@ def serialize_workflow(workflow: WorkflowDefinition) -> str:
         data["fail_fast"] = False
     if not workflow.skip_optional_on_failure:
         data["skip_optional_on_failure"] = False
+    if workflow.max_parallel != 4:
+        data["max_parallel"] = workflow.max_parallel
 
     if workflow.tags:
         data["tags"] = workflow.tags
@@ -360,6 +478,8 @@ def serialize_workflow(workflow: WorkflowDefinition) -> str:
                 phase_data["test_timeout"] = phase.test_timeout
         if phase.parallel_with:
             phase_data["parallel_with"] = phase.parallel_with
+        if phase.depends_on is not None:
+            phase_data["depends_on"] = phase.depends_on
 
         phases_data.append(phase_data)
 
@@ -386,6 +506,106 @@ def save_workflow(workflow: WorkflowDefinition, path: Path | str) -> None:
 # Prompt Templating
 # ============================================================================
 
+# Compiled templates kept in memory; the least recently used are dropped first
+TEMPLATE_CACHE_SIZE = 256
+
+# Segment kinds of a compiled template
+_TEXT = "text"
+_VAR = "var"
+_IF = "if"
+
+# (kind, text or variable name, conditional body)
+_Segment = tuple[str, str, tuple[tuple[str, str], ...]]
+
+# (mtime_ns, size) of a file, or None if it does not exist
+_FileSignature = tuple[int, int] | None
+
+_template_cache: OrderedDict[tuple[str, str, int], _CompiledTemplate] = OrderedDict()
+_file_cache: dict[Path, tuple[_FileSignature, str]] = {}
+_workflow_cache: dict[Path, tuple[_FileSignature, WorkflowDefinition]] = {}
+_cache_lock = threading.Lock()
+
+
+def _file_signature(path: Path) -> _FileSignature:
+    """Get what identifies a version of a file, or None if it is missing."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_cached(path: Path) -> str:
+    """Read a text file, reusing the last read while it is unchanged.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    signature = _file_signature(path)
+    if signature is None:
+        raise FileNotFoundError(path)
+    with _cache_lock:
+        cached = _file_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    content = path.read_text(encoding="utf-8")
+    with _cache_lock:
+        _file_cache[path] = (signature, content)
+    return content
+
+
+def _split_variables(text: str) -> tuple[tuple[str, str], ...]:
+    """Split text into literal and variable segments."""
+    segments: list[tuple[str, str]] = []
+    position = 0
+    for match in PromptTemplate.VAR_PATTERN.finditer(text):
+        if match.start() > position:
+            segments.append((_TEXT, text[position : match.start()]))
+        segments.append((_VAR, match.group(1)))
+        position = match.end()
+    if position < len(text):
+        segments.append((_TEXT, text[position:]))
+    return tuple(segments)
+
+
+def _render_segment(kind: str, value: str, context: dict[str, Any]) -> str:
+    """Render a literal or variable segment."""
+    if kind == _TEXT:
+        return value
+    resolved = context.get(value)
+    if resolved is None:
+        logger.debug("Undefined variable: %s", value)
+        return f"{{{{{value}}}}}"  # Keep original if not found
+    return str(resolved)
+
+
+@dataclass(frozen=True)
+class _CompiledTemplate:
+    """A template with its includes resolved, split into segments.
+
+    Attributes:
+        segments: Literal, variable and conditional segments, in order.
+        dependencies: Files read while resolving includes, with their
+            signatures at the time.
+    """
+
+    segments: tuple[_Segment, ...]
+    dependencies: tuple[tuple[Path, _FileSignature], ...]
+
+    def is_current(self) -> bool:
+        """Check that no included file has changed since compiling."""
+        return all(_file_signature(path) == signature for path, signature in self.dependencies)
+
+    def render(self, context: dict[str, Any]) -> str:
+        """Render the segments in a single pass."""
+        parts = []
+        for kind, value, body in self.segments:
+            if kind != _IF:
+                parts.append(_render_segment(kind, value, context))
+            elif context.get(value):
+                parts.extend(_render_segment(k, v, context) for k, v in body)
+        return "".join(parts)
+
 
 class PromptTemplate:
     """Template engine for workflow prompts.
@@ -394,6 +614,10 @@ class PromptTemplate:
     - Variable substitution: {{variable_name}}
     - Include directives: {{include path/to/file.md}}
     - Conditional blocks: {{#if condition}}...{{/if}}
+
+    Templates are compiled once: includes are resolved and the result is split
+    into segments, so rendering is a single pass. Compiled templates are shared
+    between instances and recompiled when an included file changes.
     """
 
     VAR_PATTERN = re.compile(r"\{\{(\w+)\}\}")
@@ -420,8 +644,10 @@ class PromptTemplate:
         # Load template from file if it's a path
         if template.endswith((".md", ".txt", ".tmpl")):
             template_path = self._resolve_path(template)
-            if template_path.exists():
-                template = template_path.read_text(encoding="utf-8")
+            try:
+                template = _read_cached(template_path)
+            except FileNotFoundError:
+                pass
 
         self.template = template
 
@@ -432,8 +658,8 @@ class PromptTemplate:
             return path
         return self.base_path / path
 
-    def _process_includes(self, content: str) -> str:
-        """Process include directives."""
+    def _process_includes(self, content: str, dependencies: dict[Path, _FileSignature]) -> str:
+        """Process include directives, recording the files they read."""
 
         def replace_include(match: re.Match[str]) -> str:
             if self._include_count >= self.max_includes:
@@ -441,44 +667,52 @@ class PromptTemplate:
                 return f"<!-- Include limit reached: {match.group(1)} -->"
 
             include_path = self._resolve_path(match.group(1).strip())
-            if not include_path.exists():
+            dependencies[include_path] = _file_signature(include_path)
+            try:
+                included = _read_cached(include_path)
+            except FileNotFoundError:
                 logger.warning("Include file not found: %s", include_path)
                 return f"<!-- Include not found: {match.group(1)} -->"
 
             self._include_count += 1
-            included = include_path.read_text(encoding="utf-8")
             # Recursively process includes in the included content
-            return self._process_includes(included)
+            return self._process_includes(included, dependencies)
 
         return self.INCLUDE_PATTERN.sub(replace_include, content)
 
-    def _process_conditionals(self, content: str, context: dict[str, Any]) -> str:
-        """Process conditional blocks."""
-
-        def replace_conditional(match: re.Match[str]) -> str:
-            condition_var = match.group(1)
-            block_content = match.group(2)
-
-            # Evaluate condition
-            value = context.get(condition_var)
-            if value:
-                return str(block_content.strip())
-            return ""
-
-        return str(self.CONDITIONAL_PATTERN.sub(replace_conditional, content))
-
-    def _process_variables(self, content: str, context: dict[str, Any]) -> str:
-        """Process variable substitutions."""
-
-        def replace_var(match: re.Match[str]) -> str:
-            var_name = match.group(1)
-            value = context.get(var_name)
-            if value is None:
-                logger.debug("Undefined variable: %s", var_name)
-                return match.group(0)  # Keep original if not found
-            return str(value)
-
-        return str(self.VAR_PATTERN.sub(replace_var, content))
+    def _compile(self) -> _CompiledTemplate:
+        """Resolve includes and split the template into segments."""
+        self._include_count = 0
+        dependencies: dict[Path, _FileSignature] = {}
+        content = self._process_includes(self.template, dependencies)
+
+        segments: list[_Segment] = []
+        position = 0
+        for match in self.CONDITIONAL_PATTERN.finditer(content):
+            segments.extend((kind, value, ()) for kind, value in _split_variables(content[position : match.start()]))
+            segments.append((_IF, match.group(1), _split_variables(match.group(2).strip())))
+            position = match.end()
+        segments.extend((kind, value, ()) for kind, value in _split_variables(content[position:]))
+
+        return _CompiledTemplate(tuple(segments), tuple(dependencies.items()))
+
+    def compiled(self) -> _CompiledTemplate:
+        """Get the compiled template, compiling it if needed."""
+        key = (self.template, str(self.base_path), self.max_includes)
+        with _cache_lock:
+            compiled = _template_cache.get(key)
+            if compiled is not None:
+                _template_cache.move_to_end(key)
+        if compiled is not None and compiled.is_current():
+            return compiled
+
+        compiled = self._compile()
+        with _cache_lock:
+            _template_cache[key] = compiled
+            _template_cache.move_to_end(key)
+            while len(_template_cache) > TEMPLATE_CACHE_SIZE:
+                _template_cache.popitem(last=False)
+        return compiled
 
     def render(self, **context: Any) -> str:
         """Render the template with the given context.
@@ -489,14 +723,7 @@ class PromptTemplate:
         Returns:
             Rendered template string.
         """
-        self._include_count = 0
-
-        # Process in order: includes, conditionals, variables
-        content = self._process_includes(self.template)
-        content = self._process_conditionals(content, context)
-        content = self._process_variables(content, context)
-
-        return content
+        return self.compiled().render(context)
 
     @classmethod
     def from_file(cls, path: Path | str, base_path: Path | None = None) -> PromptTemplate:
@@ -513,10 +740,18 @@ class PromptTemplate:
         if not path.exists():
             raise FileNotFoundError(f"Template file not found: {path}")
 
-        content = path.read_text(encoding="utf-8")
+        content = _read_cached(path)
         return cls(content, base_path=base_path or path.parent)
 
 
+def clear_template_cache() -> None:
+    """Forget compiled templates, template files and parsed workflows."""
+    with _cache_lock:
+        _template_cache.clear()
+        _file_cache.clear()
+        _workflow_cache.clear()
+
+
 # ============================================================================
 # Workflow Library Management
 # ============================================================================
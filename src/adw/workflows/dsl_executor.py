@@ -18,13 +18,15 @@ Example usage:
 
 from __future__ import annotations
 
+import heapq
 import logging
 import os
+import statistics
 import subprocess
 import sys
 import time
 from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 from dataclasses import dataclass, field
 from pathlib import Path
 from threading import Lock
@@ -35,6 +37,7 @@ from ..agent.executor import prompt_with_retry
 from ..agent.models import AgentPromptRequest
 from ..agent.state import ADWState
 from ..agent.task_updater import mark_done, mark_failed, mark_in_progress
+from ..agent.usage import record_task_end
 from ..agent.utils import generate_adw_id
 from ..retry.context import format_test_failure_context, select_retry_strategy
 from ..retry.escalation import AttemptRecord, generate_escalation_report
@@ -46,6 +49,7 @@ from .dsl import (
     PhaseDefinition,
     PromptTemplate,
     WorkflowDefinition,
+    build_parallel_groups,
     get_workflow,
 )
 
@@ -229,14 +233,19 @@ def execute_dsl_phase(
         worktree=str(context.worktree_path),
     )
 
-    # Inject expertise for plan/implement phases
+    # Inject packed context (expertise, bundles, docs) for plan/implement phases
     if phase.name in ("plan", "implement"):
         try:
-            from ..learning.expertise import inject_expertise_into_prompt
+            from ..context.packing import inject_packed_context
 
-            prompt = inject_expertise_into_prompt(prompt=prompt, position="end")
+            prompt = inject_packed_context(
+                prompt,
+                context.task_description,
+                task_id=context.adw_id,
+                base_path=context.worktree_path,
+            )
         except Exception as e:
-            logger.debug("Could not inject expertise: %s", e)
+            logger.debug("Could not inject context: %s", e)
 
     # Add retry context if provided
     if retry_context:
@@ -399,48 +408,6 @@ def execute_phase_with_loop(
 # ============================================================================
 
 
-def build_parallel_groups(
-    phases: list[PhaseDefinition],
-) -> list[list[PhaseDefinition]]:
-    """Build groups of phases that can be executed together.
-
-    Phases with `parallel_with` references are grouped together.
-    Phases without parallel references are in their own single-phase group.
-
-    Args:
-        phases: List of phase definitions.
-
-    Returns:
-        List of phase groups (each group executes in parallel).
-    """
-    groups: list[list[PhaseDefinition]] = []
-    processed_names: set[str] = set()
-
-    for phase in phases:
-        if phase.name in processed_names:
-            continue
-
-        if phase.parallel_with:
-            # Build a group with this phase and all its parallel partners
-            group = [phase]
-            processed_names.add(phase.name)
-
-            for ref_name in phase.parallel_with:
-                # Find the referenced phase
-                ref_phase = next((p for p in phases if p.name == ref_name), None)
-                if ref_phase and ref_name not in processed_names:
-                    group.append(ref_phase)
-                    processed_names.add(ref_name)
-
-            groups.append(group)
-        else:
-            # Single phase group
-            groups.append([phase])
-            processed_names.add(phase.name)
-
-    return groups
-
-
 def execute_parallel_phases(
     phases: list[PhaseDefinition],
     context: DSLExecutionContext,
@@ -526,6 +493,220 @@ def execute_parallel_phases(
     return results, all_attempt_records
 
 
+# ============================================================================
+# Dependency (DAG) Scheduling
+# ============================================================================
+
+
+def estimate_phase_durations(phases: list[PhaseDefinition], history: int = 100) -> dict[str, float]:
+    """Estimate how long each phase takes, from recent task metrics.
+
+    Agents are recorded as "<phase>-<adw_id>", so a phase's history is the
+    metrics of agents with its name. Phases with no history are assumed to
+    take the median of the others, or their timeout if nothing is known.
+
+    Args:
+        phases: Phases to estimate.
+        history: Number of recent tasks to look at.
+
+    Returns:
+        Mapping of phase name to estimated seconds.
+    """
+    samples: dict[str, list[float]] = {p.name: [] for p in phases}
+    try:
+        from ..reports.metrics import DEFAULT_METRICS_DB_PATH, get_metrics_db
+
+        if DEFAULT_METRICS_DB_PATH.exists():
+            for task in get_metrics_db().get_recent_metrics(history):
+                for metric in task.phases:
+                    name = metric.name.removesuffix(f"-{task.task_id}")
+                    if name in samples and metric.duration_seconds > 0:
+                        samples[name].append(metric.duration_seconds)
+    except Exception as e:
+        logger.debug("Could not read phase history: %s", e)
+
+    known = {name: statistics.mean(values) for name, values in samples.items() if values}
+    if not known:
+        return {p.name: float(p.timeout_seconds) for p in phases}
+    default = statistics.median(known.values())
+    return {p.name: known.get(p.name, default) for p in phases}
+
+
+def critical_path_priorities(
+    graph: dict[str, list[str]],
+    durations: dict[str, float],
+) -> dict[str, float]:
+    """Rank phases by the longest chain of work they hold up.
+
+    A phase's priority is its own duration plus that of the longest path
+    through the phases depending on it, so phases on the critical path
+    start first when workers are scarce.
+
+    Args:
+        graph: Mapping of phase name to the phases it waits for.
+        durations: Estimated duration of each phase.
+
+    Returns:
+        Mapping of phase name to priority (higher runs first).
+    """
+    dependents: dict[str, list[str]] = {name: [] for name in graph}
+    for name, deps in graph.items():
+        for dep in deps:
+            dependents[dep].append(name)
+
+    priorities: dict[str, float] = {}
+
+    def rank(name: str) -> float:
+        if name not in priorities:
+            downstream = max((rank(d) for d in dependents[name]), default=0.0)
+            priorities[name] = durations.get(name, 0.0) + downstream
+        return priorities[name]
+
+    for name in graph:
+        rank(name)
+    return priorities
+
+
+def execute_phase_graph(
+    workflow: WorkflowDefinition,
+    context: DSLExecutionContext,
+    on_progress: Callable[[str], None] | None = None,
+    skip_optional: bool = False,
+) -> tuple[list[DSLPhaseResult], list[AttemptRecord], bool]:
+    """Execute phases as soon as the phases they depend on are done.
+
+    Up to workflow.max_parallel phases run at once; ready phases on the
+    critical path go first. When a required phase fails, everything
+    downstream of it is cancelled, and with fail_fast nothing new starts.
+    Skipped phases (condition not met, optional) count as done.
+
+    Args:
+        workflow: Workflow whose phases to execute.
+        context: Execution context shared by all phases.
+        on_progress: Optional progress callback (called thread-safely).
+        skip_optional: If True, skip non-required phases.
+
+    Returns:
+        Tuple of (results in completion order, attempt records, whether a
+        required phase failed).
+    """
+    phases = {p.name: p for p in workflow.phases}
+    order = {p.name: i for i, p in enumerate(workflow.phases)}
+    graph = workflow.dependency_graph()
+    priorities = critical_path_priorities(graph, estimate_phase_durations(workflow.phases))
+    dependents: dict[str, list[str]] = {name: [] for name in graph}
+    for name, deps in graph.items():
+        for dep in deps:
+            dependents[dep].append(name)
+
+    waiting = {name: set(deps) for name, deps in graph.items()}
+    ready: list[tuple[float, int, str]] = []
+    cancelled: set[str] = set()
+    overlapped: set[str] = set()
+    results: list[DSLPhaseResult] = []
+    all_attempt_records: list[AttemptRecord] = []
+    required_failed = False
+    stopped = False
+
+    def mark_ready(name: str) -> None:
+        heapq.heappush(ready, (-priorities[name], order[name], name))
+
+    def complete(name: str) -> None:
+        for dependent in dependents[name]:
+            waiting[dependent].discard(name)
+            if not waiting[dependent] and dependent not in cancelled:
+                mark_ready(dependent)
+
+    def cancel_downstream(name: str) -> None:
+        pending = list(dependents[name])
+        while pending:
+            dependent = pending.pop()
+            if dependent in cancelled:
+                continue
+            cancelled.add(dependent)
+            pending.extend(dependents[dependent])
+            if on_progress:
+                on_progress(f"Cancelling phase {dependent}: depends on failed phase {name}")
+            results.append(
+                DSLPhaseResult(
+                    phase_name=dependent,
+                    success=False,
+                    error=f"Cancelled: required phase {name} failed",
+                )
+            )
+
+    def skip_reason(phase: PhaseDefinition) -> str | None:
+        if skip_optional and not phase.required:
+            return "optional"
+        if not evaluate_condition(phase.condition, phase.condition_value, context):
+            return f"condition not met ({phase.condition.value})"
+        if not phase.required and required_failed and workflow.skip_optional_on_failure:
+            return "previous required phase failed"
+        return None
+
+    def execute_single(phase: PhaseDefinition) -> tuple[DSLPhaseResult, list[AttemptRecord]]:
+        def thread_progress(msg: str) -> None:
+            if on_progress:
+                on_progress(f"[{phase.name}] {msg}")
+
+        return execute_phase_with_loop(phase=phase, context=context, on_progress=thread_progress)
+
+    for name, deps in graph.items():
+        if not deps:
+            mark_ready(name)
+
+    with ThreadPoolExecutor(max_workers=workflow.max_parallel) as executor:
+        running: dict[Future[tuple[DSLPhaseResult, list[AttemptRecord]]], str] = {}
+        while ready or running:
+            while ready and not stopped and len(running) < workflow.max_parallel:
+                _, _, name = heapq.heappop(ready)
+                phase = phases[name]
+                reason = skip_reason(phase)
+                if reason:
+                    if on_progress:
+                        on_progress(f"Skipping phase {name}: {reason}")
+                    complete(name)
+                    continue
+                if running:
+                    overlapped.add(name)
+                    overlapped.update(running.values())
+                if on_progress:
+                    on_progress(f"Phase: {name}")
+                running[executor.submit(execute_single, phase)] = name
+
+            if not running:
+                break  # Stopped, or only skipped phases were left
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    result, attempt_records = future.result()
+                except Exception as e:
+                    logger.error("Phase %s failed with exception: %s", name, e)
+                    result, attempt_records = DSLPhaseResult(phase_name=name, success=False, error=str(e)), []
+                result.was_parallel = name in overlapped
+                results.append(result)
+                all_attempt_records.extend(attempt_records)
+                context.update_result(name, result)
+                context.has_changes = check_git_changes(context.worktree_path)
+
+                if result.success or not phases[name].required:
+                    if not result.success and on_progress:
+                        on_progress(f"Optional phase {name} failed, continuing...")
+                    complete(name)
+                    continue
+
+                required_failed = True
+                if on_progress:
+                    on_progress(f"Required phase {name} failed: {result.error}")
+                cancel_downstream(name)
+                if workflow.fail_fast:
+                    stopped = True
+
+    return results, all_attempt_records, required_failed
+
+
 def get_current_commit() -> str | None:
     """Get current git commit hash."""
     try:
@@ -599,8 +780,26 @@ def run_dsl_workflow(
     if on_progress:
         on_progress(f"Starting workflow: {workflow.name} ({len(phases)} phases)")
 
-    # Build phase groups for parallel execution
-    phase_groups = build_parallel_groups(phases)
+    if workflow.uses_dependencies:
+        results, all_attempt_records, required_failed = execute_phase_graph(
+            workflow=workflow,
+            context=context,
+            on_progress=on_progress,
+            skip_optional=skip_optional,
+        )
+        overall_success = not required_failed
+        if required_failed and all_attempt_records:
+            generate_escalation_report(
+                task_id=adw_id,
+                task_description=task_description,
+                workflow_type=f"dsl:{workflow.name}",
+                attempts=all_attempt_records,
+                output_dir=Path(f"agents/{adw_id}"),
+            )
+            logger.warning("Generated escalation report for task %s", adw_id)
+
+    # Build phase groups for parallel execution (dependency-scheduled workflows are done by now)
+    phase_groups = [] if workflow.uses_dependencies else build_parallel_groups(phases)
 
     for group in phase_groups:
         # Filter out phases that don't meet conditions or should be skipped
@@ -701,6 +900,7 @@ def run_dsl_workflow(
         error_msg = failed_result.error if failed_result and failed_result.error else "Unknown error"
         mark_failed(tasks_file, task_description, adw_id, error_msg)
         context.state.save("failed")
+    record_task_end(adw_id, overall_success, context.state.workflow_type, task_description)
 
     return overall_success, results
 
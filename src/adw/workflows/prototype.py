@@ -29,6 +29,7 @@ from ..agent.executor import prompt_with_retry
 from ..agent.models import AgentPromptRequest
 from ..agent.state import ADWState
 from ..agent.task_updater import mark_done, mark_failed, mark_in_progress
+from ..agent.usage import record_task_end
 from ..agent.utils import generate_adw_id
 
 logger = logging.getLogger(__name__)
@@ -297,6 +298,7 @@ def run_prototype_workflow(
             error = scaffold_response.error_message or "Scaffold phase failed"
             mark_failed(tasks_file, task_description, adw_id, error)
             state.add_error("scaffold", error)
+            record_task_end(adw_id, False, state.workflow_type, task_description)
             return False, PrototypeResult(
                 success=False,
                 error=error,
@@ -309,6 +311,7 @@ def run_prototype_workflow(
         error = str(e)
         mark_failed(tasks_file, task_description, adw_id, error)
         state.add_error("scaffold", error)
+        record_task_end(adw_id, False, state.workflow_type, task_description)
         return False, PrototypeResult(
             success=False,
             error=error,
@@ -364,6 +367,7 @@ def run_prototype_workflow(
     duration = time.time() - start_time
     mark_done(tasks_file, task_description, adw_id)
     state.save("complete")
+    record_task_end(adw_id, True, state.workflow_type, task_description)
 
     if on_progress:
         on_progress(f"Prototype created: {output_dir}")
@@ -31,6 +31,7 @@ from ..agent.executor import prompt_with_retry
 from ..agent.models import AgentPromptRequest
 from ..agent.state import ADWState
 from ..agent.task_updater import mark_done, mark_failed, mark_in_progress
+from ..agent.usage import record_task_end
 from ..agent.utils import generate_adw_id
 from ..retry.context import format_test_failure_context, select_retry_strategy
 from ..retry.escalation import AttemptRecord, generate_escalation_report
@@ -146,6 +147,10 @@ class TestValidationConfig:
     max_test_retries: int = 3  # Number of implement-test cycles to try
     timeout_seconds: int = 300
     skip_if_no_tests: bool = True  # Skip validation if no test framework found
+    impact_analysis: bool = True  # Run affected tests first, full suite once they pass
+    shards: int = 1  # Parallel test shards (0 = one per CPU)
+    max_failures: int = 5  # Stop a test run after this many failures (0 = never)
+    use_cache: bool = True  # Skip the suite on a tree that already passed
 
 
 def get_current_commit() -> str | None:
@@ -160,6 +165,7 @@ def run_test_validation(
     task_description: str,
     validation_config: TestValidationConfig | None = None,
     on_progress: Callable[[str], None] | None = None,
+    base_commit: str | None = None,
 ) -> ValidationResult:
     """Run test validation using the testing module.
 
@@ -172,6 +178,7 @@ def run_test_validation(
         task_description: Description of the task being validated.
         validation_config: Test validation configuration.
         on_progress: Progress callback.
+        base_commit: Commit the task started from, for impact analysis.
 
     Returns:
         ValidationResult with test outcomes.
@@ -205,6 +212,12 @@ def run_test_validation(
         max_retries=0,  # We handle retries at the workflow level
         timeout_seconds=config.timeout_seconds,
         test_command=framework_info.command,
+        impact_base=base_commit if config.impact_analysis else None,
+        shards=config.shards,
+        owner=adw_id,
+        stream_output=True,
+        max_failures=config.max_failures,
+        use_cache=config.use_cache,
     )
 
     result = validate_tests(
@@ -255,17 +268,14 @@ def execute_phase_with_retry(
     # Build prompt with optional retry context
     prompt = phase_config.prompt_template.format(task=task_description)
 
-    # Inject expertise section for IMPLEMENT and PLAN phases
+    # Inject packed context (expertise, bundles, docs) for IMPLEMENT and PLAN phases
     if inject_expertise and phase_name in ("implement", "plan"):
         try:
-            from ..learning.expertise import inject_expertise_into_prompt
+            from ..context.packing import inject_packed_context
 
-            prompt = inject_expertise_into_prompt(
-                prompt=prompt,
-                position="end",
-            )
+            prompt = inject_packed_context(prompt, task_description, task_id=adw_id, base_path=worktree_path)
         except Exception as e:
-            logger.debug("Could not inject expertise: %s", e)
+            logger.debug("Could not inject context: %s", e)
 
     if retry_context:
         prompt = f"{prompt}\n\n{retry_context}"
@@ -338,17 +348,14 @@ def execute_phase(
     phase_name = phase_config.name.value
     prompt = phase_config.prompt_template.format(task=task_description)
 
-    # Inject expertise section for IMPLEMENT and PLAN phases
+    # Inject packed context (expertise, bundles, docs) for IMPLEMENT and PLAN phases
     if inject_expertise and phase_name in ("implement", "plan"):
         try:
-            from ..learning.expertise import inject_expertise_into_prompt
+            from ..context.packing import inject_packed_context
 
-            prompt = inject_expertise_into_prompt(
-                prompt=prompt,
-                position="end",
-            )
+            prompt = inject_packed_context(prompt, task_description, task_id=adw_id)
         except Exception as e:
-            logger.debug("Could not inject expertise: %s", e)
+            logger.debug("Could not inject context: %s", e)
 
     if on_progress:
         on_progress(f"Starting {phase_name} phase...")
@@ -444,6 +451,7 @@ def run_sdlc_workflow(
     test_config = test_validation_config or TestValidationConfig()
     tasks_file = Path("tasks.md")
     worktree_path = Path.cwd()  # TODO: Resolve actual worktree path
+    base_commit = get_current_commit()
 
     # Filter phases if skipping optional
     phases = config.phases
@@ -524,6 +532,7 @@ def run_sdlc_workflow(
                 task_description=task_description,
                 validation_config=test_config,
                 on_progress=on_progress,
+                base_commit=base_commit,
             )
             duration = time.time() - start_time
 
@@ -608,6 +617,7 @@ def run_sdlc_workflow(
         error_msg = failed_phase.error if failed_phase and failed_phase.error else "Unknown error"
         mark_failed(tasks_file, task_description, adw_id, error_msg)
         state.save("failed")
+    record_task_end(adw_id, overall_success, state.workflow_type, task_description)
 
     return overall_success, results
 
@@ -18,9 +18,10 @@ import click
 
 from ..agent.environment import write_env_file
 from ..agent.executor import AgentPromptRequest, prompt_with_retry
-from ..agent.ports import find_available_ports, write_ports_env
+from ..agent.ports import find_available_ports, release_ports, write_ports_env
 from ..agent.state import ADWState
 from ..agent.task_updater import mark_done, mark_failed
+from ..agent.usage import record_task_end
 from ..agent.utils import generate_adw_id
 from ..agent.worktree import create_worktree
 
@@ -111,7 +112,9 @@ def run_simple_workflow(
     else:
         mark_failed(tasks_file, task_description, adw_id, error_message or "Unknown")
 
+    release_ports(adw_id)
     state.save("complete" if success else "failed")
+    record_task_end(adw_id, success, state.workflow_type, task_description)
     return success
 
 
@@ -19,12 +19,13 @@ import click
 
 from ..agent.environment import write_env_file
 from ..agent.executor import AgentPromptRequest, prompt_with_retry
-from ..agent.ports import find_available_ports, write_ports_env
+from ..agent.ports import find_available_ports, release_ports, write_ports_env
 from ..agent.state import ADWState
 from ..agent.task_updater import mark_done, mark_failed
+from ..agent.usage import record_task_end
 from ..agent.utils import generate_adw_id
 from ..agent.worktree import create_worktree
-from ..integrations import qmd as qmd_integration
+from ..context.packing import inject_packed_context
 
 
 def run_standard_workflow(
@@ -83,14 +84,11 @@ def run_standard_workflow(
         # Build plan prompt and let plugins inject context
         plan_prompt = f"/plan {adw_id} {task_description}"
 
-        # Inject QMD context if available
+        # Inject packed context (qmd docs, bundles, expertise) if available
         try:
-            if qmd_integration.is_available():
-                qmd_context = qmd_integration.get_context_for_task(task_description)
-                if qmd_context:
-                    plan_prompt = f"{plan_prompt}\n\n{qmd_context}"
+            plan_prompt = inject_packed_context(plan_prompt, task_description, task_id=adw_id, base_path=worktree_path)
         except Exception:
-            pass  # Don't fail if QMD has issues
+            pass  # Don't fail if context sources have issues
 
         plan_response = prompt_with_retry(
             AgentPromptRequest(
@@ -152,7 +150,9 @@ def run_standard_workflow(
     else:
         mark_failed(tasks_file, task_description, adw_id, error_message or "Unknown")
 
+    release_ports(adw_id)
     state.save("complete" if success else "failed")
+    record_task_end(adw_id, success, state.workflow_type, task_description)
     return success
 
 
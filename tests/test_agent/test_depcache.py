@@ -0,0 +1,166 @@
+"""Unit tests for the shared dependency cache."""
+
+import os
+from pathlib import Path
+
+from adw.agent.depcache import (
+    DEPENDENCY_SPECS,
+    DependencyCache,
+    materialize_dependencies,
+)
+
+NPM = next(spec for spec in DEPENDENCY_SPECS if spec.name == "npm")
+UV = next(spec for spec in DEPENDENCY_SPECS if spec.name == "uv")
+
+
+def make_node_checkout(root: Path, lock: str = "lock-v1", size: int = 10) -> Path:
+    """Create a checkout with a package-lock.json and an installed node_modules."""
+    root.mkdir(parents=True, exist_ok=True)
+    (root / "package-lock.json").write_text(lock)
+    package = root / "node_modules" / "left-pad"
+    package.mkdir(parents=True, exist_ok=True)
+    (package / "index.js").write_text("x" * size)
+    return root
+
+
+class TestDependencyCache:
+    """Test DependencyCache."""
+
+    def test_materialize_seeds_from_source(self, tmp_path):
+        """A miss is filled from a source with the same lockfile."""
+        source = make_node_checkout(tmp_path / "main")
+        worktree = tmp_path / "tree"
+        worktree.mkdir()
+        (worktree / "package-lock.json").write_text("lock-v1")
+        cache = DependencyCache(tmp_path / "cache")
+
+        assert cache.materialize(NPM, worktree, source) is True
+        assert (worktree / "node_modules" / "left-pad" / "index.js").read_text() == "x" * 10
+        assert len(cache.entries()) == 1
+
+    def test_materialize_reuses_entry(self, tmp_path):
+        """Later worktrees are filled from the cache without a source."""
+        source = make_node_checkout(tmp_path / "main")
+        cache = DependencyCache(tmp_path / "cache")
+        cache.store(NPM, source)
+
+        worktree = tmp_path / "tree"
+        worktree.mkdir()
+        (worktree / "package-lock.json").write_text("lock-v1")
+        assert cache.materialize(NPM, worktree) is True
+        assert (worktree / "node_modules" / "left-pad" / "index.js").exists()
+
+    def test_materialize_lockfile_mismatch(self, tmp_path):
+        """A worktree with a different lockfile gets nothing."""
+        source = make_node_checkout(tmp_path / "main")
+        worktree = tmp_path / "tree"
+        worktree.mkdir()
+        (worktree / "package-lock.json").write_text("lock-v2")
+        cache = DependencyCache(tmp_path / "cache")
+
+        assert cache.materialize(NPM, worktree, source) is False
+        assert not (worktree / "node_modules").exists()
+        assert cache.entries() == []
+
+    def test_materialize_skips_existing_directory(self, tmp_path):
+        """An existing dependency directory is left alone."""
+        source = make_node_checkout(tmp_path / "main")
+        worktree = make_node_checkout(tmp_path / "tree", size=3)
+        cache = DependencyCache(tmp_path / "cache")
+
+        assert cache.materialize(NPM, worktree, source) is False
+        assert (worktree / "node_modules" / "left-pad" / "index.js").read_text() == "xxx"
+
+    def test_cached_entry_independent_of_source(self, tmp_path):
+        """Changes to the source after storing do not reach the cache."""
+        source = make_node_checkout(tmp_path / "main")
+        cache = DependencyCache(tmp_path / "cache")
+        key = cache.store(NPM, source)
+        (source / "node_modules" / "left-pad" / "index.js").write_text("changed")
+
+        cached = tmp_path / "cache" / key / "node_modules" / "left-pad" / "index.js"
+        assert cached.read_text() == "x" * 10
+
+    def test_symlinks_preserved(self, tmp_path):
+        """Symlinks (such as node_modules/.bin entries) stay symlinks."""
+        source = make_node_checkout(tmp_path / "main")
+        bin_dir = source / "node_modules" / ".bin"
+        bin_dir.mkdir()
+        os.symlink("../left-pad/index.js", bin_dir / "left-pad")
+        os.symlink("left-pad", source / "node_modules" / "alias")
+        worktree = tmp_path / "tree"
+        worktree.mkdir()
+        (worktree / "package-lock.json").write_text("lock-v1")
+
+        assert DependencyCache(tmp_path / "cache").materialize(NPM, worktree, source) is True
+        link = worktree / "node_modules" / ".bin" / "left-pad"
+        assert link.is_symlink()
+        assert os.readlink(link) == "../left-pad/index.js"
+        assert (worktree / "node_modules" / "alias").is_symlink()
+
+    def test_venv_paths_rewritten(self, tmp_path):
+        """Virtualenv scripts point at the worktree, not the source."""
+        source = tmp_path / "main"
+        (source / ".venv" / "bin").mkdir(parents=True)
+        (source / "uv.lock").write_text("uv-lock")
+        origin = str(source.resolve())
+        script = source / ".venv" / "bin" / "pytest"
+        script.write_text(f"#!{origin}/.venv/bin/python\n")
+        script.chmod(0o755)
+        site = source / ".venv" / "lib" / "site-packages"
+        site.mkdir(parents=True)
+        (site / "_app.pth").write_text(f"{origin}/src\n")
+        (site / "module.py").write_text(f"# {origin}\n")
+        worktree = tmp_path / "tree"
+        worktree.mkdir()
+        (worktree / "uv.lock").write_text("uv-lock")
+
+        assert DependencyCache(tmp_path / "cache").materialize(UV, worktree, source) is True
+        target = str(worktree.resolve())
+        copied = worktree / ".venv" / "bin" / "pytest"
+        assert copied.read_text() == f"#!{target}/.venv/bin/python\n"
+        assert os.access(copied, os.X_OK)
+        assert (worktree / ".venv" / "lib" / "site-packages" / "_app.pth").read_text() == f"{target}/src\n"
+        # Ordinary files are linked unchanged
+        assert (worktree / ".venv" / "lib" / "site-packages" / "module.py").read_text() == f"# {origin}\n"
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Entries beyond the size limit are evicted, oldest first."""
+        cache = DependencyCache(tmp_path / "cache", max_bytes=150)
+        keys = []
+        for i in range(3):
+            source = make_node_checkout(tmp_path / f"main{i}", lock=f"lock-{i}", size=100)
+            keys.append(cache.store(NPM, source))
+
+        assert cache.evict(keep=keys[2]) == [keys[0], keys[1]]
+        assert [key for key, _ in cache.entries()] == [keys[2]]
+
+
+class TestMaterializeDependencies:
+    """Test materialize_dependencies."""
+
+    def test_requires_initialized_project(self, tmp_path):
+        """Without an .adw directory there is no default cache."""
+        source = make_node_checkout(tmp_path / "main")
+        worktree = tmp_path / "tree"
+        worktree.mkdir()
+        (worktree / "package-lock.json").write_text("lock-v1")
+
+        assert materialize_dependencies(worktree, source) == []
+
+        (source / ".adw").mkdir()
+        assert materialize_dependencies(worktree, source) == ["node_modules"]
+        assert (source / ".adw" / "depcache").is_dir()
+
+    def test_first_lockfile_claims_directory(self, tmp_path):
+        """Only one package manager fills node_modules."""
+        source = make_node_checkout(tmp_path / "main")
+        worktree = tmp_path / "tree"
+        worktree.mkdir()
+        (worktree / "package-lock.json").write_text("lock-v1")
+        (worktree / "pnpm-lock.yaml").write_text("pnpm")
+        cache = DependencyCache(tmp_path / "cache")
+
+        # pnpm claims node_modules but has no entry, so npm's is not used
+        assert materialize_dependencies(worktree, source, cache) == []
+        assert not (worktree / "node_modules").exists()
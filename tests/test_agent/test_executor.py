@@ -1,5 +1,6 @@
 """Unit tests for agent executor."""
 
+import io
 import json
 import os
 import subprocess
@@ -16,6 +17,17 @@ from adw.agent.executor import (
     SAFE_ENV_VARS,
 )
 from adw.agent.models import AgentPromptRequest, AgentPromptResponse, RetryCode
+from adw.agent.usage import StreamUsage, UsageTracker, model_name, parse_stream_file
+
+
+def fake_process(stdout: str, returncode: int = 0) -> Mock:
+    """Create a finished Claude Code process that printed stdout."""
+    process = Mock()
+    process.stdout = io.StringIO(stdout)
+    process.wait.return_value = returncode
+    process.poll.return_value = returncode
+    process.returncode = returncode
+    return process
 
 
 class TestGetSafeEnv:
@@ -75,17 +87,16 @@ class TestPromptClaudeCode:
 
     @pytest.fixture
     def mock_subprocess_success(self):
-        """Mock successful subprocess run."""
-        mock_result = Mock()
-        mock_result.stdout = json.dumps(
-            {
-                "type": "result",
-                "result": "Test output",
-                "session_id": "session123",
-            }
+        """Mock successful Claude Code process."""
+        return fake_process(
+            json.dumps(
+                {
+                    "type": "result",
+                    "result": "Test output",
+                    "session_id": "session123",
+                }
+            )
         )
-        mock_result.returncode = 0
-        return mock_result
 
     def test_builds_command_correctly_default(self):
         """Test command building with default parameters."""
@@ -94,12 +105,12 @@ class TestPromptClaudeCode:
             adw_id="test1234",
         )
 
-        with patch("adw.agent.executor.subprocess.run") as mock_run:
-            mock_run.return_value = Mock(stdout="", returncode=0)
+        with patch("adw.agent.executor.subprocess.Popen") as mock_popen:
+            mock_popen.return_value = fake_process("", 0)
             prompt_claude_code(request)
 
             # Check command
-            call_args = mock_run.call_args
+            call_args = mock_popen.call_args
             cmd = call_args[0][0]
             assert cmd[0] == "claude"
             assert "--output-format" in cmd
@@ -116,11 +127,11 @@ class TestPromptClaudeCode:
             model="opus",
         )
 
-        with patch("adw.agent.executor.subprocess.run") as mock_run:
-            mock_run.return_value = Mock(stdout="", returncode=0)
+        with patch("adw.agent.executor.subprocess.Popen") as mock_popen:
+            mock_popen.return_value = fake_process("", 0)
             prompt_claude_code(request)
 
-            call_args = mock_run.call_args
+            call_args = mock_popen.call_args
             cmd = call_args[0][0]
             assert "--model" in cmd
             assert "opus" in cmd
@@ -133,11 +144,11 @@ class TestPromptClaudeCode:
             dangerously_skip_permissions=True,
         )
 
-        with patch("adw.agent.executor.subprocess.run") as mock_run:
-            mock_run.return_value = Mock(stdout="", returncode=0)
+        with patch("adw.agent.executor.subprocess.Popen") as mock_popen:
+            mock_popen.return_value = fake_process("", 0)
             prompt_claude_code(request)
 
-            call_args = mock_run.call_args
+            call_args = mock_popen.call_args
             cmd = call_args[0][0]
             assert "--dangerously-skip-permissions" in cmd
 
@@ -156,8 +167,8 @@ class TestPromptClaudeCode:
 
         with patch("adw.agent.executor.get_output_dir") as mock_get_dir:
             mock_get_dir.return_value = tmp_path
-            with patch("adw.agent.executor.subprocess.run") as mock_run:
-                mock_run.return_value = Mock(stdout=jsonl_output, returncode=0)
+            with patch("adw.agent.executor.subprocess.Popen") as mock_popen:
+                mock_popen.return_value = fake_process(jsonl_output, 0)
 
                 response = prompt_claude_code(request)
 
@@ -181,8 +192,8 @@ class TestPromptClaudeCode:
 
         with patch("adw.agent.executor.get_output_dir") as mock_get_dir:
             mock_get_dir.return_value = tmp_path
-            with patch("adw.agent.executor.subprocess.run") as mock_run:
-                mock_run.return_value = Mock(stdout=jsonl_output, returncode=1)
+            with patch("adw.agent.executor.subprocess.Popen") as mock_popen:
+                mock_popen.return_value = fake_process(jsonl_output, 1)
 
                 response = prompt_claude_code(request)
 
@@ -200,8 +211,8 @@ class TestPromptClaudeCode:
 
         with patch("adw.agent.executor.get_output_dir") as mock_get_dir:
             mock_get_dir.return_value = tmp_path
-            with patch("adw.agent.executor.subprocess.run") as mock_run:
-                mock_run.side_effect = subprocess.TimeoutExpired(
+            with patch("adw.agent.executor.subprocess.Popen") as mock_popen:
+                mock_popen.side_effect = subprocess.TimeoutExpired(
                     cmd="claude", timeout=1
                 )
 
@@ -210,6 +221,7 @@ class TestPromptClaudeCode:
                 assert response.success is False
                 assert response.retry_code == RetryCode.TIMEOUT_ERROR
                 assert "Timeout" in response.error_message
+                assert response.usage is not None
 
     def test_claude_code_not_found(self, tmp_path):
         """Test handling when Claude Code CLI is not found."""
@@ -220,8 +232,8 @@ class TestPromptClaudeCode:
 
         with patch("adw.agent.executor.get_output_dir") as mock_get_dir:
             mock_get_dir.return_value = tmp_path
-            with patch("adw.agent.executor.subprocess.run") as mock_run:
-                mock_run.side_effect = FileNotFoundError()
+            with patch("adw.agent.executor.subprocess.Popen") as mock_popen:
+                mock_popen.side_effect = FileNotFoundError()
 
                 response = prompt_claude_code(request)
 
@@ -243,8 +255,8 @@ class TestPromptClaudeCode:
 
         with patch("adw.agent.executor.get_output_dir") as mock_get_dir:
             mock_get_dir.return_value = tmp_path
-            with patch("adw.agent.executor.subprocess.run") as mock_run:
-                mock_run.return_value = Mock(stdout=jsonl_output, returncode=0)
+            with patch("adw.agent.executor.subprocess.Popen") as mock_popen:
+                mock_popen.return_value = fake_process(jsonl_output, 0)
 
                 prompt_claude_code(request)
 
@@ -266,8 +278,8 @@ class TestPromptClaudeCode:
 
         with patch("adw.agent.executor.get_output_dir") as mock_get_dir:
             mock_get_dir.return_value = tmp_path
-            with patch("adw.agent.executor.subprocess.run") as mock_run:
-                mock_run.return_value = Mock(stdout=jsonl_output, returncode=0)
+            with patch("adw.agent.executor.subprocess.Popen") as mock_popen:
+                mock_popen.return_value = fake_process(jsonl_output, 0)
 
                 response = prompt_claude_code(request)
 
@@ -283,11 +295,11 @@ class TestPromptClaudeCode:
             working_dir="/tmp/test",
         )
 
-        with patch("adw.agent.executor.subprocess.run") as mock_run:
-            mock_run.return_value = Mock(stdout="", returncode=0)
+        with patch("adw.agent.executor.subprocess.Popen") as mock_popen:
+            mock_popen.return_value = fake_process("", 0)
             prompt_claude_code(request)
 
-            call_kwargs = mock_run.call_args[1]
+            call_kwargs = mock_popen.call_args[1]
             assert call_kwargs["cwd"] == "/tmp/test"
 
 
@@ -453,3 +465,126 @@ class TestPromptWithRetry:
             assert response.success is True
             mock_sleep.assert_not_called()
             assert mock_prompt.call_count == 1
+
+    def test_records_usage_summed_over_attempts(self):
+        """Test that usage of every attempt is recorded as one phase."""
+        request = AgentPromptRequest(prompt="Test prompt", adw_id="test1234", agent_name="builder")
+
+        with patch("adw.agent.executor.prompt_claude_code") as mock_prompt:
+            mock_prompt.side_effect = [
+                AgentPromptResponse(
+                    output="",
+                    success=False,
+                    retry_code=RetryCode.EXECUTION_ERROR,
+                    duration_seconds=2.0,
+                    usage=StreamUsage(input_tokens=100, output_tokens=10, cost_usd=0.01),
+                ),
+                AgentPromptResponse(
+                    output="Success",
+                    success=True,
+                    duration_seconds=3.0,
+                    usage=StreamUsage(input_tokens=200, output_tokens=20, cost_usd=0.02, ttft_seconds=1.5),
+                ),
+            ]
+
+            with patch("time.sleep"), patch("adw.agent.executor.record_usage") as mock_record:
+                prompt_with_retry(request, max_retries=3)
+
+        args, kwargs = mock_record.call_args
+        assert args[:2] == ("test1234", "builder")
+        assert args[2].input_tokens == 300
+        assert args[2].cost_usd == pytest.approx(0.03)
+        assert args[2].ttft_seconds == 1.5
+        assert kwargs["duration_seconds"] == 5.0
+        assert kwargs["retries"] == 1
+        assert kwargs["success"] is True
+
+    def test_no_usage_not_recorded(self):
+        """Test that runs without a usage report are not recorded."""
+        request = AgentPromptRequest(prompt="Test prompt", adw_id="test1234")
+
+        with patch("adw.agent.executor.prompt_claude_code") as mock_prompt:
+            mock_prompt.return_value = AgentPromptResponse(output="Success", success=True)
+
+            with patch("adw.agent.executor.record_usage") as mock_record:
+                prompt_with_retry(request)
+
+        mock_record.assert_not_called()
+
+
+class TestUsageTracking:
+    """Test usage extraction from stream-json output."""
+
+    RESULT = {
+        "type": "result",
+        "result": "Done",
+        "is_error": False,
+        "num_turns": 4,
+        "duration_ms": 12000,
+        "duration_api_ms": 9000,
+        "total_cost_usd": 0.25,
+        "usage": {
+            "input_tokens": 50,
+            "cache_creation_input_tokens": 1000,
+            "cache_read_input_tokens": 20000,
+            "output_tokens": 700,
+        },
+    }
+
+    def test_tracker_reads_result(self):
+        """Test usage, cost, turns and durations come from the result message."""
+        tracker = UsageTracker(start_time=100.0)
+        tracker.feed({"type": "system", "subtype": "init", "model": "claude-opus-4-1"}, 100.2)
+        tracker.feed({"type": "assistant", "message": {"content": []}}, 102.5)
+        tracker.feed({"type": "assistant", "message": {"content": []}}, 104.0)
+        tracker.feed(self.RESULT, 112.0)
+
+        usage = tracker.usage
+        assert usage is not None
+        assert usage.input_tokens == 1050
+        assert usage.cache_read_tokens == 20000
+        assert usage.output_tokens == 700
+        assert usage.cost_usd == 0.25
+        assert usage.num_turns == 4
+        assert usage.api_duration_seconds == 9.0
+        assert usage.ttft_seconds == pytest.approx(2.5)
+        assert model_name(usage.model) == "opus"
+
+    def test_tracker_without_result(self):
+        """Test that a stream without a result reports no usage."""
+        tracker = UsageTracker()
+        tracker.feed({"type": "assistant", "message": {}})
+
+        assert tracker.usage is None
+
+    def test_tracker_partial_usage(self):
+        """Test that a run cut short reports the usage of its assistant turns."""
+        tracker = UsageTracker()
+        turn = {"id": "msg_1", "usage": {"input_tokens": 10, "cache_read_input_tokens": 500, "output_tokens": 5}}
+        tracker.feed({"type": "assistant", "message": turn})
+        tracker.feed({"type": "assistant", "message": {**turn, "usage": {**turn["usage"], "output_tokens": 40}}})
+        tracker.feed({"type": "assistant", "message": {"id": "msg_2", "usage": {"input_tokens": 20}}})
+
+        usage = tracker.partial_usage
+        assert (usage.input_tokens, usage.output_tokens, usage.cache_read_tokens) == (30, 40, 500)
+        assert usage.num_turns == 2
+        assert usage.is_error
+
+        tracker.feed(self.RESULT)
+        assert tracker.partial_usage is tracker.usage
+
+    def test_prompt_returns_usage(self, tmp_path):
+        """Test that prompt_claude_code attaches usage from the stream."""
+        request = AgentPromptRequest(prompt="Test prompt", adw_id="test1234")
+        stdout = "\n".join(json.dumps(m) for m in [{"type": "assistant", "message": {}}, self.RESULT]) + "\n"
+
+        with patch("adw.agent.executor.get_output_dir", return_value=tmp_path):
+            with patch("adw.agent.executor.subprocess.Popen", return_value=fake_process(stdout)):
+                response = prompt_claude_code(request)
+
+        assert response.success is True
+        assert response.usage is not None
+        assert response.usage.output_tokens == 700
+        assert response.usage.ttft_seconds is not None
+        assert (tmp_path / "cc_raw_output.jsonl").read_text() == stdout
+        assert parse_stream_file(tmp_path / "cc_raw_output.jsonl").cost_usd == 0.25
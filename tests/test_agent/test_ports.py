@@ -0,0 +1,143 @@
+"""Unit tests for lease-based port allocation."""
+
+import socket
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from adw.agent.ports import PortAllocator, get_ports_for_adw, write_ports_env
+
+
+@pytest.fixture
+def allocator(tmp_path):
+    """An allocator with small ranges in a temporary database."""
+    return PortAllocator(
+        db_path=tmp_path / "ports.db",
+        ranges={"backend": (19100, 19103), "frontend": (19200, 19203)},
+        default_range=(19300, 19309),
+    )
+
+
+def dead_pid() -> int:
+    """Get the PID of a process that has exited."""
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+class TestPortAllocator:
+    """Test PortAllocator."""
+
+    def test_acquire_default_names(self, allocator):
+        """Backend and frontend ports come from their own ranges."""
+        ports = allocator.acquire("abc12345")
+
+        assert set(ports) == {"backend", "frontend"}
+        assert 19100 <= ports["backend"] <= 19103
+        assert 19200 <= ports["frontend"] <= 19203
+
+    def test_acquire_named_ports(self, allocator):
+        """Other named ports come from the default range, one each."""
+        ports = allocator.acquire("abc12345", ["db", "redis", "storybook"])
+
+        assert len(set(ports.values())) == 3
+        assert all(19300 <= port <= 19309 for port in ports.values())
+
+    def test_acquire_is_stable(self, allocator):
+        """An owner keeps its ports when it asks again."""
+        first = allocator.acquire("abc12345", ["backend", "db"])
+        second = allocator.acquire("abc12345", ["backend", "db", "redis"])
+
+        assert second["backend"] == first["backend"]
+        assert second["db"] == first["db"]
+        assert len(allocator.leases("abc12345")) == 3
+
+    def test_owners_never_share_ports(self, allocator):
+        """Different owners get different ports until the range runs out."""
+        taken = [allocator.acquire(f"owner{i}", ["backend"])["backend"] for i in range(4)]
+
+        assert sorted(taken) == [19100, 19101, 19102, 19103]
+        with pytest.raises(RuntimeError, match="No available ports"):
+            allocator.acquire("owner5", ["backend"])
+
+    def test_failed_acquire_takes_nothing(self, allocator):
+        """An exhausted range rolls back the whole allocation."""
+        for i in range(4):
+            allocator.acquire(f"owner{i}", ["backend"])
+
+        with pytest.raises(RuntimeError):
+            allocator.acquire("late", ["db", "backend"])
+        assert allocator.leases("late") == []
+
+    def test_skips_ports_in_use(self, allocator):
+        """Ports something else is listening on are not leased."""
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(("127.0.0.1", 19100))
+            s.listen()
+            for i in range(3):
+                assert allocator.acquire(f"owner{i}", ["backend"])["backend"] != 19100
+
+    def test_release(self, allocator):
+        """Released ports can be leased again."""
+        allocator.acquire("abc12345")
+
+        assert allocator.release("abc12345") == 2
+        assert allocator.leases() == []
+
+    def test_reclaims_dead_processes(self, allocator):
+        """Leases of processes that are gone are reclaimed."""
+        allocator.acquire("dead0001", pid=dead_pid())
+        assert allocator.reclaim() == 2
+
+        # Allocation reclaims them too
+        allocator.acquire("dead0002", pid=dead_pid())
+        allocator.acquire("alive001")
+        assert {lease.owner for lease in allocator.leases()} == {"alive001"}
+
+    def test_reclaims_expired_leases(self, allocator):
+        """Leases past their lifetime are reclaimed."""
+        allocator.ttl = 60
+        allocator.acquire("abc12345")
+
+        with patch("adw.agent.ports.time.time", return_value=time.time() + 120):
+            assert allocator.reclaim() == 2
+
+    def test_renew(self, allocator):
+        """Renewing pushes a lease's expiry forward."""
+        allocator.ttl = 60
+        allocator.acquire("abc12345")
+        before = allocator.leases()[0].expires_at
+
+        allocator.ttl = 3600
+        assert allocator.renew("abc12345") == 2
+        assert allocator.leases()[0].expires_at > before
+
+    def test_scales_beyond_fifteen_instances(self, tmp_path):
+        """The default ranges hold many more instances than the old limit of 15."""
+        allocator = PortAllocator(db_path=tmp_path / "ports.db")
+        with patch("adw.agent.ports.is_port_available", return_value=True):
+            ports = [allocator.acquire(f"agent{i:03d}") for i in range(50)]
+
+        assert len({p["backend"] for p in ports}) == 50
+        assert len({p["frontend"] for p in ports}) == 50
+
+
+class TestPortHelpers:
+    """Test module-level port helpers."""
+
+    def test_preferred_ports_line_up(self):
+        """Preferred backend and frontend ports share a slot."""
+        backend, frontend = get_ports_for_adw("abc12345")
+        assert frontend - backend == 100
+
+    def test_write_ports_env_extra_ports(self, tmp_path):
+        """Extra named ports are written as <NAME>_PORT."""
+        write_ports_env(str(tmp_path), 9100, 9200, {"db": 9300, "storybook-ui": 9301})
+
+        content = (tmp_path / ".ports.env").read_text()
+        assert "BACKEND_PORT=9100" in content
+        assert "DB_PORT=9300" in content
+        assert "STORYBOOK_UI_PORT=9301" in content
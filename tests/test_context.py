@@ -29,7 +29,16 @@ from adw.context import (
     save_bundle,
     suggest_bundles,
 )
+from adw.context.bundle_index import BundleIndex, tokenize
 from adw.context.bundles import compress_old_bundles
+from adw.context.packing import (
+    ContextCandidate,
+    PackedContext,
+    build_task_context,
+    estimate_tokens,
+    pack_context,
+    qmd_candidates,
+)
 from adw.context.priming import ProjectDetection
 
 
@@ -630,6 +639,150 @@ class TestSuggestBundles:
         assert suggestions == []
 
 
+class TestBundleIndex:
+    """Tests for the persistent bundle search index."""
+
+    def _write(self, bundles_dir: Path, task_id: str, description: str, tags: list[str], paths: list[str]) -> None:
+        data = {
+            "task_id": task_id,
+            "created_at": datetime.now().isoformat(),
+            "files": [{"path": p} for p in paths],
+            "description": description,
+            "total_lines": 0,
+            "tags": tags,
+        }
+        (bundles_dir / f"{task_id}.json").write_text(json.dumps(data))
+
+    def test_tokenize(self) -> None:
+        """Tokens are lowercase alphanumeric runs."""
+        assert tokenize("src/auth/Login_View.py") == ["src", "auth", "login", "view", "py"]
+
+    def test_index_stored_in_cache_dir(self, tmp_path: Path) -> None:
+        """Index lives under .adw/cache, outside the bundles directory."""
+        (tmp_path / "file.txt").write_text("content")
+        save_bundle("cached", ["file.txt"], description="cache me", base_path=tmp_path)
+
+        assert (tmp_path / ".adw" / "cache" / "bundle_index.db").exists()
+        assert not list((tmp_path / ".adw" / "bundles").glob("*.db"))
+
+    def test_bm25_prefers_rarer_terms(self, tmp_path: Path) -> None:
+        """A match on a rare term outranks a match on a common one."""
+        bundles_dir = tmp_path / ".adw" / "bundles"
+        bundles_dir.mkdir(parents=True)
+        for i in range(5):
+            self._write(bundles_dir, f"common{i}", "update api handler", [], [])
+        self._write(bundles_dir, "rare", "update websocket handler", [], [])
+
+        with BundleIndex(bundles_dir) as index:
+            index.sync()
+            results = index.search("websocket api", top_n=2)
+
+        assert results[0][0] == "rare"
+
+    def test_save_and_delete_update_index(self, tmp_path: Path) -> None:
+        """save_bundle and delete_bundle keep suggestions current."""
+        (tmp_path / "billing.py").write_text("x")
+        save_bundle("billing", ["billing.py"], description="Stripe invoices", base_path=tmp_path)
+
+        assert suggest_bundles("stripe", base_path=tmp_path)[0][0].task_id == "billing"
+
+        delete_bundle("billing", base_path=tmp_path)
+
+        assert suggest_bundles("stripe", base_path=tmp_path) == []
+
+    def test_external_bundles_picked_up(self, tmp_path: Path) -> None:
+        """Bundles written directly to disk are indexed on the next query."""
+        (tmp_path / "file.txt").write_text("content")
+        save_bundle("first", ["file.txt"], description="alpha", base_path=tmp_path)
+        suggest_bundles("alpha", base_path=tmp_path)
+
+        self._write(tmp_path / ".adw" / "bundles", "second", "beta feature", [], [])
+
+        suggestions = suggest_bundles("beta", base_path=tmp_path)
+        assert [b.task_id for b, _ in suggestions] == ["second"]
+
+    def test_compressed_bundles_remain_searchable(self, tmp_path: Path) -> None:
+        """Compression moves the indexed file without losing postings."""
+        bundles_dir = tmp_path / ".adw" / "bundles"
+        bundles_dir.mkdir(parents=True)
+        data = {
+            "task_id": "archived",
+            "created_at": (datetime.now() - timedelta(days=30)).isoformat(),
+            "files": [{"path": "src/legacy/importer.py"}],
+            "description": "legacy importer",
+            "total_lines": 0,
+            "tags": [],
+        }
+        (bundles_dir / "archived.json").write_text(json.dumps(data))
+        suggest_bundles("importer", base_path=tmp_path)
+
+        assert compress_old_bundles(days=7, base_path=tmp_path) == 1
+
+        suggestions = suggest_bundles("legacy importer", base_path=tmp_path)
+        assert suggestions[0][0].task_id == "archived"
+
+    def test_suggest_respects_top_n(self, tmp_path: Path) -> None:
+        """Only top_n suggestions are returned."""
+        bundles_dir = tmp_path / ".adw" / "bundles"
+        bundles_dir.mkdir(parents=True)
+        for i in range(6):
+            self._write(bundles_dir, f"b{i}", "search feature", ["search"], [])
+
+        assert len(suggest_bundles("search", base_path=tmp_path, top_n=4)) == 4
+
+
+class TestBundleManifest:
+    """Tests for the bundle manifest used by list and diff."""
+
+    def test_manifest_entry(self, tmp_path: Path) -> None:
+        """Manifest records metadata and file counts."""
+        (tmp_path / "a.py").write_text("a\nb\n")
+        (tmp_path / "b.py").write_text("c")
+        save_bundle("m1", ["a.py", "b.py"], description="manifest", tags=["x"], base_path=tmp_path)
+
+        with BundleIndex(tmp_path / ".adw" / "bundles") as index:
+            entry = index.get_entry("m1")
+
+        assert entry is not None
+        assert entry["file_count"] == 2
+        assert entry["tags"] == ["x"]
+        assert entry["compressed"] is False
+
+    def test_list_does_not_read_bundle_files(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Listing an up-to-date manifest never opens bundle files."""
+        (tmp_path / "file.txt").write_text("content")
+        for i in range(3):
+            save_bundle(f"bundle{i}", ["file.txt"], base_path=tmp_path)
+
+        def fail(*args: object, **kwargs: object) -> None:
+            raise AssertionError("bundle file was read")
+
+        monkeypatch.setattr(Path, "read_text", fail)
+        monkeypatch.setattr(gzip, "open", fail)
+
+        bundles = list_bundles(base_path=tmp_path, limit=2)
+
+        assert len(bundles) == 2
+        assert bundles[0].file_count == 1
+
+    def test_diff_compressed_bundles(self, tmp_path: Path) -> None:
+        """Diff works across compressed bundles via the manifest."""
+        bundles_dir = tmp_path / ".adw" / "bundles"
+        bundles_dir.mkdir(parents=True)
+        old = (datetime.now() - timedelta(days=30)).isoformat()
+        for task_id, paths in [("old1", ["a.py", "b.py"]), ("old2", ["b.py", "c.py"])]:
+            data = {"task_id": task_id, "created_at": old, "files": [{"path": p} for p in paths], "tags": []}
+            (bundles_dir / f"{task_id}.json").write_text(json.dumps(data))
+        compress_old_bundles(days=7, base_path=tmp_path)
+
+        diff = diff_bundles("old1", "old2", base_path=tmp_path)
+
+        assert diff is not None
+        assert diff.added == ["c.py"]
+        assert diff.removed == ["a.py"]
+        assert diff.common == ["b.py"]
+
+
 class TestBundleFileContents:
     """Tests for loading bundle file contents."""
 
@@ -738,3 +891,124 @@ class TestDeleteBundle:
 
         assert result is True
         assert not (bundles_dir / "compressed.json.gz").exists()
+
+
+class TestContextPacking:
+    """Tests for token-budgeted context packing."""
+
+    def test_estimate_tokens(self) -> None:
+        """Token estimate is roughly a quarter of the character count."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd" * 10) == 10
+
+    def test_pack_respects_budget(self) -> None:
+        """Packed items never exceed the token budget."""
+        candidates = [ContextCandidate("bundle", f"f{i}.py", f"line {i} " * 40, score=1.0) for i in range(10)]
+
+        packed = pack_context(candidates, token_budget=200)
+
+        assert packed.total_tokens <= 200
+        assert packed.dropped > 0
+
+    def test_pack_prefers_score_per_token(self) -> None:
+        """A short high-value item beats a long one of equal score."""
+        short = ContextCandidate("expertise", "short", "- Use the repository helpers", score=1.0)
+        long = ContextCandidate("bundle", "long.py", "x = 1\n" * 200, score=1.0)
+
+        packed = pack_context([long, short], token_budget=100)
+
+        assert [item.key for item in packed.items] == ["short"]
+
+    def test_pack_drops_overlapping_content(self) -> None:
+        """Content already covered by a selected item is deduplicated."""
+        text = "def authenticate(user):\n    return check_password(user)\n"
+        a = ContextCandidate("bundle", "auth.py", text, score=1.0)
+        b = ContextCandidate("qmd", "a.md", "### a.md\n" + text, score=0.5)
+
+        packed = pack_context([a, b], token_budget=1000)
+
+        assert len(packed.items) == 1
+        assert packed.duplicates == 1
+
+    def test_pack_best_single_fallback(self) -> None:
+        """One valuable item wins over many low-value items that crowd it out."""
+        small = [ContextCandidate("expertise", f"s{i}", f"- small tip number {i}", score=0.1) for i in range(5)]
+        big = ContextCandidate("bundle", "core.py", "y" * 360, score=1.0)
+
+        packed = pack_context(small + [big], token_budget=100)
+
+        assert [item.key for item in packed.items] == ["core.py"]
+
+    def test_prompt_section_grouped_by_source(self) -> None:
+        """Rendered section has one heading per source, in fixed order."""
+        packed = PackedContext(
+            items=[
+                ContextCandidate("expertise", "a", "- tip one"),
+                ContextCandidate("expertise", "b", "- tip two"),
+                ContextCandidate("qmd", "doc.md", "### doc.md\nsnippet"),
+            ]
+        )
+
+        section = packed.to_prompt_section()
+
+        assert section.index("## Expertise") < section.index("## Relevant Context")
+        assert "- tip one\n- tip two" in section
+
+    def test_qmd_candidates_filters_low_scores(self) -> None:
+        """qmd results below the relevance floor are ignored."""
+        results = [
+            {"path": "qmd://docs/guide.md", "snippet": "Useful", "score": 0.9},
+            {"path": "qmd://docs/other.md", "snippet": "Noise", "score": 0.1},
+        ]
+
+        candidates = qmd_candidates(results)
+
+        assert [c.key for c in candidates] == ["guide.md"]
+
+    def test_build_task_context_uses_bundles_and_caches(self, tmp_path: Path) -> None:
+        """Bundle files are packed and the result is cached per commit."""
+        import subprocess
+
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "billing.py").write_text("def charge_invoice():\n    pass\n")
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        subprocess.run(
+            ["git", "-c", "user.email=t@t", "-c", "user.name=t", "commit", "-q", "--allow-empty", "-m", "init"],
+            cwd=tmp_path,
+            check=True,
+        )
+        save_bundle("b1", ["src/billing.py"], description="billing invoices", base_path=tmp_path)
+
+        packed = build_task_context("fix billing invoices", task_id="t1", base_path=tmp_path, sources=("bundle",))
+
+        assert [item.key for item in packed.items] == ["src/billing.py"]
+        cached = list((tmp_path / ".adw" / "cache" / "context").glob("t1-*.json"))
+        assert len(cached) == 1
+
+        # Second call is served from the cache even if the bundle goes away
+        delete_bundle("b1", base_path=tmp_path)
+        again = build_task_context("fix billing invoices", task_id="t1", base_path=tmp_path, sources=("bundle",))
+        assert [item.key for item in again.items] == ["src/billing.py"]
+
+    def test_worktree_uses_project_bundles(self, tmp_path: Path) -> None:
+        """A worktree finds the project's bundles but reads its own files."""
+        import subprocess
+
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "billing.py").write_text("def charge_invoice():\n    pass\n")
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        subprocess.run(["git", "add", "src"], cwd=tmp_path, check=True)
+        subprocess.run(
+            ["git", "-c", "user.email=t@t", "-c", "user.name=t", "commit", "-q", "-m", "init"],
+            cwd=tmp_path,
+            check=True,
+        )
+        worktree = tmp_path / "trees" / "feature"
+        subprocess.run(["git", "worktree", "add", "-q", str(worktree)], cwd=tmp_path, check=True)
+        (worktree / "src" / "billing.py").write_text("def charge_invoice(amount):\n    pass\n")
+        save_bundle("b1", ["src/billing.py"], description="billing invoices", base_path=tmp_path)
+
+        packed = build_task_context("fix billing invoices", base_path=worktree, sources=("bundle",), use_cache=False)
+
+        assert [item.key for item in packed.items] == ["src/billing.py"]
+        assert "charge_invoice(amount)" in packed.items[0].content
@@ -147,3 +147,62 @@ class TestIsMonorepo:
     def test_not_monorepo(self, tmp_path: Path) -> None:
         """Test non-monorepo detection."""
         assert is_monorepo(tmp_path) is False
+
+
+class TestFingerprintCache:
+    """Tests for the project fingerprint cache shared by detectors."""
+
+    def test_cache_hit_skips_detection(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Unchanged manifests are not re-read."""
+        import adw.detect as detect_module
+
+        (tmp_path / "go.mod").write_text("module example.com/x\n")
+        assert detect_project(tmp_path)[0].stack == "go"
+
+        calls = []
+        monkeypatch.setattr(detect_module, "_detect_project", lambda path: calls.append(path) or [])
+
+        assert detect_project(tmp_path)[0].stack == "go"
+        assert calls == []
+
+    def test_manifest_change_invalidates(self, tmp_path: Path) -> None:
+        """Editing a manifest triggers re-detection."""
+        package_json = tmp_path / "package.json"
+        package_json.write_text(json.dumps({"dependencies": {"vue": "^3.0.0"}}))
+        assert detect_project(tmp_path)[0].stack == "vue"
+
+        package_json.write_text(json.dumps({"dependencies": {"react": "^18.0.0"}}))
+        assert detect_project(tmp_path)[0].stack == "react"
+
+    def test_persisted_for_initialized_projects(self, tmp_path: Path) -> None:
+        """Projects with an .adw directory get an on-disk cache."""
+        (tmp_path / ".adw").mkdir()
+        (tmp_path / "Cargo.toml").write_text("[package]\nname = 'x'\n")
+
+        detect_project(tmp_path)
+
+        cache = json.loads((tmp_path / ".adw" / "cache" / "project_fingerprint.json").read_text())
+        assert cache["results"]["detect_project"][0]["stack"] == "rust"
+
+    def test_not_persisted_outside_initialized_projects(self, tmp_path: Path) -> None:
+        """Detection never creates .adw in an uninitialized directory."""
+        (tmp_path / "go.mod").write_text("module example.com/x\n")
+
+        detect_project(tmp_path)
+
+        assert not (tmp_path / ".adw").exists()
+
+    def test_detectors_share_cache_file(self, tmp_path: Path) -> None:
+        """Priming and test-framework detection use the same cache."""
+        from adw.context.priming import ProjectType, detect_project_type
+        from adw.testing.detector import detect_test_framework
+
+        (tmp_path / ".adw").mkdir()
+        (tmp_path / "pyproject.toml").write_text("[tool.pytest.ini_options]\n")
+
+        assert detect_project_type(tmp_path).project_type == ProjectType.PYTHON
+        assert detect_test_framework(tmp_path).command == "pytest"
+
+        cache = json.loads((tmp_path / ".adw" / "cache" / "project_fingerprint.json").read_text())
+        assert set(cache["results"]) == {"project_type", "test_framework"}
+        assert detect_test_framework(tmp_path).config_file == "pyproject.toml"
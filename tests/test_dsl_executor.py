@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import os
 import subprocess
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -23,8 +24,10 @@ from adw.workflows.dsl_executor import (
     check_env_set,
     check_file_exists,
     check_git_changes,
+    critical_path_priorities,
     evaluate_condition,
     execute_parallel_phases,
+    execute_phase_graph,
     format_dsl_results_summary,
     run_workflow_by_name,
 )
@@ -945,3 +948,132 @@ class TestDSLExecutionContextThreadSafe:
         )
 
         assert context.get_result("nonexistent") is None
+
+
+class TestPhaseGraph:
+    """Tests for dependency (DAG) scheduling."""
+
+    @pytest.fixture
+    def context(self, tmp_path: Path) -> DSLExecutionContext:
+        """Execution context with a mock state."""
+        return DSLExecutionContext(
+            task_description="Test",
+            adw_id="test123",
+            worktree_path=tmp_path,
+            state=MagicMock(),
+        )
+
+    @staticmethod
+    def agent(calls: list[str], failing: tuple[str, ...] = (), barrier: threading.Barrier | None = None):
+        """Fake prompt_with_retry recording the phases it runs."""
+
+        def prompt(request: AgentPromptRequest, max_retries: int = 2) -> MagicMock:
+            phase = request.agent_name.removesuffix("-test123")
+            calls.append(phase)
+            if barrier is not None and phase != "implement":
+                barrier.wait()
+            failed = phase in failing
+            return MagicMock(success=not failed, output="", error_message="boom" if failed else None)
+
+        return prompt
+
+    def test_critical_path_priorities(self) -> None:
+        """A phase ranks by the longest chain it holds up."""
+        graph = {"a": [], "b": [], "c": ["b"]}
+        priorities = critical_path_priorities(graph, {"a": 2.0, "b": 10.0, "c": 1.0})
+        assert priorities == {"a": 2.0, "b": 11.0, "c": 1.0}
+
+    def test_independent_phases_overlap(self, context: DSLExecutionContext) -> None:
+        """Phases sharing a dependency all run at once after it."""
+        wf = WorkflowDefinition(
+            name="dag",
+            phases=[
+                PhaseDefinition(name="implement", prompt="Implement"),
+                PhaseDefinition(name="lint", prompt="Lint", depends_on=["implement"]),
+                PhaseDefinition(name="typecheck", prompt="Typecheck", depends_on=["implement"]),
+                PhaseDefinition(name="docs", prompt="Docs", depends_on=["implement"]),
+            ],
+        )
+        calls: list[str] = []
+        barrier = threading.Barrier(3, timeout=10)  # Broken unless all three run together
+
+        with patch("adw.workflows.dsl_executor.prompt_with_retry", side_effect=self.agent(calls, barrier=barrier)):
+            results, _, required_failed = execute_phase_graph(wf, context)
+
+        assert not required_failed
+        assert calls[0] == "implement"
+        assert all(r.success for r in results)
+        assert {r.phase_name for r in results if r.was_parallel} == {"lint", "typecheck", "docs"}
+
+    def test_critical_path_first(self, context: DSLExecutionContext) -> None:
+        """With one worker, the longest chain starts first."""
+        wf = WorkflowDefinition(
+            name="dag",
+            max_parallel=1,
+            phases=[
+                PhaseDefinition(name="a", prompt="A", depends_on=[]),
+                PhaseDefinition(name="b", prompt="B", depends_on=[]),
+                PhaseDefinition(name="c", prompt="C", depends_on=["b"]),
+            ],
+        )
+        calls: list[str] = []
+
+        with (
+            patch("adw.workflows.dsl_executor.prompt_with_retry", side_effect=self.agent(calls)),
+            patch(
+                "adw.workflows.dsl_executor.estimate_phase_durations",
+                return_value={"a": 2.0, "b": 10.0, "c": 1.0},
+            ),
+        ):
+            execute_phase_graph(wf, context)
+
+        assert calls == ["b", "a", "c"]
+
+    def test_required_failure_cancels_downstream(self, context: DSLExecutionContext) -> None:
+        """Dependents of a failed required phase are cancelled; other branches go on."""
+        wf = WorkflowDefinition(
+            name="dag",
+            fail_fast=False,
+            phases=[
+                PhaseDefinition(name="implement", prompt="Implement"),
+                PhaseDefinition(name="lint", prompt="Lint", depends_on=["implement"]),
+                PhaseDefinition(name="report", prompt="Report", depends_on=["lint"]),
+                PhaseDefinition(name="notes", prompt="Notes", depends_on=[]),
+            ],
+        )
+        calls: list[str] = []
+
+        with patch(
+            "adw.workflows.dsl_executor.prompt_with_retry",
+            side_effect=self.agent(calls, failing=("implement",)),
+        ):
+            results, _, required_failed = execute_phase_graph(wf, context)
+
+        assert required_failed
+        assert sorted(calls) == ["implement", "notes"]
+        by_name = {r.phase_name: r for r in results}
+        assert "Cancelled" in by_name["lint"].error
+        assert "Cancelled" in by_name["report"].error
+        assert by_name["notes"].success
+
+    def test_skipped_phase_unblocks_dependents(self, context: DSLExecutionContext) -> None:
+        """A phase whose condition is not met counts as done."""
+        wf = WorkflowDefinition(
+            name="dag",
+            phases=[
+                PhaseDefinition(
+                    name="setup",
+                    prompt="Setup",
+                    depends_on=[],
+                    condition=PhaseCondition.FILE_EXISTS,
+                    condition_value="missing.txt",
+                ),
+                PhaseDefinition(name="build", prompt="Build", depends_on=["setup"]),
+            ],
+        )
+        calls: list[str] = []
+
+        with patch("adw.workflows.dsl_executor.prompt_with_retry", side_effect=self.agent(calls)):
+            execute_phase_graph(wf, context)
+
+        assert calls == ["build"]
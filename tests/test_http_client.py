@@ -0,0 +1,194 @@
+"""Tests for the shared HTTP client."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from adw.utils.http_client import HttpClient, RateLimiter, parse_retry_after
+
+
+def make_client(handler, **kwargs) -> HttpClient:  # type: ignore[no-untyped-def]
+    """A client whose requests are answered by handler."""
+    return HttpClient(
+        transport=httpx.MockTransport(handler),
+        async_transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter."""
+
+    def test_burst_then_rate(self) -> None:
+        """Requests within the burst go at once; the next waits for a token."""
+        limiter = RateLimiter(rate=2.0, burst=2)
+
+        assert limiter.reserve() == 0
+        assert limiter.reserve() == 0
+        assert limiter.reserve() == pytest.approx(0.5, abs=0.05)
+
+    def test_block(self) -> None:
+        """A block holds back requests even with tokens left."""
+        limiter = RateLimiter(rate=10.0, burst=10)
+        limiter.block(5)
+
+        assert limiter.reserve() == pytest.approx(5, abs=0.05)
+
+
+class TestParseRetryAfter:
+    """Tests for parse_retry_after."""
+
+    def test_seconds(self) -> None:
+        assert parse_retry_after("12") == 12
+        assert parse_retry_after("-3") == 0
+
+    def test_http_date(self) -> None:
+        value = format_datetime(datetime.now(UTC) + timedelta(seconds=30), usegmt=True)
+        assert 25 < (parse_retry_after(value) or 0) <= 30
+
+    def test_invalid(self) -> None:
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+
+class TestHttpClient:
+    """Tests for HttpClient."""
+
+    def test_limiter_matches_subdomains(self) -> None:
+        """Hosts share the limiter of their configured domain."""
+        client = HttpClient(rate_limits={"slack.com": (1.0, 5)})
+
+        limiter = client.limiter("https://hooks.slack.com/services/x")
+        assert limiter is not None
+        assert limiter is client.limiter("https://hooks.slack.com/other")
+        assert client.limiter("https://example.com") is None
+
+    def test_retries_after_retry_after(self) -> None:
+        """A 429 is retried after the Retry-After, which also blocks the host."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(429, headers={"Retry-After": "2"})
+            return httpx.Response(200, json={"ok": True})
+
+        client = make_client(handler, rate_limits={"slack.com": (100.0, 100)})
+        with patch("adw.utils.http_client.time.sleep") as sleep:
+            response = client.request("POST", "https://slack.com/api/chat.postMessage", json={})
+
+        assert response.json() == {"ok": True}
+        assert len(calls) == 2
+        assert 2 in [c[0][0] for c in sleep.call_args_list]
+        assert client.limiter("https://slack.com").reserve() > 1  # type: ignore[union-attr]
+        assert calls[0].headers["User-Agent"].startswith("ADW-CLI/")
+
+    def test_long_retry_after_is_returned(self) -> None:
+        """Retry-After beyond MAX_RETRY_AFTER is left to the caller."""
+        client = make_client(lambda r: httpx.Response(429, headers={"Retry-After": "3600"}))
+
+        with patch("adw.utils.http_client.time.sleep") as sleep:
+            response = client.request("GET", "https://example.com")
+
+        assert response.status_code == 429
+        sleep.assert_not_called()
+
+    def test_gives_up_after_retries(self) -> None:
+        """Unavailable responses are returned once retries run out."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(503)
+
+        client = make_client(handler, max_retries=2)
+        with patch("adw.utils.http_client.time.sleep"):
+            response = client.request("GET", "https://example.com")
+
+        assert response.status_code == 503
+        assert len(calls) == 3
+
+    def test_post_not_resent_after_read_error(self) -> None:
+        """A POST that may have reached the server is not sent twice."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        client = make_client(handler)
+        with patch("adw.utils.http_client.time.sleep"), pytest.raises(httpx.ReadTimeout):
+            client.request("POST", "https://example.com")
+
+        assert len(calls) == 1
+
+    def test_post_not_resent_after_bad_gateway(self) -> None:
+        """A POST answered by a 502 may have been acted on, so it is returned."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(502)
+
+        client = make_client(handler)
+        with patch("adw.utils.http_client.time.sleep"):
+            response = client.request("POST", "https://example.com")
+
+        assert response.status_code == 502
+        assert len(calls) == 1
+
+    def test_connect_error_retried(self) -> None:
+        """Requests that never connected are retried whatever the method."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) == 1:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(204)
+
+        client = make_client(handler)
+        with patch("adw.utils.http_client.time.sleep"):
+            response = client.request("POST", "https://example.com")
+
+        assert response.status_code == 204
+        assert len(calls) == 2
+
+    def test_connections_are_reused(self) -> None:
+        """Requests share one pooled client until it is closed."""
+        client = make_client(lambda r: httpx.Response(200))
+        pooled = client.client
+
+        client.request("GET", "https://example.com")
+        assert client.client is pooled
+
+        client.close()
+        assert client.client is not pooled
+
+    def test_arequest(self) -> None:
+        """The async facade retries like the sync one."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            if len(calls) == 1:
+                return httpx.Response(502)
+            return httpx.Response(200, json={"ok": True})
+
+        client = make_client(handler)
+
+        async def run() -> httpx.Response:
+            with patch("adw.utils.http_client.asyncio.sleep"):
+                response = await client.arequest("GET", "https://example.com")
+            await client.aclose()
+            return response
+
+        response = asyncio.run(run())
+        assert response.json() == {"ok": True}
+        assert len(calls) == 2
@@ -9,6 +9,7 @@ import json
 import tempfile
 from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -243,6 +244,253 @@ class TestPatternStore:
         assert store2.learnings[0].content == "Export me"
 
 
+class TestPatternStoreDatabase:
+    """Tests for the SQLite backend of PatternStore."""
+
+    def test_shared_database_isolates_projects(self, tmp_path: Path) -> None:
+        """Test that projects share one database but not learnings."""
+        store_a = PatternStore(learning_dir=tmp_path, project="a")
+        store_b = PatternStore(learning_dir=tmp_path, project="b")
+        store_a.add_learning(Learning(type=LearningType.PATTERN, content="Only in A"))
+
+        assert (tmp_path / "learning.db").exists()
+        assert len(store_a.learnings) == 1
+        assert len(store_b.learnings) == 0
+
+    def test_migrates_legacy_json(self, tmp_path: Path) -> None:
+        """Test that patterns.json and outcomes.jsonl are imported once."""
+        legacy_dir = tmp_path / "legacy"
+        legacy_dir.mkdir()
+        learning = Learning(type=LearningType.ISSUE, content="Old issue", domain="backend")
+        (legacy_dir / "patterns.json").write_text(json.dumps({"learnings": [learning.to_dict()]}))
+        outcome = TaskOutcome(task_id="t1", task_description="Old task", success=True)
+        (legacy_dir / "outcomes.jsonl").write_text(json.dumps(outcome.to_dict()) + "\n")
+
+        store = PatternStore(learning_dir=tmp_path, project="legacy")
+        issues = store.get_known_issues(domain="backend")
+        assert [item.content for item in issues] == ["Old issue"]
+        assert store.get_outcome_statistics()["total_outcomes"] == 1
+
+        # Reopening does not import the files again
+        store.close()
+        reopened = PatternStore(learning_dir=tmp_path, project="legacy")
+        assert len(reopened.learnings) == 1
+        assert reopened.get_outcome_statistics()["total_outcomes"] == 1
+
+    def test_mark_used_updates_row(self, tmp_path: Path) -> None:
+        """Test that mark_used persists the new success count."""
+        store = PatternStore(learning_dir=tmp_path, project="test")
+        store.add_learning(Learning(type=LearningType.PATTERN, content="Reuse fixtures"))
+
+        learning = store.learnings[0]
+        store.mark_used(learning)
+        store.mark_used(learning, success=False)
+
+        stored = store.learnings[0]
+        assert stored.success_count == 2
+        assert stored.last_used is not None
+        assert learning.success_count == 2
+
+    def test_mark_used_merged_learning(self, tmp_path: Path) -> None:
+        """Test that marking merged content updates the learning it was merged into."""
+        store = PatternStore(learning_dir=tmp_path, project="test")
+        store.add_learning(Learning(type=LearningType.PATTERN, content="Use async for database calls"))
+        merged = Learning(type=LearningType.PATTERN, content="Use async for the database calls!")
+        store.add_learning(merged)
+
+        store.mark_used(merged)
+
+        stored = store.learnings
+        assert len(stored) == 1
+        assert stored[0].success_count == 3
+        assert stored[0].last_used is not None
+
+    def test_clear_by_domain(self, tmp_path: Path) -> None:
+        """Test clearing learnings for a single domain."""
+        store = PatternStore(learning_dir=tmp_path, project="test")
+        store.add_learning(Learning(type=LearningType.PATTERN, content="F1", domain="frontend"))
+        store.add_learning(Learning(type=LearningType.PATTERN, content="B1", domain="backend"))
+
+        assert store.clear(domain="frontend") == 1
+        assert [item.content for item in store.learnings] == ["B1"]
+
+        store.clear()
+        assert store.get_statistics()["total_learnings"] == 0
+
+    def test_outcome_rollup(self, tmp_path: Path) -> None:
+        """Test that outcomes are aggregated incrementally."""
+        store = PatternStore(learning_dir=tmp_path, project="test")
+        for i in range(3):
+            store.record_outcome(
+                TaskOutcome(
+                    task_id=f"t{i}",
+                    task_description="Task",
+                    success=i != 1,
+                    retry_count=i,
+                    test_passed_first_try=i == 0,
+                )
+            )
+
+        assert store.rollup_outcomes() == 3
+        assert store.rollup_outcomes() == 0
+
+        store.record_outcome(TaskOutcome(task_id="t3", task_description="Task", success=True))
+        stats = store.get_outcome_statistics()
+
+        assert stats["total_outcomes"] == 4
+        assert stats["successes"] == 3
+        assert stats["first_try_passes"] == 1
+        assert stats["avg_retries"] == pytest.approx(0.75)
+
+    def test_rollup_counts_own_outcomes(self, tmp_path: Path) -> None:
+        """Test that another project's outcomes don't trigger this project's rollup."""
+        store = PatternStore(learning_dir=tmp_path, project="test")
+        other = PatternStore(learning_dir=tmp_path, project="other")
+
+        with patch("adw.learning.patterns.ROLLUP_INTERVAL", 3):
+            other.record_outcome(TaskOutcome(task_id="o1", task_description="Task", success=True))
+            other.record_outcome(TaskOutcome(task_id="o2", task_description="Task", success=True))
+            store.record_outcome(TaskOutcome(task_id="t1", task_description="Task", success=True))
+            assert store.rollup_outcomes() == 1  # Nothing was rolled up yet
+
+            for i in range(3):
+                store.record_outcome(TaskOutcome(task_id=f"t{i + 2}", task_description="Task", success=True))
+            assert store.rollup_outcomes() == 0
+
+    def test_top_patterns_use_index(self, tmp_path: Path) -> None:
+        """Test that domain-filtered pattern queries are served by an index."""
+        store = PatternStore(learning_dir=tmp_path, project="test")
+        store.save()
+
+        with store._cursor() as cursor:
+            plan = cursor.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM learnings "
+                "WHERE project = ? AND domain IN (?, 'general') AND type = ? "
+                "ORDER BY success_count DESC LIMIT 10",
+                ("test", "frontend", "pattern"),
+            ).fetchall()
+
+        assert any("idx_learnings" in row["detail"] for row in plan)
+
+
+class TestNearDuplicateLearnings:
+    """Tests for MinHash/LSH near-duplicate merging."""
+
+    def test_similarity_helpers(self) -> None:
+        """Test shingle similarity and LSH lookup."""
+        from adw.learning.similarity import LSHIndex, jaccard, shingles
+
+        a = shingles("Use async for database calls")
+        b = shingles("Use async for the database calls.")
+        assert jaccard(a, b) >= 0.7
+        assert jaccard(a, shingles("Prefer composition over inheritance")) < 0.2
+
+        index = LSHIndex()
+        index.add(1, "Use async for database calls")
+        index.add(2, "Prefer composition over inheritance")
+        assert index.find("use async for the database calls") == 1
+        assert index.find("Write migrations for schema changes") is None
+
+    def test_different_numbers_are_distinct(self) -> None:
+        """Test that texts differing only in numbers are not merged."""
+        from adw.learning.similarity import LSHIndex
+
+        index = LSHIndex()
+        index.add(1, "Run the dev server on port 3000")
+        assert index.find("Run the dev server on port 8080") is None
+
+    @pytest.mark.parametrize(
+        ("stored", "other"),
+        [
+            ("Use async session for database calls", "Use sync session for database calls"),
+            ("Keep variant styles in Button.tsx", "Keep variant styles in Buttons.tsx"),
+            ("Always validate request payloads before saving", "Never validate request payloads before saving"),
+            ("Don't mock the database in integration tests", "Mock the database in integration tests"),
+            ("Call get_user before rendering the profile", "Call get_users before rendering the profile"),
+        ],
+    )
+    def test_different_meanings_are_distinct(self, stored: str, other: str) -> None:
+        """Test that similar texts differing in a key word or identifier are not merged."""
+        from adw.learning.similarity import LSHIndex, best_match
+
+        index = LSHIndex()
+        index.add(1, stored)
+        assert index.find(other) is None
+        assert best_match(other, [(1, stored)]) is None
+
+    def test_buckets_rebuilt_on_signature_change(self, tmp_path: Path) -> None:
+        """Test that buckets stored under an older shingling are rebuilt."""
+        store = PatternStore(learning_dir=tmp_path, project="test")
+        store.add_learning(Learning(type=LearningType.PATTERN, content="Use async for database calls"))
+        with store._cursor() as cursor:
+            cursor.execute("UPDATE lsh_buckets SET bucket = bucket + 1")
+            cursor.execute("UPDATE meta SET value = '1' WHERE key = 'lsh_version'")
+        store.close()
+
+        store = PatternStore(learning_dir=tmp_path, project="test")
+        store.add_learning(Learning(type=LearningType.PATTERN, content="Use async for the database calls!"))
+
+        assert len(store.learnings) == 1
+        assert store.learnings[0].success_count == 2
+
+    def test_add_merges_near_duplicate(self, tmp_path: Path) -> None:
+        """Test that near-duplicate adds sum success counts."""
+        store = PatternStore(learning_dir=tmp_path, project="test")
+        store.add_learning(Learning(type=LearningType.PATTERN, content="Use async for database calls"))
+        store.add_learning(
+            Learning(type=LearningType.PATTERN, content="Use async for the database calls!", success_count=3)
+        )
+        # Same text but a different type stays separate
+        store.add_learning(Learning(type=LearningType.MISTAKE, content="Use async for database calls"))
+
+        patterns = store.get_learnings_by_type(LearningType.PATTERN)
+        assert len(patterns) == 1
+        assert patterns[0].content == "Use async for database calls"
+        assert patterns[0].success_count == 4
+        assert len(store.learnings) == 2
+
+    def test_import_merges_near_duplicates(self, tmp_path: Path) -> None:
+        """Test that importing a large set collapses near-duplicates."""
+        data = {
+            "learnings": [
+                Learning(type=LearningType.PATTERN, content=text).to_dict()
+                for i in range(200)
+                for text in (f"Validate input in handler {i} before use", "Always validate request payloads.")
+            ]
+        }
+        store = PatternStore(learning_dir=tmp_path, project="test")
+
+        assert store.import_learnings(data) == 400
+        learnings = store.learnings
+        assert len(learnings) == 201
+        payload = [item for item in learnings if "payloads" in item.content]
+        assert payload[0].success_count == 200
+
+    def test_dedupe_existing_store(self, tmp_path: Path) -> None:
+        """Test batch dedupe of learnings stored before merging existed."""
+        store = PatternStore(learning_dir=tmp_path, project="test")
+        store.save()
+        with store._cursor() as cursor:
+            for content, count in [
+                ("Always validate JWT tokens", 1),
+                ("Always validate the JWT tokens", 5),
+                ("Cache expensive lookups", 2),
+            ]:
+                cursor.execute(
+                    "INSERT INTO learnings (project, type, content, content_key, success_count, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    ("test", "pattern", content, content.lower(), count, datetime.now().isoformat()),
+                )
+
+        assert store.dedupe(dry_run=True) == 1
+        assert len(store.learnings) == 3
+
+        assert store.dedupe() == 1
+        contents = {item.content: item.success_count for item in store.learnings}
+        assert contents == {"Always validate the JWT tokens": 6, "Cache expensive lookups": 2}
+        assert store.dedupe() == 0
+
+
 class TestTaskOutcome:
     """Tests for TaskOutcome."""
 
@@ -489,6 +737,126 @@ class TestGetCombinedExpertise:
         assert "F1" in frontend_content
 
 
+class TestRelevanceRetrieval:
+    """Tests for relevance-ranked expertise retrieval."""
+
+    @pytest.fixture
+    def default_store(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> PatternStore:
+        """Point the default pattern store at a temporary directory."""
+        import adw.learning.patterns as patterns_module
+        from adw.learning.retrieval import clear_retrieval_cache
+
+        monkeypatch.setattr(patterns_module, "DEFAULT_LEARNING_DIR", tmp_path)
+        monkeypatch.setattr(patterns_module, "_default_store", None)
+        clear_retrieval_cache()
+        return get_default_pattern_store(project="test")
+
+    def test_rank_by_relevance(self) -> None:
+        """Test that task-relevant learnings outrank popular ones."""
+        from adw.learning import rank_learnings
+
+        learnings = [
+            Learning(type=LearningType.PATTERN, content="Memoize React selectors", success_count=50),
+            Learning(type=LearningType.PATTERN, content="Wrap database migrations in a transaction"),
+            Learning(type=LearningType.ISSUE, content="Unrelated flaky CI cache"),
+        ]
+
+        ranked = rank_learnings(learnings, "Add a migration for the orders database table")
+
+        assert [r.learning.content for r in ranked] == ["Wrap database migrations in a transaction"]
+
+    def test_file_terms_count(self) -> None:
+        """Test that touched files contribute query terms."""
+        from adw.learning import rank_learnings
+
+        learnings = [
+            Learning(type=LearningType.PATTERN, content="Keep auth middleware stateless"),
+            Learning(type=LearningType.PATTERN, content="Paginate billing queries"),
+        ]
+
+        ranked = rank_learnings(learnings, "Refactor module", files=["src/billing/invoices.py"])
+
+        assert ranked[0].learning.content == "Paginate billing queries"
+
+    def test_no_query_terms_falls_back_to_success(self) -> None:
+        """Test ranking by success count when the task has no usable terms."""
+        from adw.learning import rank_learnings
+
+        learnings = [
+            Learning(type=LearningType.PATTERN, content="Low", success_count=1),
+            Learning(type=LearningType.PATTERN, content="High", success_count=9),
+        ]
+
+        ranked = rank_learnings(learnings, "fix it")
+
+        assert [r.learning.content for r in ranked] == ["High", "Low"]
+
+    def test_token_budget(self, default_store: PatternStore) -> None:
+        """Test that retrieved learnings fit the token budget."""
+        from adw.learning import retrieve_learnings
+
+        for i in range(20):
+            default_store.add_learning(
+                Learning(type=LearningType.PATTERN, content=f"Validate webhook payload signature variant {i}")
+            )
+
+        selected = retrieve_learnings("Validate webhook payloads", project="test", token_budget=40)
+
+        assert 0 < len(selected) < 20
+        assert sum(len(f"- {item.content}") for item in selected) <= 40 * 4
+
+    def test_cached_per_task(self, default_store: PatternStore) -> None:
+        """Test that rankings are cached per task until the store changes."""
+        from adw.learning import retrieve_learnings
+
+        default_store.add_learning(Learning(type=LearningType.PATTERN, content="Retry webhook deliveries"))
+        first = retrieve_learnings("webhook retries", project="test", task_id="abc12345")
+
+        with patch.object(PatternStore, "get_learnings_by_domain") as by_domain, patch(
+            "adw.learning.retrieval.rank_learnings"
+        ) as rank:
+            again = retrieve_learnings("webhook retries", project="test", task_id="abc12345")
+            assert not rank.called
+            assert not by_domain.called
+        assert [item.content for item in again] == [item.content for item in first]
+
+        default_store.add_learning(Learning(type=LearningType.ISSUE, content="Webhook retries need idempotency keys"))
+        updated = retrieve_learnings("webhook retries", project="test", task_id="abc12345")
+        assert len(updated) == 2
+
+    def test_combined_expertise_uses_task(self, default_store: PatternStore) -> None:
+        """Test that get_combined_expertise only includes relevant learnings."""
+        default_store.add_learning(Learning(type=LearningType.PATTERN, content="Use Zod for form validation"))
+        default_store.add_learning(Learning(type=LearningType.MISTAKE, content="Never log raw passwords"))
+
+        section = get_combined_expertise(
+            project="test",
+            task_description="Build the signup form validation",
+            include_global=False,
+        )
+
+        assert "Zod" in section
+        assert "passwords" not in section
+
+    def test_packing_uses_retrieval(self, default_store: PatternStore) -> None:
+        """Test that packed expertise comes from the same ranked retrieval."""
+        from adw.context.packing import expertise_candidates
+
+        default_store.add_learning(
+            Learning(type=LearningType.ISSUE, content="Webhook retries repeat", context="Use idempotency keys")
+        )
+        default_store.add_learning(Learning(type=LearningType.PATTERN, content="Memoize React selectors"))
+
+        candidates = expertise_candidates("webhook retries", project="test", task_id="abc12345")
+
+        assert default_store.project == "test"
+        assert [c.content for c in candidates] == ["- **Webhook retries repeat**: Use idempotency keys"]
+        with patch("adw.learning.retrieval.rank_learnings") as rank:
+            again = expertise_candidates("webhook retries", project="test", task_id="abc12345")
+        assert not rank.called
+        assert again == candidates
+
+
 # =============================================================================
 # Record Outcome Tests
 # =============================================================================
@@ -11,13 +11,14 @@ Tests cover:
 
 from __future__ import annotations
 
-import json
 import os
 import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
 from adw.integrations.linear import (
@@ -26,6 +27,7 @@ from adw.integrations.linear import (
     LinearClient,
     LinearConfig,
     LinearIssue,
+    LinearMutation,
     LinearWatcher,
     _parse_simple_toml,
     parse_linear_issue,
@@ -508,10 +510,9 @@ class TestLinearClient:
 
         assert client.api_key == "lin_api_test"
         assert client.API_URL == "https://api.linear.app/graphql"
-        assert client._rate_limit_reset == 0
 
-    @patch("urllib.request.urlopen")
-    def test_get_viewer_success(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.linear.http_client.request")
+    def test_get_viewer_success(self, mock_request: MagicMock) -> None:
         """Test successful viewer query."""
         response_data = {
             "data": {
@@ -522,12 +523,8 @@ class TestLinearClient:
                 }
             }
         }
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(response_data).encode()
-        mock_response.headers = {}
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_response = httpx.Response(200, json=response_data)
+        mock_request.return_value = mock_response
 
         client = LinearClient("lin_api_test")
         viewer = client.get_viewer()
@@ -536,8 +533,8 @@ class TestLinearClient:
         assert viewer["id"] == "user_123"
         assert viewer["name"] == "Test User"
 
-    @patch("urllib.request.urlopen")
-    def test_get_teams_success(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.linear.http_client.request")
+    def test_get_teams_success(self, mock_request: MagicMock) -> None:
         """Test successful teams query."""
         response_data = {
             "data": {
@@ -549,12 +546,8 @@ class TestLinearClient:
                 }
             }
         }
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(response_data).encode()
-        mock_response.headers = {}
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_response = httpx.Response(200, json=response_data)
+        mock_request.return_value = mock_response
 
         client = LinearClient("lin_api_test")
         teams = client.get_teams()
@@ -566,8 +559,8 @@ class TestLinearClient:
         assert client._team_cache["team_1"] == "ENG"
         assert client._team_cache["team_2"] == "DES"
 
-    @patch("urllib.request.urlopen")
-    def test_get_team_states(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.linear.http_client.request")
+    def test_get_team_states(self, mock_request: MagicMock) -> None:
         """Test fetching workflow states for a team."""
         response_data = {
             "data": {
@@ -582,12 +575,8 @@ class TestLinearClient:
                 }
             }
         }
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(response_data).encode()
-        mock_response.headers = {}
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_response = httpx.Response(200, json=response_data)
+        mock_request.return_value = mock_response
 
         client = LinearClient("lin_api_test")
         states = client.get_team_states("team_1")
@@ -599,8 +588,8 @@ class TestLinearClient:
         assert client._state_cache["team_1"]["in progress"] == "state_2"
         assert client._state_cache["team_1"]["done"] == "state_3"
 
-    @patch("urllib.request.urlopen")
-    def test_find_state_id(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.linear.http_client.request")
+    def test_find_state_id(self, mock_request: MagicMock) -> None:
         """Test finding state ID by name."""
         response_data = {
             "data": {
@@ -613,12 +602,8 @@ class TestLinearClient:
                 }
             }
         }
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(response_data).encode()
-        mock_response.headers = {}
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_response = httpx.Response(200, json=response_data)
+        mock_request.return_value = mock_response
 
         client = LinearClient("lin_api_test")
 
@@ -627,12 +612,16 @@ class TestLinearClient:
         assert state_id == "state_progress"
 
         # Second call uses cache (no new request)
-        mock_urlopen.reset_mock()
+        mock_request.reset_mock()
         state_id = client.find_state_id("team_1", "in progress")
         assert state_id == "state_progress"
 
-    @patch("urllib.request.urlopen")
-    def test_update_issue(self, mock_urlopen: MagicMock) -> None:
+        # Unknown names don't refetch either
+        assert client.find_state_id("team_1", "doing") is None
+        mock_request.assert_not_called()
+
+    @patch("adw.integrations.linear.http_client.request")
+    def test_update_issue(self, mock_request: MagicMock) -> None:
         """Test updating an issue."""
         response_data = {
             "data": {
@@ -641,20 +630,16 @@ class TestLinearClient:
                 }
             }
         }
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(response_data).encode()
-        mock_response.headers = {}
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_response = httpx.Response(200, json=response_data)
+        mock_request.return_value = mock_response
 
         client = LinearClient("lin_api_test")
         success = client.update_issue("issue_1", state_id="state_progress")
 
         assert success is True
 
-    @patch("urllib.request.urlopen")
-    def test_add_comment(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.linear.http_client.request")
+    def test_add_comment(self, mock_request: MagicMock) -> None:
         """Test adding a comment to an issue."""
         response_data = {
             "data": {
@@ -663,56 +648,161 @@ class TestLinearClient:
                 }
             }
         }
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(response_data).encode()
-        mock_response.headers = {}
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_response = httpx.Response(200, json=response_data)
+        mock_request.return_value = mock_response
 
         client = LinearClient("lin_api_test")
         success = client.add_comment("issue_1", "Test comment")
 
         assert success is True
 
-    @patch("urllib.request.urlopen")
-    def test_handles_graphql_errors(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.linear.http_client.request")
+    def test_mutate_batches_aliases(self, mock_request: MagicMock) -> None:
+        """Test that several mutations are sent as one aliased document."""
+        mock_request.return_value = httpx.Response(
+            200,
+            json={"data": {"m0": {"success": True}, "m1": {"success": False}}},
+        )
+
+        client = LinearClient("lin_api_test")
+        results = client.mutate(
+            [
+                LinearMutation.issue_update("issue_1", state_id="state_done"),
+                LinearMutation.comment_create("issue_1", 'Done "quoted"\nline'),
+            ]
+        )
+
+        assert results == [True, False]
+        mock_request.assert_called_once()
+        body = mock_request.call_args.kwargs["json"]
+        assert "m0: issueUpdate(id: $id0, input: $input0)" in body["query"]
+        assert "m1: commentCreate(input: $input1)" in body["query"]
+        assert body["variables"]["input0"] == {"stateId": "state_done"}
+        assert body["variables"]["input1"]["body"] == 'Done "quoted"\nline'
+
+    @patch.object(LinearClient, "find_state_id", return_value="state_progress")
+    @patch("adw.integrations.linear.http_client.request")
+    def test_claim_survives_failed_comment(
+        self, mock_request: MagicMock, mock_find_state: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test that a failed comment does not hide the update that claimed the issue."""
+        mock_request.return_value = httpx.Response(
+            200,
+            json={
+                "data": {"m0": {"success": True}, "m1": None},
+                "errors": [{"message": "Comment rejected", "path": ["m1"]}],
+            },
+        )
+
+        config = LinearConfig(api_key="lin_api_test", team_id="team_123")
+        watcher = LinearWatcher(config, state_file=tmp_path / "linear_state.json")
+        issue = LinearIssue(id="issue_1", identifier="T-1", title="Test", team_id="team_123")
+
+        assert watcher.mark_issue_started(issue, "abc12345") is True
+        assert "issue_1" in watcher._processed_ids
+
+    @patch("adw.integrations.linear.http_client.request")
+    def test_get_issues_follows_pages(self, mock_request: MagicMock) -> None:
+        """Test that issue queries follow pageInfo cursors."""
+        mock_request.side_effect = [
+            httpx.Response(
+                200,
+                json={
+                    "data": {
+                        "issues": {
+                            "nodes": [{"id": "issue_1"}],
+                            "pageInfo": {"hasNextPage": True, "endCursor": "page_2"},
+                        }
+                    }
+                },
+            ),
+            httpx.Response(
+                200,
+                json={"data": {"issues": {"nodes": [{"id": "issue_2"}], "pageInfo": {"hasNextPage": False}}}},
+            ),
+        ]
+
+        client = LinearClient("lin_api_test")
+        issues = client.get_issues(team_id="team_1", limit=None, updated_after="2024-01-01T00:00:00+00:00")
+
+        assert [i["id"] for i in issues] == ["issue_1", "issue_2"]
+        last = mock_request.call_args.kwargs["json"]
+        assert last["variables"]["after"] == "page_2"
+        assert 'updatedAt: { gt: "2024-01-01T00:00:00+00:00" }' in last["query"]
+
+    @patch("adw.integrations.linear.http_client.request")
+    def test_get_issues_failed_page(self, mock_request: MagicMock) -> None:
+        """Test that a failed page request is not mistaken for the last page."""
+        mock_request.side_effect = [
+            httpx.Response(
+                200,
+                json={
+                    "data": {
+                        "issues": {
+                            "nodes": [{"id": "issue_1"}],
+                            "pageInfo": {"hasNextPage": True, "endCursor": "page_2"},
+                        }
+                    }
+                },
+            ),
+            httpx.Response(400, json={"errors": [{"message": "Bad request"}]}),
+        ]
+
+        client = LinearClient("lin_api_test")
+
+        assert client.get_issues(team_id="team_1", limit=None) is None
+
+    @patch("adw.integrations.linear.http_client.request")
+    def test_handles_graphql_errors(self, mock_request: MagicMock) -> None:
         """Test handling GraphQL errors in response."""
         response_data = {
             "errors": [
                 {"message": "Authentication required"}
             ]
         }
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(response_data).encode()
-        mock_response.headers = {}
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        mock_response = httpx.Response(200, json=response_data)
+        mock_request.return_value = mock_response
 
         client = LinearClient("invalid_key")
         viewer = client.get_viewer()
 
         assert viewer is None
 
-    @patch("urllib.request.urlopen")
-    def test_handles_http_error(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.linear.http_client.request")
+    def test_handles_http_error(self, mock_request: MagicMock) -> None:
         """Test handling HTTP errors."""
-        import urllib.error
-
-        mock_urlopen.side_effect = urllib.error.HTTPError(
-            "https://api.linear.app/graphql",
-            401,
-            "Unauthorized",
-            {},
-            None,
-        )
+        mock_request.return_value = httpx.Response(401, json={"errors": [{"message": "Unauthorized"}]})
 
         client = LinearClient("invalid_key")
         viewer = client.get_viewer()
 
         assert viewer is None
 
+    @patch("adw.integrations.linear.http_client.request")
+    def test_handles_transport_error(self, mock_request: MagicMock) -> None:
+        """Test handling requests that never got a response."""
+        mock_request.side_effect = httpx.ConnectError("Connection refused")
+
+        client = LinearClient("test_key")
+
+        assert client.get_viewer() is None
+
+    @patch("adw.integrations.linear.http_client.get_http_client")
+    @patch("adw.integrations.linear.http_client.request")
+    def test_low_rate_limit_blocks_limiter(self, mock_request: MagicMock, mock_get_client: MagicMock) -> None:
+        """Test that nearly exhausted rate limits hold back further requests."""
+        reset_ms = int((time.time() + 30) * 1000)
+        mock_request.return_value = httpx.Response(
+            200,
+            json={"data": {"viewer": {"id": "user-1"}}},
+            headers={"X-RateLimit-Requests-Remaining": "3", "X-RateLimit-Requests-Reset": str(reset_ms)},
+        )
+
+        LinearClient("test_key").get_viewer()
+
+        seconds = mock_get_client.return_value.limiter.return_value.block.call_args[0][0]
+        assert 25 < seconds <= 30
+
 
 # =============================================================================
 # LinearWatcher Tests
@@ -761,7 +851,7 @@ class TestLinearWatcher:
     @patch.object(LinearClient, "get_issues")
     @patch.object(LinearWatcher, "_ensure_team_id")
     def test_get_pending_issues(
-        self, mock_ensure_team: MagicMock, mock_get_issues: MagicMock
+        self, mock_ensure_team: MagicMock, mock_get_issues: MagicMock, tmp_path: Path
     ) -> None:
         """Test fetching pending issues."""
         mock_ensure_team.return_value = "team_123"
@@ -786,7 +876,7 @@ class TestLinearWatcher:
         ]
 
         config = LinearConfig(api_key="lin_api_test", team_id="team_123")
-        watcher = LinearWatcher(config)
+        watcher = LinearWatcher(config, state_file=tmp_path / "linear_state.json")
 
         issues = watcher.get_pending_issues()
 
@@ -797,7 +887,7 @@ class TestLinearWatcher:
     @patch.object(LinearClient, "get_issues")
     @patch.object(LinearWatcher, "_ensure_team_id")
     def test_get_pending_issues_skips_processed(
-        self, mock_ensure_team: MagicMock, mock_get_issues: MagicMock
+        self, mock_ensure_team: MagicMock, mock_get_issues: MagicMock, tmp_path: Path
     ) -> None:
         """Test that already processed issues are skipped."""
         mock_ensure_team.return_value = "team_123"
@@ -813,7 +903,7 @@ class TestLinearWatcher:
         ]
 
         config = LinearConfig(api_key="lin_api_test", team_id="team_123")
-        watcher = LinearWatcher(config)
+        watcher = LinearWatcher(config, state_file=tmp_path / "linear_state.json")
 
         # Mark as processed
         watcher._processed_ids.add("issue_1")
@@ -822,19 +912,16 @@ class TestLinearWatcher:
 
         assert len(issues) == 0
 
-    @patch.object(LinearClient, "add_comment")
-    @patch.object(LinearClient, "update_issue")
+    @patch.object(LinearClient, "mutate")
     @patch.object(LinearClient, "find_state_id")
     def test_mark_issue_started(
         self,
         mock_find_state: MagicMock,
-        mock_update: MagicMock,
-        mock_comment: MagicMock,
+        mock_mutate: MagicMock,
     ) -> None:
         """Test marking an issue as started."""
         mock_find_state.return_value = "state_progress"
-        mock_update.return_value = True
-        mock_comment.return_value = True
+        mock_mutate.return_value = [True, True]
 
         config = LinearConfig(api_key="lin_api_test", team_id="team_123")
         watcher = LinearWatcher(config)
@@ -850,22 +937,23 @@ class TestLinearWatcher:
 
         assert success is True
         assert "issue_1" in watcher._processed_ids
-        mock_update.assert_called_once()
-        mock_comment.assert_called_once()
-
-    @patch.object(LinearClient, "add_comment")
-    @patch.object(LinearClient, "update_issue")
+        # Update and comment are sent in one request
+        mock_mutate.assert_called_once()
+        update, comment = mock_mutate.call_args[0][0]
+        assert update.input["stateId"] == "state_progress"
+        assert "ADW: abc12345" in update.input["description"]
+        assert comment.name == "commentCreate"
+
+    @patch.object(LinearClient, "mutate")
     @patch.object(LinearClient, "find_state_id")
     def test_mark_issue_completed(
         self,
         mock_find_state: MagicMock,
-        mock_update: MagicMock,
-        mock_comment: MagicMock,
+        mock_mutate: MagicMock,
     ) -> None:
         """Test marking an issue as completed."""
         mock_find_state.return_value = "state_done"
-        mock_update.return_value = True
-        mock_comment.return_value = True
+        mock_mutate.return_value = [True, True]
 
         config = LinearConfig(api_key="lin_api_test", team_id="team_123")
         watcher = LinearWatcher(config)
@@ -881,21 +969,18 @@ class TestLinearWatcher:
 
         assert success is True
         mock_find_state.assert_called()
-        mock_update.assert_called()
+        mock_mutate.assert_called_once()
 
-    @patch.object(LinearClient, "add_comment")
-    @patch.object(LinearClient, "update_issue")
+    @patch.object(LinearClient, "mutate")
     @patch.object(LinearClient, "find_state_id")
     def test_mark_issue_failed(
         self,
         mock_find_state: MagicMock,
-        mock_update: MagicMock,
-        mock_comment: MagicMock,
+        mock_mutate: MagicMock,
     ) -> None:
         """Test marking an issue as failed."""
         mock_find_state.return_value = "state_canceled"
-        mock_update.return_value = True
-        mock_comment.return_value = True
+        mock_mutate.return_value = [True, True]
 
         config = LinearConfig(api_key="lin_api_test", team_id="team_123")
         watcher = LinearWatcher(config)
@@ -911,9 +996,79 @@ class TestLinearWatcher:
 
         assert success is True
         # Should include error in comment
-        mock_comment.assert_called_once()
-        call_args = mock_comment.call_args
-        assert "Test error message" in call_args[0][1]
+        _, comment = mock_mutate.call_args[0][0]
+        assert "Test error message" in comment.input["body"]
+
+    @patch.object(LinearClient, "mutate", return_value=[True])
+    @patch.object(LinearClient, "find_state_id", return_value="state_1")
+    @patch.object(LinearClient, "get_issues")
+    def test_incremental_sync_cursor(
+        self, mock_get_issues: MagicMock, mock_find: MagicMock, mock_mutate: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test that polls fetch only issues updated since the persisted cursor."""
+        state_file = tmp_path / "linear_state.json"
+        mock_get_issues.return_value = [
+            {"id": "issue_1", "identifier": "T-1", "title": "Old", "updatedAt": "2024-01-01T10:00:00.000Z"},
+            {"id": "issue_2", "identifier": "T-2", "title": "New", "updatedAt": "2024-01-02T10:00:00.000Z"},
+        ]
+        config = LinearConfig(api_key="lin_api_test", team_id="team_123")
+
+        # First poll is a full sync
+        watcher = LinearWatcher(config, state_file=state_file)
+        for issue in watcher.get_pending_issues():
+            watcher.mark_issue_started(issue, "abc12345")
+        assert mock_get_issues.call_args.kwargs["updated_after"] is None
+
+        # A restarted watcher resumes from the latest claimed updatedAt
+        mock_get_issues.return_value = []
+        LinearWatcher(config, state_file=state_file).get_pending_issues()
+        assert mock_get_issues.call_args.kwargs["updated_after"] == "2024-01-02T10:00:00+00:00"
+
+    @patch.object(LinearClient, "mutate", side_effect=[[False], [True]])
+    @patch.object(LinearClient, "find_state_id", return_value="state_1")
+    @patch.object(LinearClient, "get_issues")
+    def test_cursor_stops_before_unclaimed_issue(
+        self, mock_get_issues: MagicMock, mock_find: MagicMock, mock_mutate: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test that an issue whose claim failed is fetched again."""
+        state_file = tmp_path / "linear_state.json"
+        mock_get_issues.return_value = [
+            {"id": "issue_0", "identifier": "T-0", "title": "Seen", "updatedAt": "2024-01-01T09:00:00.000Z",
+             "description": "ADW: deadbeef"},
+            {"id": "issue_1", "identifier": "T-1", "title": "Old", "updatedAt": "2024-01-01T10:00:00.000Z"},
+            {"id": "issue_2", "identifier": "T-2", "title": "New", "updatedAt": "2024-01-02T10:00:00.000Z"},
+        ]
+        config = LinearConfig(api_key="lin_api_test", team_id="team_123")
+
+        watcher = LinearWatcher(config, state_file=state_file)
+        first, second = watcher.get_pending_issues()
+        assert not watcher.mark_issue_started(first, "abc12345")
+        assert watcher.mark_issue_started(second, "abc12345")
+
+        mock_get_issues.return_value = []
+        LinearWatcher(config, state_file=state_file).get_pending_issues()
+        assert mock_get_issues.call_args.kwargs["updated_after"] == "2024-01-01T09:00:00+00:00"
+
+    @patch.object(LinearClient, "get_issues", return_value=None)
+    def test_failed_fetch_keeps_state(self, mock_get_issues: MagicMock, tmp_path: Path) -> None:
+        """Test that an incomplete fetch neither moves the cursor nor counts as a full sync."""
+        state_file = tmp_path / "linear_state.json"
+        watcher = LinearWatcher(LinearConfig(api_key="lin_api_test", team_id="team_123"), state_file=state_file)
+
+        assert watcher.get_pending_issues() == []
+        assert not state_file.exists()
+
+    @patch.object(LinearClient, "get_issues")
+    def test_dry_run_keeps_cursor(self, mock_get_issues: MagicMock, tmp_path: Path) -> None:
+        """Test that polls not advancing the cursor leave no state behind."""
+        state_file = tmp_path / "linear_state.json"
+        mock_get_issues.return_value = [
+            {"id": "issue_1", "identifier": "T-1", "title": "New", "updatedAt": "2024-01-02T10:00:00.000Z"},
+        ]
+        watcher = LinearWatcher(LinearConfig(api_key="lin_api_test", team_id="team_123"), state_file=state_file)
+
+        assert len(watcher.get_pending_issues(advance_cursor=False)) == 1
+        assert not state_file.exists()
 
 
 # =============================================================================
@@ -0,0 +1,101 @@
+"""Tests for the compiled pattern table matcher."""
+
+from __future__ import annotations
+
+import re
+
+from adw.recovery.classifier import ErrorClass, classify_error
+from adw.utils.matcher import MEMO_MAX_CHARS, PatternTable, fold_pattern
+
+
+class TestFoldPattern:
+    """Tests for fold_pattern."""
+
+    def test_lowercases_literals(self) -> None:
+        """Test that literal characters are lowercased."""
+        assert fold_pattern(r"ECONNREFUSED|FAILED") == "econnrefused|failed"
+
+    def test_keeps_escapes(self) -> None:
+        """Test that escape sequences keep their case."""
+        assert fold_pattern(r"\S+\W\D\BName") == r"\S+\W\D\Bname"
+
+    def test_equivalent_to_ignorecase(self) -> None:
+        """Test folded patterns match lowercased text like IGNORECASE does."""
+        pattern = r"(TypeError|ValueError)\s*:\s*\S+"
+        for text in ["TypeError: Bad", "valueerror :X", "no error here"]:
+            expected = re.search(pattern, text, re.IGNORECASE) is not None
+            assert (re.search(fold_pattern(pattern), text.lower()) is not None) == expected
+
+
+class TestPatternTable:
+    """Tests for PatternTable."""
+
+    def test_scan_reports_all_matches(self) -> None:
+        """Test that every matching entry is reported with its value."""
+        table = PatternTable([(r"\breact\b", 0.9), (r"\bcss\b", 0.8), (r"\bvue\b", 0.9)])
+
+        matches = table.scan("Style the React button with CSS")
+
+        assert [(m.index, m.value, m.text) for m in matches] == [(0, 0.9, "react"), (1, 0.8, "css")]
+
+    def test_first_and_search(self) -> None:
+        """Test first match in table order and the boolean check."""
+        table = PatternTable([(r"\.tsx$", "frontend"), (r"api/", "backend")])
+
+        match = table.first("src/api/Button.TSX")
+        assert match is not None
+        assert match.value == "frontend"
+        assert not table.search("README.md")
+
+    def test_anchored(self) -> None:
+        """Test anchored tables behave like re.match."""
+        table = PatternTable([(r"lgtm\s*$", None)], anchored=True)
+
+        assert table.search("LGTM")
+        assert not table.search("not lgtm")
+
+    def test_case_sensitive(self) -> None:
+        """Test tables that keep case."""
+        table = PatternTable([("API", None)], ignore_case=False)
+
+        assert table.search("REST API")
+        assert not table.search("rest api")
+
+    def test_memoizes_repeated_inputs(self) -> None:
+        """Test that repeated inputs are served from the memo."""
+        table = PatternTable([(r"timeout", None)])
+
+        table.scan("request timeout")
+        table.scan("request timeout")
+
+        info = table._memo_scan.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+
+    def test_long_inputs_not_memoized(self) -> None:
+        """Test that whole logs are scanned without being cached."""
+        table = PatternTable([(r"assertionerror", None)])
+        log = "x" * MEMO_MAX_CHARS + "\nAssertionError"
+
+        assert table.search(log)
+        assert table.scan(log)
+        assert table._memo_scan.cache_info().currsize == 0
+
+
+class TestClassifierTable:
+    """Tests for classify_error on the compiled table."""
+
+    def test_fatal_wins_confidence_tie(self) -> None:
+        """Test that fatal patterns win ties, as when tables were checked in order."""
+        # "permission denied" (fatal, 0.9) and "network error" (retriable, 0.9)
+        result = classify_error("Permission denied: network error")
+
+        assert result.error_class == ErrorClass.FATAL
+
+    def test_large_log(self) -> None:
+        """Test classifying a long test log."""
+        log = "PASSED tests/test_x.py::test_a\n" * 5000 + "E   AssertionError: expected 1 but got 2\n"
+
+        result = classify_error(log)
+
+        assert result.error_class == ErrorClass.FIXABLE
@@ -11,18 +11,21 @@ Tests cover:
 
 from __future__ import annotations
 
-import json
 import os
 import tempfile
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import httpx
+import pytest
+
 from adw.integrations.notion import (
     ADW_TO_NOTION_STATUS,
     NOTION_TO_ADW_STATUS,
     NotionClient,
     NotionConfig,
+    NotionQueryError,
     NotionTask,
     NotionWatcher,
     _extract_text_from_property,
@@ -31,6 +34,7 @@ from adw.integrations.notion import (
     build_status_property,
     parse_notion_page,
 )
+from adw.integrations.notion import test_notion_connection as check_notion_connection
 
 # =============================================================================
 # Status Mapping Tests
@@ -613,23 +617,21 @@ class TestNotionClient:
         assert client.BASE_URL == "https://api.notion.com/v1"
         assert client.API_VERSION == "2022-06-28"
 
-    @patch("urllib.request.urlopen")
-    def test_query_database_success(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.notion.http_client.request")
+    def test_query_database_success(self, mock_request: MagicMock) -> None:
         """Test successful database query."""
         # Mock response
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(
-            {
+        mock_response = httpx.Response(
+            200,
+            json={
                 "results": [
                     {"id": "page1", "properties": {}},
                     {"id": "page2", "properties": {}},
                 ],
                 "has_more": False,
-            }
-        ).encode("utf-8")
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+            },
+        )
+        mock_request.return_value = mock_response
 
         client = NotionClient("secret_test")
         results = client.query_database("db123")
@@ -637,43 +639,101 @@ class TestNotionClient:
         assert len(results) == 2
         assert results[0]["id"] == "page1"
 
-    @patch("urllib.request.urlopen")
-    def test_query_database_with_filter(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.notion.http_client.request")
+    def test_query_database_with_filter(self, mock_request: MagicMock) -> None:
         """Test database query with filter."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(
-            {
+        mock_response = httpx.Response(
+            200,
+            json={
                 "results": [],
                 "has_more": False,
-            }
-        ).encode("utf-8")
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+            },
+        )
+        mock_request.return_value = mock_response
 
         client = NotionClient("secret_test")
         filter_obj = {"property": "Status", "status": {"equals": "To Do"}}
         client.query_database("db123", filter_obj=filter_obj)
 
         # Verify the request was made with filter in body
-        call_args = mock_urlopen.call_args
-        request = call_args[0][0]
-        body = json.loads(request.data.decode("utf-8"))
+        call_args = mock_request.call_args
+        body = call_args.kwargs["json"]
         assert "filter" in body
 
-    @patch("urllib.request.urlopen")
-    def test_update_page_success(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.notion.http_client.request")
+    def test_iter_database_follows_cursor(self, mock_request: MagicMock) -> None:
+        """Test that results are streamed page by page via start_cursor."""
+        mock_request.side_effect = [
+            httpx.Response(200, json={"results": [{"id": "page1"}], "has_more": True, "next_cursor": "cur2"}),
+            httpx.Response(200, json={"results": [{"id": "page2"}], "has_more": False, "next_cursor": None}),
+        ]
+
+        client = NotionClient("secret_test")
+        pages = client.iter_database("db123")
+
+        assert next(pages)["id"] == "page1"
+        assert mock_request.call_count == 1  # Next batch not requested yet
+        assert [p["id"] for p in pages] == ["page2"]
+        assert "start_cursor" not in mock_request.call_args_list[0].kwargs["json"]
+        assert mock_request.call_args_list[1].kwargs["json"]["start_cursor"] == "cur2"
+
+    @patch("adw.integrations.notion.http_client.request")
+    def test_iter_database_failed_page(self, mock_request: MagicMock) -> None:
+        """Test that a failed request is not mistaken for the last page."""
+        mock_request.side_effect = [
+            httpx.Response(200, json={"results": [{"id": "page1"}], "has_more": True, "next_cursor": "cur2"}),
+            httpx.Response(502, text="Bad gateway"),
+        ]
+
+        pages = NotionClient("secret_test").iter_database("db123")
+
+        assert next(pages)["id"] == "page1"
+        with pytest.raises(NotionQueryError):
+            next(pages)
+
+    @patch("adw.integrations.notion.http_client.request")
+    def test_connection_reads_one_page(self, mock_request: MagicMock) -> None:
+        """Test that the connection check requests a single page."""
+        mock_request.return_value = httpx.Response(
+            200, json={"results": [{"id": "page1"}], "has_more": True, "next_cursor": "cur2"}
+        )
+
+        assert check_notion_connection(NotionConfig(api_key="secret_test", database_id="db123"))
+        assert mock_request.call_count == 1
+        assert mock_request.call_args.kwargs["json"]["page_size"] == 1
+
+    @patch("adw.integrations.notion.http_client.request")
+    def test_connection_failure(self, mock_request: MagicMock) -> None:
+        """Test that a failed query fails the connection check."""
+        mock_request.return_value = httpx.Response(401, text="Unauthorized")
+
+        assert not check_notion_connection(NotionConfig(api_key="secret_test", database_id="db123"))
+
+    @patch("adw.integrations.notion.http_client.request")
+    def test_database_properties_cached(self, mock_request: MagicMock) -> None:
+        """Test that the database schema is fetched once."""
+        mock_request.return_value = httpx.Response(
+            200,
+            json={"properties": {"Status": {"id": "a", "type": "select"}, "Name": {"id": "title", "type": "title"}}},
+        )
+
+        client = NotionClient("secret_test")
+
+        assert client.get_database_properties("db123") == {"Status": "select", "Name": "title"}
+        client.get_database_properties("db123")
+        mock_request.assert_called_once()
+
+    @patch("adw.integrations.notion.http_client.request")
+    def test_update_page_success(self, mock_request: MagicMock) -> None:
         """Test successful page update."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(
-            {
+        mock_response = httpx.Response(
+            200,
+            json={
                 "id": "page123",
                 "properties": {"Status": {"status": {"name": "Done"}}},
-            }
-        ).encode("utf-8")
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+            },
+        )
+        mock_request.return_value = mock_response
 
         client = NotionClient("secret_test")
         result = client.update_page("page123", {"Status": {"status": {"name": "Done"}}})
@@ -740,13 +800,13 @@ api_key = "test"
 class TestIntegration:
     """Integration tests with mocked API calls."""
 
-    @patch("urllib.request.urlopen")
-    def test_get_pending_tasks(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.notion.http_client.request")
+    def test_get_pending_tasks(self, mock_request: MagicMock, tmp_path: Path) -> None:
         """Test getting pending tasks from watcher."""
         # Mock API response with tasks
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(
-            {
+        mock_response = httpx.Response(
+            200,
+            json={
                 "results": [
                     {
                         "id": "page1",
@@ -786,33 +846,29 @@ class TestIntegration:
                     },
                 ],
                 "has_more": False,
-            }
-        ).encode("utf-8")
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+            },
+        )
+        mock_request.return_value = mock_response
 
         config = NotionConfig(api_key="test", database_id="db123")
-        watcher = NotionWatcher(config)
+        watcher = NotionWatcher(config, state_file=tmp_path / "notion_state.json")
         tasks = watcher.get_pending_tasks()
 
         # Should only return task without ADW ID
         assert len(tasks) == 1
         assert tasks[0].title == "Task 1"
 
-    @patch("urllib.request.urlopen")
-    def test_mark_task_started(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.notion.http_client.request")
+    def test_mark_task_started(self, mock_request: MagicMock) -> None:
         """Test marking a task as started."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(
-            {
+        mock_response = httpx.Response(
+            200,
+            json={
                 "id": "page1",
                 "properties": {},
-            }
-        ).encode("utf-8")
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+            },
+        )
+        mock_request.return_value = mock_response
 
         config = NotionConfig(api_key="test", database_id="db123")
         watcher = NotionWatcher(config)
@@ -822,3 +878,95 @@ class TestIntegration:
 
         assert result is True
         assert task.page_id in watcher._processed_ids
+
+    @patch.object(NotionClient, "update_page", return_value={"id": "page"})
+    @patch.object(NotionClient, "iter_database")
+    @patch.object(NotionClient, "get_database_properties")
+    def test_incremental_polling(
+        self, mock_properties: MagicMock, mock_iter: MagicMock, mock_update: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test that polls query only pages edited since the persisted mark."""
+        state_file = tmp_path / "notion_state.json"
+        mock_properties.return_value = {"Status": "select"}
+        mock_iter.return_value = iter(
+            [
+                {"id": "page1", "last_edited_time": "2026-01-15T10:00:00.000Z", "properties": {}},
+                {"id": "page2", "last_edited_time": "2026-01-15T11:00:00.000Z", "properties": {}},
+            ]
+        )
+        config = NotionConfig(api_key="test", database_id="db123", filter_status=["To Do"])
+
+        # First poll is a full scan
+        watcher = NotionWatcher(config, state_file=state_file)
+        tasks = watcher.get_pending_tasks()
+        assert len(tasks) == 2
+        assert mock_iter.call_args.kwargs["filter_obj"] == {"property": "Status", "select": {"equals": "To Do"}}
+        for task in tasks:
+            watcher.mark_task_started(task, "abc12345")
+
+        # A restarted watcher resumes from the latest claimed edit
+        mock_iter.return_value = iter([])
+        NotionWatcher(config, state_file=state_file).get_pending_tasks()
+        filter_obj = mock_iter.call_args.kwargs["filter_obj"]
+        assert filter_obj["and"][1] == {
+            "timestamp": "last_edited_time",
+            "last_edited_time": {"on_or_after": "2026-01-15T11:00:00+00:00"},
+        }
+
+    @patch.object(NotionClient, "iter_database")
+    @patch.object(NotionClient, "get_database_properties")
+    def test_dry_run_keeps_mark(self, mock_properties: MagicMock, mock_iter: MagicMock, tmp_path: Path) -> None:
+        """Test that polls not advancing the mark leave no state behind."""
+        state_file = tmp_path / "notion_state.json"
+        mock_properties.return_value = {}
+        mock_iter.return_value = iter(
+            [{"id": "page1", "last_edited_time": "2026-01-15T10:00:00.000Z", "properties": {}}]
+        )
+        watcher = NotionWatcher(NotionConfig(api_key="test", database_id="db123"), state_file=state_file)
+
+        assert len(watcher.get_pending_tasks(advance_mark=False)) == 1
+        assert not state_file.exists()
+
+    @patch.object(NotionClient, "update_page", side_effect=[None, {"id": "page2"}])
+    @patch.object(NotionClient, "iter_database")
+    @patch.object(NotionClient, "get_database_properties")
+    def test_mark_stops_before_unclaimed_task(
+        self, mock_properties: MagicMock, mock_iter: MagicMock, mock_update: MagicMock, tmp_path: Path
+    ) -> None:
+        """Test that a task whose claim failed is queried again."""
+        state_file = tmp_path / "notion_state.json"
+        mock_properties.return_value = {}
+        mock_iter.return_value = iter(
+            [
+                {"id": "page1", "last_edited_time": "2026-01-15T10:00:00.000Z", "properties": {}},
+                {"id": "page2", "last_edited_time": "2026-01-15T11:00:00.000Z", "properties": {}},
+            ]
+        )
+        config = NotionConfig(api_key="test", database_id="db123", filter_status=[])
+
+        watcher = NotionWatcher(config, state_file=state_file)
+        first, second = watcher.get_pending_tasks()
+        assert not watcher.mark_task_started(first, "abc12345")
+        assert watcher.mark_task_started(second, "abc12345")
+
+        # No page precedes the unclaimed one, so the next poll has no mark to query from
+        mock_iter.return_value = iter([])
+        NotionWatcher(config, state_file=state_file).get_pending_tasks()
+        assert mock_iter.call_args.kwargs["filter_obj"] is None
+
+    @patch.object(NotionClient, "iter_database")
+    @patch.object(NotionClient, "get_database_properties")
+    def test_failed_query_keeps_mark(self, mock_properties: MagicMock, mock_iter: MagicMock, tmp_path: Path) -> None:
+        """Test that a cut-short query neither moves the mark nor counts as a full scan."""
+
+        def pages():  # type: ignore[no-untyped-def]
+            yield {"id": "page1", "last_edited_time": "2026-01-15T10:00:00.000Z", "properties": {}}
+            raise NotionQueryError("Query of database db123 failed")
+
+        state_file = tmp_path / "notion_state.json"
+        mock_properties.return_value = {}
+        mock_iter.return_value = pages()
+        watcher = NotionWatcher(NotionConfig(api_key="test", database_id="db123"), state_file=state_file)
+
+        assert watcher.get_pending_tasks() == []
+        assert not state_file.exists()
@@ -36,6 +36,12 @@ from adw.agent.worktree import (
 )
 
 
+@pytest.fixture(autouse=True)
+def isolated_port_leases(tmp_path, monkeypatch):
+    """Keep port leases out of the repository's .adw directory."""
+    monkeypatch.setattr("adw.agent.ports.DEFAULT_LEASE_DB", tmp_path / "ports.db")
+
+
 # ============================================================================
 # WORKTREE MANAGEMENT TESTS
 # ============================================================================
@@ -177,8 +183,8 @@ def test_deterministic_port_allocation():
 
     assert ports1 == ports2
     assert len(ports1) == 2
-    assert 9100 <= ports1[0] <= 9114  # Backend port range
-    assert 9200 <= ports1[1] <= 9214  # Frontend port range
+    assert 9100 <= ports1[0] <= 9199  # Backend port range
+    assert 9200 <= ports1[1] <= 9299  # Frontend port range
 
 
 def test_different_ids_get_different_ports():
@@ -190,7 +196,7 @@ def test_different_ids_get_different_ports():
     ports2 = get_ports_for_adw(adw_id2)
 
     # Different IDs should get different ports (usually)
-    # Note: With only 15 slots, collisions are possible but unlikely for different IDs
+    # Note: Preferred ports can collide; leases resolve that at allocation time
     assert isinstance(ports1, tuple)
     assert isinstance(ports2, tuple)
 
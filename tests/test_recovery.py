@@ -6,6 +6,7 @@ Tests error classification, recovery strategies, and checkpoint system.
 from __future__ import annotations
 
 import json
+import subprocess
 import tempfile
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -43,7 +44,9 @@ from adw.recovery.checkpoints import (
     clear_checkpoints,
     clear_old_checkpoints,
     create_wip_commit,
+    rollback_to_checkpoint,
 )
+from adw.recovery.snapshots import list_snapshots
 
 
 # =============================================================================
@@ -763,3 +766,96 @@ class TestWIPCommit:
 
         result = create_wip_commit("test123", "No changes")
         assert result is None
+
+
+class TestCheckpointManifest:
+    """Tests for the checkpoint manifest."""
+
+    @pytest.fixture
+    def temp_agents_dir(self, tmp_path: Path, monkeypatch):
+        """Create temporary agents directory."""
+        agents_dir = tmp_path / "agents"
+        agents_dir.mkdir()
+        monkeypatch.chdir(tmp_path)
+        return agents_dir
+
+    def test_listing_reads_manifest_only(self, temp_agents_dir: Path):
+        """Listing without state should not parse checkpoint files."""
+        save_checkpoint("test123", "plan", "Step 1", {"big": "state"})
+        save_checkpoint("test123", "implement", "Step 2", {})
+
+        with patch("adw.recovery.checkpoints.load_checkpoint") as mock_load:
+            checkpoints = list_checkpoints("test123", include_state=False)
+
+        mock_load.assert_not_called()
+        assert [c.phase for c in checkpoints] == ["implement", "plan"]
+        assert checkpoints[1].state_snapshot == {}
+
+    def test_manifest_catches_up_with_files(self, temp_agents_dir: Path):
+        """Files added or removed behind the manifest's back should be picked up."""
+        saved = save_checkpoint("test123", "plan", "Step 1", {})
+        extra = Checkpoint("20200101T000000000000", "test123", "old", "Step 0", "2020-01-01T00:00:00", True, {})
+        checkpoints_dir = temp_agents_dir / "test123" / "checkpoints"
+        (checkpoints_dir / f"{extra.checkpoint_id}.json").write_text(extra.to_json())
+        (checkpoints_dir / f"{saved.checkpoint_id}.json").unlink()
+
+        assert [c.phase for c in list_checkpoints("test123")] == ["old"]
+        assert len((checkpoints_dir / "index.jsonl").read_text().splitlines()) == 1
+
+
+class TestSnapshots:
+    """Tests for git-object working tree snapshots."""
+
+    @pytest.fixture
+    def repo(self, tmp_path: Path, monkeypatch) -> Path:
+        """Create a git repository with one commit."""
+        monkeypatch.chdir(tmp_path)
+        for key in ("AUTHOR", "COMMITTER"):
+            monkeypatch.setenv(f"GIT_{key}_NAME", "Test")
+            monkeypatch.setenv(f"GIT_{key}_EMAIL", "test@example.com")
+        subprocess.run(["git", "init", "-q"], check=True)
+        (tmp_path / ".gitignore").write_text("agents/\n*.log\n")
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "app.py").write_text("v1\n")
+        subprocess.run(["git", "add", "-A"], check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "init"], check=True)
+        return tmp_path
+
+    def _git(self, *args: str) -> str:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout
+
+    def test_snapshot_leaves_head_and_index(self, repo: Path):
+        """Snapshots should not move HEAD, stage files or add to history."""
+        (repo / "src" / "app.py").write_text("v2\n")
+        (repo / "notes.md").write_text("new\n")
+        head = self._git("rev-parse", "HEAD")
+        status = self._git("status", "--porcelain")
+
+        checkpoint = save_checkpoint("t1", "implement", "Edit app", {}, snapshot=True)
+
+        assert checkpoint.snapshot is not None
+        assert self._git("rev-parse", "HEAD") == head
+        assert self._git("status", "--porcelain") == status
+        assert list_snapshots("t1") == {checkpoint.checkpoint_id: checkpoint.snapshot}
+        assert self._git("show", f"{checkpoint.snapshot}:notes.md") == "new\n"
+
+    def test_rollback_restores_changed_paths(self, repo: Path):
+        """Rollback should rewrite changed files and leave ignored ones."""
+        (repo / "src" / "app.py").write_text("v2\n")
+        checkpoint = save_checkpoint("t1", "implement", "Edit app", {}, snapshot=True)
+
+        (repo / "src" / "app.py").write_text("broken\n")
+        (repo / "src" / "extra.py").write_text("x\n")
+        (repo / "debug.log").write_text("keep\n")
+
+        assert rollback_to_checkpoint("t1", checkpoint.checkpoint_id) is True
+        assert (repo / "src" / "app.py").read_text() == "v2\n"
+        assert not (repo / "src" / "extra.py").exists()
+        assert (repo / "debug.log").read_text() == "keep\n"
+
+    def test_delete_removes_ref(self, repo: Path):
+        """Deleting a checkpoint should drop its snapshot ref."""
+        checkpoint = save_checkpoint("t1", "plan", "Plan", {}, snapshot=True)
+
+        assert delete_checkpoint("t1", checkpoint.checkpoint_id) is True
+        assert list_snapshots("t1") == {}
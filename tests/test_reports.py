@@ -6,6 +6,10 @@ metrics storage, and notifications.
 
 from __future__ import annotations
 
+import json
+import os
+import subprocess
+import sys
 import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -13,11 +17,13 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from adw.agent.usage import backfill_usage
+from adw.reports.commits import CommitCountCache
 from adw.reports.daily import (
     DailySummary,
-    _calculate_cost,
     _estimate_time_saved,
     _format_duration,
+    calculate_cost,
     generate_daily_summary,
     save_daily_summary,
 )
@@ -32,11 +38,13 @@ from adw.reports.notifications import (
     NotificationEvent,
     _format_discord_message,
     _format_slack_message,
+    _send_webhook,
     add_channel,
     list_channels,
     remove_channel,
     send_notification,
 )
+from adw.reports.series import HAS_NUMPY, resample, series_stats
 from adw.reports.trends import (
     TrendAnalysis,
     TrendPoint,
@@ -51,7 +59,6 @@ from adw.reports.trends import (
 from adw.reports.weekly import (
     WeeklyDigest,
     _calculate_comparison,
-    _find_best_worst_tasks,
     _get_week_bounds,
     generate_weekly_digest,
     save_weekly_digest,
@@ -138,7 +145,7 @@ class TestDailyHelpers:
 
     def test_calculate_cost(self) -> None:
         """Test cost calculation."""
-        cost = _calculate_cost(1_000_000, 500_000, "sonnet")
+        cost = calculate_cost(1_000_000, 500_000, "sonnet")
         # Sonnet: $3/M input, $15/M output
         expected = 3.0 + 7.5
         assert cost == expected
@@ -150,6 +157,69 @@ class TestDailyHelpers:
         assert hours > 4.0
 
 
+class TestCommitCounts:
+    """Tests for the cached per-day commit counts."""
+
+    def _commit(self, repo: Path, when: str) -> None:
+        env = {**os.environ, "GIT_COMMITTER_DATE": when, "GIT_AUTHOR_DATE": when}
+        subprocess.run(
+            ["git", "-c", "user.email=t@t", "-c", "user.name=t", "commit", "-q", "--allow-empty", "-m", when],
+            cwd=repo,
+            env=env,
+            check=True,
+        )
+
+    @pytest.fixture
+    def repo(self, tmp_path: Path) -> Path:
+        """Create a repository with commits on two days."""
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        (tmp_path / ".adw").mkdir()
+        self._commit(tmp_path, "2026-03-02T10:00:00")
+        self._commit(tmp_path, "2026-03-02T15:00:00")
+        self._commit(tmp_path, "2026-03-04T09:00:00")
+        return tmp_path
+
+    def test_counts_by_day(self, repo: Path) -> None:
+        """Test commits are bucketed by day within the range."""
+        cache = CommitCountCache(repo)
+
+        assert cache.counts(datetime(2026, 3, 1), datetime(2026, 3, 7)) == {"2026-03-02": 2, "2026-03-04": 1}
+        assert cache.counts(datetime(2026, 3, 3), datetime(2026, 3, 4)) == {"2026-03-04": 1}
+        assert cache.cache_path.exists()
+
+    def test_cached_range_not_rescanned(self, repo: Path) -> None:
+        """Test a cached range at the same HEAD runs no git log."""
+        cache = CommitCountCache(repo)
+        cache.counts(datetime(2026, 3, 1), datetime(2026, 3, 7))
+
+        with patch.object(CommitCountCache, "_log_days", side_effect=AssertionError("rescanned")):
+            assert CommitCountCache(repo).counts(datetime(2026, 3, 2), datetime(2026, 3, 2)) == {"2026-03-02": 2}
+
+    def test_new_commits_counted_incrementally(self, repo: Path) -> None:
+        """Test commits added after caching are counted without a full rescan."""
+        cache = CommitCountCache(repo)
+        cache.counts(datetime(2026, 3, 1), datetime(2026, 3, 7))
+        self._commit(repo, "2026-03-04T18:00:00")
+
+        calls = []
+        original = CommitCountCache._log_days
+
+        def spy(self: CommitCountCache, args: list[str]) -> object:
+            calls.append(args)
+            return original(self, args)
+
+        with patch.object(CommitCountCache, "_log_days", spy):
+            counts = cache.counts(datetime(2026, 3, 1), datetime(2026, 3, 7))
+
+        assert counts == {"2026-03-02": 2, "2026-03-04": 2}
+        assert len(calls) == 1
+        assert ".." in calls[0][0]
+
+    def test_not_a_repository(self, tmp_path: Path) -> None:
+        """Test directories outside git have no commits."""
+        assert CommitCountCache(tmp_path).counts(datetime(2026, 3, 1), datetime(2026, 3, 7)) == {}
+
+
 # =============================================================================
 # Metrics Tests
 # =============================================================================
@@ -338,6 +408,267 @@ class TestMetricsDB:
         assert stats["failed"] == 1
 
 
+class TestMetricsAggregates:
+    """Tests for hourly rollups and aggregate queries."""
+
+    @pytest.fixture
+    def temp_db(self) -> MetricsDB:
+        """Create a temporary database for testing."""
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            db_path = Path(f.name)
+        db = MetricsDB(db_path)
+        yield db
+        db.close()
+        db_path.unlink(missing_ok=True)
+
+    def _record(self, db: MetricsDB, task_id: str, start: datetime, **kwargs: object) -> None:
+        db.record_metrics(TaskMetrics(task_id=task_id, start_time=start, **kwargs))
+
+    def test_hourly_buckets(self, temp_db: MetricsDB) -> None:
+        """Test tasks roll up into hourly and daily buckets."""
+        day = datetime(2026, 3, 2)
+        self._record(temp_db, "a", day.replace(hour=9, minute=5), total_input_tokens=100)
+        self._record(temp_db, "b", day.replace(hour=9, minute=50), total_input_tokens=200, status="failed")
+        self._record(temp_db, "c", day.replace(hour=14), total_input_tokens=400)
+
+        hourly = temp_db.query_aggregates(day, day.replace(hour=23), granularity="hour")
+        assert [(r["period"], r["total_input_tokens"]) for r in hourly] == [
+            ("2026-03-02 09", 300),
+            ("2026-03-02 14", 400),
+        ]
+        assert hourly[0]["tasks_completed"] == 1
+        assert hourly[0]["tasks_failed"] == 1
+
+        daily = temp_db.query_aggregates(day, day)
+        assert len(daily) == 1
+        assert daily[0]["period"] == "2026-03-02"
+        assert daily[0]["total_input_tokens"] == 700
+
+    def test_breakdown_by_model_and_workflow(self, temp_db: MetricsDB) -> None:
+        """Test aggregates can be grouped by model and workflow."""
+        day = datetime(2026, 3, 2, 10)
+        self._record(temp_db, "a", day, model="opus", workflow="sdlc")
+        self._record(temp_db, "b", day, model="haiku", workflow="simple")
+        self._record(temp_db, "c", day, model="haiku", workflow="sdlc")
+
+        by_model = temp_db.query_aggregates(day, day, granularity=None, group_by=("model",))
+        assert {r["model"]: r["tasks_completed"] for r in by_model} == {"haiku": 2, "opus": 1}
+
+        by_workflow = temp_db.query_aggregates(day, day, granularity=None, group_by=("workflow",))
+        assert {r["workflow"]: r["tasks_completed"] for r in by_workflow} == {"sdlc": 2, "simple": 1}
+
+    def test_rerecord_replaces_contribution(self, temp_db: MetricsDB) -> None:
+        """Test re-recording a task does not double count it."""
+        day = datetime(2026, 3, 2, 10)
+        self._record(temp_db, "a", day, status="in_progress", total_duration_seconds=10)
+        self._record(temp_db, "a", day.replace(hour=11), status="completed", total_duration_seconds=60)
+
+        hourly = temp_db.query_aggregates(day, day.replace(hour=23), granularity="hour")
+        assert len(hourly) == 1
+        assert hourly[0]["period"] == "2026-03-02 11"
+        assert hourly[0]["tasks_in_progress"] == 0
+        assert hourly[0]["tasks_completed"] == 1
+        assert hourly[0]["total_duration_seconds"] == 60
+
+        daily = temp_db.get_daily_aggregate(day)
+        assert daily is not None
+        assert daily["tasks_completed"] == 1
+        assert daily["total_duration_seconds"] == 60
+
+    def test_empty_range(self, temp_db: MetricsDB) -> None:
+        """Test an empty range yields no rows."""
+        day = datetime(2026, 3, 2)
+        assert temp_db.query_aggregates(day, day, granularity=None) == []
+
+    def test_invalid_query(self, temp_db: MetricsDB) -> None:
+        """Test unsupported granularities and dimensions are rejected."""
+        day = datetime(2026, 3, 2)
+        with pytest.raises(ValueError):
+            temp_db.query_aggregates(day, day, granularity="week")
+        with pytest.raises(ValueError):
+            temp_db.query_aggregates(day, day, group_by=("status",))
+
+    def test_backfills_existing_database(self, temp_db: MetricsDB) -> None:
+        """Test databases without hourly rollups are backfilled on open."""
+        import sqlite3
+
+        day = datetime(2026, 3, 2, 10)
+        self._record(temp_db, "a", day, total_retries=2)
+        self._record(temp_db, "b", day, total_retries=1)
+        temp_db.close()
+
+        conn = sqlite3.connect(temp_db.db_path)
+        conn.execute("DROP TABLE hourly_aggregates")
+        conn.commit()
+        conn.close()
+
+        db = MetricsDB(temp_db.db_path)
+        rows = db.query_aggregates(day, day, granularity=None)
+        assert rows[0]["tasks_completed"] == 2
+        assert rows[0]["total_retries"] == 3
+
+    def test_task_extremes(self, temp_db: MetricsDB) -> None:
+        """Test finding the fastest and most retried tasks in a range."""
+        day = datetime(2026, 3, 2, 10)
+        self._record(temp_db, "fast", day, total_duration_seconds=30)
+        self._record(temp_db, "slow", day, total_duration_seconds=300, total_retries=3)
+        self._record(temp_db, "bad", day, status="failed", total_retries=1)
+
+        best, worst = temp_db.get_task_extremes(day, day)
+        assert best is not None and best["task_id"] == "fast"
+        assert worst is not None and worst["task_id"] == "slow"
+        assert temp_db.get_task_extremes(day + timedelta(days=1), day + timedelta(days=1)) == (None, None)
+
+    def test_daily_summary_prices_each_model(self, temp_db: MetricsDB) -> None:
+        """Test daily costs use each model's pricing and report breakdowns."""
+        day = datetime(2026, 3, 2)
+        self._record(temp_db, "a", day.replace(hour=9), model="opus", total_input_tokens=1_000_000, commits_generated=1)
+        self._record(temp_db, "b", day.replace(hour=10), model="haiku", total_input_tokens=1_000_000)
+
+        summary = generate_daily_summary(day, db=temp_db)
+
+        assert summary.estimated_cost == pytest.approx(15.0 + 0.25)
+        assert summary.model_breakdown["opus"]["estimated_cost"] == pytest.approx(15.0)
+        assert summary.workflow_breakdown["standard"]["tasks"] == 2
+        assert "## By Model" in summary.to_markdown()
+
+    def test_weekly_digest_from_aggregates(self, temp_db: MetricsDB) -> None:
+        """Test the weekly digest matches per-day summaries."""
+        monday = datetime(2026, 3, 2)
+        for day in range(3):
+            self._record(
+                temp_db,
+                f"w{day}",
+                monday + timedelta(days=day, hours=10),
+                status="failed" if day == 2 else "completed",
+                commits_generated=1,
+                total_output_tokens=1000,
+            )
+
+        digest = generate_weekly_digest(monday, db=temp_db, include_previous_week=False)
+
+        assert digest.tasks_completed == 2
+        assert digest.tasks_failed == 1
+        assert [s.total_tasks for s in digest.daily_summaries[:4]] == [1, 1, 1, 0]
+        assert digest.worst_task is not None
+
+
+class TestPhaseIngestion:
+    """Tests for recording agent runs as task phases."""
+
+    @pytest.fixture
+    def temp_db(self) -> MetricsDB:
+        """Create a temporary database for testing."""
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            db_path = Path(f.name)
+        db = MetricsDB(db_path)
+        yield db
+        db.close()
+        db_path.unlink(missing_ok=True)
+
+    def test_record_phase_creates_and_merges(self, temp_db: MetricsDB) -> None:
+        """Test phases build up a task's totals and aggregates."""
+        ended = datetime(2026, 3, 2, 10, 0)
+        temp_db.record_phase("t1", PhaseMetrics("planner", 60, input_tokens=100, cost_usd=0.1), "opus", ended_at=ended)
+        temp_db.record_phase("t1", PhaseMetrics("builder", 120, output_tokens=50, cost_usd=0.2), ended_at=ended)
+        temp_db.record_phase("t1", PhaseMetrics("builder", 30, output_tokens=5, success=False), ended_at=ended)
+
+        task = temp_db.get_metrics("t1")
+        assert task is not None
+        assert [p.name for p in task.phases] == ["planner", "builder"]
+        assert task.phases[1].duration_seconds == 150
+        assert task.total_duration_seconds == 210
+        assert task.total_output_tokens == 55
+        assert task.total_cost_usd == pytest.approx(0.3)
+        assert task.model == "opus"
+        assert task.status == "failed"
+        assert temp_db.get_summary_stats()["total_cost_usd"] == pytest.approx(0.3)
+
+        rows = temp_db.query_aggregates(ended, ended)
+        assert rows[0]["tasks_failed"] == 1
+        assert rows[0]["total_input_tokens"] == 100
+
+    def test_record_phase_concurrent_processes(self, temp_db: MetricsDB) -> None:
+        """Test phases recorded by concurrent processes are all kept."""
+        script = (
+            "import sys\n"
+            "from datetime import datetime\n"
+            "from adw.reports.metrics import MetricsDB, PhaseMetrics\n"
+            "db = MetricsDB(sys.argv[1])\n"
+            "for _ in range(10):\n"
+            "    db.record_phase('t1', PhaseMetrics('builder', 1, input_tokens=1), ended_at=datetime(2026, 3, 2, 10))\n"
+        )
+        workers = [subprocess.Popen([sys.executable, "-c", script, str(temp_db.db_path)]) for _ in range(4)]
+        assert [worker.wait(timeout=60) for worker in workers] == [0] * 4
+
+        task = temp_db.get_metrics("t1")
+        assert task is not None
+        assert task.total_input_tokens == 40
+        rows = temp_db.query_aggregates(datetime(2026, 3, 2, 10), datetime(2026, 3, 2, 10))
+        assert rows[0]["tasks_in_progress"] == 1
+        assert rows[0]["total_input_tokens"] == 40
+
+    def test_finish_task(self, temp_db: MetricsDB) -> None:
+        """Test a task is in progress until its workflow records how it ended."""
+        temp_db.record_phase("t1", PhaseMetrics("planner", 60, input_tokens=100))
+        assert temp_db.get_metrics("t1").status == "in_progress"
+
+        temp_db.finish_task("t1", "completed", workflow="sdlc", description="Add login")
+
+        task = temp_db.get_metrics("t1")
+        assert task is not None
+        assert (task.status, task.workflow, task.description) == ("completed", "sdlc", "Add login")
+        assert task.total_input_tokens == 100
+        assert temp_db.get_summary_stats()["completed"] == 1
+
+    def test_record_phase_only_if_missing(self, temp_db: MetricsDB) -> None:
+        """Test re-imports leave recorded phases alone."""
+        temp_db.record_phase("t1", PhaseMetrics("planner", 60, input_tokens=100))
+        temp_db.record_phase("t1", PhaseMetrics("planner", 60, input_tokens=100), only_if_missing=True)
+
+        task = temp_db.get_metrics("t1")
+        assert task is not None
+        assert task.total_input_tokens == 100
+
+    def test_backfill(self, temp_db: MetricsDB, tmp_path: Path) -> None:
+        """Test importing saved agent output."""
+        result = {
+            "type": "result",
+            "result": "ok",
+            "duration_ms": 4000,
+            "total_cost_usd": 0.05,
+            "usage": {"input_tokens": 10, "output_tokens": 20},
+        }
+        for agent in ("planner", "builder"):
+            out = tmp_path / "abc12345" / agent
+            out.mkdir(parents=True)
+            (out / "cc_raw_output.jsonl").write_text(json.dumps(result) + "\n")
+        (tmp_path / "abc12345" / "adw_state.json").write_text(
+            json.dumps(
+                {
+                    "adw_id": "abc12345",
+                    "workflow_type": "simple",
+                    "task_description": "Fix it",
+                    "current_phase": "complete",
+                }
+            )
+        )
+        (tmp_path / "abc12345" / "empty").mkdir()
+        (tmp_path / "abc12345" / "empty" / "cc_raw_output.jsonl").write_text("")
+
+        assert backfill_usage(tmp_path, db=temp_db) == 2
+        assert backfill_usage(tmp_path, db=temp_db) == 0
+
+        task = temp_db.get_metrics("abc12345")
+        assert task is not None
+        assert task.workflow == "simple"
+        assert task.description == "Fix it"
+        assert task.status == "completed"
+        assert task.total_duration_seconds == 8
+        assert task.total_output_tokens == 40
+        assert task.total_cost_usd == pytest.approx(0.1)
+
+
 # =============================================================================
 # Weekly Digest Tests
 # =============================================================================
@@ -414,20 +745,6 @@ class TestWeeklyHelpers:
         assert comparison["tasks_completed"] == 100.0  # 100% increase
         assert comparison["estimated_cost"] == 25.0  # 25% increase
 
-    def test_find_best_worst_tasks(self) -> None:
-        """Test finding best and worst tasks."""
-        metrics_list = [
-            TaskMetrics(task_id="fast", description="Fast task", status="completed", total_duration_seconds=60),
-            TaskMetrics(task_id="slow", description="Slow task", status="completed", total_duration_seconds=600),
-            TaskMetrics(task_id="failed", description="Failed task", status="failed", total_retries=5),
-        ]
-        best, worst = _find_best_worst_tasks(metrics_list)
-
-        assert best is not None
-        assert best["task_id"] == "fast"
-        assert worst is not None
-        assert worst["task_id"] == "failed"
-
 
 # =============================================================================
 # Trends Tests
@@ -455,6 +772,13 @@ class TestTrendPoint:
         assert result["date"] == "2026-02-01"
         assert result["value"] == 90.0
 
+    def test_hourly_midnight_keeps_hour(self) -> None:
+        """Test that the midnight point of an hourly series is formatted like its neighbours."""
+        points = [TrendPoint(date=date, value=1.0) for date in (datetime(2026, 2, 1, 23), datetime(2026, 2, 2))]
+        analysis = TrendAnalysis(metric_name="Tasks/Hour", period_days=1, points=points, granularity="hour")
+
+        assert [p["date"] for p in analysis.to_dict()["points"]] == ["2026-02-01 23:00", "2026-02-02 00:00"]
+
 
 class TestTrendAnalysis:
     """Tests for TrendAnalysis dataclass."""
@@ -557,6 +881,84 @@ class TestTrendHelpers:
         assert len(analysis.points) == 7
 
 
+class TestSeriesEngine:
+    """Tests for the array-backed series statistics."""
+
+    def test_rolling_mean_and_ewma(self) -> None:
+        """Test rolling windows and EWMA on a small series."""
+        stats = series_stats([1.0, 2.0, 3.0, 4.0], window=2, alpha=0.5, use_numpy=False)
+
+        assert stats.rolling_mean == [1.0, 1.5, 2.5, 3.5]
+        assert stats.ewma == [1.0, 1.5, 2.25, 3.125]
+        assert stats.slope == pytest.approx(1.0)
+        assert stats.mean == 2.5
+
+    def test_empty_series(self) -> None:
+        """Test an empty series yields zeroed statistics."""
+        stats = series_stats([])
+        assert stats.count == 0
+        assert stats.anomalies() == []
+
+    def test_seasonal_workload_not_anomalous(self) -> None:
+        """Test a weekly pattern is not flagged once seasonality is removed."""
+        values = [100.0 if day % 7 == 0 else 10.0 + day % 3 for day in range(42)]
+        slots = [day % 7 for day in range(42)]
+
+        assert series_stats(values).anomalies() != []
+        assert series_stats(values, slots=slots).anomalies() == []
+
+    def test_seasonal_spike_detected(self) -> None:
+        """Test a spike is flagged relative to its own seasonal slot."""
+        values = [100.0 if day % 7 == 0 else 10.0 + day % 3 for day in range(42)]
+        values[30] = 60.0  # Busy for a weekday that is normally quiet
+        slots = [day % 7 for day in range(42)]
+
+        assert series_stats(values, slots=slots).anomalies() == [30]
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="NumPy not installed")
+    def test_backends_agree(self) -> None:
+        """Test the NumPy and array backends compute the same statistics."""
+        values = [float((i * 37) % 101) for i in range(500)]
+        slots = [i % 24 for i in range(500)]
+
+        fast = series_stats(values, slots=slots, use_numpy=True)
+        slow = series_stats(values, slots=slots, use_numpy=False)
+
+        assert fast.slope == pytest.approx(slow.slope)
+        assert fast.std == pytest.approx(slow.std)
+        assert fast.rolling_mean == pytest.approx(slow.rolling_mean)
+        assert fast.ewma == pytest.approx(slow.ewma)
+        assert fast.scores == pytest.approx(slow.scores)
+
+    def test_resample(self) -> None:
+        """Test resampling averages equal-sized buckets."""
+        assert resample([0.0, 1.0, 2.0, 3.0], 2) == [0.5, 2.5]
+        assert resample([1.0, 2.0], 5) == [1.0, 2.0]
+
+    def test_hourly_trend_report(self) -> None:
+        """Test trend reports at hourly granularity."""
+        with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
+            db_path = Path(f.name)
+        db = MetricsDB(db_path)
+        try:
+            now = datetime.now()
+            for hour in range(6):
+                db.record_metrics(TaskMetrics(task_id=f"h{hour}", start_time=now - timedelta(hours=hour)))
+
+            report = generate_trend_report(period_days=1, db=db, granularity="hour")
+
+            assert report.tasks_per_day is not None
+            assert report.tasks_per_day.metric_name == "Tasks/Hour"
+            assert len(report.tasks_per_day.points) >= 24
+            assert sum(p.value for p in report.tasks_per_day.points) == 6
+            assert "(hourly)" in report.to_markdown()
+            with pytest.raises(ValueError):
+                generate_trend_report(period_days=1, db=db, granularity="week")
+        finally:
+            db.close()
+            db_path.unlink(missing_ok=True)
+
+
 class TestTrendReport:
     """Tests for TrendReport dataclass."""
 
@@ -756,6 +1158,10 @@ class TestNotificationFunctions:
         assert len(channels) == 2
         assert channels[0]["name"] == "ch1"
 
+    def test_send_webhook_invalid_url(self) -> None:
+        """Test that a malformed webhook URL fails the send instead of raising."""
+        assert _send_webhook("http://host:abc/x", {"text": "hi"}) is False
+
 
 # =============================================================================
 # Integration Tests
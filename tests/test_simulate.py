@@ -0,0 +1,183 @@
+"""Tests for capacity simulation."""
+
+import json
+import random
+from pathlib import Path
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from adw.agent.models import Task, TaskStatus
+from adw.cli import main
+from adw.reports.metrics import PhaseMetrics, TaskMetrics
+from adw.reports.simulate import (
+    PhaseHistory,
+    PhaseSample,
+    SimPhase,
+    SimTask,
+    plan_task,
+    simulate,
+    simulate_once,
+)
+from adw.workflows.dsl import PhaseDefinition, WorkflowDefinition
+
+
+def make_task(name: str, seconds: list[float], worktree: str = "Main", blocked: bool = False) -> SimTask:
+    """A task whose phases run one after another."""
+    phases = [
+        SimPhase(f"{name}/p{i}", "sonnet", s, depends_on=[f"{name}/p{i - 1}"] if i else [])
+        for i, s in enumerate(seconds)
+    ]
+    return SimTask(name, worktree, blocked, "test", phases)
+
+
+def fixed_history(tasks: list[SimTask], failing: tuple[str, ...] = ()) -> PhaseHistory:
+    """A history in which every phase always takes its timeout."""
+    history = PhaseHistory()
+    for task in tasks:
+        for phase in task.phases:
+            sample = PhaseSample(phase.timeout_seconds, 1000, 100, success=task.description not in failing)
+            history.add(phase.name, "sonnet", sample)
+    return history
+
+
+class TestPhaseHistory:
+    """Tests for PhaseHistory."""
+
+    def test_from_metrics(self) -> None:
+        """Runs are grouped by phase name without the task ID, and by model."""
+        tasks = [
+            TaskMetrics(task_id="aaaa1111", model="opus", phases=[PhaseMetrics("plan-aaaa1111", duration_seconds=60)]),
+            TaskMetrics(task_id="bbbb2222", model="haiku", phases=[PhaseMetrics("plan-bbbb2222", duration_seconds=20)]),
+        ]
+        history = PhaseHistory.from_metrics(tasks)
+
+        assert [s.duration_seconds for s in history.samples[("plan", "opus")]] == [60]
+        assert len(history.by_phase["plan"]) == 2
+
+    def test_draw_fallbacks(self) -> None:
+        """Other models' runs are used without their cost; unknown phases take their timeout."""
+        history = PhaseHistory()
+        history.add("plan", "opus", PhaseSample(60, 10, 10, cost_usd=1.0))
+        rng = random.Random(0)
+
+        assert history.draw(SimPhase("plan", "haiku", 900), rng).cost_usd == 0.0
+        assert history.draw(SimPhase("review", "opus", 300), rng).duration_seconds == 300
+
+
+class TestSimulation:
+    """Tests for simulate_once and simulate."""
+
+    def test_slots_and_waits(self) -> None:
+        """Four equal tasks on two slots take two rounds."""
+        tasks = [make_task(f"t{i}", [60, 40]) for i in range(4)]
+        result = simulate_once(tasks, fixed_history(tasks), concurrency=2)
+
+        assert result.makespan_seconds == 200
+        assert result.utilization == 1.0
+        assert result.mean_wait_seconds == 50
+        assert result.max_wait_seconds == 100
+        assert result.tasks_completed == 4
+        assert result.input_tokens == 8000
+
+    def test_blocked_tasks_wait_for_worktree(self) -> None:
+        """A blocked task starts only after the tasks above it finish."""
+        tasks = [make_task("a", [100]), make_task("b", [50], blocked=True), make_task("c", [10], worktree="Other")]
+        result = simulate_once(tasks, fixed_history(tasks), concurrency=4)
+
+        assert result.makespan_seconds == 150
+        assert result.max_wait_seconds == 0  # Waits count from becoming eligible
+
+    def test_failure_strands_blocked_tasks(self) -> None:
+        """Tasks blocked behind a failed task never run."""
+        tasks = [make_task("a", [100, 100]), make_task("b", [50], blocked=True)]
+        result = simulate_once(tasks, fixed_history(tasks, failing=("a",)), concurrency=2)
+
+        assert result.tasks_failed == 1
+        assert result.tasks_stranded == 1
+        assert result.makespan_seconds == 100  # The phase after the failure is not run
+
+    def test_model_override_prices_tokens(self) -> None:
+        """Running on a cheaper model lowers the estimated cost."""
+        tasks = [make_task("a", [100])]
+        history = fixed_history(tasks)
+
+        sonnet = simulate(tasks, history, 1, runs=3)
+        haiku = simulate(tasks, history, 1, model="haiku", runs=3)
+
+        assert haiku.cost_usd < sonnet.cost_usd
+        assert haiku.makespan_p90_seconds == 100
+
+    def test_dependency_declared_later(self) -> None:
+        """A phase depending on one declared after it still runs, after it."""
+        phases = [
+            SimPhase("review", "sonnet", 30, depends_on=["build"]),
+            SimPhase("deploy", "sonnet", 20, depends_on=["review"]),
+            SimPhase("build", "sonnet", 50),
+        ]
+        tasks = [SimTask("a", "Main", False, "test", phases)]
+        result = simulate_once(tasks, fixed_history(tasks), concurrency=1)
+
+        assert result.makespan_seconds == 100
+        assert result.input_tokens == 3000
+
+
+class TestPlanTask:
+    """Tests for plan_task."""
+
+    def test_adaptive_uses_task_model(self) -> None:
+        """Adaptive tasks run the phases of their complexity on the task's model."""
+        task = Task(description="Fix login", tags=["sdlc", "haiku"], status=TaskStatus.BLOCKED)
+        planned = plan_task(task)
+
+        assert planned.workflow == "sdlc"
+        assert planned.blocked
+        assert [p.name for p in planned.phases] == ["plan", "implement", "test", "review", "document"]
+        assert {p.model for p in planned.phases} == {"haiku"}
+        assert planned.phases[1].depends_on == ["plan"]
+
+    def test_dsl_dependencies(self) -> None:
+        """DSL phases keep their own models and dependencies."""
+        workflow = WorkflowDefinition(
+            name="dag",
+            phases=[
+                PhaseDefinition(name="build", prompt="Build", model="opus"),
+                PhaseDefinition(name="lint", prompt="Lint", depends_on=["build"]),
+                PhaseDefinition(name="docs", prompt="Docs", depends_on=[]),
+            ],
+        )
+        with patch("adw.workflows.dsl.get_workflow", return_value=workflow):
+            planned = plan_task(Task(description="x", tags=["dag"]), default_workflow="dag")
+
+        assert [(p.name, p.model, p.depends_on) for p in planned.phases] == [
+            ("build", "opus", []),
+            ("lint", "sonnet", ["build"]),
+            ("docs", "sonnet", []),
+        ]
+
+
+def test_simulate_command(tmp_path: Path) -> None:
+    """adw simulate reports one result per concurrency level."""
+    tasks_file = tmp_path / "tasks.md"
+    tasks_file.write_text("## Main\n[] Fix typo in readme\n[] Update docs\n[✅] Done already\n")
+
+    with patch("adw.reports.simulate.PhaseHistory.load", return_value=PhaseHistory()):
+        result = CliRunner().invoke(main, ["simulate", "-t", str(tasks_file), "-c", "1", "-c", "2", "--json"])
+
+    assert result.exit_code == 0, result.output
+    results = json.loads(result.output)
+    assert [r["concurrency"] for r in results] == [1, 2]
+    assert results[0]["makespan_seconds"] == 2 * results[1]["makespan_seconds"]
+
+
+def test_simulate_command_table(tmp_path: Path) -> None:
+    """adw simulate renders one table row per configuration."""
+    tasks_file = tmp_path / "tasks.md"
+    tasks_file.write_text("## Main\n[] Fix typo in readme\n")
+
+    with patch("adw.reports.simulate.PhaseHistory.load", return_value=PhaseHistory()):
+        result = CliRunner().invoke(main, ["simulate", "-t", str(tasks_file), "-c", "1", "-c", "2"])
+
+    assert result.exit_code == 0, result.output
+    assert "| Model" not in result.output
+    assert sum(line.lstrip("│┃ ").startswith("current") for line in result.output.splitlines()) == 2
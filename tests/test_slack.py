@@ -14,12 +14,13 @@ from __future__ import annotations
 
 import hashlib
 import hmac
-import json
 import os
 import tempfile
 import time
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
+
+import httpx
 
 from adw.integrations.slack import (
     InteractionPayload,
@@ -553,16 +554,9 @@ class TestSlackClient:
         """Test successful message posting."""
         client = SlackClient("xoxb-test")
 
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(
-            {"ok": True, "ts": "1234567890.123456"}
-        ).encode()
-        mock_response.status = 200
-        mock_response.headers = {}
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
+        mock_response = httpx.Response(200, json={"ok": True, "ts": "1234567890.123456"})
 
-        with patch("urllib.request.urlopen", return_value=mock_response):
+        with patch("adw.integrations.slack.http_client.request", return_value=mock_response):
             result = client.post_message(channel="C12345678", text="Hello")
 
         assert result is not None
@@ -572,39 +566,28 @@ class TestSlackClient:
         """Test posting message with blocks."""
         client = SlackClient("xoxb-test")
 
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps({"ok": True, "ts": "123"}).encode()
-        mock_response.status = 200
-        mock_response.headers = {}
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
+        mock_response = httpx.Response(200, json={"ok": True, "ts": "123"})
 
         blocks = [{"type": "section", "text": {"type": "mrkdwn", "text": "Test"}}]
 
-        with patch("urllib.request.urlopen", return_value=mock_response) as mock_open:
+        with patch("adw.integrations.slack.http_client.request", return_value=mock_response) as mock_request:
             result = client.post_message(
                 channel="C12345678", text="Hello", blocks=blocks
             )
 
         assert result is not None
         # Verify request included blocks
-        call_args = mock_open.call_args
-        request = call_args[0][0]
-        body = json.loads(request.data.decode())
+        call_args = mock_request.call_args
+        body = call_args.kwargs["json"]
         assert body["blocks"] == blocks
 
     def test_post_message_in_thread(self) -> None:
         """Test posting message in thread."""
         client = SlackClient("xoxb-test")
 
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps({"ok": True, "ts": "123"}).encode()
-        mock_response.status = 200
-        mock_response.headers = {}
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
+        mock_response = httpx.Response(200, json={"ok": True, "ts": "123"})
 
-        with patch("urllib.request.urlopen", return_value=mock_response) as mock_open:
+        with patch("adw.integrations.slack.http_client.request", return_value=mock_response) as mock_request:
             result = client.post_message(
                 channel="C12345678",
                 text="Thread reply",
@@ -613,30 +596,25 @@ class TestSlackClient:
 
         assert result is not None
         # Verify thread_ts was included
-        call_args = mock_open.call_args
-        request = call_args[0][0]
-        body = json.loads(request.data.decode())
+        call_args = mock_request.call_args
+        body = call_args.kwargs["json"]
         assert body["thread_ts"] == "1234567890.123456"
 
     def test_auth_test(self) -> None:
         """Test auth.test API call."""
         client = SlackClient("xoxb-test")
 
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(
-            {
+        mock_response = httpx.Response(
+            200,
+            json={
                 "ok": True,
                 "user": "testbot",
                 "team": "TestTeam",
                 "user_id": "U12345678",
-            }
-        ).encode()
-        mock_response.status = 200
-        mock_response.headers = {}
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
-
-        with patch("urllib.request.urlopen", return_value=mock_response):
+            },
+        )
+
+        with patch("adw.integrations.slack.http_client.request", return_value=mock_response):
             result = client.auth_test()
 
         assert result is not None
@@ -646,16 +624,9 @@ class TestSlackClient:
         """Test handling of Slack API errors."""
         client = SlackClient("xoxb-test")
 
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps(
-            {"ok": False, "error": "channel_not_found"}
-        ).encode()
-        mock_response.status = 200
-        mock_response.headers = {}
-        mock_response.__enter__ = MagicMock(return_value=mock_response)
-        mock_response.__exit__ = MagicMock(return_value=False)
+        mock_response = httpx.Response(200, json={"ok": False, "error": "channel_not_found"})
 
-        with patch("urllib.request.urlopen", return_value=mock_response):
+        with patch("adw.integrations.slack.http_client.request", return_value=mock_response):
             result = client.post_message(channel="C_invalid", text="Test")
 
         assert result is None
@@ -13,13 +13,14 @@ Tests cover:
 
 from __future__ import annotations
 
-import json
 import os
 import tempfile
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import httpx
+
 from adw.integrations.telegram import (
     TelegramClient,
     TelegramConfig,
@@ -530,24 +531,20 @@ class TestTelegramClient:
         """Test client initialization."""
         client = TelegramClient("123:ABC")
         assert client.bot_token == "123:ABC"
-        assert client._rate_limit_reset == 0
         assert client._last_update_id == 0
 
-    @patch("urllib.request.urlopen")
-    def test_get_me_success(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.telegram.http_client.request")
+    def test_get_me_success(self, mock_request: MagicMock) -> None:
         """Test successful getMe request."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps({
+        mock_response = httpx.Response(200, json={
             "ok": True,
             "result": {
                 "id": 123456789,
                 "username": "test_bot",
                 "first_name": "Test Bot",
             },
-        }).encode()
-        mock_response.__enter__ = lambda s: s
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        })
+        mock_request.return_value = mock_response
 
         client = TelegramClient("123:ABC")
         result = client.get_me()
@@ -556,21 +553,18 @@ class TestTelegramClient:
         assert result["id"] == 123456789
         assert result["username"] == "test_bot"
 
-    @patch("urllib.request.urlopen")
-    def test_send_message_success(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.telegram.http_client.request")
+    def test_send_message_success(self, mock_request: MagicMock) -> None:
         """Test successful message sending."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps({
+        mock_response = httpx.Response(200, json={
             "ok": True,
             "result": {
                 "message_id": 100,
                 "chat": {"id": 999},
                 "text": "Hello",
             },
-        }).encode()
-        mock_response.__enter__ = lambda s: s
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        })
+        mock_request.return_value = mock_response
 
         client = TelegramClient("123:ABC")
         result = client.send_message(999, "Hello")
@@ -578,17 +572,14 @@ class TestTelegramClient:
         assert result is not None
         assert result["message_id"] == 100
 
-    @patch("urllib.request.urlopen")
-    def test_send_message_with_keyboard(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.telegram.http_client.request")
+    def test_send_message_with_keyboard(self, mock_request: MagicMock) -> None:
         """Test message sending with inline keyboard."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps({
+        mock_response = httpx.Response(200, json={
             "ok": True,
             "result": {"message_id": 101},
-        }).encode()
-        mock_response.__enter__ = lambda s: s
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        })
+        mock_request.return_value = mock_response
 
         client = TelegramClient("123:ABC")
         keyboard = make_approve_reject_keyboard("abc123")
@@ -596,17 +587,14 @@ class TestTelegramClient:
 
         assert result is not None
 
-    @patch("urllib.request.urlopen")
-    def test_edit_message_text(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.telegram.http_client.request")
+    def test_edit_message_text(self, mock_request: MagicMock) -> None:
         """Test message editing."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps({
+        mock_response = httpx.Response(200, json={
             "ok": True,
             "result": {"message_id": 100, "text": "Updated"},
-        }).encode()
-        mock_response.__enter__ = lambda s: s
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        })
+        mock_request.return_value = mock_response
 
         client = TelegramClient("123:ABC")
         result = client.edit_message_text(999, 100, "Updated")
@@ -614,37 +602,31 @@ class TestTelegramClient:
         assert result is not None
         assert result["text"] == "Updated"
 
-    @patch("urllib.request.urlopen")
-    def test_answer_callback_query(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.telegram.http_client.request")
+    def test_answer_callback_query(self, mock_request: MagicMock) -> None:
         """Test callback query answering."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps({
+        mock_response = httpx.Response(200, json={
             "ok": True,
             "result": True,
-        }).encode()
-        mock_response.__enter__ = lambda s: s
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        })
+        mock_request.return_value = mock_response
 
         client = TelegramClient("123:ABC")
         result = client.answer_callback_query("query123", "Done!")
 
         assert result is True
 
-    @patch("urllib.request.urlopen")
-    def test_get_updates(self, mock_urlopen: MagicMock) -> None:
+    @patch("adw.integrations.telegram.http_client.request")
+    def test_get_updates(self, mock_request: MagicMock) -> None:
         """Test getting updates."""
-        mock_response = MagicMock()
-        mock_response.read.return_value = json.dumps({
+        mock_response = httpx.Response(200, json={
             "ok": True,
             "result": [
                 {"update_id": 1, "message": {"text": "/help"}},
                 {"update_id": 2, "message": {"text": "/task test"}},
             ],
-        }).encode()
-        mock_response.__enter__ = lambda s: s
-        mock_response.__exit__ = MagicMock(return_value=False)
-        mock_urlopen.return_value = mock_response
+        })
+        mock_request.return_value = mock_response
 
         client = TelegramClient("123:ABC")
         updates = client.get_updates()
@@ -0,0 +1,131 @@
+"""Tests for the test result cache."""
+
+import os
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from adw.testing import FailedTest, TestFramework, TestResult, ValidationConfig
+from adw.testing.cache import TestResultCache, clear_test_result_cache, run_cached
+from adw.testing.validation import validate_tests
+
+
+def git(path: Path, *args: str) -> None:
+    """Run a git command in a test repository."""
+    subprocess.run(["git", *args], cwd=path, capture_output=True, check=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_memo():
+    """Start every test with an empty in-process cache."""
+    clear_test_result_cache()
+    yield
+    clear_test_result_cache()
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """A committed repository inside an initialized project."""
+    root = tmp_path / "project"
+    (root / ".adw").mkdir(parents=True)
+    (root / ".gitignore").write_text(".adw/\n")
+    (root / "app.py").write_text("VALUE = 1\n")
+    git(root, "init", "-q")
+    git(root, "config", "user.email", "test@example.com")
+    git(root, "config", "user.name", "Test")
+    git(root, "add", "-A")
+    git(root, "commit", "-q", "-m", "initial")
+    return root
+
+
+def passing(command: str = "pytest") -> TestResult:
+    """A passing result."""
+    return TestResult(passed=3, total=3, command=command, framework=TestFramework.PYTEST)
+
+
+class TestTestResultCache:
+    """Tests for TestResultCache."""
+
+    def test_round_trip(self, repo: Path) -> None:
+        """Stored results come back intact, marked as cached."""
+        cache = TestResultCache(repo)
+        key = cache.key(repo, "pytest")
+        result = passing()
+        result.failed_tests.append(FailedTest(name="test_x", error_message="flaky", line_number=3))
+
+        cache.put(key, result)
+        clear_test_result_cache()  # Read it back from disk
+        cached = cache.get(key)
+
+        assert cached.cached
+        assert cached.failed_tests[0].line_number == 3
+        assert cached.framework == TestFramework.PYTEST
+        assert "(cached)" in cached.summary()
+
+    def test_key_follows_tree_command_and_env(self, repo: Path) -> None:
+        """Any change to the tree, including untracked files, changes the key."""
+        cache = TestResultCache(repo)
+        key = cache.key(repo, "pytest")
+
+        assert cache.key(repo, "pytest") == key
+        assert cache.key(repo, "pytest -x") != key
+        assert cache.key(repo, "pytest", env={"CI": "1"}) != key
+
+        (repo / "new.py").write_text("x = 1\n")
+        assert cache.key(repo, "pytest") != key
+
+    def test_failures_not_cached(self, repo: Path) -> None:
+        """Failing or incomplete runs are run again."""
+        cache = TestResultCache(repo)
+        key = cache.key(repo, "pytest")
+
+        cache.put(key, TestResult(failed=1, total=1, exit_code=1))
+        cache.put(key, TestResult(passed=1, total=1, error_message="Stopped on error"))
+        assert cache.get(key) is None
+
+    def test_lru_eviction(self, repo: Path) -> None:
+        """The least recently used entries go first."""
+        cache = TestResultCache(repo, max_entries=2)
+        for i, key in enumerate(["a", "b"]):
+            cache.put(key, passing())
+            os.utime(cache.cache_dir / f"{key}.json", (1000 + i, 1000 + i))
+        cache.get("a")  # Now more recent than b
+
+        cache.put("c", passing())
+
+        assert sorted(p.stem for p in cache.cache_dir.glob("*.json")) == ["a", "c"]
+
+    def test_not_a_repository(self, tmp_path: Path) -> None:
+        """Without git there is no key, and tests always run."""
+        calls = []
+
+        def run() -> TestResult:
+            calls.append(1)
+            return passing()
+
+        for _ in range(2):
+            run_cached(run, tmp_path, "pytest", cache=TestResultCache(tmp_path))
+        assert len(calls) == 2
+
+
+class TestCachedValidation:
+    """Tests for validate_tests with the cache."""
+
+    def test_unchanged_tree_skips_suite(self, repo: Path) -> None:
+        """A tree that already passed is not tested again."""
+        config = ValidationConfig(test_command="pytest", use_cache=True)
+
+        with (
+            patch("adw.testing.validation.TestResultCache", side_effect=lambda: TestResultCache(repo)),
+            patch("adw.testing.validation.run_tests", return_value=passing()) as run,
+        ):
+            first = validate_tests(repo, config)
+            second = validate_tests(repo, config)
+            (repo / "app.py").write_text("VALUE = 2\n")
+            third = validate_tests(repo, config)
+
+        assert first.success and second.success and third.success
+        assert second.final_test_result.cached
+        assert run.call_count == 2
@@ -0,0 +1,279 @@
+"""Tests for test impact analysis."""
+
+import subprocess
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from adw.testing import TestFramework, TestResult, ValidationConfig, select_tests
+from adw.testing.impact import (
+    ImportGraphCache,
+    clear_import_graph_cache,
+    is_test_file,
+    narrow_command,
+)
+from adw.testing.validation import validate_tests
+
+
+def git(path: Path, *args: str) -> str:
+    """Run a git command in a test repository."""
+    result = subprocess.run(["git", *args], cwd=path, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+def make_repo(path: Path, files: dict[str, str]) -> str:
+    """Create a git repository with some files committed; returns HEAD."""
+    path.mkdir(parents=True, exist_ok=True)
+    git(path, "init", "-q")
+    git(path, "config", "user.email", "test@example.com")
+    git(path, "config", "user.name", "Test")
+    for name, content in files.items():
+        (path / name).parent.mkdir(parents=True, exist_ok=True)
+        (path / name).write_text(content)
+    git(path, "add", "-A")
+    git(path, "commit", "-q", "-m", "initial")
+    return git(path, "rev-parse", "HEAD")
+
+
+@pytest.fixture(autouse=True)
+def clear_memo():
+    """Start every test with an empty in-process import cache."""
+    clear_import_graph_cache()
+    yield
+    clear_import_graph_cache()
+
+
+@pytest.fixture
+def python_repo(tmp_path: Path) -> tuple[Path, str]:
+    """A src-layout Python project with two test files."""
+    root = tmp_path / "repo"
+    base = make_repo(
+        root,
+        {
+            "pyproject.toml": "[project]\nname = 'pkg'\n",
+            "README.md": "# pkg\n",
+            "src/pkg/__init__.py": "",
+            "src/pkg/util.py": "def helper():\n    return 1\n",
+            "src/pkg/core.py": "from .util import helper\n\ndef run():\n    return helper()\n",
+            "src/pkg/extra.py": "VALUE = 2\n",
+            "tests/test_core.py": "from pkg.core import run\n",
+            "tests/test_util.py": "from pkg import util\n",
+            "tests/test_extra.py": "import pkg.extra\n",
+        },
+    )
+    return root, base
+
+
+class TestSelectTests:
+    """Tests for select_tests."""
+
+    def test_no_changes(self, python_repo) -> None:
+        """Nothing changed, nothing to run."""
+        root, base = python_repo
+        selection = select_tests(root, base)
+        assert not selection.full_run
+        assert selection.tests == []
+
+    def test_transitive_python_imports(self, python_repo) -> None:
+        """A change reaches tests through relative and absolute imports."""
+        root, base = python_repo
+        (root / "src/pkg/util.py").write_text("def helper():\n    return 2\n")
+
+        selection = select_tests(root, base)
+        assert selection.tests == ["tests/test_core.py", "tests/test_util.py"]
+
+    def test_leaf_change(self, python_repo) -> None:
+        """Only the tests importing a changed module are selected."""
+        root, base = python_repo
+        (root / "src/pkg/extra.py").write_text("VALUE = 3\n")
+
+        assert select_tests(root, base).tests == ["tests/test_extra.py"]
+
+    def test_package_init_reaches_everything(self, python_repo) -> None:
+        """Importing a module imports its package's __init__."""
+        root, base = python_repo
+        (root / "src/pkg/__init__.py").write_text("X = 1\n")
+
+        assert select_tests(root, base).tests == ["tests/test_core.py", "tests/test_extra.py", "tests/test_util.py"]
+
+    def test_committed_and_untracked_changes(self, python_repo) -> None:
+        """Commits since the base and new untracked tests both count."""
+        root, base = python_repo
+        (root / "src/pkg/extra.py").write_text("VALUE = 3\n")
+        git(root, "commit", "-qam", "change extra")
+        (root / "tests/test_new.py").write_text("def test_new():\n    pass\n")
+
+        assert select_tests(root, base).tests == ["tests/test_extra.py", "tests/test_new.py"]
+
+    def test_docs_change_selects_nothing(self, python_repo) -> None:
+        """Documentation changes affect no tests."""
+        root, base = python_repo
+        (root / "README.md").write_text("# pkg\n\nMore docs.\n")
+
+        selection = select_tests(root, base)
+        assert not selection.full_run
+        assert selection.tests == []
+
+    @pytest.mark.parametrize("name", ["pyproject.toml", "tests/conftest.py", "data/fixture.json"])
+    def test_full_run_files(self, python_repo, name: str) -> None:
+        """Configuration and unknown files force a full run."""
+        root, base = python_repo
+        (root / name).parent.mkdir(parents=True, exist_ok=True)
+        (root / name).write_text("changed\n")
+
+        selection = select_tests(root, base)
+        assert selection.full_run
+        assert name in selection.reason
+
+    def test_deleted_source_forces_full_run(self, python_repo) -> None:
+        """Importers of a deleted module cannot be traced."""
+        root, base = python_repo
+        (root / "src/pkg/extra.py").unlink()
+
+        assert select_tests(root, base).full_run
+
+    def test_not_a_repository(self, tmp_path: Path) -> None:
+        """Without git history the whole suite runs."""
+        selection = select_tests(tmp_path, "HEAD")
+        assert selection.full_run
+
+    def test_js_relative_imports(self, tmp_path: Path) -> None:
+        """Relative JS/TS imports are followed, including index files."""
+        root = tmp_path / "web"
+        base = make_repo(
+            root,
+            {
+                "src/api/index.ts": "export const url = '/api'\n",
+                "src/client.ts": "import { url } from './api'\nexport const get = () => url\n",
+                "src/client.test.ts": "import { get } from './client.js'\n",
+                "src/other.test.ts": "const lodash = require('lodash')\n",
+            },
+        )
+        (root / "src/api/index.ts").write_text("export const url = '/v2'\n")
+
+        assert select_tests(root, base).tests == ["src/client.test.ts"]
+
+    def test_go_packages(self, tmp_path: Path) -> None:
+        """Go imports within the module select the importing packages' tests."""
+        root = tmp_path / "gomod"
+        base = make_repo(
+            root,
+            {
+                "go.mod": "module example.com/m\n\ngo 1.22\n",
+                "pkg/x/x.go": "package x\n\nfunc X() int { return 1 }\n",
+                "pkg/y/y.go": 'package y\n\nimport (\n\t"fmt"\n\t"example.com/m/pkg/x"\n)\n',
+                "pkg/y/y_test.go": "package y\n",
+                "pkg/z/z_test.go": "package z\n",
+            },
+        )
+        (root / "pkg/x/x.go").write_text("package x\n\nfunc X() int { return 2 }\n")
+
+        assert select_tests(root, base).tests == ["pkg/y/y_test.go"]
+
+
+class TestImportGraphCache:
+    """Tests for ImportGraphCache."""
+
+    def test_only_changed_files_reparsed(self, python_repo) -> None:
+        """Unchanged files are not read again."""
+        root, _ = python_repo
+        (root / ".adw").mkdir()
+        ImportGraphCache(root).build()
+        assert (root / ".adw/cache/import_graph.json").exists()
+
+        clear_import_graph_cache()  # Drop the memo, keep the file
+        (root / "src/pkg/extra.py").write_text("import os\nVALUE = 30\n")
+        with patch("adw.testing.impact._parse_imports", return_value=[]) as parse:
+            ImportGraphCache(root).build()
+        assert [call.args[1] for call in parse.call_args_list] == ["src/pkg/extra.py"]
+
+
+class TestNarrowCommand:
+    """Tests for narrow_command."""
+
+    def test_pytest(self) -> None:
+        """Pytest gets the test files as arguments."""
+        assert narrow_command("pytest -q", TestFramework.PYTEST, ["tests/test_a.py"]) == "pytest -q tests/test_a.py"
+
+    def test_npm_script(self) -> None:
+        """Package scripts get the files after --."""
+        command = narrow_command("npm test", TestFramework.JEST, ["src/a.test.ts"])
+        assert command == "npm test -- src/a.test.ts"
+
+    def test_go_packages(self) -> None:
+        """Go runs the packages holding the tests."""
+        command = narrow_command("go test ./...", TestFramework.GO_TEST, ["pkg/y/y_test.go", "main_test.go"])
+        assert command == "go test . ./pkg/y"
+
+    def test_cargo_unsupported(self) -> None:
+        """Cargo cannot select test files."""
+        assert narrow_command("cargo test", TestFramework.CARGO_TEST, ["tests/a.rs"]) is None
+
+    def test_is_test_file(self) -> None:
+        """Test files are recognized across languages."""
+        assert is_test_file("tests/test_a.py")
+        assert is_test_file("src/a.spec.tsx")
+        assert is_test_file("src/__tests__/a.js")
+        assert is_test_file("pkg/a_test.go")
+        assert not is_test_file("src/pkg/core.py")
+
+
+class TestImpactValidation:
+    """Tests for validate_tests with impact analysis."""
+
+    def test_affected_then_full_suite(self, python_repo) -> None:
+        """Affected tests run first; the full suite confirms a pass."""
+        root, base = python_repo
+        (root / "src/pkg/extra.py").write_text("VALUE = 3\n")
+        commands = []
+
+        def fake_run(command, path, timeout):
+            commands.append(command)
+            return TestResult(passed=1, total=1, command=command)
+
+        with patch("adw.testing.validation.run_tests", side_effect=fake_run):
+            result = validate_tests(root, ValidationConfig(test_command="pytest", impact_base=base))
+
+        assert result.success
+        assert commands == ["pytest tests/test_extra.py", "pytest"]
+
+    def test_affected_failure_skips_full_suite(self, python_repo) -> None:
+        """A failing affected run is reported without running everything."""
+        root, base = python_repo
+        (root / "src/pkg/extra.py").write_text("VALUE = 3\n")
+        commands = []
+
+        def fake_run(command, path, timeout):
+            commands.append(command)
+            return TestResult(failed=1, total=1, exit_code=1, command=command)
+
+        with patch("adw.testing.validation.run_tests", side_effect=fake_run):
+            result = validate_tests(root, ValidationConfig(test_command="pytest", impact_base=base))
+
+        assert not result.success
+        assert result.retry_context
+        assert commands == ["pytest tests/test_extra.py"]
+
+    def test_no_affected_tests_without_full_suite(self, python_repo) -> None:
+        """With the confirming run off, an unaffected change runs nothing."""
+        root, base = python_repo
+        (root / "README.md").write_text("docs\n")
+        config = ValidationConfig(test_command="pytest", impact_base=base, full_suite_on_pass=False)
+
+        with patch("adw.testing.validation.run_tests") as run:
+            result = validate_tests(root, config)
+
+        assert result.success
+        run.assert_not_called()
+
+    def test_sharded_runs_lease_ports_for_task(self, python_repo) -> None:
+        """Sharded runs take their port leases in the task's name."""
+        root, base = python_repo
+        (root / "src/pkg/extra.py").write_text("VALUE = 3\n")
+        config = ValidationConfig(test_command="pytest", impact_base=base, shards=2, owner="abc12345")
+
+        with patch("adw.testing.validation.run_sharded_tests", return_value=TestResult(passed=1, total=1)) as run:
+            validate_tests(root, config)
+
+        assert [call.kwargs["owner"] for call in run.call_args_list] == ["abc12345", "abc12345"]
@@ -0,0 +1,216 @@
+"""Tests for sharded test execution."""
+
+import subprocess
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from adw.testing import FailedTest, TestFramework, TestResult, run_sharded_tests
+from adw.testing.runner import _parse_cargo_test_output
+from adw.testing.shards import (
+    DurationHistory,
+    balance_shards,
+    discover_units,
+    merge_results,
+    shard_command,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_port_leases():
+    """Keep shards away from the real port lease database."""
+    leased = iter(range(9100, 9200))
+    with (
+        patch("adw.testing.shards.allocate_ports", side_effect=lambda owner: {"backend": next(leased)}),
+        patch("adw.testing.shards.release_ports") as release,
+    ):
+        yield release
+
+
+@pytest.fixture(autouse=True)
+def clear_memo():
+    """Start every test without remembered durations."""
+    with patch("adw.testing.shards._memo", {}):
+        yield
+
+
+class TestBalanceShards:
+    """Tests for balance_shards."""
+
+    def test_longest_first(self) -> None:
+        """Long units are spread out before short ones fill the gaps."""
+        durations = {"a": 7.0, "b": 5.0, "c": 4.0, "d": 3.0, "e": 1.0}
+        shards = balance_shards(list(durations), 2, durations)
+
+        loads = sorted(sum(durations[u] for u in shard) for shard in shards)
+        assert loads == [10.0, 10.0]
+
+    def test_unknown_units_use_median(self) -> None:
+        """Units with no history count as a typical unit."""
+        shards = balance_shards(["a", "b", "new"], 2, {"a": 10.0, "b": 2.0})
+        assert sorted(shards) == [["a"], ["b", "new"]]
+
+    def test_fewer_units_than_shards(self) -> None:
+        """No empty shards are created."""
+        assert balance_shards(["a", "b"], 8, {}) == [["a"], ["b"]]
+
+
+class TestShardCommand:
+    """Tests for discover_units and shard_command."""
+
+    def test_cargo_targets(self, tmp_path: Path) -> None:
+        """Cargo suites split by test target."""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src/lib.rs").write_text("")
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests/api.rs").write_text("")
+
+        units = discover_units(tmp_path, TestFramework.CARGO_TEST)
+        assert units == ["--lib", "--doc", "--test api"]
+        assert shard_command("cargo test", TestFramework.CARGO_TEST, units[2:]) == "cargo test --test api"
+
+    def test_pytest_config(self, tmp_path: Path) -> None:
+        """Pytest units are limited to what pytest itself would collect."""
+        for name in ("tests/test_a.py", "tests/fixtures/test_b.py", "scripts/test_c.py", "tests/.cache/test_d.py"):
+            (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / name).write_text("")
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+
+        assert discover_units(tmp_path, TestFramework.PYTEST) == [
+            "scripts/test_c.py",
+            "tests/fixtures/test_b.py",
+            "tests/test_a.py",
+        ]
+
+        (tmp_path / "pyproject.toml").write_text(
+            '[tool.pytest.ini_options]\ntestpaths = ["tests"]\nnorecursedirs = ["fixtures"]\n'
+        )
+        assert discover_units(tmp_path, TestFramework.PYTEST) == ["tests/.cache/test_d.py", "tests/test_a.py"]
+
+        # pytest.ini takes precedence over pyproject.toml
+        (tmp_path / "pytest.ini").write_text("[pytest]\ntestpaths = scripts tests/fixtures\n")
+        assert discover_units(tmp_path, TestFramework.PYTEST) == ["scripts/test_c.py", "tests/fixtures/test_b.py"]
+
+    def test_go_packages(self) -> None:
+        """Go shards run their packages."""
+        command = shard_command("go test ./...", TestFramework.GO_TEST, ["pkg/a", "."])
+        assert command == "go test . ./pkg/a"
+
+    def test_unsupported(self) -> None:
+        """Frameworks that cannot select tests are not sharded."""
+        assert shard_command("make test", TestFramework.UNKNOWN, ["a"]) is None
+
+
+class TestDurationHistory:
+    """Tests for DurationHistory."""
+
+    def test_apportions_shard_time(self, tmp_path: Path) -> None:
+        """A shard's time is split in proportion to earlier estimates."""
+        history = DurationHistory(tmp_path)
+        history.record(TestFramework.PYTEST, [["a", "b"]], [4.0])
+        assert history.get(TestFramework.PYTEST) == {"a": 2.0, "b": 2.0}
+
+        history.record(TestFramework.PYTEST, [["a"], ["b"]], [6.0, 2.0])
+        assert history.get(TestFramework.PYTEST) == {"a": 4.0, "b": 2.0}
+
+    def test_persisted_only_when_initialized(self, tmp_path: Path) -> None:
+        """Durations are written under .adw/ for initialized projects."""
+        DurationHistory(tmp_path).record(TestFramework.PYTEST, [["a"]], [1.0])
+        assert not (tmp_path / ".adw").exists()
+
+        (tmp_path / ".adw").mkdir()
+        DurationHistory(tmp_path).record(TestFramework.PYTEST, [["a"]], [1.0])
+        assert (tmp_path / ".adw/cache/test_durations.json").exists()
+
+
+class TestMergeResults:
+    """Tests for merge_results and multi-target parsing."""
+
+    def test_merge(self) -> None:
+        """Counts add up, failures are combined, any failure fails the run."""
+        failing = TestResult(failed=1, passed=2, total=3, exit_code=1, command="pytest b")
+        failing.failed_tests.append(FailedTest(name="test_b", error_message="assert False"))
+        merged = merge_results(
+            [TestResult(passed=3, total=3, command="pytest a"), failing],
+            "pytest",
+            5.0,
+        )
+
+        assert (merged.passed, merged.failed, merged.total) == (5, 1, 6)
+        assert [t.name for t in merged.failed_tests] == ["test_b"]
+        assert merged.exit_code == 1
+        assert not merged.success
+        assert "shard 2/2: pytest b" in merged.stdout
+
+    def test_cargo_sums_targets(self) -> None:
+        """Every cargo test target's summary is counted."""
+        output = "test result: ok. 3 passed; 0 failed; 0 ignored\ntest result: FAILED. 1 passed; 1 failed; 2 ignored\n"
+        result = _parse_cargo_test_output(output, "", 101)
+        assert (result.passed, result.failed, result.skipped, result.total) == (4, 1, 2, 7)
+
+
+class TestRunShardedTests:
+    """Tests for run_sharded_tests."""
+
+    def test_runs_isolated_shards(self, tmp_path: Path, no_port_leases) -> None:
+        """Each shard runs its own files with its own temp dir and ports."""
+        runs = []
+        lock = threading.Lock()
+
+        def fake_run(command, path, timeout, env):
+            with lock:
+                runs.append((command, env))
+            return TestResult(passed=command.count(".py"), total=command.count(".py"), command=command)
+
+        units = ["tests/test_a.py", "tests/test_b.py", "tests/test_c.py"]
+        with patch("adw.testing.shards.run_tests", side_effect=fake_run):
+            result = run_sharded_tests("pytest -q", tmp_path, shards=2, units=units, owner="abc12345")
+
+        assert result.success
+        assert result.passed == 3
+        assert result.command == "pytest -q"
+        assert sorted(command for command, _ in runs) == [
+            "pytest -q tests/test_a.py tests/test_c.py",
+            "pytest -q tests/test_b.py",
+        ]
+        assert len({env["TMPDIR"] for _, env in runs}) == 2
+        assert len({env["BACKEND_PORT"] for _, env in runs}) == 2
+        assert {env["ADW_SHARD_COUNT"] for _, env in runs} == {"2"}
+        assert sorted(call.args[0] for call in no_port_leases.call_args_list) == [
+            "abc12345-shard1",
+            "abc12345-shard2",
+        ]
+
+    def test_doc_tests_run_alone(self, tmp_path: Path) -> None:
+        """Cargo's --doc never shares a shard with other targets."""
+        runs = []
+        lock = threading.Lock()
+
+        def fake_run(command, path, timeout, env):
+            with lock:
+                runs.append(command)
+            return TestResult(command=command)
+
+        units = ["--lib", "--doc", "--test api"]
+        with patch("adw.testing.shards.run_tests", side_effect=fake_run):
+            run_sharded_tests("cargo test", tmp_path, shards=1, units=units)
+
+        assert "cargo test --doc" in runs
+        assert len(runs) == 2
+        assert all("--doc" not in command for command in runs if command != "cargo test --doc")
+
+    def test_single_shard_runs_once(self, tmp_path: Path) -> None:
+        """One shard is a plain run, narrowed to the selected units."""
+        with patch("adw.testing.shards.run_tests", return_value=TestResult()) as run:
+            run_sharded_tests("pytest", tmp_path, shards=1, units=["tests/test_a.py"])
+
+        assert run.call_args.kwargs["command"] == "pytest tests/test_a.py"
+
+    def test_unsupported_framework(self, tmp_path: Path) -> None:
+        """Suites that cannot be split run as a whole."""
+        with patch("adw.testing.shards.run_tests", return_value=TestResult()) as run:
+            run_sharded_tests("make test", tmp_path, shards=4)
+
+        run.assert_called_once_with(command="make test", path=tmp_path, timeout=300, env=None)
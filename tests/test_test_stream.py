@@ -0,0 +1,176 @@
+"""Tests for streaming test execution."""
+
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from adw.testing import TestFramework, TestResult, ValidationConfig, stream_tests
+from adw.testing.stream import OutputWatcher
+from adw.testing.validation import validate_tests
+
+PYTEST = f"{sys.executable} -m pytest -p no:cacheprovider"
+
+
+def write_suite(path: Path, failing: int, slow_seconds: float = 0) -> None:
+    """Write a pytest suite with some failing tests and an optional slow one."""
+    lines = [f"def test_fail_{i}():\n    assert {i} == -1\n" for i in range(failing)]
+    lines.append("def test_ok():\n    pass\n")
+    if slow_seconds:
+        lines.append(f"def test_slow():\n    import time\n    time.sleep({slow_seconds})\n")
+    (path / "test_suite.py").write_text("\n".join(lines))
+
+
+class TestOutputWatcher:
+    """Tests for OutputWatcher."""
+
+    def test_pytest_progress_and_summary(self) -> None:
+        """Verbose progress lines count once, even when the summary repeats them."""
+        seen = []
+        watcher = OutputWatcher(TestFramework.PYTEST, on_failure=seen.append)
+        for line in [
+            "\x1b[31mtests/test_a.py::test_x FAILED\x1b[0m    [ 50%]",
+            "tests/test_a.py::test_p[1] FAILED    [ 75%]",
+            "tests/test_a.py::test_y PASSED    [100%]",
+            "FAILED tests/test_a.py::test_x - assert 1 == 2",
+            "FAILED tests/test_a.py::test_p[1] - assert 0",
+        ]:
+            watcher.feed(line)
+
+        assert [f.name for f in seen] == ["tests/test_a.py::test_x", "tests/test_a.py::test_p[1]"]
+        assert watcher.fatal_error is None
+
+    def test_cargo_compile_error(self) -> None:
+        """Compile errors are fatal; test failures are not."""
+        watcher = OutputWatcher(TestFramework.CARGO_TEST)
+        watcher.feed("test tests::adds ... FAILED")
+        watcher.feed("error: test failed, to rerun pass `--lib`")
+        assert [f.name for f in watcher.failures] == ["tests::adds"]
+        assert watcher.fatal_error is None
+
+        watcher.feed("error[E0425]: cannot find value `x` in this scope")
+        assert watcher.fatal_error.startswith("error[E0425]")
+
+    def test_go_build_failure(self) -> None:
+        """A package that does not build is fatal."""
+        watcher = OutputWatcher(TestFramework.GO_TEST)
+        watcher.feed("--- FAIL: TestAdd (0.00s)")
+        watcher.feed("FAIL\texample.com/m/pkg [build failed]")
+        assert [f.name for f in watcher.failures] == ["TestAdd"]
+        assert watcher.fatal_error
+
+
+class TestStreamTests:
+    """Tests for stream_tests against a real pytest run."""
+
+    def test_complete_run(self, tmp_path: Path) -> None:
+        """Without a limit, the run completes and is parsed as usual."""
+        write_suite(tmp_path, failing=2)
+        seen = []
+
+        result = stream_tests(f"{PYTEST} -q", tmp_path, on_failure=seen.append)
+
+        assert (result.passed, result.failed) == (1, 2)
+        assert len(seen) == 2
+        assert result.error_message is None
+
+    def test_stops_after_max_failures(self, tmp_path: Path) -> None:
+        """Pytest stops by itself and still prints its failure summary."""
+        write_suite(tmp_path, failing=2, slow_seconds=30)
+
+        start = time.time()
+        result = stream_tests(f"{PYTEST} -q", tmp_path, max_failures=2)
+
+        assert time.time() - start < 20
+        assert not result.success
+        assert result.failed == 2
+        assert "assert 0 == -1" in result.stdout
+        assert result.error_message == "Stopped after 2 failures"
+
+    def test_inline_runner_stopped_past_limit(self, tmp_path: Path) -> None:
+        """Runners that print failures inline are stopped at the next failure."""
+        script = tmp_path / "fake_go.py"
+        script.write_text(
+            "import time\n"
+            "for name in ('TestA', 'TestB'):\n"
+            "    print(f'--- FAIL: {name} (0.00s)', flush=True)\n"
+            "    print('    a_test.go:5: boom', flush=True)\n"
+            "time.sleep(30)\n"
+        )
+
+        start = time.time()
+        result = stream_tests(f"{sys.executable} {script.name} # go test", tmp_path, max_failures=1)
+
+        assert time.time() - start < 20
+        assert "a_test.go:5: boom" in result.stdout
+        assert result.error_message == "Stopped after 2 failures"
+
+    def test_stops_on_collection_error(self, tmp_path: Path) -> None:
+        """A test module that cannot be imported stops the run."""
+        (tmp_path / "test_broken.py").write_text("import does_not_exist\n")
+
+        result = stream_tests(PYTEST, tmp_path)
+
+        assert not result.success
+        assert result.errors >= 1
+        assert "collecting" in result.error_message
+        # The traceback after the header reaches the result and the retry context
+        assert "No module named" in result.stdout
+        assert "No module named" in result.error_message
+
+    def test_output_after_fatal_error_kept(self, tmp_path: Path) -> None:
+        """Output following a compile error is read before the run is stopped."""
+        script = tmp_path / "fake_cargo.py"
+        script.write_text(
+            "import time\n"
+            "print('error[E0425]: cannot find value `x` in this scope', flush=True)\n"
+            "print('  --> src/lib.rs:3:5', flush=True)\n"
+            "time.sleep(30)\n"
+        )
+
+        start = time.time()
+        with patch("adw.testing.stream.FATAL_ERROR_GRACE_SECONDS", 1):
+            result = stream_tests(f"{sys.executable} {script.name} # cargo test", tmp_path)
+
+        assert time.time() - start < 20
+        assert result.errors == 1
+        assert result.error_message.startswith("Stopped on error: error[E0425]")
+        assert "src/lib.rs:3:5" in result.error_message
+
+    def test_timeout(self, tmp_path: Path) -> None:
+        """A run past its timeout is stopped and reported as timed out."""
+        write_suite(tmp_path, failing=0, slow_seconds=30)
+
+        result = stream_tests(PYTEST, tmp_path, timeout=2)
+
+        assert result.timed_out
+        assert not result.success
+
+
+class TestStreamedValidation:
+    """Tests for validate_tests with streaming."""
+
+    def test_failures_reported_as_they_happen(self, tmp_path: Path) -> None:
+        """Failures reach the callbacks and the retry context says the run stopped."""
+        failures, progress = [], []
+
+        def fake_stream(command, path, timeout, on_failure, max_failures, stop_on_error):
+            from adw.testing import FailedTest
+
+            failure = FailedTest(name="test_a", error_message="boom")
+            on_failure(failure)
+            return TestResult(
+                failed=1,
+                total=1,
+                exit_code=1,
+                failed_tests=[failure],
+                error_message="Stopped after 1 failures",
+            )
+
+        config = ValidationConfig(test_command="pytest", stream_output=True, max_failures=1)
+        with patch("adw.testing.validation.stream_tests", side_effect=fake_stream):
+            result = validate_tests(tmp_path, config, on_progress=progress.append, on_failure=failures.append)
+
+        assert [f.name for f in failures] == ["test_a"]
+        assert any("test_a" in message for message in progress)
+        assert "Stopped after 1 failures" in result.retry_context
@@ -37,6 +37,7 @@ from adw.triggers.webhook import (
     log_webhook_event,
     register_callback,
     revoke_api_key,
+    send_callback,
     verify_api_key,
 )
 
@@ -466,6 +467,12 @@ class TestCallbackSystem:
         assert get_callback_url("task1") == "https://example.com/callback1"
         assert get_callback_url("task2") == "https://example.com/callback2"
 
+    def test_send_callback_invalid_url(self, mock_adw_dir: Path) -> None:
+        """Test that a malformed callback URL fails the send instead of raising."""
+        register_callback("task1", "http://host:abc/x")
+
+        assert send_callback("task1", "completed", {}) is False
+
 
 # =============================================================================
 # Webhook Logging Tests
@@ -13,6 +13,7 @@ from adw.workflows.dsl import (
     PhaseDefinition,
     PromptTemplate,
     WorkflowDefinition,
+    clear_template_cache,
     create_workflow,
     delete_workflow,
     ensure_builtin_workflows,
@@ -212,6 +213,77 @@ class TestWorkflowDefinition:
         assert all(not p.required for p in optional)
 
 
+class TestPhaseDependencies:
+    """Tests for depends_on and the dependency graph."""
+
+    def test_graph_defaults_to_list_order(self) -> None:
+        """Phases without depends_on wait for the previous group."""
+        wf = WorkflowDefinition(
+            name="test",
+            phases=[
+                PhaseDefinition(name="implement", prompt="Implement"),
+                PhaseDefinition(name="lint", prompt="Lint", depends_on=["implement"]),
+                PhaseDefinition(name="docs", prompt="Docs", depends_on=["implement"]),
+                PhaseDefinition(name="check", prompt="Check", parallel_with=["review"]),
+                PhaseDefinition(name="review", prompt="Review"),
+                PhaseDefinition(name="ship", prompt="Ship"),
+                PhaseDefinition(name="notes", prompt="Notes", depends_on=[]),
+            ],
+        )
+
+        assert wf.uses_dependencies
+        assert wf.dependency_graph() == {
+            "implement": [],
+            "lint": ["implement"],
+            "docs": ["implement"],
+            "check": ["docs"],
+            "review": ["docs"],
+            "ship": ["check", "review"],
+            "notes": [],
+        }
+
+    def test_unknown_dependency(self) -> None:
+        """depends_on must name an existing phase."""
+        with pytest.raises(ValueError, match="unknown phase 'build'"):
+            WorkflowDefinition(
+                name="test",
+                phases=[PhaseDefinition(name="lint", prompt="Lint", depends_on=["build"])],
+            )
+
+    def test_cycle(self) -> None:
+        """Cycles, including through implicit list order, are rejected."""
+        with pytest.raises(ValueError, match="dependency cycle: a -> b -> a"):
+            WorkflowDefinition(
+                name="test",
+                phases=[
+                    PhaseDefinition(name="a", prompt="A", depends_on=["b"]),
+                    PhaseDefinition(name="b", prompt="B"),
+                ],
+            )
+
+    def test_yaml_round_trip(self) -> None:
+        """depends_on and max_parallel survive parsing and serialization."""
+        wf = parse_workflow_yaml(
+            """
+name: dag
+max_parallel: 2
+phases:
+  - name: implement
+    prompt: Implement
+  - name: lint
+    prompt: Lint
+    depends_on: [implement]
+  - name: notes
+    prompt: Notes
+    depends_on: []
+"""
+        )
+        parsed = parse_workflow_yaml(serialize_workflow(wf))
+
+        assert parsed.max_parallel == 2
+        assert [p.depends_on for p in parsed.phases] == [None, ["implement"], []]
+
+
 # =============================================================================
 # YAML Parsing Tests
 # =============================================================================
@@ -552,6 +624,56 @@ class TestPromptTemplate:
         with pytest.raises(FileNotFoundError):
             PromptTemplate.from_file("/nonexistent/template.md")
 
+    def test_variables_inside_conditional(self) -> None:
+        """Test that variables in a conditional block are substituted."""
+        template = PromptTemplate("A{{#if extra}} {{name}} and {{other}} {{/if}}B {{name}}")
+        assert template.render(extra=True, name="x") == "Ax and {{other}}B x"
+        assert template.render(name="x") == "AB x"
+
+
+class TestTemplateCache:
+    """Tests for compiled template and workflow caching."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        """Start every test with empty caches."""
+        clear_template_cache()
+        yield
+        clear_template_cache()
+
+    def test_compiled_once(self, tmp_path: Path) -> None:
+        """Test that instances of the same template share one compilation."""
+        (tmp_path / "part.md").write_text("Part {{name}}")
+        first = PromptTemplate("{{include part.md}}!", base_path=tmp_path)
+        second = PromptTemplate("{{include part.md}}!", base_path=tmp_path)
+
+        assert first.compiled() is second.compiled()
+        assert second.render(name="one") == "Part one!"
+
+    def test_changed_include_recompiles(self, tmp_path: Path) -> None:
+        """Test that editing, adding or removing an include is picked up."""
+        include = tmp_path / "part.md"
+        template = PromptTemplate("{{include part.md}}", base_path=tmp_path)
+        assert "Include not found" in template.render()
+
+        include.write_text("first")
+        assert template.render() == "first"
+
+        include.write_text("second version")
+        assert template.render() == "second version"
+
+    def test_workflow_cached_until_modified(self, tmp_path: Path) -> None:
+        """Test that load_workflow reparses only changed files."""
+        path = tmp_path / "wf.yaml"
+        path.write_text("name: wf\nphases:\n  - name: build\n    prompt: Build\n")
+
+        first = load_workflow(path)
+        first.phases.clear()  # Callers cannot change the cached definition
+        assert [p.name for p in load_workflow(path).phases] == ["build"]
+
+        path.write_text("name: wf\nphases:\n  - name: build\n    prompt: Build\n  - name: test\n    prompt: Test\n")
+        assert [p.name for p in load_workflow(path).phases] == ["build", "test"]
+
 
 # =============================================================================
 # Library Management Tests